@@ -1,3 +1,4 @@
+import asyncio
 import json
 import time
 import uuid
@@ -6,16 +7,14 @@ import logging
 import threading
 from datetime import datetime, timezone, timedelta
 from zoneinfo import ZoneInfo
-from typing import Any, Dict, Optional, List, Literal
+from typing import Any, Dict, Optional, List, Literal, Tuple
 
 # Load .env file FIRST before any other imports
 from dotenv import load_dotenv
 load_dotenv()  # Load environment variables from .env file
 
-import pika
 from fastapi import FastAPI, Header, HTTPException, Request, Body, Response, Query
 from fastapi.responses import PlainTextResponse, StreamingResponse, HTMLResponse, FileResponse
-from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 
@@ -27,14 +26,16 @@ from shared.tenant_ctx import TenantCtx
 # Import TTS service (ElevenLabs as primary, Google Cloud as fallback)
 TTS_ENABLED = False
 generate_tts = None
+stream_tts = None  # starts synthesis on the TTS worker pool; returns before the audio is done
 tts_temp_dir = None
 
 # Try ElevenLabs first (recommended for Korean)
 try:
-    from shared.tts_elevenlabs import generate_tts_elevenlabs, elevenlabs_tts_service
+    from shared.tts_elevenlabs import generate_tts_elevenlabs, stream_tts_elevenlabs, elevenlabs_tts_service
     if elevenlabs_tts_service.enabled:
         TTS_ENABLED = True
         generate_tts = generate_tts_elevenlabs
+        stream_tts = stream_tts_elevenlabs
         tts_temp_dir = elevenlabs_tts_service.temp_dir
         print("✅ TTS service enabled (ElevenLabs - Multilingual)")
 except ImportError:
@@ -45,7 +46,7 @@ except Exception as e:
 # Fallback to Google Cloud TTS (service account)
 if not TTS_ENABLED:
     try:
-        from shared.tts_service import generate_tts, tts_service
+        from shared.tts_service import generate_tts, stream_tts, tts_service
         if tts_service.enabled:
             TTS_ENABLED = True
             tts_temp_dir = tts_service.temp_dir
@@ -56,10 +57,11 @@ if not TTS_ENABLED:
 # Fallback to Google Cloud TTS (API Key)
 if not TTS_ENABLED:
     try:
-        from shared.tts_service_apikey import generate_tts_with_apikey, tts_service_apikey
+        from shared.tts_service_apikey import generate_tts_with_apikey, stream_tts_with_apikey, tts_service_apikey
         if tts_service_apikey.enabled:
             TTS_ENABLED = True
             generate_tts = generate_tts_with_apikey
+            stream_tts = stream_tts_with_apikey
             tts_temp_dir = tts_service_apikey.temp_dir
             print("✅ TTS service enabled (Google Cloud TTS - API Key)")
         else:
@@ -70,20 +72,25 @@ if not TTS_ENABLED:
 if not TTS_ENABLED:
     print("⚠️ All TTS services disabled - no API keys configured")
 from shared.pii_mask import mask_sensitive
+from shared import redis_client
 from shared.llm_client import LLMClient
-from shared.task_store import TaskStore
-from shared.stream_store import StreamStore
+from shared.task_store import AsyncTaskStore, TaskStore
+from shared.stream_store import AsyncStreamStore, StreamStore
+from shared.stream_hub import StreamHub, sse_frame
 from shared.youtube_client import YouTubeClient
-from shared.rag_naive import NaiveRAG
+from shared.rag_naive import AsyncNaiveRAG, NaiveRAG
 from shared.rag_folder_ingest import RagFolderIngestor
 from shared.youtube_queue import YouTubeQueueStore
+from shared.tts_pipeline import SentencePipeline, TenantTTSLimiter
 from shared.play_games import PlayEngine
 from shared.security import verify_callback_signature, verify_callback_signature_multi, parse_callback_secrets_json
 from shared.callback_rotation import load_callback_secrets, load_rotatable_secrets, rotate_activate_rotatable, dump_rotatable_secrets_json, reconcile_expired, persist_if_file
 from shared.nonce_store import NonceStore
 # from shared.metrics import TASK_CREATE, TASK_GET, CALLBACK, LLM_GEN, QUEUE_PUBLISH_FAIL, TASK_DURATION  # Disabled for minimal deployment
 from shared.mq_utils import declare_queues, publish_json
-from shared.node_store import NodeStore
+from shared.mq_pool import RabbitPool
+from shared.node_ingest import IngestBatch, NodeIngestQueue, NodeIngestSessions, docs_from_chunks
+from shared.node_store import AsyncNodeStore, NodeCommandWaiter
 from nexus_supervisor.public_pages_i18n import (
     landing_page as render_landing_page_i18n,
     intro_page as render_intro_page_i18n,
@@ -94,8 +101,12 @@ from nexus_supervisor.public_pages_i18n import (
     login_page as render_login_page_i18n,
     modules_page as render_modules_page_i18n,
     load_modules_data,
-    load_benchmark_data
+    load_benchmark_data,
+    DATA_FILES as PUBLIC_DATA_FILES,
+    TRANSLATIONS as PUBLIC_TRANSLATIONS,
 )
+from nexus_supervisor.public_page_cache import PublicPageCache
+from nexus_supervisor.static_assets import HashedStaticFiles, assets as static_assets
 
 setup_logging()
 logger = logging.getLogger("nexus_supervisor")
@@ -109,20 +120,33 @@ from pathlib import Path
 
 static_dir = Path(__file__).parent.parent / "static"
 if static_dir.exists():
-    app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+    # content-hashed bundles under /static/dist are served with immutable cache headers
+    app.mount("/static", HashedStaticFiles(directory=str(static_dir)), name="static")
     logger.info(f"✅ Static files mounted from {static_dir}")
 else:
     logger.warning(f"⚠️ Static directory not found: {static_dir}")
 
+# request handlers use the Async* stores (redis.asyncio, same keys); the sync ones serve
+# sync endpoints and worker threads
 store = TaskStore(settings.redis_url, settings.task_ttl_seconds)
+store_async = AsyncTaskStore(settings.redis_url, settings.task_ttl_seconds)
 nonce_store = NonceStore(settings.redis_url, settings.callback_nonce_ttl_seconds, settings.callback_nonce_store_path)
-stream_store = StreamStore(settings.redis_url, event_keep=settings.stream_event_keep, worklog_keep=settings.stream_worklog_keep)
+stream_store = StreamStore(settings.redis_url, event_keep=settings.stream_event_keep, worklog_keep=settings.stream_worklog_keep, backend=settings.stream_backend)
+stream_store_async = AsyncStreamStore(settings.redis_url, event_keep=settings.stream_event_keep, worklog_keep=settings.stream_worklog_keep, backend=settings.stream_backend)
+stream_hub = StreamHub(settings.redis_url, stream_store_async, queue_max=settings.stream_subscriber_queue_max, ping_every_s=settings.stream_ping_seconds)
 youtube_client = YouTubeClient(settings.redis_url, api_key=settings.youtube_api_key)
-rag_engine = NaiveRAG(settings.redis_url)
+rag_engine = NaiveRAG(settings.redis_url, default_analyzer=settings.rag_analyzer)
+rag_engine_async = AsyncNaiveRAG(settings.redis_url, default_analyzer=settings.rag_analyzer)
 rag_folder_ingestor = RagFolderIngestor(settings.redis_url, rag_engine)
 youtube_queue_store = YouTubeQueueStore(settings.redis_url)
 play_engine = PlayEngine(settings.redis_url, ttl_seconds=int(os.getenv('PLAY_SESSION_TTL_SECONDS', '86400')))
-node_store = NodeStore(settings.redis_url)
+node_store_async = AsyncNodeStore(settings.redis_url)
+node_waiter = NodeCommandWaiter(settings.redis_url, node_store_async)
+# rendered public pages (bytes + gzip/br), re-rendered when data/modules.json or benchmark.json change
+public_pages = PublicPageCache(PUBLIC_DATA_FILES, languages=PUBLIC_TRANSLATIONS.keys())
+
+# nodes enrolled before the node→tenant index existed were only registered under these tenants
+_LEGACY_NODE_TENANTS = ("demo:demo", "org123:proj456")
 callback_secrets = load_callback_secrets(getattr(settings, 'callback_secret_rotation_source', 'env'), getattr(settings, 'callback_signature_secrets_json', '') or '', getattr(settings, 'callback_signature_secrets_path', '') or '')
 
 # Tenant-scoped credential vault + LLM client (KEY03)
@@ -150,6 +174,20 @@ def declare_alarm_queue(ch):
         pass
 
 
+def declare_topology(ch):
+    declare_queues(ch, settings.task_queue, settings.retry_queue_prefix, settings.dlq_queue)
+    declare_hold_queue(ch)
+    declare_alarm_queue(ch)
+
+
+rabbit_pool = RabbitPool(
+    settings.rabbitmq_url,
+    size=settings.rabbitmq_pool_size,
+    declare=declare_topology,
+    confirms=settings.rabbitmq_publisher_confirms,
+)
+
+
 
 def require_api_key(x_api_key: Optional[str], authorization: Optional[str] = None):
     """Accept either X-API-Key or Authorization: Bearer <token>."""
@@ -201,6 +239,7 @@ CommandType = Literal[
     "rag.query",
     "rag.folder.ingest",
     "rag.folder.status",
+    "rag.analyzer.set",
 ]
 
 
@@ -234,19 +273,8 @@ class ApprovalDecisionAccepted(BaseModel):
     first_followup_report_id: Optional[str] = None
     correlation_id: str
 
-def _rabbit_channel():
-    params = pika.URLParameters(settings.rabbitmq_url)
-    connection = pika.BlockingConnection(params)
-    ch = connection.channel()
-    declare_queues(ch, settings.task_queue, settings.retry_queue_prefix, settings.dlq_queue)
-    return connection, ch
-
 def publish_task(envelope: Dict[str, Any]) -> None:
-    conn, ch = _rabbit_channel()
-    try:
-        publish_json(ch, settings.task_queue, envelope, correlation_id=envelope["task_id"], headers={"x-retry-count": 0})
-    finally:
-        conn.close()
+    rabbit_pool.publish(settings.task_queue, envelope, correlation_id=envelope["task_id"], headers={"x-retry-count": 0})
 
 @app.get("/health")
 def health():
@@ -258,12 +286,8 @@ def health():
     except Exception:
         redis_ok = False
 
-    try:
-        conn, ch = _rabbit_channel()
-        conn.close()
-        rabbit_ok = True
-    except Exception:
-        rabbit_ok = False
+    # pooled connection check; dials only if no pooled connection is open
+    rabbit_ok = rabbit_pool.ping()
 
     return {
         "status": "ok" if (redis_ok and rabbit_ok) else "degraded",
@@ -271,10 +295,13 @@ def health():
         "llm_provider": settings.llm_provider,
         "redis_ok": redis_ok,
         "rabbit_ok": rabbit_ok,
+        "rabbit_pool": rabbit_pool.status(),
+        "redis_pools": redis_client.pool_stats(),
     }
 
 @app.get("/metrics", response_class=PlainTextResponse)
 def metrics():
+    redis_client.update_pool_metrics()
     return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 # ---- Tenant-scoped credentials (SaaS) ----
@@ -510,9 +537,9 @@ def create_excel_kakao(req: TaskCreateRequest, request: Request, x_api_key: Opti
     return TaskCreateResponse(task_id=task_id, status="queued")
 
 @app.get("/tasks/{task_id}")
-def get_task(task_id: str, x_api_key: Optional[str] = Header(None), authorization: Optional[str] = Header(None)):
+async def get_task(task_id: str, x_api_key: Optional[str] = Header(None), authorization: Optional[str] = Header(None)):
     require_api_key(x_api_key, authorization)
-    task = store.get(task_id)
+    task = await store_async.get(task_id)
     if not task:
         raise HTTPException(status_code=404, detail={"error": {"code": "NOT_FOUND", "message": "Task not found"}})
     TASK_GET.labels(task_type=task.get("task_type","unknown")).inc()
@@ -574,7 +601,7 @@ async def agent_callback(request: Request, x_api_key: Optional[str] = Header(Non
 
     cb = AgentCallbackRequest(**json.loads(body.decode("utf-8")))
 
-    task = store.get(cb.task_id)
+    task = await store_async.get(cb.task_id)
     if not task:
         raise HTTPException(status_code=404, detail={"error": {"code": "NOT_FOUND", "message": "Task not found"}})
 
@@ -593,7 +620,7 @@ async def agent_callback(request: Request, x_api_key: Optional[str] = Header(Non
         if isinstance(dur_ms, int) and dur_ms >= 0:
             TASK_DURATION.labels(task_type=task.get("task_type","unknown")).observe(dur_ms / 1000.0)
 
-    updated = store.update(cb.task_id, patch)
+    updated = await store_async.update(cb.task_id, patch)
     CALLBACK.labels(status=cb.status).inc()
 
     masked = mask_sensitive({"task_id": cb.task_id, "status": cb.status, "result": cb.result, "error": cb.error, "metrics": cb.metrics})
@@ -661,16 +688,9 @@ def alarm_peek(limit: int = 10, x_admin_key: Optional[str] = Header(None)):
     require_admin_key(x_admin_key)
     limit = max(1, min(limit, 50))
 
-    params = pika.URLParameters(settings.rabbitmq_url)
-    conn = pika.BlockingConnection(params)
-    ch = conn.channel()
-    declare_queues(ch, settings.task_queue, settings.retry_queue_prefix, settings.dlq_queue)
-    declare_hold_queue(ch)
-    declare_alarm_queue(ch)
-
-    out = []
-    scanned = 0
-    try:
+    with rabbit_pool.channel() as ch:
+        out = []
+        scanned = 0
         for _ in range(limit):
             method_frame, props, body = ch.basic_get(queue=settings.alarm_queue, auto_ack=False)
             if not method_frame:
@@ -680,8 +700,6 @@ def alarm_peek(limit: int = 10, x_admin_key: Optional[str] = Header(None)):
             msg = json.loads(body.decode("utf-8"))
             out.append({"correlation_id": getattr(props, "correlation_id", None), "headers": headers, "message": msg})
             ch.basic_nack(method_frame.delivery_tag, requeue=True)
-    finally:
-        conn.close()
 
     return {"count": len(out), "scanned": scanned, "items": out}
 
@@ -692,15 +710,8 @@ def alarm_purge(limit: int = 1000, dry_run: bool = False, x_admin_key: Optional[
     require_admin_key(x_admin_key)
     limit = max(1, min(limit, 5000))
 
-    params = pika.URLParameters(settings.rabbitmq_url)
-    conn = pika.BlockingConnection(params)
-    ch = conn.channel()
-    declare_queues(ch, settings.task_queue, settings.retry_queue_prefix, settings.dlq_queue)
-    declare_hold_queue(ch)
-    declare_alarm_queue(ch)
-
-    purged = 0
-    try:
+    with rabbit_pool.channel() as ch:
+        purged = 0
         for _ in range(limit):
             method_frame, props, body = ch.basic_get(queue=settings.alarm_queue, auto_ack=False)
             if not method_frame:
@@ -711,11 +722,31 @@ def alarm_purge(limit: int = 1000, dry_run: bool = False, x_admin_key: Optional[
                 continue
             ch.basic_ack(method_frame.delivery_tag)
             purged += 1
-    finally:
-        conn.close()
 
     return {"purged": purged, "dry_run": dry_run}
 
+def _hold_snapshot(limit: int) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Up to limit (headers, message) pairs from the head of HOLD, requeued before returning.
+
+    The fix_*, github_issue and suggest_fix endpoints spend seconds to minutes per message in
+    LLM and GitHub calls. Taking the messages first keeps the pooled channel checked out only for
+    the broker round-trips: the pool has a few slots with a short checkout timeout, and a
+    BlockingConnection services heartbeats only while it is in use. All messages stay unacked until the last get, so they are distinct.
+    """
+    items: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+    with rabbit_pool.channel() as ch:
+        last_tag = None
+        for _ in range(limit):
+            method_frame, props, body = ch.basic_get(queue=settings.hold_queue, auto_ack=False)
+            if not method_frame:
+                break
+            last_tag = method_frame.delivery_tag
+            items.append(((props.headers or {}) if props else {}, json.loads(body.decode("utf-8"))))
+        if last_tag is not None:
+            ch.basic_nack(last_tag, multiple=True, requeue=True)
+    return items
+
+
 @app.post("/hold/fix_pr_ci")
 def hold_fix_pr_ci(limit: int = 1, provider: str = "anthropic", dry_run: bool = False,
                    apply_patches: bool = False, allowlist: str = "", max_files: int = 5, max_lines: int = 400,
@@ -724,46 +755,30 @@ def hold_fix_pr_ci(limit: int = 1, provider: str = "anthropic", dry_run: bool =
     require_admin_key(x_admin_key)
     limit = max(1, min(limit, 1))  # single item per call to keep runtime bounded
 
-    params = pika.URLParameters(settings.rabbitmq_url)
-    conn = pika.BlockingConnection(params)
-    ch = conn.channel()
-    declare_queues(ch, settings.task_queue, settings.retry_queue_prefix, settings.dlq_queue)
-    declare_hold_queue(ch)
-
     out = []
-    try:
-        for _ in range(limit):
-            method_frame, props, body = ch.basic_get(queue=settings.hold_queue, auto_ack=False)
-            if not method_frame:
-                break
-            headers = (props.headers or {}) if props else {}
-            msg = json.loads(body.decode("utf-8"))
-            fc = extract_failure_code(headers, msg) or "unknown"
-
-            if dry_run:
-                out.append({"dry_run": True, "failure_code": fc, "provider": provider})
-                ch.basic_nack(method_frame.delivery_tag, requeue=True)
-                continue
-
-            allow = [p.strip() for p in allowlist.split(",") if p.strip()] if allowlist else None
-            res = create_fix_pr_and_ci(msg, fc, provider_override=(provider or None),
-                                       apply_patches=apply_patches, allowlist=allow,
-                                       max_files=max_files, max_lines=max_lines)
-            out.append({
-                "dry_run": False,
-                "failure_code": fc,
-                "provider": provider,
-                "ok": res.ok,
-                "pr_url": res.pr_url,
-                "workflow_run_url": (res.run.run_url if res.run else None),
-                "status": (res.run.status if res.run else None),
-                "conclusion": (res.run.conclusion if res.run else None),
-                "comment_url": res.comment_url,
-                "error": res.error,
-            })
-            ch.basic_nack(method_frame.delivery_tag, requeue=True)
-    finally:
-        conn.close()
+    for headers, msg in _hold_snapshot(limit):
+        fc = extract_failure_code(headers, msg) or "unknown"
+
+        if dry_run:
+            out.append({"dry_run": True, "failure_code": fc, "provider": provider})
+            continue
+
+        allow = [p.strip() for p in allowlist.split(",") if p.strip()] if allowlist else None
+        res = create_fix_pr_and_ci(msg, fc, provider_override=(provider or None),
+                                   apply_patches=apply_patches, allowlist=allow,
+                                   max_files=max_files, max_lines=max_lines)
+        out.append({
+            "dry_run": False,
+            "failure_code": fc,
+            "provider": provider,
+            "ok": res.ok,
+            "pr_url": res.pr_url,
+            "workflow_run_url": (res.run.run_url if res.run else None),
+            "status": (res.run.status if res.run else None),
+            "conclusion": (res.run.conclusion if res.run else None),
+            "comment_url": res.comment_url,
+            "error": res.error,
+        })
 
     return {"count": len(out), "items": out}
 
@@ -773,42 +788,26 @@ def hold_fix_pr(limit: int = 1, provider: str = "anthropic", dry_run: bool = Fal
     require_admin_key(x_admin_key)
     limit = max(1, min(limit, 2))
 
-    params = pika.URLParameters(settings.rabbitmq_url)
-    conn = pika.BlockingConnection(params)
-    ch = conn.channel()
-    declare_queues(ch, settings.task_queue, settings.retry_queue_prefix, settings.dlq_queue)
-    declare_hold_queue(ch)
-
     out = []
-    try:
-        for _ in range(limit):
-            method_frame, props, body = ch.basic_get(queue=settings.hold_queue, auto_ack=False)
-            if not method_frame:
-                break
-            headers = (props.headers or {}) if props else {}
-            msg = json.loads(body.decode("utf-8"))
-            fc = extract_failure_code(headers, msg) or "unknown"
-
-            if dry_run:
-                out.append({"dry_run": True, "failure_code": fc, "provider": provider})
-                ch.basic_nack(method_frame.delivery_tag, requeue=True)
-                continue
-
-            allow = [p.strip() for p in allowlist.split(",") if p.strip()] if allowlist else None
-            res = create_fix_pr_from_hold(msg, fc, provider_override=(provider or None), apply_patches=apply_patches, allowlist=allow, max_files=max_files, max_lines=max_lines)
-            out.append({
-                "dry_run": False,
-                "failure_code": fc,
-                "provider": provider,
-                "ok": res.ok,
-                "pr_url": (res.pr.pr_url if res.pr else None),
-                "branch": (res.pr.branch if res.pr else None),
-                "md_path": res.md_path,
-                "error": res.error,
-            })
-            ch.basic_nack(method_frame.delivery_tag, requeue=True)
-    finally:
-        conn.close()
+    for headers, msg in _hold_snapshot(limit):
+        fc = extract_failure_code(headers, msg) or "unknown"
+
+        if dry_run:
+            out.append({"dry_run": True, "failure_code": fc, "provider": provider})
+            continue
+
+        allow = [p.strip() for p in allowlist.split(",") if p.strip()] if allowlist else None
+        res = create_fix_pr_from_hold(msg, fc, provider_override=(provider or None), apply_patches=apply_patches, allowlist=allow, max_files=max_files, max_lines=max_lines)
+        out.append({
+            "dry_run": False,
+            "failure_code": fc,
+            "provider": provider,
+            "ok": res.ok,
+            "pr_url": (res.pr.pr_url if res.pr else None),
+            "branch": (res.pr.branch if res.pr else None),
+            "md_path": res.md_path,
+            "error": res.error,
+        })
 
     return {"count": len(out), "items": out}
 
@@ -818,40 +817,24 @@ def hold_fix_issue(limit: int = 1, provider: str = "anthropic", dry_run: bool =
     require_admin_key(x_admin_key)
     limit = max(1, min(limit, 3))
 
-    params = pika.URLParameters(settings.rabbitmq_url)
-    conn = pika.BlockingConnection(params)
-    ch = conn.channel()
-    declare_queues(ch, settings.task_queue, settings.retry_queue_prefix, settings.dlq_queue)
-    declare_hold_queue(ch)
-
     out = []
-    try:
-        for _ in range(limit):
-            method_frame, props, body = ch.basic_get(queue=settings.hold_queue, auto_ack=False)
-            if not method_frame:
-                break
-            headers = (props.headers or {}) if props else {}
-            msg = json.loads(body.decode("utf-8"))
-            fc = extract_failure_code(headers, msg) or "unknown"
+    for headers, msg in _hold_snapshot(limit):
+        fc = extract_failure_code(headers, msg) or "unknown"
 
-            if dry_run:
-                out.append({"dry_run": True, "failure_code": fc, "provider": provider})
-                ch.basic_nack(method_frame.delivery_tag, requeue=True)
-                continue
+        if dry_run:
+            out.append({"dry_run": True, "failure_code": fc, "provider": provider})
+            continue
 
-            res = create_fix_issue_from_hold(msg, fc, provider_override=(provider or None))
-            out.append({
-                "dry_run": False,
-                "failure_code": fc,
-                "provider": provider,
-                "ok": res.ok,
-                "issue_url": (res.issue.url if res.issue else None),
-                "error": res.error,
-                "suggestion": res.suggestion,
-            })
-            ch.basic_nack(method_frame.delivery_tag, requeue=True)
-    finally:
-        conn.close()
+        res = create_fix_issue_from_hold(msg, fc, provider_override=(provider or None))
+        out.append({
+            "dry_run": False,
+            "failure_code": fc,
+            "provider": provider,
+            "ok": res.ok,
+            "issue_url": (res.issue.url if res.issue else None),
+            "error": res.error,
+            "suggestion": res.suggestion,
+        })
 
     return {"count": len(out), "items": out}
 
@@ -861,32 +844,15 @@ def hold_github_issue(limit: int = 1, dry_run: bool = False, x_admin_key: Option
     require_admin_key(x_admin_key)
     limit = max(1, min(limit, 5))
 
-    params = pika.URLParameters(settings.rabbitmq_url)
-    conn = pika.BlockingConnection(params)
-    ch = conn.channel()
-    declare_queues(ch, settings.task_queue, settings.retry_queue_prefix, settings.dlq_queue)
-    declare_hold_queue(ch)
-
     created = []
-    try:
-        for _ in range(limit):
-            method_frame, props, body = ch.basic_get(queue=settings.hold_queue, auto_ack=False)
-            if not method_frame:
-                break
-            headers = (props.headers or {}) if props else {}
-            msg = json.loads(body.decode("utf-8"))
+    for headers, msg in _hold_snapshot(limit):
+        tpl = build_hold_pr(msg, headers=headers)
+        if dry_run:
+            created.append({"dry_run": True, "title": tpl.title})
+            continue
 
-            tpl = build_hold_pr(msg, headers=headers)
-            if dry_run:
-                created.append({"dry_run": True, "title": tpl.title})
-                ch.basic_nack(method_frame.delivery_tag, requeue=True)
-                continue
-
-            res = create_issue(tpl.title, tpl.body, labels=["hold", "schema"])
-            created.append({"dry_run": False, "title": tpl.title, "ok": res.ok, "url": res.url, "error": res.error})
-            ch.basic_nack(method_frame.delivery_tag, requeue=True)
-    finally:
-        conn.close()
+        res = create_issue(tpl.title, tpl.body, labels=["hold", "schema"])
+        created.append({"dry_run": False, "title": tpl.title, "ok": res.ok, "url": res.url, "error": res.error})
 
     return {"count": len(created), "items": created}
 
@@ -896,26 +862,11 @@ def hold_suggest_fix(limit: int = 1, provider: str = "", x_admin_key: Optional[s
     require_admin_key(x_admin_key)
     limit = max(1, min(limit, 3))
 
-    params = pika.URLParameters(settings.rabbitmq_url)
-    conn = pika.BlockingConnection(params)
-    ch = conn.channel()
-    declare_queues(ch, settings.task_queue, settings.retry_queue_prefix, settings.dlq_queue)
-    declare_hold_queue(ch)
-
     out = []
-    try:
-        for _ in range(limit):
-            method_frame, props, body = ch.basic_get(queue=settings.hold_queue, auto_ack=False)
-            if not method_frame:
-                break
-            headers = (props.headers or {}) if props else {}
-            msg = json.loads(body.decode("utf-8"))
-            fc = extract_failure_code(headers, msg) or "unknown"
-            r = suggest_fix(msg, fc, provider_override=(provider or None))
-            out.append({"failure_code": fc, "ok": r.ok, "provider": r.provider, "model": r.model, "repaired": r.repaired, "attempts": r.attempts, "data": r.data, "error": r.error})
-            ch.basic_nack(method_frame.delivery_tag, requeue=True)
-    finally:
-        conn.close()
+    for headers, msg in _hold_snapshot(limit):
+        fc = extract_failure_code(headers, msg) or "unknown"
+        r = suggest_fix(msg, fc, provider_override=(provider or None))
+        out.append({"failure_code": fc, "ok": r.ok, "provider": r.provider, "model": r.model, "repaired": r.repaired, "attempts": r.attempts, "data": r.data, "error": r.error})
 
     return {"count": len(out), "items": out}
 
@@ -925,14 +876,8 @@ def hold_pr(limit: int = 1, x_admin_key: Optional[str] = Header(None)):
     require_admin_key(x_admin_key)
     limit = max(1, min(limit, 5))
 
-    params = pika.URLParameters(settings.rabbitmq_url)
-    conn = pika.BlockingConnection(params)
-    ch = conn.channel()
-    declare_queues(ch, settings.task_queue, settings.retry_queue_prefix, settings.dlq_queue)
-    declare_hold_queue(ch)
-
-    templates = []
-    try:
+    with rabbit_pool.channel() as ch:
+        templates = []
         for _ in range(limit):
             method_frame, props, body = ch.basic_get(queue=settings.hold_queue, auto_ack=False)
             if not method_frame:
@@ -943,8 +888,6 @@ def hold_pr(limit: int = 1, x_admin_key: Optional[str] = Header(None)):
             tpl = build_hold_pr(msg, headers=headers)
             templates.append({"title": tpl.title, "body": tpl.body})
             ch.basic_nack(method_frame.delivery_tag, requeue=True)
-    finally:
-        conn.close()
 
     return {"count": len(templates), "items": templates}
 
@@ -954,15 +897,9 @@ def hold_peek(limit: int = 10, x_admin_key: Optional[str] = Header(None)):
     require_admin_key(x_admin_key)
     limit = max(1, min(limit, 50))
 
-    params = pika.URLParameters(settings.rabbitmq_url)
-    conn = pika.BlockingConnection(params)
-    ch = conn.channel()
-    declare_queues(ch, settings.task_queue, settings.retry_queue_prefix, settings.dlq_queue)
-    declare_hold_queue(ch)
-
-    out = []
-    scanned = 0
-    try:
+    with rabbit_pool.channel() as ch:
+        out = []
+        scanned = 0
         for _ in range(limit):
             method_frame, props, body = ch.basic_get(queue=settings.hold_queue, auto_ack=False)
             if not method_frame:
@@ -972,8 +909,6 @@ def hold_peek(limit: int = 10, x_admin_key: Optional[str] = Header(None)):
             msg = json.loads(body.decode("utf-8"))
             out.append({"correlation_id": getattr(props, "correlation_id", None), "headers": headers, "message": msg})
             ch.basic_nack(method_frame.delivery_tag, requeue=True)
-    finally:
-        conn.close()
 
     return {"count": len(out), "scanned": scanned, "items": out}
 
@@ -984,14 +919,8 @@ def hold_purge(limit: int = 1000, dry_run: bool = False, x_admin_key: Optional[s
     require_admin_key(x_admin_key)
     limit = max(1, min(limit, 5000))
 
-    params = pika.URLParameters(settings.rabbitmq_url)
-    conn = pika.BlockingConnection(params)
-    ch = conn.channel()
-    declare_queues(ch, settings.task_queue, settings.retry_queue_prefix, settings.dlq_queue)
-    declare_hold_queue(ch)
-
-    purged = 0
-    try:
+    with rabbit_pool.channel() as ch:
+        purged = 0
         for _ in range(limit):
             method_frame, props, body = ch.basic_get(queue=settings.hold_queue, auto_ack=False)
             if not method_frame:
@@ -1002,8 +931,6 @@ def hold_purge(limit: int = 1000, dry_run: bool = False, x_admin_key: Optional[s
                 continue
             ch.basic_ack(method_frame.delivery_tag)
             purged += 1
-    finally:
-        conn.close()
 
     return {"purged": purged, "dry_run": dry_run}
 
@@ -1013,16 +940,11 @@ def dlq_stats(sample: int = 200, x_admin_key: Optional[str] = Header(None)):
     require_admin_key(x_admin_key)
     sample = max(10, min(sample, 2000))
 
-    params = pika.URLParameters(settings.rabbitmq_url)
-    conn = pika.BlockingConnection(params)
-    ch = conn.channel()
-    declare_queues(ch, settings.task_queue, settings.retry_queue_prefix, settings.dlq_queue)
-
-    by_code = {}
-    by_type = {}
-    scanned = 0
+    with rabbit_pool.channel() as ch:
+        by_code = {}
+        by_type = {}
+        scanned = 0
 
-    try:
         for _ in range(sample):
             method_frame, props, body = ch.basic_get(queue=settings.dlq_queue, auto_ack=False)
             if not method_frame:
@@ -1052,8 +974,6 @@ def dlq_stats(sample: int = 200, x_admin_key: Optional[str] = Header(None)):
 
             # requeue (non-destructive)
             ch.basic_nack(method_frame.delivery_tag, requeue=True)
-    finally:
-        conn.close()
 
     # sort descending
     by_code = dict(sorted(by_code.items(), key=lambda kv: kv[1], reverse=True))
@@ -1069,24 +989,38 @@ def alerts_test(x_admin_key: Optional[str] = Header(None)):
     res = send_webhook("test", {"ts": time.time(), "service": "nexus_supervisor"})
     return {"ok": res.ok, "status_code": res.status_code, "error": res.error}
 
+def _send_dlq_alarms(alarms: List[Tuple[str, str, Dict[str, Any]]]) -> int:
+    """Webhook alerts for (failure_code, task_id, message) moved to ALARM; returns how many were sent.
+
+    Called after the pooled channel is released, so slow webhooks do not hold a slot.
+    """
+    from shared.alerter import send_webhook
+    alerted = 0
+    for fc, correlation_id, msg in alarms:
+        try:
+            task_type = extract_task_type(msg)
+            d = AlertDedupe().allow(f"{task_type}:{fc}")
+            if not d.allowed:
+                continue
+            res = send_webhook("dlq_alarm", {"failure_code": fc, "task_id": correlation_id, "task_type": task_type, "runbook": get_runbook(fc), "dedupe_ttl": d.ttl_seconds})
+            if getattr(res, "ok", False):
+                alerted += 1
+        except Exception:
+            pass
+    return alerted
+
+
 @app.post("/dlq/apply")
 def dlq_apply(sample: int = 500, dry_run: bool = False, send_alert: bool = True, max_requeue: int = 200, max_hold: int = 200, max_alarm: int = 50, x_admin_key: Optional[str] = Header(None)):
     """Apply triage policy to DLQ: requeue transient, route schema to HOLD, route auth/disabled to ALARM. Best-effort scan."""
     require_admin_key(x_admin_key)
     sample = max(10, min(sample, 5000))
 
-    params = pika.URLParameters(settings.rabbitmq_url)
-    conn = pika.BlockingConnection(params)
-    ch = conn.channel()
-    declare_queues(ch, settings.task_queue, settings.retry_queue_prefix, settings.dlq_queue)
-    declare_hold_queue(ch)
-    declare_alarm_queue(ch)
-
-    scanned = 0
-    acted = {"requeue": 0, "hold": 0, "alarm": 0, "ignore": 0}
-    alerted = 0
+    alarms: List[Tuple[str, str, Dict[str, Any]]] = []
+    with rabbit_pool.channel() as ch:
+        scanned = 0
+        acted = {"requeue": 0, "hold": 0, "alarm": 0, "ignore": 0}
 
-    try:
         for _ in range(sample):
             method_frame, props, body = ch.basic_get(queue=settings.dlq_queue, auto_ack=False)
             if not method_frame:
@@ -1149,27 +1083,14 @@ def dlq_apply(sample: int = 500, dry_run: bool = False, send_alert: bool = True,
                 ch.basic_ack(method_frame.delivery_tag)
                 acted["alarm"] += 1
                 if send_alert:
-                    try:
-                        from shared.alerter import send_webhook
-                        rb = get_runbook(fc)
-                        dedupe = AlertDedupe()
-                        dedupe_key = f"{extract_task_type(msg)}:{fc}"
-                        d = dedupe.allow(dedupe_key)
-                        if d.allowed:
-                            res = send_webhook("dlq_alarm", {"failure_code": fc, "task_id": correlation_id, "task_type": extract_task_type(msg), "runbook": rb, "dedupe_ttl": d.ttl_seconds})
-                            if getattr(res, 'ok', False):
-                                alerted += 1
-                    except Exception:
-                        pass
+                    alarms.append((fc, correlation_id, msg))
                 continue
 
             # ignore: keep in DLQ
             ch.basic_nack(method_frame.delivery_tag, requeue=True)
             acted["ignore"] += 1
 
-    finally:
-        conn.close()
-
+    alerted = _send_dlq_alarms(alarms)
     return {"scanned": scanned, "dry_run": dry_run, "send_alert": send_alert, "acted": acted, "alerted": alerted}
 
 @app.post("/dlq/alarm")
@@ -1178,18 +1099,11 @@ def dlq_alarm(limit: int = 100, mode: str = "auto", dry_run: bool = False, send_
     require_admin_key(x_admin_key)
     limit = max(1, min(limit, 500))
 
-    params = pika.URLParameters(settings.rabbitmq_url)
-    conn = pika.BlockingConnection(params)
-    ch = conn.channel()
-    declare_queues(ch, settings.task_queue, settings.retry_queue_prefix, settings.dlq_queue)
-    declare_hold_queue(ch)
-    declare_alarm_queue(ch)
-
-    moved = 0
-    scanned = 0
-    alerted = 0
+    alarms: List[Tuple[str, str, Dict[str, Any]]] = []
+    with rabbit_pool.channel() as ch:
+        moved = 0
+        scanned = 0
 
-    try:
         max_scan = limit * 50
         for _ in range(max_scan):
             method_frame, props, body = ch.basic_get(queue=settings.dlq_queue, auto_ack=False)
@@ -1219,26 +1133,12 @@ def dlq_alarm(limit: int = 100, mode: str = "auto", dry_run: bool = False, send_
             moved += 1
 
             if send_alert:
-                try:
-                    from shared.alerter import send_webhook
-                    rb = get_runbook(fc)
-                    dedupe = AlertDedupe()
-                    dedupe_key = f"{extract_task_type(msg)}:{fc}"
-                    d = dedupe.allow(dedupe_key)
-                    if not d.allowed:
-                        res = None
-                    else:
-                        res = send_webhook("dlq_alarm", {"failure_code": fc, "task_id": correlation_id, "task_type": extract_task_type(msg), "runbook": rb, "dedupe_ttl": d.ttl_seconds})
-                    if res.ok:
-                        alerted += 1
-                except Exception:
-                    pass
+                alarms.append((fc, correlation_id, msg))
 
             if moved >= limit:
                 break
-    finally:
-        conn.close()
 
+    alerted = _send_dlq_alarms(alarms)
     return {"moved": moved, "scanned": scanned, "dry_run": dry_run, "send_alert": send_alert, "alerted": alerted}
 
 @app.post("/dlq/route")
@@ -1247,15 +1147,9 @@ def dlq_route(limit: int = 100, mode: str = "auto", dry_run: bool = False, x_adm
     require_admin_key(x_admin_key)
     limit = max(1, min(limit, 500))
 
-    params = pika.URLParameters(settings.rabbitmq_url)
-    conn = pika.BlockingConnection(params)
-    ch = conn.channel()
-    declare_queues(ch, settings.task_queue, settings.retry_queue_prefix, settings.dlq_queue)
-    declare_hold_queue(ch)
-
-    moved = 0
-    scanned = 0
-    try:
+    with rabbit_pool.channel() as ch:
+        moved = 0
+        scanned = 0
         max_scan = limit * 50
         for _ in range(max_scan):
             method_frame, props, body = ch.basic_get(queue=settings.dlq_queue, auto_ack=False)
@@ -1286,8 +1180,6 @@ def dlq_route(limit: int = 100, mode: str = "auto", dry_run: bool = False, x_adm
             moved += 1
             if moved >= limit:
                 break
-    finally:
-        conn.close()
 
     return {"moved": moved, "scanned": scanned, "mode": mode, "dry_run": dry_run}
 
@@ -1297,16 +1189,11 @@ def dlq_triage(sample: int = 200, x_admin_key: Optional[str] = Header(None)):
     require_admin_key(x_admin_key)
     sample = max(10, min(sample, 2000))
 
-    params = pika.URLParameters(settings.rabbitmq_url)
-    conn = pika.BlockingConnection(params)
-    ch = conn.channel()
-    declare_queues(ch, settings.task_queue, settings.retry_queue_prefix, settings.dlq_queue)
-
-    counts = {"requeue": 0, "hold": 0, "alarm": 0, "ignore": 0}
-    by_code = {}
-    scanned = 0
+    with rabbit_pool.channel() as ch:
+        counts = {"requeue": 0, "hold": 0, "alarm": 0, "ignore": 0}
+        by_code = {}
+        scanned = 0
 
-    try:
         for _ in range(sample):
             method_frame, props, body = ch.basic_get(queue=settings.dlq_queue, auto_ack=False)
             if not method_frame:
@@ -1321,8 +1208,6 @@ def dlq_triage(sample: int = 200, x_admin_key: Optional[str] = Header(None)):
             by_code[fc] = by_code.get(fc, 0) + 1
 
             ch.basic_nack(method_frame.delivery_tag, requeue=True)
-    finally:
-        conn.close()
 
     by_code = dict(sorted(by_code.items(), key=lambda kv: kv[1], reverse=True))
     return {"scanned": scanned, "counts": counts, "by_failure_code": by_code}
@@ -1333,16 +1218,11 @@ def dlq_peek(limit: int = 10, failure_code: Optional[str] = None, task_type: Opt
     require_admin_key(x_admin_key)
     limit = max(1, min(limit, 50))
 
-    params = pika.URLParameters(settings.rabbitmq_url)
-    conn = pika.BlockingConnection(params)
-    ch = conn.channel()
-    declare_queues(ch, settings.task_queue, settings.retry_queue_prefix, settings.dlq_queue)
-
-    out = []
-    scanned = 0
-    max_scan = limit * 20  # bounded scan to allow filtering without losing messages
+    with rabbit_pool.channel() as ch:
+        out = []
+        scanned = 0
+        max_scan = limit * 20  # bounded scan to allow filtering without losing messages
 
-    try:
         for _ in range(max_scan):
             method_frame, props, body = ch.basic_get(queue=settings.dlq_queue, auto_ack=False)
             if not method_frame:
@@ -1370,8 +1250,6 @@ def dlq_peek(limit: int = 10, failure_code: Optional[str] = None, task_type: Opt
             ch.basic_nack(method_frame.delivery_tag, requeue=True)
             if len(out) >= limit:
                 break
-    finally:
-        conn.close()
 
     return {"count": len(out), "scanned": scanned, "items": out}
 
@@ -1386,14 +1264,9 @@ def dlq_requeue(limit: int = 10, dry_run: bool = False, mode: str = "manual", x_
     require_admin_key(x_admin_key)
     limit = max(1, min(limit, 200))
 
-    params = pika.URLParameters(settings.rabbitmq_url)
-    conn = pika.BlockingConnection(params)
-    ch = conn.channel()
-    declare_queues(ch, settings.task_queue, settings.retry_queue_prefix, settings.dlq_queue)
-
-    moved = 0
-    scanned = 0
-    try:
+    with rabbit_pool.channel() as ch:
+        moved = 0
+        scanned = 0
         for _ in range(limit * 50):
             method_frame, props, body = ch.basic_get(queue=settings.dlq_queue, auto_ack=False)
             if not method_frame:
@@ -1424,8 +1297,6 @@ def dlq_requeue(limit: int = 10, dry_run: bool = False, mode: str = "manual", x_
             moved += 1
             if moved >= limit:
                 break
-    finally:
-        conn.close()
 
     logger.info(json.dumps({"event": "DLQ_REQUEUE", "scanned": scanned, "moved": moved, "dry_run": dry_run, "mode": mode}, ensure_ascii=False))
     return {"scanned": scanned, "moved": moved, "dry_run": dry_run, "mode": mode}
@@ -1436,13 +1307,8 @@ def dlq_purge(limit: int = 1000, x_admin_key: Optional[str] = Header(None)):
     require_admin_key(x_admin_key)
     limit = max(1, min(limit, 10000))
 
-    params = pika.URLParameters(settings.rabbitmq_url)
-    conn = pika.BlockingConnection(params)
-    ch = conn.channel()
-    declare_queues(ch, settings.task_queue, settings.retry_queue_prefix, settings.dlq_queue)
-
-    purged = 0
-    try:
+    with rabbit_pool.channel() as ch:
+        purged = 0
         for _ in range(limit):
             method_frame, props, body = ch.basic_get(queue=settings.dlq_queue, auto_ack=False)
             if not method_frame:
@@ -1456,8 +1322,6 @@ def dlq_purge(limit: int = 1000, x_admin_key: Optional[str] = Header(None)):
 
             ch.basic_ack(method_frame.delivery_tag)
             purged += 1
-    finally:
-        conn.close()
 
     logger.info(json.dumps({"event":"DLQ_PURGE","purged":purged}, ensure_ascii=False))
     return {"purged": purged}
@@ -1483,7 +1347,7 @@ class ChatSendAccepted(BaseModel):
 
 
 @app.post("/chat", status_code=202)
-def chat_shorthand(
+async def chat_shorthand(
     body: Dict[str, Any] = Body(...),
     x_api_key: Optional[str] = Header(None),
     authorization: Optional[str] = Header(None),
@@ -1506,11 +1370,11 @@ def chat_shorthand(
         session_id=session_id
     )
     
-    return chat_send(request, x_api_key, authorization, x_org_id, x_project_id)
+    return await chat_send(request, x_api_key, authorization, x_org_id, x_project_id)
 
 
 @app.post("/chat/send", status_code=202, response_model=ChatSendAccepted)
-def chat_send(
+async def chat_send(
     body: ChatSendRequest,
     x_api_key: Optional[str] = Header(None),
     authorization: Optional[str] = Header(None),
@@ -1519,7 +1383,7 @@ def chat_send(
 ):
     require_api_key(x_api_key, authorization)
     tenant = _tenant_from_headers(x_org_id, x_project_id)
-    tenant_id = tenant.tenant_id
+    tenant_id = _tenant_key(tenant)
 
     msg = (body.message or "").strip()
     if not msg:
@@ -1532,7 +1396,7 @@ def chat_send(
     causality = {"type": "chat.send", "command_id": None, "correlation_id": correlation_id}
 
     # Emit agent_status: listening (user message received)
-    _emit_agent_status(tenant_id, "listening", {"user_message": msg[:80]})
+    await _emit_agent_status_async(tenant_id, "listening", {"user_message": msg[:80]})
 
     # 1) append user message as a chat report
     user_report = _mk_report(
@@ -1541,9 +1405,9 @@ def chat_send(
         risk="GREEN",
         causality=causality,
         ui_hint={"renderer": "chat.message"},
-        data={"role": "user", "text": mask_sensitive(msg), "session_id": session_id, "snapshot": stream_store.snapshot(tenant_id)},
+        data={"role": "user", "text": mask_sensitive(msg), "session_id": session_id, "state": await stream_store_async.state_delta(tenant_id)},
     )
-    stream_store.append_event(tenant_id, "report", user_report)
+    await stream_store_async.append_event(tenant_id, "report", user_report)
 
     # 2) route slash commands
     try:
@@ -1557,9 +1421,9 @@ def chat_send(
                     risk="GREEN",
                     causality=causality,
                     ui_hint={"renderer": "chat.message"},
-                    data={"role": "assistant", "text": assistant_text, "session_id": session_id, "snapshot": stream_store.snapshot(tenant_id)},
+                    data={"role": "assistant", "text": assistant_text, "session_id": session_id, "state": await stream_store_async.state_delta(tenant_id)},
                 )
-                stream_store.append_event(tenant_id, "report", assistant)
+                await stream_store_async.append_event(tenant_id, "report", assistant)
                 return {"accepted": True, "first_followup_report_id": assistant["report_id"], "correlation_id": correlation_id}
 
             if not youtube_client.enabled():
@@ -1572,31 +1436,31 @@ def chat_send(
                     data={
                         "ask_id": f"ask_{uuid.uuid4().hex}",
                         "instructions": "환경변수 YOUTUBE_API_KEY 또는 settings.youtube_api_key에 키를 설정한 뒤 재시도하세요.",
-                        "snapshot": stream_store.snapshot(tenant_id),
+                        "state": await stream_store_async.state_delta(tenant_id),
                     },
                 )
-                stream_store.append_event(tenant_id, "report", ask)
+                await stream_store_async.append_event(tenant_id, "report", ask)
                 return {"accepted": True, "first_followup_report_id": ask["report_id"], "correlation_id": correlation_id}
 
-            results = youtube_client.search(tenant=tenant_id, query=q, max_results=6, region="KR", language="ko")
+            results = await asyncio.to_thread(youtube_client.search, tenant=tenant_id, query=q, max_results=6, region="KR", language="ko")
             rep = _mk_report(
                 status="done",
                 summary=f"youtube.search: {q}",
                 risk=settings.youtube_default_risk,
                 causality=causality,
                 ui_hint={"renderer": "youtube.search.results"},
-                data={"query": q, "results": results, "session_id": session_id, "snapshot": stream_store.snapshot(tenant_id)},
+                data={"query": q, "results": results, "session_id": session_id, "state": await stream_store_async.state_delta(tenant_id)},
             )
-            stream_store.append_event(tenant_id, "report", rep)
+            await stream_store_async.append_event(tenant_id, "report", rep)
             assistant = _mk_report(
                 status="done",
                 summary="chat: youtube search done",
                 risk="GREEN",
                 causality=causality,
                 ui_hint={"renderer": "chat.message"},
-                data={"role": "assistant", "text": "유튜브 검색 결과를 표시했어요. 재생/큐에 추가할 수 있어요.", "session_id": session_id, "snapshot": stream_store.snapshot(tenant_id)},
+                data={"role": "assistant", "text": "유튜브 검색 결과를 표시했어요. 재생/큐에 추가할 수 있어요.", "session_id": session_id, "state": await stream_store_async.state_delta(tenant_id)},
             )
-            stream_store.append_event(tenant_id, "report", assistant)
+            await stream_store_async.append_event(tenant_id, "report", assistant)
             return {"accepted": True, "first_followup_report_id": rep["report_id"], "correlation_id": correlation_id}
 
         if msg.startswith("/rag"):
@@ -1609,77 +1473,55 @@ def chat_send(
                     risk="GREEN",
                     causality=causality,
                     ui_hint={"renderer": "chat.message"},
-                    data={"role": "assistant", "text": assistant_text, "session_id": session_id, "snapshot": stream_store.snapshot(tenant_id)},
+                    data={"role": "assistant", "text": assistant_text, "session_id": session_id, "state": await stream_store_async.state_delta(tenant_id)},
                 )
-                stream_store.append_event(tenant_id, "report", assistant)
+                await stream_store_async.append_event(tenant_id, "report", assistant)
                 return {"accepted": True, "first_followup_report_id": assistant["report_id"], "correlation_id": correlation_id}
 
-            results = rag_engine.query(tenant=tenant_id, q=q, top_k=5)
+            results = await rag_engine_async.query(tenant=tenant_id, q=q, top_k=5)
             rep = _mk_report(
                 status="done",
                 summary=f"rag.query: {q}",
                 risk="GREEN",
                 causality=causality,
                 ui_hint={"renderer": "rag.query.results"},
-                data={"query": q, "results": results, "session_id": session_id, "snapshot": stream_store.snapshot(tenant_id)},
+                data={"query": q, "results": results, "session_id": session_id, "state": await stream_store_async.state_delta(tenant_id)},
             )
-            stream_store.append_event(tenant_id, "report", rep)
+            await stream_store_async.append_event(tenant_id, "report", rep)
             assistant = _mk_report(
                 status="done",
                 summary="chat: rag query done",
                 risk="GREEN",
                 causality=causality,
                 ui_hint={"renderer": "chat.message"},
-                data={"role": "assistant", "text": "RAG 검색 결과를 표시했어요. 필요하면 더 구체적으로 물어봐요.", "session_id": session_id, "snapshot": stream_store.snapshot(tenant_id)},
+                data={"role": "assistant", "text": "RAG 검색 결과를 표시했어요. 필요하면 더 구체적으로 물어봐요.", "session_id": session_id, "state": await stream_store_async.state_delta(tenant_id)},
             )
-            stream_store.append_event(tenant_id, "report", assistant)
+            await stream_store_async.append_event(tenant_id, "report", assistant)
             return {"accepted": True, "first_followup_report_id": rep["report_id"], "correlation_id": correlation_id}
 
         # default: normal chat (includes /play and '놀아줘' via state_engine -> play_engine)
         # inject session_id for continuity
         # Emit agent_status: thinking (processing chat request)
-        _emit_agent_status(tenant_id, "thinking", {"user_message": msg[:80]})
+        await _emit_agent_status_async(tenant_id, "thinking", {"user_message": msg[:80]})
         
         context = dict(body.context or {})
         context["session_id"] = session_id
-        payload = _run_character_chat_core(tenant_id=tenant_id, user_input=msg, context=context, request_id=request_id)
+        # LLM / state engine calls are blocking: keep them off the event loop
+        payload = await asyncio.to_thread(_run_character_chat_core, tenant_id=tenant_id, user_input=msg, context=context, request_id=request_id)
         
         # Emit agent_status: speaking (sending response)
         response_text = payload.get("text", "")
-        _emit_agent_status(tenant_id, "speaking", {"response": response_text[:80]})
+        await _emit_agent_status_async(tenant_id, "speaking", {"response": response_text[:80]})
         
-        # Generate high-quality TTS audio using Google Cloud TTS
+        # Pipelined TTS on the TTS worker pool: tts_start goes out now, then one tts_chunk
+        # (audio_url + duration) per sentence in order as audio arrives, then tts_end
         if TTS_ENABLED and response_text:
-            tts_result = generate_tts(
-                text=response_text,
-                voice_name="ko-KR-Wavenet-A",  # High-quality Korean female voice
-                speaking_rate=1.0,
-                pitch=0.0
-            )
-            
-            if tts_result:
-                # Emit TTS start event with audio URL
-                _emit_tts(tenant_id, "tts_start", {
-                    "text": response_text,
-                    "audio_url": tts_result["audio_url"],
-                    "duration_ms": tts_result["duration_ms"],
-                    "voice": tts_result["voice"]
-                })
-                
-                # Emit TTS end event
-                _emit_tts(tenant_id, "tts_end", {
-                    "duration_ms": tts_result["duration_ms"]
-                })
-            else:
-                # Fallback: simulate TTS without actual audio
-                estimated_duration_ms = len(response_text) * 100
-                _emit_tts(tenant_id, "tts_start", {"text": response_text, "voice": "ko-KR-Wavenet-A"})
-                _emit_tts(tenant_id, "tts_end", {"duration_ms": estimated_duration_ms})
+            await asyncio.to_thread(_start_chat_tts, tenant_id, response_text)
         else:
             # TTS disabled: just emit events without audio
             estimated_duration_ms = len(response_text) * 100
-            _emit_tts(tenant_id, "tts_start", {"text": response_text, "voice": "ko-KR-Wavenet-A"})
-            _emit_tts(tenant_id, "tts_end", {"duration_ms": estimated_duration_ms})
+            await _emit_tts_async(tenant_id, "tts_start", {"text": response_text, "voice": "ko-KR-Wavenet-A"})
+            await _emit_tts_async(tenant_id, "tts_end", {"duration_ms": estimated_duration_ms})
         
         assistant = _mk_report(
             status="done",
@@ -1694,13 +1536,13 @@ def chat_send(
                 "presence_packet": payload.get("presence_packet"),
                 "confirm_card": payload.get("confirm_card"),
                 "session_id": session_id,
-                "snapshot": stream_store.snapshot(tenant_id),
+                "state": await stream_store_async.state_delta(tenant_id),
             },
         )
-        stream_store.append_event(tenant_id, "report", assistant)
+        await stream_store_async.append_event(tenant_id, "report", assistant)
         
         # Emit agent_status: idle (chat completed)
-        _emit_agent_status(tenant_id, "idle", {"chat_completed": True})
+        await _emit_agent_status_async(tenant_id, "idle", {"chat_completed": True})
         
         return {"accepted": True, "first_followup_report_id": assistant["report_id"], "correlation_id": correlation_id}
 
@@ -1711,11 +1553,11 @@ def chat_send(
             risk="YELLOW",
             causality=causality,
             ui_hint={"renderer": "error"},
-            data={"snapshot": stream_store.snapshot(tenant_id)},
+            data={"state": await stream_store_async.state_delta(tenant_id)},
         )
-        stream_store.append_event(tenant_id, "report", err)
+        await stream_store_async.append_event(tenant_id, "report", err)
         # Emit agent_status: idle (error occurred)
-        _emit_agent_status(tenant_id, "idle", {"error": str(e)})
+        await _emit_agent_status_async(tenant_id, "idle", {"error": str(e)})
         return {"accepted": True, "first_followup_report_id": err["report_id"], "correlation_id": correlation_id}
 
 
@@ -1838,8 +1680,7 @@ def _tenant_key(tenant: TenantCtx) -> str:
 
 
 def _sse_event(seq: int, event_type: str, data: Dict[str, Any]) -> str:
-    payload = json.dumps(data, ensure_ascii=False)
-    return f"id: {seq}\nevent: {event_type}\ndata: {payload}\n\n"
+    return sse_frame(seq, event_type, data)
 
 
 def _mk_report(
@@ -1864,6 +1705,19 @@ def _mk_report(
     }
 
 
+def _agent_status_payload(status: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    valid_statuses = {"idle", "listening", "thinking", "speaking", "busy", "waiting_approval"}
+    if status not in valid_statuses:
+        logger.warning(f"Invalid agent_status: {status}. Defaulting to 'idle'")
+        status = "idle"
+    
+    return {
+        "status": status,
+        "ts": _utc_now(),
+        "context": context or {},
+    }
+
+
 def _emit_agent_status(tenant_id: str, status: str, context: Optional[Dict[str, Any]] = None) -> None:
     """
     Emit agent_status event to SSE stream for Live2D character state sync.
@@ -1873,52 +1727,90 @@ def _emit_agent_status(tenant_id: str, status: str, context: Optional[Dict[str,
         status: One of: idle, listening, thinking, speaking, busy, waiting_approval
         context: Optional context data (e.g., current_task, message)
     """
-    valid_statuses = {"idle", "listening", "thinking", "speaking", "busy", "waiting_approval"}
-    if status not in valid_statuses:
-        logger.warning(f"Invalid agent_status: {status}. Defaulting to 'idle'")
-        status = "idle"
+    payload = _agent_status_payload(status, context)
+    stream_store.append_event(tenant_id, "agent_status", payload)
+    logger.debug(f"[agent_status] {tenant_id}: {payload['status']}")
+
+
+async def _emit_agent_status_async(tenant_id: str, status: str, context: Optional[Dict[str, Any]] = None) -> None:
+    """_emit_agent_status for async handlers (AsyncStreamStore)."""
+    payload = _agent_status_payload(status, context)
+    await stream_store_async.append_event(tenant_id, "agent_status", payload)
+    logger.debug(f"[agent_status] {tenant_id}: {payload['status']}")
+
+
+def _tts_payload(event_type: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    valid_event_types = {"tts_start", "tts_chunk", "tts_end"}
+    if event_type not in valid_event_types:
+        logger.warning(f"Invalid tts event_type: {event_type}")
+        return None
     
-    payload = {
-        "status": status,
+    return {
         "ts": _utc_now(),
-        "context": context or {},
+        **data,
     }
-    stream_store.append_event(tenant_id, "agent_status", payload)
-    logger.debug(f"[agent_status] {tenant_id}: {status}")
 
 
 def _emit_tts(tenant_id: str, event_type: str, data: Dict[str, Any]) -> None:
     """
     Emit TTS event to SSE stream for Live2D lip-sync.
     
+    Called from TTS worker threads (SentencePipeline callbacks), hence the sync store.
+    
     Args:
         tenant_id: Tenant identifier
         event_type: One of: tts_start, tts_chunk, tts_end
         data: TTS event data (e.g., audio_url, chunk_data, duration)
     """
-    valid_event_types = {"tts_start", "tts_chunk", "tts_end"}
-    if event_type not in valid_event_types:
-        logger.warning(f"Invalid tts event_type: {event_type}")
+    payload = _tts_payload(event_type, data)
+    if payload is None:
         return
-    
-    payload = {
-        "ts": _utc_now(),
-        **data,
-    }
     stream_store.append_event(tenant_id, event_type, payload)
     logger.debug(f"[{event_type}] {tenant_id}")
 
 
+async def _emit_tts_async(tenant_id: str, event_type: str, data: Dict[str, Any]) -> None:
+    """_emit_tts for async handlers (AsyncStreamStore)."""
+    payload = _tts_payload(event_type, data)
+    if payload is None:
+        return
+    await stream_store_async.append_event(tenant_id, event_type, payload)
+    logger.debug(f"[{event_type}] {tenant_id}")
+
+
+tts_limiter = TenantTTSLimiter(settings.tts_tenant_concurrency)
+
+
+def _start_chat_tts(tenant_id: str, text: str) -> None:
+    """
+    Speak a chat reply sentence by sentence (shared.tts_pipeline.SentencePipeline).
+    
+    tts_start goes out immediately; each sentence then arrives as an ordered tts_chunk
+    with its own audio_url (streamable while still synthesizing) and duration, so playback
+    of sentence N overlaps synthesis of sentence N+1. tts_end follows the last sentence.
+    """
+    SentencePipeline(
+        tenant_id,
+        text,
+        start=stream_tts,
+        emit=lambda event_type, data: _emit_tts(tenant_id, event_type, data),
+        limiter=tts_limiter,
+        max_chars=settings.tts_sentence_max_chars,
+    ).run()
+
+
 @app.get("/tts/{filename}")
 async def serve_tts_audio(filename: str):
     """
     Serve TTS audio files.
     
-    This endpoint serves generated TTS audio files from temporary storage.
-    Files are automatically cleaned up after 24 hours.
+    This endpoint serves generated TTS audio files from the shared TTS cache
+    (shared.tts_cache). File names are content hashes, so a name never changes meaning;
+    files are evicted LRU once the cache exceeds TTS_CACHE_MAX_MB.
+    
+    A clip that is still being synthesized (stream_tts) is streamed as its chunks arrive.
     """
-    from pathlib import Path
-    from fastapi.responses import FileResponse
+    from shared.tts_cache import tts_cache
     
     # Security: validate filename format
     if not filename.startswith("tts_") or not filename.endswith(".mp3"):
@@ -1927,19 +1819,114 @@ async def serve_tts_audio(filename: str):
     if TTS_ENABLED and tts_temp_dir:
         audio_path = tts_temp_dir / filename
         
-        if audio_path.exists():
+        if audio_path.exists() and not tts_cache.is_streaming(filename):
             return FileResponse(
                 audio_path,
                 media_type="audio/mpeg",
                 headers={
-                    "Cache-Control": "public, max-age=86400",  # Cache for 24 hours
+                    "Cache-Control": "public, max-age=31536000, immutable",  # content-addressed
                     "Access-Control-Allow-Origin": "*",  # Allow CORS
                 }
             )
+        
+        # Still synthesizing: follow the producer (sync iterator runs in Starlette's threadpool)
+        chunks = tts_cache.iter_audio(filename)
+        if chunks is not None:
+            return StreamingResponse(
+                chunks,
+                media_type="audio/mpeg",
+                headers={
+                    "Cache-Control": "no-store",  # may end early if synthesis fails
+                    "Access-Control-Allow-Origin": "*",
+                }
+            )
     
     raise HTTPException(status_code=404, detail="Audio file not found")
 
 
+def _generate_tts_with_fallback(body: Dict[str, Any], stream: bool) -> tuple:
+    """
+    Run the TTS provider chain (blocking; call via asyncio.to_thread).
+    
+    Priority: ElevenLabs → Google Cloud TTS (API Key) → Google Cloud TTS (Service Account).
+    With stream=True each provider only starts synthesis on the TTS worker pool.
+    Returns (result, provider, last_error).
+    """
+    text = body.get("text")
+    result = None
+    provider = None
+    last_error = None
+    
+    # Try ElevenLabs first
+    try:
+        from shared.tts_elevenlabs import elevenlabs_tts_service
+        
+        if elevenlabs_tts_service.enabled:
+            speak = elevenlabs_tts_service.stream_speech if stream else elevenlabs_tts_service.generate_speech
+            result = speak(
+                text=text,
+                voice_id=body.get("voice_id", "EXAVITQu4vr4xnSDxMaL"),  # Rachel
+                speaking_rate=body.get("speaking_rate", 1.0),
+                stability=body.get("stability", 0.5),
+                similarity_boost=body.get("similarity_boost", 0.75),
+            )
+            
+            if result:
+                provider = "elevenlabs"
+                logger.info(f"✅ TTS generated with ElevenLabs")
+            else:
+                logger.warning("⚠️ ElevenLabs TTS failed, trying fallback...")
+    except Exception as e:
+        logger.warning(f"⚠️ ElevenLabs TTS error: {e}, trying fallback...")
+        last_error = str(e)
+    
+    # Fallback to Google Cloud TTS (API Key)
+    if not result:
+        try:
+            from shared.tts_service_apikey import tts_service_apikey
+            
+            if tts_service_apikey.enabled:
+                speak = tts_service_apikey.stream_speech if stream else tts_service_apikey.generate_speech
+                result = speak(
+                    text=text,
+                    voice_name=body.get("voice_name", "ko-KR-Wavenet-A"),
+                    speaking_rate=body.get("speaking_rate", 1.0),
+                    pitch=body.get("pitch", 0.0),
+                )
+                
+                if result:
+                    provider = "google_cloud_api_key"
+                    logger.info(f"✅ TTS generated with Google Cloud (API Key)")
+                else:
+                    logger.warning("⚠️ Google Cloud TTS (API Key) failed, trying service account...")
+        except Exception as e:
+            logger.warning(f"⚠️ Google Cloud TTS (API Key) error: {e}")
+            last_error = str(e)
+    
+    # Fallback to Google Cloud TTS (Service Account)
+    if not result:
+        try:
+            from shared.tts_service import tts_service
+            
+            if tts_service.enabled:
+                speak = tts_service.stream_speech if stream else tts_service.generate_speech
+                result = speak(
+                    text=text,
+                    voice_name=body.get("voice_name", "ko-KR-Wavenet-A"),
+                    speaking_rate=body.get("speaking_rate", 1.0),
+                    pitch=body.get("pitch", 0.0),
+                )
+                
+                if result:
+                    provider = "google_cloud_service_account"
+                    logger.info(f"✅ TTS generated with Google Cloud (Service Account)")
+        except Exception as e:
+            logger.warning(f"⚠️ Google Cloud TTS (Service Account) error: {e}")
+            last_error = str(e)
+    
+    return result, provider, last_error
+
+
 @app.post("/api/tts/generate")
 async def generate_tts_endpoint(request: Request):
     """
@@ -1947,6 +1934,10 @@ async def generate_tts_endpoint(request: Request):
     
     Priority: ElevenLabs → Google Cloud TTS (API Key) → Google Cloud TTS (Service Account)
     
+    Synthesis runs off the event loop. With "stream": true the response returns as soon
+    as synthesis has started; audio_url then streams the audio while it is produced
+    (provider failures after the start end that stream early instead of falling back).
+    
     Request body:
     {
         "text": str,  # Required: Text to synthesize
@@ -1954,7 +1945,8 @@ async def generate_tts_endpoint(request: Request):
         "voice_name": str,  # Optional: For Google Cloud (default: ko-KR-Wavenet-A)
         "speaking_rate": float,  # Optional: Speed 0.5~2.0 (default: 1.0)
         "stability": float,  # Optional: ElevenLabs stability 0.0~1.0 (default: 0.5)
-        "similarity_boost": float  # Optional: ElevenLabs similarity 0.0~1.0 (default: 0.75)
+        "similarity_boost": float,  # Optional: ElevenLabs similarity 0.0~1.0 (default: 0.75)
+        "stream": bool  # Optional: return before synthesis finishes (default: false)
     }
     
     Response:
@@ -1964,7 +1956,9 @@ async def generate_tts_endpoint(request: Request):
         "duration_ms": int,  # Estimated duration in milliseconds
         "text": str,  # Original text
         "voice": str,  # Voice ID/name used
-        "provider": str  # "elevenlabs" or "google_cloud"
+        "provider": str,  # "elevenlabs" or "google_cloud"
+        "cached": bool,  # served from the TTS cache
+        "streaming": bool  # audio_url is still being synthesized
     }
     """
     if not TTS_ENABLED:
@@ -1977,86 +1971,9 @@ async def generate_tts_endpoint(request: Request):
         if not text:
             raise HTTPException(status_code=400, detail="Missing 'text' field")
         
-        result = None
-        provider = None
-        last_error = None
-        
-        # Try ElevenLabs first
-        try:
-            from shared.tts_elevenlabs import elevenlabs_tts_service
-            
-            if elevenlabs_tts_service.enabled:
-                voice_id = body.get("voice_id", "EXAVITQu4vr4xnSDxMaL")  # Rachel
-                speaking_rate = body.get("speaking_rate", 1.0)
-                stability = body.get("stability", 0.5)
-                similarity_boost = body.get("similarity_boost", 0.75)
-                
-                result = elevenlabs_tts_service.generate_speech(
-                    text=text,
-                    voice_id=voice_id,
-                    speaking_rate=speaking_rate,
-                    stability=stability,
-                    similarity_boost=similarity_boost
-                )
-                
-                if result:
-                    provider = "elevenlabs"
-                    logger.info(f"✅ TTS generated with ElevenLabs")
-                else:
-                    logger.warning("⚠️ ElevenLabs TTS failed, trying fallback...")
-        except Exception as e:
-            logger.warning(f"⚠️ ElevenLabs TTS error: {e}, trying fallback...")
-            last_error = str(e)
-        
-        # Fallback to Google Cloud TTS (API Key)
-        if not result:
-            try:
-                from shared.tts_service_apikey import tts_service_apikey
-                
-                if tts_service_apikey.enabled:
-                    voice_name = body.get("voice_name", "ko-KR-Wavenet-A")
-                    speaking_rate = body.get("speaking_rate", 1.0)
-                    pitch = body.get("pitch", 0.0)
-                    
-                    result = tts_service_apikey.generate_speech(
-                        text=text,
-                        voice_name=voice_name,
-                        speaking_rate=speaking_rate,
-                        pitch=pitch
-                    )
-                    
-                    if result:
-                        provider = "google_cloud_api_key"
-                        logger.info(f"✅ TTS generated with Google Cloud (API Key)")
-                    else:
-                        logger.warning("⚠️ Google Cloud TTS (API Key) failed, trying service account...")
-            except Exception as e:
-                logger.warning(f"⚠️ Google Cloud TTS (API Key) error: {e}")
-                last_error = str(e)
-        
-        # Fallback to Google Cloud TTS (Service Account)
-        if not result:
-            try:
-                from shared.tts_service import tts_service
-                
-                if tts_service.enabled:
-                    voice_name = body.get("voice_name", "ko-KR-Wavenet-A")
-                    speaking_rate = body.get("speaking_rate", 1.0)
-                    pitch = body.get("pitch", 0.0)
-                    
-                    result = tts_service.generate_speech(
-                        text=text,
-                        voice_name=voice_name,
-                        speaking_rate=speaking_rate,
-                        pitch=pitch
-                    )
-                    
-                    if result:
-                        provider = "google_cloud_service_account"
-                        logger.info(f"✅ TTS generated with Google Cloud (Service Account)")
-            except Exception as e:
-                logger.warning(f"⚠️ Google Cloud TTS (Service Account) error: {e}")
-                last_error = str(e)
+        result, provider, last_error = await asyncio.to_thread(
+            _generate_tts_with_fallback, body, bool(body.get("stream", False))
+        )
         
         if not result:
             error_msg = f"All TTS providers failed. Last error: {last_error}"
@@ -2070,6 +1987,8 @@ async def generate_tts_endpoint(request: Request):
             "text": result["text"],
             "voice": result.get("voice", "unknown"),
             "provider": provider,
+            "cached": result.get("cached", False),
+            "streaming": result.get("streaming", False),
         }
         
     except HTTPException:
@@ -2222,15 +2141,15 @@ async def character_decide(request: Request):
 
 
 @app.get("/")
-def landing_page(lang: str = "ko"):
+def landing_page(request: Request, lang: str = "ko"):
     """World-Class Landing Page with huge Live2D character."""
-    return HTMLResponse(render_landing_page_i18n(lang))
+    return public_pages.response(request.headers, "landing", lang, render_landing_page_i18n)
 
 
 @app.get("/intro")
-def intro_page(lang: str = "ko"):
+def intro_page(request: Request, lang: str = "ko"):
     """Intro page: purpose + core values + architecture + developer section."""
-    return HTMLResponse(render_intro_page_i18n(lang))
+    return public_pages.response(request.headers, "intro", lang, render_intro_page_i18n)
 
 
 @app.get("/live2d-test")
@@ -2263,7 +2182,7 @@ def live2d_simple_test():
 
 
 @app.get("/developer")
-def developer_page(lang: str = "ko"):
+def developer_page(request: Request, lang: str = "ko"):
     """
     Developer page: Prof. Nam Hyunwoo profile and NEXUS-ON project vision.
     
@@ -2271,96 +2190,13 @@ def developer_page(lang: str = "ko"):
     - Left: Profile image placeholder
     - Right: Research interests, project vision, philosophy, contact
     """
-    return HTMLResponse(render_developer_page_i18n(lang))
+    return public_pages.response(request.headers, "developer", lang, render_developer_page_i18n)
 
 
 @app.get("/modules")
-def modules_page(lang: str = "ko"):
-    """Modules page: render modules.json + benchmark table on same page."""
-    modules = load_modules_data()
-    benchmark = load_benchmark_data()
-    
-    # Build modules table
-    modules_rows = ""
-    for m in modules:
-        status_class = {"G": "green", "Y": "yellow", "R": "red"}.get(m.get("status", "Y"), "yellow")
-        highlights = "<br>".join([f"• {h}" for h in m.get("highlights", [])])
-        modules_rows += f"""
-<tr>
-  <td><strong>{m.get('module_id', '')}</strong></td>
-  <td>{m.get('name', '')}</td>
-  <td><span class="badge badge-{status_class}">{m.get('status', 'Y')}</span></td>
-  <td style="font-size:12px">{highlights}</td>
-  <td style="font-size:12px">{m.get('last_updated', '')}</td>
-</tr>
-"""
-    
-    # Build benchmark table
-    benchmark_rows = ""
-    for b in benchmark:
-        benchmark_rows += f"""
-<tr>
-  <td><strong>{b.get('category', '')}</strong></td>
-  <td>{b.get('product', '')}</td>
-  <td style="font-size:12px">{b.get('strengths', '')}</td>
-  <td style="font-size:12px">{b.get('weaknesses', '')}</td>
-  <td>{b.get('price_tier', '')}</td>
-  <td style="font-size:12px">{b.get('last_updated', '')}</td>
-</tr>
-"""
-    
-    body = f"""
-<div class="container">
-  <h1>모듈 현황</h1>
-  <p class="lead">
-    NEXUS-ON을 구성하는 핵심 모듈들의 상태와 주요 기능을 확인하세요.
-  </p>
-  
-  <table>
-    <thead>
-      <tr>
-        <th>Module ID</th>
-        <th>Name</th>
-        <th>Status</th>
-        <th>Highlights</th>
-        <th>Last Updated</th>
-      </tr>
-    </thead>
-    <tbody>
-      {modules_rows}
-    </tbody>
-  </table>
-  
-  <h2 style="margin-top:48px">경쟁 제품 비교</h2>
-  <p class="lead">
-    NEXUS-ON과 유사한 제품들의 강점, 약점, 가격대를 비교합니다.
-  </p>
-  
-  <table>
-    <thead>
-      <tr>
-        <th>Category</th>
-        <th>Product</th>
-        <th>Strengths</th>
-        <th>Weaknesses</th>
-        <th>Price Tier</th>
-        <th>Last Updated</th>
-      </tr>
-    </thead>
-    <tbody>
-      {benchmark_rows}
-    </tbody>
-  </table>
-  
-  <div class="card" style="margin-top:24px">
-    <p class="small">
-      <strong>참고:</strong> 위 비교 데이터는 /data/modules.json 및 /data/benchmark.json 파일에서 로드됩니다.<br>
-      향후 데이터베이스 기반 실시간 업데이트로 전환될 예정입니다.
-    </p>
-  </div>
-</div>
-"""
-    return HTMLResponse(render_modules_page_i18n(lang))
+def modules_page(request: Request, lang: str = "ko"):
+    """Modules page: module cards (i18n)."""
+    return public_pages.response(request.headers, "modules", lang, render_modules_page_i18n)
 
 
 @app.get("/benchmark")
@@ -2421,48 +2257,15 @@ def benchmark_page():
     return HTMLResponse(render_page("Benchmark", body, "benchmark"))
 
 
-@app.get("/app")
-def ui_app():
-    """Existing work app UI moved to /app. All functionality unchanged."""
-    # Simple, zero-build local UI.
+def _render_app_ui(lang: str = "ko") -> str:
+    # Simple, zero-build local UI; its CSS/JS are hashed static bundles (nexus_supervisor/assets/app.*)
     html = """<!doctype html>
 <html lang="ko">
 <head>
   <meta charset="utf-8" />
   <meta name="viewport" content="width=device-width, initial-scale=1" />
   <title>NEXUS Local</title>
-  <style>
-    body { font-family: system-ui, -apple-system, Segoe UI, Roboto, Arial, "Noto Sans KR", sans-serif; margin: 0; background:#0b0f17; color:#e8eefc;}
-    header { padding: 12px 14px; border-bottom: 1px solid rgba(255,255,255,0.08); display:flex; gap:12px; align-items:center; }
-    header .pill { border: 1px solid rgba(255,255,255,0.12); padding: 6px 10px; border-radius: 999px; font-size:12px; color:#c9d6ff; }
-    header input { background: rgba(255,255,255,0.06); border: 1px solid rgba(255,255,255,0.10); color:#e8eefc; border-radius:10px; padding:8px 10px; width: 260px; }
-    main { display:grid; grid-template-columns: 1.35fr 0.65fr; gap:12px; padding: 12px; height: calc(100vh - 56px); box-sizing:border-box; }
-    .card { background: rgba(255,255,255,0.04); border: 1px solid rgba(255,255,255,0.08); border-radius: 14px; overflow:hidden; }
-    .card h3 { margin:0; padding:10px 12px; border-bottom: 1px solid rgba(255,255,255,0.08); font-size:14px; color:#dbe6ff;}
-    .chat { display:flex; flex-direction:column; height: 100%; }
-    #log { flex:1; overflow:auto; padding: 10px 12px; line-height:1.45; font-size:13px; }
-    .msg { margin: 8px 0; }
-    .msg .meta { font-size:11px; color:#9fb3ea; margin-bottom:3px; }
-    .msg .bubble { display:inline-block; padding: 8px 10px; border-radius: 12px; max-width: 92%; white-space: pre-wrap; }
-    .msg.user .bubble { background: rgba(100,140,255,0.18); border: 1px solid rgba(100,140,255,0.25); }
-    .msg.assistant .bubble { background: rgba(255,255,255,0.06); border: 1px solid rgba(255,255,255,0.10); }
-    .composer { display:flex; gap:8px; padding: 10px; border-top: 1px solid rgba(255,255,255,0.08); }
-    .composer input { flex:1; background: rgba(255,255,255,0.06); border: 1px solid rgba(255,255,255,0.10); color:#e8eefc; border-radius:10px; padding:10px 10px; }
-    .composer button { background:#2f6bff; border:0; color:white; border-radius:10px; padding: 10px 12px; cursor:pointer; }
-    .small { font-size:12px; color:#9fb3ea; padding: 8px 12px; }
-    .gridRight { display:flex; flex-direction:column; gap:12px; overflow:auto; }
-    .panel { padding: 10px 12px; }
-    .btn { background: rgba(255,255,255,0.08); border: 1px solid rgba(255,255,255,0.12); color:#e8eefc; border-radius:10px; padding: 7px 10px; cursor:pointer; font-size:12px; }
-    .btn.primary { background:#2f6bff; border:0; }
-    .row { display:flex; gap:8px; align-items:center; flex-wrap:wrap; }
-    .list { display:flex; flex-direction:column; gap:8px; }
-    .item { border: 1px solid rgba(255,255,255,0.10); background: rgba(255,255,255,0.04); border-radius: 12px; padding: 8px 10px; }
-    .item .title { font-size:13px; color:#e8eefc; }
-    .item .sub { font-size:11px; color:#9fb3ea; margin-top:2px; }
-    iframe { width:100%; height: 220px; border:0; background:black; }
-    textarea { width:100%; min-height: 140px; background: rgba(255,255,255,0.06); border: 1px solid rgba(255,255,255,0.10); color:#e8eefc; border-radius:10px; padding:10px; resize: vertical; box-sizing:border-box; }
-    code.kbd { padding: 2px 6px; border-radius:6px; border:1px solid rgba(255,255,255,0.12); background: rgba(255,255,255,0.06); font-size:12px; }
-  </style>
+  {styles}
 </head>
 <body>
 <header>
@@ -2539,407 +2342,17 @@ def ui_app():
   </section>
 </main>
 
-<script>
-  const $ = (id) => document.getElementById(id);
-
-  function ensureSessionId() {
-    let sid = localStorage.getItem("nexus_session_id");
-    if (!sid) {
-      sid = "sess_" + Math.random().toString(16).slice(2) + "_" + Date.now().toString(16);
-      localStorage.setItem("nexus_session_id", sid);
-    }
-    $("sessionId").textContent = sid;
-    return sid;
-  }
-
-  function apiKey() {
-    const v = $("apiKey").value.trim();
-    localStorage.setItem("nexus_api_key", v);
-    return v;
-  }
-
-  function restoreApiKey() {
-    $("apiKey").value = localStorage.getItem("nexus_api_key") || "";
-  }
-
-  function addMsg(role, text) {
-    const el = document.createElement("div");
-    el.className = "msg " + role;
-    const meta = document.createElement("div");
-    meta.className = "meta";
-    meta.textContent = role === "user" ? "YOU" : "NEXUS";
-    const bubble = document.createElement("div");
-    bubble.className = "bubble";
-    bubble.textContent = text;
-    el.appendChild(meta);
-    el.appendChild(bubble);
-    $("log").appendChild(el);
-    $("log").scrollTop = $("log").scrollHeight;
-  }
-
-  // ---------- YouTube queue ----------
-  function loadQueue() {
-    try { return JSON.parse(localStorage.getItem("nexus_yt_queue") || "[]"); } catch(e) { return []; }
-  }
-  function saveQueue(q) { localStorage.setItem("nexus_yt_queue", JSON.stringify(q.slice(0, 50))); }
-  function renderQueue() {
-    const q = loadQueue();
-    $("ytQueue").innerHTML = "";
-    if (!q.length) {
-      const empty = document.createElement("div");
-      empty.className = "small";
-      empty.textContent = "큐가 비었습니다.";
-      $("ytQueue").appendChild(empty);
-      return;
-    }
-    q.forEach((it, idx) => {
-      const d = document.createElement("div");
-      d.className = "item";
-      d.innerHTML = `<div class="title">${escapeHtml(it.title || it.video_id || "item")}</div>
-                     <div class="sub">${escapeHtml(it.channel || "")}</div>`;
-      const row = document.createElement("div");
-      row.className = "row";
-      row.style.marginTop = "6px";
-      const play = btn("Play", () => playVideo(it.video_id, 0));
-      const up = btn("Up", () => { if (idx>0){ const qq=loadQueue(); const t=qq[idx-1]; qq[idx-1]=qq[idx]; qq[idx]=t; saveQueue(qq); renderQueue(); }});
-      const del = btn("Remove", () => { const qq=loadQueue(); qq.splice(idx,1); saveQueue(qq); renderQueue(); });
-      row.appendChild(play); row.appendChild(up); row.appendChild(del);
-      d.appendChild(row);
-      $("ytQueue").appendChild(d);
-    });
-  }
-
-  function _mkCorr() {
-    return "corr-" + Math.random().toString(16).slice(2) + Date.now().toString(16);
-  }
-
-  async function _sidecar(type, params) {
-    const corr = _mkCorr();
-    const cmd = "cmd-" + corr.slice(5);
-    return postJSON("/sidecar/command", {
-      command_id: cmd,
-      type,
-      context: { ref: "ui", title: "ui" },
-      params: params || {},
-      client_context: { surface: "sidecar", correlation_id: corr, session_id: ensureSessionId() },
-    });
-  }
-
-  async function enqueue(item) {
-    // Optimistic local update
-    const q = loadQueue();
-    q.push(item);
-    saveQueue(q);
-    renderQueue();
-
-    try {
-      await _sidecar("youtube.queue.add", {
-        video_id: item.video_id,
-        title: item.title || "",
-        channel: item.channel || "",
-      });
-    } catch (e) {
-      // Local queue remains usable
-    }
-  }
-
-  async function playNext() {
-    try {
-      await _sidecar("youtube.queue.next", {});
-      return;
-    } catch (e) {
-      // Fallback to local queue
-    }
-
-    const q = loadQueue();
-    if (!q.length) { addMsg("assistant", "YouTube 큐가 비었습니다."); return; }
-    const it = q.shift();
-    saveQueue(q);
-    renderQueue();
-    playVideo(it.video_id, 0);
-  }
-
-  async function clearQueue() {
-    saveQueue([]);
-    renderQueue();
-    try { await _sidecar("youtube.queue.clear", {}); } catch (e) {}
-  }
-
-  async function syncQueueFromServer() {
-    try { await _sidecar("youtube.queue.list", {}); } catch (e) {}
-  }
-
-  // ---------- Work canvas ----------
-  function restoreCanvas() {
-    const c = localStorage.getItem("nexus_work_canvas") || "";
-    $("canvas").value = c;
-    const ts = localStorage.getItem("nexus_work_canvas_ts") || "";
-    $("canvasMeta").textContent = ts ? ("saved: " + ts) : "";
-  }
-  function saveCanvas() {
-    localStorage.setItem("nexus_work_canvas", $("canvas").value);
-    const ts = new Date().toISOString();
-    localStorage.setItem("nexus_work_canvas_ts", ts);
-    $("canvasMeta").textContent = "saved: " + ts;
-  }
-  function clearCanvas() {
-    $("canvas").value = "";
-    saveCanvas();
-  }
-
-  // ---------- RAG render ----------
-  function renderRag(results, query) {
-    $("ragResults").innerHTML = "";
-    if (!results || !results.length) {
-      const empty = document.createElement("div");
-      empty.className = "small";
-      empty.textContent = query ? "결과 없음" : "대기 중";
-      $("ragResults").appendChild(empty);
-      return;
-    }
-    results.forEach(r => {
-      const d = document.createElement("div");
-      d.className = "item";
-      d.innerHTML = `<div class="title">${escapeHtml(r.doc_id)} <span class="sub">(score ${r.score})</span></div>
-                     <div class="sub">${escapeHtml((r.snippet || "").slice(0, 240))}</div>`;
-      $("ragResults").appendChild(d);
-    });
-  }
-
-  function escapeHtml(s) {
-    return (s || "").replaceAll("&","&amp;").replaceAll("<","&lt;").replaceAll(">","&gt;");
-  }
-
-  function btn(label, onClick) {
-    const b = document.createElement("button");
-    b.className = "btn";
-    b.textContent = label;
-    b.onclick = onClick;
-    return b;
-  }
-
-  async function postJSON(url, body) {
-    const res = await fetch(url, {
-      method: "POST",
-      headers: {
-        "Content-Type": "application/json",
-        "x-api-key": apiKey() || ""
-      },
-      body: JSON.stringify(body)
-    });
-    return await res.json();
-  }
-
-  async function playVideo(video_id, start_seconds) {
-    await postJSON("/sidecar/command", {
-      command_id: "cmd_" + Math.random().toString(16).slice(2),
-      type: "youtube.play",
-      context: { ref: "ui", title: "youtube.play" },
-      params: { video_id, start_seconds: start_seconds || 0 },
-      client_context: { surface: "ui", correlation_id: "corr_" + Math.random().toString(16).slice(2) }
-    });
-  }
-
-  async function sendChat() {
-    const msg = $("msg").value.trim();
-    if (!msg) return;
-    $("msg").value = "";
-    await postJSON("/chat/send", {
-      message: msg,
-      session_id: ensureSessionId(),
-      correlation_id: "corr_" + Math.random().toString(16).slice(2),
-      context: {}
-    });
-  }
-
-  function connectSSE() {
-    const key = apiKey();
-    const url = "/agent/reports/stream" + (key ? ("?api_key=" + encodeURIComponent(key)) : "");
-    const es = new EventSource(url);
-    $("sseStatus").textContent = "SSE: connecting…";
-    es.addEventListener("open", () => $("sseStatus").textContent = "SSE: connected");
-    es.addEventListener("error", () => $("sseStatus").textContent = "SSE: error/reconnecting…");
-
-    es.addEventListener("snapshot", (ev) => {
-      try {
-        const snap = JSON.parse(ev.data || "{}");
-        renderSnapshot(snap);
-      } catch(e) {}
-    });
-
-    es.addEventListener("report", (ev) => {
-      try {
-        const r = JSON.parse(ev.data || "{}");
-        renderReport(r);
-      } catch(e) {}
-    });
-
-    es.addEventListener("ping", () => {});
-  }
-
-  function renderSnapshot(snap) {
-    if (!snap) return;
-
-    // approvals (asks)
-    const a = $("approvals");
-    a.innerHTML = "";
-    const asks = (snap.asks || []).slice(0, 20);
-    if (!asks.length) {
-      const emptyA = document.createElement("div");
-      emptyA.className = "small";
-      emptyA.textContent = "승인/Ask 없음";
-      a.appendChild(emptyA);
-    } else {
-      asks.forEach(x => {
-        const d = document.createElement("div");
-        d.className = "item";
-        d.innerHTML = `<div class="title">${escapeHtml(x.summary || "Ask")}</div>
-                       <div class="sub">${escapeHtml((x.data && x.data.instructions) || "")}</div>`;
-        a.appendChild(d);
-      });
-    }
-
-    // worklog
-    const w = $("worklog");
-    w.innerHTML = "";
-    const logs = (snap.worklog || []).slice(0, 20);
-    if (!logs.length) {
-      const empty = document.createElement("div");
-      empty.className = "small";
-      empty.textContent = "worklog 비어 있음";
-      w.appendChild(empty);
-      return;
-    }
-    logs.forEach(e => {
-      const d = document.createElement("div");
-      d.className = "item";
-      const title = e.event_type || (e.ui_hint && e.ui_hint.renderer) || "event";
-      const summary = e.summary || (e.payload && (e.payload.summary || e.payload.status)) || "";
-      d.innerHTML = `<div class="title">${escapeHtml(title)}</div>
-                     <div class="sub">${escapeHtml(summary)}</div>`;
-      w.appendChild(d);
-    });
-  }
-
-  function renderReport(r) {
-    const renderer = (r.ui_hint && r.ui_hint.renderer) || "";
-    const data = r.data || {};
-
-    if (renderer === "chat.message") {
-      addMsg(data.role === "user" ? "user" : "assistant", data.text || "");
-      return;
-    }
-
-    if (renderer === "youtube.search.results") {
-      const results = data.results || data.items || [];
-      $("ytResults").innerHTML = "";
-      if (!results.length) {
-        const empty = document.createElement("div");
-        empty.className = "small";
-        empty.textContent = "검색 결과 없음";
-        $("ytResults").appendChild(empty);
-        return;
-      }
-      results.forEach(it => {
-        const d = document.createElement("div");
-        d.className = "item";
-        d.innerHTML = `<div class="title">${escapeHtml(it.title || "")}</div>
-                       <div class="sub">${escapeHtml(it.channel || "")} • ${escapeHtml(it.duration || "")}</div>`;
-        const row = document.createElement("div");
-        row.className = "row";
-        row.style.marginTop = "6px";
-        row.appendChild(btn("Play", () => playVideo(it.video_id, 0)));
-        row.appendChild(btn("Queue", () => enqueue(it)));
-        d.appendChild(row);
-        $("ytResults").appendChild(d);
-      });
-      return;
-    }
-
-    if (renderer === "youtube.play.embed") {
-      const video_id = data.video_id || (data.queue_item ? (data.queue_item.video_id || "") : "");
-      const start = data.start_seconds || 0;
-      const url = video_id ? `https://www.youtube.com/embed/${video_id}?autoplay=1&start=${start}` : "";
-      $("ytFrame").src = url;
-      if (Array.isArray(data.queue)) {
-        saveQueue(data.queue);
-        renderQueue();
-      }
-      return;
-    }
-
-    if (renderer === "youtube.queue.updated") {
-      if (Array.isArray(data.queue)) {
-        saveQueue(data.queue);
-        renderQueue();
-      }
-      return;
-    }
-
-    if (renderer === "rag.folder.ingest.done") {
-      const r = data.result || {};
-      const errs = (r.errors || []).slice(0, 5).map(e => `${escapeHtml(e.path || "")}: ${escapeHtml(e.error || "")}`).join("<br/>");
-      $("ragResults").innerHTML = `
-        <div><b>Folder ingest</b></div>
-        <div>folder: ${escapeHtml(r.folder || "")}</div>
-        <div>ingested_chunks: ${r.ingested_chunks ?? 0} / candidates: ${r.candidates ?? 0} / skipped: ${r.skipped ?? 0}</div>
-        <div>pending_hwp: ${r.pending_hwp ?? 0}</div>
-        <div>started: ${escapeHtml(r.started_at || "")}</div>
-        <div>finished: ${escapeHtml(r.finished_at || "")}</div>
-        <div style="margin-top:6px;color:#a00">${errs}</div>
-      `;
-      return;
-    }
-
-    if (renderer === "rag.folder.status") {
-      $("ragResults").textContent = data.raw || "(no status)";
-      return;
-    }
-
-    if (renderer === "rag.query.results") {
-      renderRag(data.results || [], data.query || "");
-      return;
-    }
-
-    // Ask-style approvals (minimal)
-    if (renderer.startsWith("ask.")) {
-      const a = document.createElement("div");
-      a.className = "item";
-      a.innerHTML = `<div class="title">${escapeHtml(r.summary || "승인 필요")}</div>
-                     <div class="sub">${escapeHtml((data && data.instructions) || "")}</div>`;
-      $("approvals").prepend(a);
-      return;
-    }
-
-    // fallback to worklog
-    const w = document.createElement("div");
-    w.className = "item";
-    w.innerHTML = `<div class="title">${escapeHtml(renderer || "report")}</div>
-                   <div class="sub">${escapeHtml(r.summary || "")}</div>`;
-    $("worklog").prepend(w);
-  }
-
-  $("send").onclick = sendChat;
-  $("msg").addEventListener("keydown", (e) => { if (e.key === "Enter") sendChat(); });
-
-  $("ytClear").onclick = () => { $("ytResults").innerHTML = ""; };
-  $("ytNext").onclick = playNext;
-  $("ytClearQ").onclick = clearQueue;
-
-  $("canvasSave").onclick = saveCanvas;
-  $("canvasClear").onclick = clearCanvas;
-
-  restoreApiKey();
-  ensureSessionId();
-  renderQueue();
-  restoreCanvas();
-  connectSSE();
-    syncQueueFromServer();
-</script>
+{script}
 </body>
 </html>
 """
-    return HTMLResponse(html)
+    return html.replace("{styles}", static_assets.stylesheet("app.css")).replace("{script}", static_assets.script("app.js"))
+
+
+@app.get("/app")
+def ui_app(request: Request):
+    """Existing work app UI moved to /app. All functionality unchanged."""
+    return public_pages.response(request.headers, "app", "ko", _render_app_ui)
 
 
 @app.get("/api/public/modules")
@@ -2961,33 +2374,33 @@ def api_public_benchmark():
 # ============================================
 
 @app.get("/pricing")
-def pricing_page_route(lang: str = "ko"):
+def pricing_page_route(request: Request, lang: str = "ko"):
     """Pricing page with 3-tier plans."""
-    return HTMLResponse(render_pricing_page_i18n(lang))
+    return public_pages.response(request.headers, "pricing", lang, render_pricing_page_i18n)
 
 
 @app.get("/dashboard-preview")
-def dashboard_preview_page_route(lang: str = "ko"):
+def dashboard_preview_page_route(request: Request, lang: str = "ko"):
     """Dashboard preview page."""
-    return HTMLResponse(render_dashboard_page_i18n(lang))
+    return public_pages.response(request.headers, "dashboard-preview", lang, render_dashboard_page_i18n)
 
 
 @app.get("/canvas-preview")
-def canvas_preview_page_route(lang: str = "ko"):
+def canvas_preview_page_route(request: Request, lang: str = "ko"):
     """Canvas workspace preview page."""
-    return HTMLResponse(render_canvas_page_i18n(lang))
+    return public_pages.response(request.headers, "canvas-preview", lang, render_canvas_page_i18n)
 
 
 @app.get("/login")
-def login_page_route(lang: str = "ko"):
+def login_page_route(request: Request, lang: str = "ko"):
     """Login page."""
-    return HTMLResponse(render_login_page_i18n(lang))
+    return public_pages.response(request.headers, "login", lang, render_login_page_i18n)
 
 
 @app.get("/signup")
-def signup_page_route(lang: str = "ko"):
+def signup_page_route(request: Request, lang: str = "ko"):
     """Sign up page (redirects to login for now)."""
-    return HTMLResponse(render_login_page_i18n(lang))
+    return public_pages.response(request.headers, "login", lang, render_login_page_i18n)
 
 
 @app.get("/ceria-test")
@@ -3007,7 +2420,7 @@ def ceria_system_test_page():
 
 
 @app.get("/agent/reports/stream")
-def agent_reports_stream(
+async def agent_reports_stream(
     x_api_key: Optional[str] = Header(None),
     authorization: Optional[str] = Header(None),
     x_org_id: Optional[str] = Header(None),
@@ -3023,37 +2436,57 @@ def agent_reports_stream(
     tenant_id = _tenant_key(tenant)
     start = int(cursor or 0)
 
-    def gen():
+    async def gen():
         # snapshot first (not persisted)
-        snap = stream_store.snapshot(tenant_id)
-        current = stream_store.current_seq(tenant_id)
+        snap = await stream_store_async.snapshot(tenant_id)
+        current = await stream_store_async.current_seq(tenant_id)
         yield _sse_event(current, "snapshot", snap)
 
-        last_sent = start
-        # replay backlog
-        for ev in stream_store.replay(tenant_id, after_seq=last_sent, limit=1000):
-            yield _sse_event(ev.seq, ev.event_type, ev.payload)
-            last_sent = ev.seq
-
-        # live poll
-        ping_every = 15
-        last_ping = time.time()
-        while True:
-            evs = stream_store.replay(tenant_id, after_seq=last_sent, limit=200)
-            if evs:
-                for ev in evs:
-                    yield _sse_event(ev.seq, ev.event_type, ev.payload)
-                    last_sent = ev.seq
-                continue
-            now = time.time()
-            if now - last_ping >= ping_every:
-                yield f"event: ping\ndata: {json.dumps({'ts': _utc_now()}, ensure_ascii=False)}\n\n"
-                last_ping = now
-            time.sleep(0.5)
+        # backlog replay + live push via the per-tenant pub/sub fan-out (no per-client polling)
+        async for frame in stream_hub.stream(tenant_id, after_seq=start, now_iso=_utc_now):
+            yield frame
 
     return StreamingResponse(gen(), media_type="text/event-stream")
 
 
+@app.get("/agent/state")
+async def agent_state(
+    x_api_key: Optional[str] = Header(None),
+    authorization: Optional[str] = Header(None),
+    x_org_id: Optional[str] = Header(None),
+    x_project_id: Optional[str] = Header(None),
+    api_key: Optional[str] = Query(None),
+    org_id: Optional[str] = Query(None),
+    project_id: Optional[str] = Query(None),
+):
+    """Full UI state (asks/worklog/autopilot + version) for clients behind a report's state delta."""
+    require_api_key(api_key or x_api_key, authorization)
+    tenant = _tenant_from_headers(x_org_id or org_id, x_project_id or project_id)
+    return await stream_store_async.snapshot(_tenant_key(tenant))
+
+
+@app.on_event("shutdown")
+async def _shutdown_stream_hub() -> None:
+    await stream_hub.close()
+
+
+@app.on_event("shutdown")
+def _shutdown_rabbit_pool() -> None:
+    rabbit_pool.close()
+
+
+@app.on_event("shutdown")
+async def _shutdown_node_waiter() -> None:
+    await node_waiter.close()
+    await node_ingest_queue.close()
+
+
+@app.on_event("shutdown")
+async def _shutdown_redis_pools() -> None:
+    await redis_client.aclose_all()
+    redis_client.close_all()
+
+
 # RED Command Types Registry (불변 계약)
 RED_COMMAND_TYPES = {
     "external_share.execute",
@@ -3107,15 +2540,14 @@ def sidecar_command(
         risk="GREEN",
         causality=causality,
         ui_hint={"renderer": "sidecar.command.accepted"},
-        data={"command": {"type": body.type, "params": body.params}, "snapshot": stream_store.snapshot(tenant_id)},
+        data={"command": {"type": body.type, "params": body.params}, "state": stream_store.state_delta(tenant_id)},
     )
     stream_store.append_event(tenant_id, "report", started)
     stream_store.add_worklog(tenant_id, {"title": "Command accepted", "body": f"{body.type}", "ts": _utc_now()})
 
     # Check RED approval requirement BEFORE execution
     if _is_red_command(body.type):
-        snap = stream_store.snapshot(tenant_id)
-        asks = snap.get("asks", [])
+        asks = stream_store.list_asks(tenant_id)
         approved = any(
             ask.get("meta", {}).get("command_id") == body.command_id
             and ask.get("decision") == "approve"
@@ -3144,7 +2576,7 @@ def sidecar_command(
                 risk="RED",
                 causality=causality,
                 ui_hint={"renderer": "approval.ask.created"},
-                data={"ask": ask, "reason": "RED command requires approval", "snapshot": stream_store.snapshot(tenant_id)},
+                data={"ask": ask, "reason": "RED command requires approval", "state": stream_store.state_delta(tenant_id)},
             )
             stream_store.append_event(tenant_id, "report", blocked_report)
             logger.info(json.dumps({"event": "RED_BLOCKED", "command_id": body.command_id, "ask_id": ask_id}, ensure_ascii=False))
@@ -3182,7 +2614,7 @@ def sidecar_command(
                 risk="RED",
                 causality=causality,
                 ui_hint={"renderer": "approval.ask.created"},
-                data={"ask": ask, "snapshot": stream_store.snapshot(tenant_id)},
+                data={"ask": ask, "state": stream_store.state_delta(tenant_id)},
             )
             stream_store.append_event(tenant_id, "report", done)
 
@@ -3207,7 +2639,7 @@ def sidecar_command(
                     risk="YELLOW",
                     causality=causality,
                     ui_hint={"renderer": "approval.ask.created"},
-                    data={"ask": ask, "snapshot": stream_store.snapshot(tenant_id)},
+                    data={"ask": ask, "state": stream_store.state_delta(tenant_id)},
                 )
                 stream_store.append_event(tenant_id, "report", done)
             else:
@@ -3218,7 +2650,7 @@ def sidecar_command(
                     risk=settings.youtube_default_risk,
                     causality=causality,
                     ui_hint={"renderer": "youtube.search.results"},
-                    data={"query": q, "results": items, "snapshot": stream_store.snapshot(tenant_id)},
+                    data={"query": q, "results": items, "state": stream_store.state_delta(tenant_id)},
                 )
                 stream_store.append_event(tenant_id, "report", done)
 
@@ -3232,7 +2664,7 @@ def sidecar_command(
                 risk=settings.youtube_default_risk,
                 causality=causality,
                 ui_hint={"renderer": "youtube.play.embed"},
-                data={"video_id": vid, "embed_url": f"https://www.youtube.com/embed/{vid}", "snapshot": stream_store.snapshot(tenant_id)},
+                data={"video_id": vid, "embed_url": f"https://www.youtube.com/embed/{vid}", "state": stream_store.state_delta(tenant_id)},
             )
             stream_store.append_event(tenant_id, "report", done)
 
@@ -3255,7 +2687,7 @@ def sidecar_command(
                 risk="GREEN",
                 causality=causality,
                 ui_hint={"renderer": "youtube.queue.updated"},
-                data={"action": "add", "item": item, "length": new_len, "queue": youtube_queue_store.list(tenant_id=tenant_id, session_id=session_id), "snapshot": stream_store.snapshot(tenant_id)},
+                data={"action": "add", "item": item, "length": new_len, "queue": youtube_queue_store.list(tenant_id=tenant_id, session_id=session_id), "state": stream_store.state_delta(tenant_id)},
             )
             stream_store.append_event(tenant_id, "report", done)
 
@@ -3272,7 +2704,7 @@ def sidecar_command(
                     "video_id": (nxt or {}).get("video_id"),
                     "embed_url": (nxt or {}).get("embed_url"),
                     "queue": youtube_queue_store.list(tenant_id=tenant_id, session_id=session_id),
-                    "snapshot": stream_store.snapshot(tenant_id),
+                    "state": stream_store.state_delta(tenant_id),
                 },
             )
             stream_store.append_event(tenant_id, "report", done)
@@ -3285,7 +2717,7 @@ def sidecar_command(
                 risk="GREEN",
                 causality=causality,
                 ui_hint={"renderer": "youtube.queue.updated"},
-                data={"action": "list", "queue": q, "snapshot": stream_store.snapshot(tenant_id)},
+                data={"action": "list", "queue": q, "state": stream_store.state_delta(tenant_id)},
             )
             stream_store.append_event(tenant_id, "report", done)
 
@@ -3297,7 +2729,7 @@ def sidecar_command(
                 risk="GREEN",
                 causality=causality,
                 ui_hint={"renderer": "youtube.queue.updated"},
-                data={"action": "clear", "queue": [], "snapshot": stream_store.snapshot(tenant_id)},
+                data={"action": "clear", "queue": [], "state": stream_store.state_delta(tenant_id)},
             )
             stream_store.append_event(tenant_id, "report", done)
 
@@ -3311,6 +2743,8 @@ def sidecar_command(
                 allowed_exts=allowed,
                 max_files=int((body.params or {}).get("max_files") or settings.rag_auto_ingest_max_files),
                 max_file_mb=int((body.params or {}).get("max_file_mb") or settings.rag_auto_ingest_max_file_mb),
+                workers=int(settings.rag_ingest_workers),
+                file_timeout_s=float(settings.rag_ingest_file_timeout_seconds),
             )
             done = _mk_report(
                 status="done" if res.ok else "error",
@@ -3318,7 +2752,7 @@ def sidecar_command(
                 risk="GREEN",
                 causality=causality,
                 ui_hint={"renderer": "rag.folder.ingest.done"},
-                data={"result": res.__dict__, "snapshot": stream_store.snapshot(tenant_id)},
+                data={"result": res.__dict__, "state": stream_store.state_delta(tenant_id)},
             )
             stream_store.append_event(tenant_id, "report", done)
 
@@ -3330,7 +2764,7 @@ def sidecar_command(
                 risk="GREEN",
                 causality=causality,
                 ui_hint={"renderer": "rag.folder.status"},
-                data={"raw": raw, "snapshot": stream_store.snapshot(tenant_id)},
+                data={"raw": raw, "state": stream_store.state_delta(tenant_id)},
             )
             stream_store.append_event(tenant_id, "report", done)
 
@@ -3347,7 +2781,22 @@ def sidecar_command(
                 risk="GREEN",
                 causality=causality,
                 ui_hint={"renderer": "rag.ingest.done"},
-                data={"result": res, "snapshot": stream_store.snapshot(tenant_id)},
+                data={"result": res, "state": stream_store.state_delta(tenant_id)},
+            )
+            stream_store.append_event(tenant_id, "report", done)
+
+        elif body.type == "rag.analyzer.set":
+            name = (body.params or {}).get("analyzer") or ""
+            if not name:
+                raise ValueError("analyzer is required")
+            res = rag_engine.set_analyzer(tenant_id, name)
+            done = _mk_report(
+                status="done",
+                summary=f"rag.analyzer.set: {name}",
+                risk="GREEN",
+                causality=causality,
+                ui_hint={"renderer": "rag.analyzer.set.done"},
+                data={"result": res, "state": stream_store.state_delta(tenant_id)},
             )
             stream_store.append_event(tenant_id, "report", done)
 
@@ -3363,7 +2812,7 @@ def sidecar_command(
                 risk="GREEN",
                 causality=causality,
                 ui_hint={"renderer": "rag.query.results"},
-                data={"query": q, "results": results, "snapshot": stream_store.snapshot(tenant_id)},
+                data={"query": q, "results": results, "state": stream_store.state_delta(tenant_id)},
             )
             stream_store.append_event(tenant_id, "report", done)
 
@@ -3374,7 +2823,7 @@ def sidecar_command(
                 risk="GREEN",
                 causality=causality,
                 ui_hint={"renderer": "noop"},
-                data={"snapshot": stream_store.snapshot(tenant_id)},
+                data={"state": stream_store.state_delta(tenant_id)},
             )
             stream_store.append_event(tenant_id, "report", done)
 
@@ -3385,7 +2834,7 @@ def sidecar_command(
             risk="YELLOW",
             causality=causality,
             ui_hint={"renderer": "error"},
-            data={"error": {"message": str(e)}, "snapshot": stream_store.snapshot(tenant_id)},
+            data={"error": {"message": str(e)}, "state": stream_store.state_delta(tenant_id)},
         )
         stream_store.append_event(tenant_id, "report", err)
         # Emit agent_status: idle (error occurred)
@@ -3435,7 +2884,7 @@ def approvals_decide(
         risk="GREEN",
         causality={"ask_id": ask_id, "decision": body.decision, "correlation_id": body.correlation_id},
         ui_hint={"renderer": "approval.decided"},
-        data={"removed": removed, "snapshot": stream_store.snapshot(tenant_id)},
+        data={"removed": removed, "state": stream_store.state_delta(tenant_id)},
     )
     stream_store.add_worklog(tenant_id, {"title": "Approval", "body": f"{body.decision} {ask_id}", "ts": _utc_now()})
     stream_store.append_event(tenant_id, "report", report)
@@ -3467,6 +2916,8 @@ def _rag_auto_ingest_once() -> None:
             allowed_exts=allowed,
             max_files=int(settings.rag_auto_ingest_max_files),
             max_file_mb=int(settings.rag_auto_ingest_max_file_mb),
+            workers=int(settings.rag_ingest_workers),
+            file_timeout_s=float(settings.rag_ingest_file_timeout_seconds),
         )
         report = _mk_report(
             status="done" if res.ok else "error",
@@ -3474,7 +2925,7 @@ def _rag_auto_ingest_once() -> None:
             risk="GREEN",
             causality={"type": "scheduler"},
             ui_hint={"renderer": "rag.folder.ingest.done"},
-            data={"result": res.__dict__, "snapshot": stream_store.snapshot(tenant_id)},
+            data={"result": res.__dict__, "state": stream_store.state_delta(tenant_id)},
         )
         stream_store.add_worklog(
             tenant_id,
@@ -3556,6 +3007,33 @@ class NodeReportResponse(BaseModel):
     report_id: str
 
 
+class NodeIngestChunk(BaseModel):
+    """노드 업로드 청크 (doc_id는 노드가 파일 경로 기준으로 고정 생성 → 재전송해도 멱등)"""
+    doc_id: str
+    text: str
+    meta: Dict[str, Any] = Field(default_factory=dict)
+
+
+class NodeIngestBatchRequest(BaseModel):
+    """노드 폴더 인제스트 청크 배치 업로드 (seq 1부터 연속, 마지막 배치는 final=True)"""
+    node_id: str
+    node_token: str
+    command_id: str
+    seq: int = Field(..., ge=1)
+    final: bool = False
+    chunks: List[NodeIngestChunk] = Field(default_factory=list)
+    delete_ids: List[str] = Field(default_factory=list)  # 변경/삭제된 파일의 이전 청크
+
+
+class NodeIngestBatchResponse(BaseModel):
+    """배치 업로드 응답 (202 Accepted: 큐에 적재됨, acked_seq까지 RAG 반영 완료)"""
+    seq: int
+    accepted: bool
+    duplicate: bool = False
+    received_seq: int
+    acked_seq: int
+
+
 class NodeStateResponse(BaseModel):
     """노드 상태 조회 응답"""
     node_id: str
@@ -3565,8 +3043,53 @@ class NodeStateResponse(BaseModel):
     info: Optional[Dict[str, Any]] = None
 
 
+def _require_node_token(node_id: str, node_token: str) -> None:
+    # TODO: JWT 검증 (미래 구현)
+    # 현재는 node_token이 "node-token-{node_id}-*" 형식인지만 확인
+    if not node_token.startswith(f"node-token-{node_id}"):
+        raise HTTPException(status_code=403, detail="Invalid node token")
+
+
+async def _node_ingest_done(batch: IngestBatch, ack: Dict[str, Any]) -> None:
+    """업로드의 마지막 배치까지 RAG에 반영되면 완료 리포트 1회 전파"""
+    st = await asyncio.to_thread(node_ingest_sessions.status, batch.tenant, batch.node_id, batch.command_id)
+    ingested = st["chunks_ingested"]
+    logger.info(f"[Node Ingest] node={batch.node_id} command={batch.command_id} batches={ack['acked_seq']} chunks={ingested}")
+    rag_report = _mk_report(
+        status="done",
+        summary=f"RAG 인제스트 완료: {ingested}개 청크",
+        risk="GREEN",
+        causality={
+            "correlation_id": batch.command_id,
+            "command_id": batch.command_id,
+            "ask_id": None,
+            "type": "rag.ingest"
+        },
+        ui_hint={
+            "surface": "dashboard",
+            "cards": [{
+                "type": "rag_ingest_done",
+                "title": "RAG 인제스트 완료",
+                "body": f"Node **{batch.node_id}**에서 **{ingested}개** 청크를 RAG 인덱스에 추가했습니다."
+            }]
+        },
+        data={"ingested": ingested, "total": st["chunks_received"], "batches": ack["acked_seq"]}
+    )
+    await stream_store_async.append_event(batch.tenant, "report", rag_report)
+
+
+node_ingest_sessions = NodeIngestSessions(settings.redis_url, inflight_lease_s=settings.node_ingest_inflight_lease_s)
+node_ingest_queue = NodeIngestQueue(
+    rag_engine_async,
+    node_ingest_sessions,
+    queue_max=settings.node_ingest_queue_max,
+    workers=settings.node_ingest_workers,
+    on_complete=_node_ingest_done,
+)
+
+
 @app.post("/node/pairing/create", status_code=200, response_model=NodePairingCreateResponse)
-def node_pairing_create(
+async def node_pairing_create(
     x_api_key: Optional[str] = Header(None),
     authorization: Optional[str] = Header(None),
     x_org_id: str = Header(...),
@@ -3581,7 +3104,7 @@ def node_pairing_create(
     require_api_key(x_api_key, authorization)
     tenant_id = f"{x_org_id}:{x_project_id}"
     
-    pairing_code = node_store.create_pairing_code(tenant_id, ttl_seconds=300)
+    pairing_code = await node_store_async.create_pairing_code(tenant_id, ttl_seconds=300)
     
     logger.info(f"[Node Pairing] Created code={pairing_code} tenant={tenant_id}")
     
@@ -3606,13 +3129,13 @@ def node_pairing_create(
         },
         data={"pairing_code": pairing_code, "expires_in": 300}
     )
-    stream_store.append_event(tenant_id, "report", report)
+    await stream_store_async.append_event(tenant_id, "report", report)
     
     return NodePairingCreateResponse(pairing_code=pairing_code, expires_in=300)
 
 
 @app.post("/node/pairing/claim", status_code=200, response_model=NodePairingClaimResponse)
-def node_pairing_claim(body: NodePairingClaimRequest):
+async def node_pairing_claim(body: NodePairingClaimRequest):
     """
     페어링 코드 사용 (일회용)
     
@@ -3625,7 +3148,7 @@ def node_pairing_claim(body: NodePairingClaimRequest):
         "agent_version": body.agent_version
     }
     
-    tenant_id = node_store.claim_pairing_code(
+    tenant_id = await node_store_async.claim_pairing_code(
         pairing_code=body.pairing_code,
         node_id=body.node_id,
         node_info=node_info
@@ -3660,7 +3183,7 @@ def node_pairing_claim(body: NodePairingClaimRequest):
         },
         data={"node_id": body.node_id, "hostname": body.hostname}
     )
-    stream_store.append_event(tenant_id, "report", report)
+    await stream_store_async.append_event(tenant_id, "report", report)
     
     return NodePairingClaimResponse(
         node_token=node_token,
@@ -3670,38 +3193,31 @@ def node_pairing_claim(body: NodePairingClaimRequest):
 
 
 @app.get("/node/poll", status_code=200)
-def node_poll(
+async def node_poll(
     node_id: str = Query(...),
-    node_token: str = Query(...)
+    node_token: str = Query(...),
+    wait: Optional[float] = Query(None, ge=0, le=60)
 ):
     """
     노드 Poll 엔드포인트 (Fallback for WSS failure)
     
-    Node → Backend: HTTP Long Polling (30초 타임아웃)
-    Backend: 큐에 있는 명령 반환
+    Node → Backend: HTTP Long Polling (기본 NODE_POLL_WAIT_SECONDS 대기, wait=0이면 즉시 반환)
+    Backend: 큐에 명령이 생기면 즉시 반환 (BLPOP), 없으면 대기 시간 후 빈 목록
     """
-    # TODO: JWT 검증 (미래 구현)
-    # 현재는 node_token이 "node-token-{node_id}-*" 형식인지만 확인
-    if not node_token.startswith(f"node-token-{node_id}"):
-        raise HTTPException(status_code=403, detail="Invalid node token")
+    _require_node_token(node_id, node_token)
     
-    # tenant_id 추출 (Redis에서 조회)
-    # 임시로 모든 테넌트 검색 (비효율적이지만 프로토타입용)
-    tenant_id = None
-    for tid in ["demo:demo", "org123:proj456"]:  # 하드코딩된 테넌트 목록
-        node_state = node_store.get_node_state(tid, node_id)
-        if node_state:
-            tenant_id = tid
-            break
+    # tenant_id 조회 (claim 시 기록된 node→tenant 색인)
+    tenant_id = await node_store_async.resolve_node_tenant(node_id, _LEGACY_NODE_TENANTS)
     
     if not tenant_id:
         raise HTTPException(status_code=404, detail="Node not found")
     
     # 연결 상태 업데이트
-    node_store.set_node_state(tenant_id, node_id, "online", "poll")
+    await node_store_async.set_node_state(tenant_id, node_id, "online", "poll")
     
-    # 명령 가져오기
-    commands = node_store.pop_commands(tenant_id, node_id, limit=10)
+    # 명령 가져오기 (없으면 push_command 또는 timeout까지 대기)
+    timeout_s = settings.node_poll_wait_seconds if wait is None else wait
+    commands = await node_waiter.wait(tenant_id, node_id, timeout_s=timeout_s, limit=10)
     
     logger.info(f"[Node Poll] node={node_id} tenant={tenant_id} commands={len(commands)}")
     
@@ -3712,7 +3228,7 @@ def node_poll(
 
 
 @app.post("/node/command", status_code=202, response_model=NodeCommandResponse)
-def node_command(
+async def node_command(
     body: NodeCommandRequest,
     x_api_key: Optional[str] = Header(None),
     authorization: Optional[str] = Header(None),
@@ -3737,7 +3253,7 @@ def node_command(
     }
     
     # 명령 큐에 추가
-    node_store.push_command(tenant_id, body.node_id, command)
+    await node_store_async.push_command(tenant_id, body.node_id, command)
     
     logger.info(f"[Node Command] command_id={command_id} node={body.node_id} type={body.command_type}")
     
@@ -3762,13 +3278,13 @@ def node_command(
         },
         data={"command": command}
     )
-    stream_store.append_event(tenant_id, "report", report)
+    await stream_store_async.append_event(tenant_id, "report", report)
     
     return NodeCommandResponse(command_id=command_id, node_id=body.node_id)
 
 
 @app.post("/node/report", status_code=200, response_model=NodeReportResponse)
-def node_report(body: NodeReportRequest):
+async def node_report(body: NodeReportRequest):
     """
     노드 리포트 수신
     
@@ -3776,13 +3292,7 @@ def node_report(body: NodeReportRequest):
     Backend: SSE로 UI에 전파
     """
     # TODO: JWT 검증
-    # 임시로 node_id 기반으로 tenant_id 조회
-    tenant_id = None
-    for tid in ["demo:demo", "org123:proj456"]:
-        node_state = node_store.get_node_state(tid, body.node_id)
-        if node_state:
-            tenant_id = tid
-            break
+    tenant_id = await node_store_async.resolve_node_tenant(body.node_id, _LEGACY_NODE_TENANTS)
     
     if not tenant_id:
         raise HTTPException(status_code=404, detail="Node not found")
@@ -3820,25 +3330,20 @@ def node_report(body: NodeReportRequest):
     )
     
     # SSE 전파
-    stream_store.append_event(tenant_id, "report", report)
+    await stream_store_async.append_event(tenant_id, "report", report)
     
-    # 완료 시 RAG 인제스트 (result에 chunks가 있는 경우)
+    # 완료 시 RAG 인제스트 (구버전 에이전트: result에 chunks를 한 번에 보내는 경우)
+    # 새 에이전트는 /node/ingest/batch로 나눠 올리고 완료 리포트는 인제스트 큐가 보낸다
     if body.status == "completed" and body.result and "chunks" in body.result:
-        chunks = body.result["chunks"]
+        chunks = [c for c in body.result["chunks"] if c.get("doc_id") and str(c.get("text") or "").strip()]
         ingested = 0
-        for chunk in chunks[:100]:  # 최대 100개씩
-            try:
-                rag_engine.ingest(
-                    tenant=tenant_id,
-                    doc_id=chunk["doc_id"],
-                    text=chunk["text"],
-                    meta=chunk.get("meta", {})
-                )
-                ingested += 1
-            except Exception as e:
-                logger.error(f"[Node Report] RAG ingest failed: {e}")
+        try:
+            # 전체를 1회 MULTI로 기록 (청크별 ingest 호출, 100개 제한 제거)
+            ingested = (await rag_engine_async.ingest_many(tenant_id, docs_from_chunks(chunks)))["ingested"]
+        except Exception as e:
+            logger.error(f"[Node Report] RAG ingest failed: {e}")
         
-        logger.info(f"[Node Report] RAG ingested {ingested}/{len(chunks)} chunks from node={body.node_id}")
+        logger.info(f"[Node Report] RAG ingested {ingested}/{len(body.result['chunks'])} chunks from node={body.node_id}")
         
         # RAG 인제스트 완료 리포트
         rag_report = _mk_report(
@@ -3859,17 +3364,72 @@ def node_report(body: NodeReportRequest):
                     "body": f"Node **{body.node_id}**에서 **{ingested}개** 청크를 RAG 인덱스에 추가했습니다."
                 }]
             },
-            data={"ingested": ingested, "total": len(chunks)}
+            data={"ingested": ingested, "total": len(body.result["chunks"])}
         )
-        stream_store.append_event(tenant_id, "report", rag_report)
+        await stream_store_async.append_event(tenant_id, "report", rag_report)
     
     logger.info(f"[Node Report] node={body.node_id} command={body.command_id} status={body.status}")
     
     return NodeReportResponse(received=True, report_id=report_id)
 
 
+@app.post("/node/ingest/batch", status_code=202, response_model=NodeIngestBatchResponse)
+async def node_ingest_batch(body: NodeIngestBatchRequest):
+    """
+    노드 폴더 인제스트 청크 배치 업로드
+    
+    Node → Backend: seq 순서대로 배치 업로드 (마지막 배치 final=True)
+    Backend: 세션에 기록 후 인제스트 큐에 적재 → 202 (RAG 쓰기는 백그라운드)
+      - seq <= acked_seq: 이미 반영됨 (duplicate, 재적재 없음)
+      - 아직 큐에서 처리 중인 seq 재전송: duplicate (재적재 없음, ack 대기)
+      - seq > received_seq + 1: 409 SEQ_GAP (expected_seq부터 재전송)
+      - 큐가 가득 참: 429 + Retry-After (같은 seq 재전송)
+    네트워크가 끊기면 노드는 /node/ingest/status의 acked_seq 다음부터 재전송한다.
+    """
+    _require_node_token(body.node_id, body.node_token)
+    if len(body.chunks) + len(body.delete_ids) > settings.node_ingest_batch_max:
+        raise HTTPException(status_code=413, detail={"error": {"code": "BATCH_TOO_LARGE", "message": f"max {settings.node_ingest_batch_max} chunks + delete_ids per batch"}})
+    
+    tenant_id = await node_store_async.resolve_node_tenant(body.node_id, _LEGACY_NODE_TENANTS)
+    if not tenant_id:
+        raise HTTPException(status_code=404, detail="Node not found")
+    
+    chunks = [c.model_dump() for c in body.chunks if c.doc_id and c.text.strip()]
+    st = await asyncio.to_thread(node_ingest_sessions.accept, tenant_id, body.node_id, body.command_id, body.seq, len(chunks), body.final)
+    if st["status"] == -1:
+        raise HTTPException(status_code=409, detail={"error": {"code": "SEQ_GAP", "message": "batch out of order", "expected_seq": st["received_seq"] + 1, "acked_seq": st["acked_seq"]}})
+    if st["status"] in (2, 3):
+        return NodeIngestBatchResponse(seq=body.seq, accepted=True, duplicate=True, received_seq=st["received_seq"], acked_seq=st["acked_seq"])
+    
+    batch = IngestBatch(tenant=tenant_id, node_id=body.node_id, command_id=body.command_id, seq=body.seq, docs=docs_from_chunks(chunks), delete_ids=body.delete_ids)
+    if not node_ingest_queue.try_put(batch):
+        await node_ingest_queue.release(batch)
+        raise HTTPException(
+            status_code=429,
+            detail={"error": {"code": "INGEST_QUEUE_FULL", "message": "ingest queue full; retry the same seq"}},
+            headers={"Retry-After": "2"},
+        )
+    
+    return NodeIngestBatchResponse(seq=body.seq, accepted=True, received_seq=max(st["received_seq"], body.seq), acked_seq=st["acked_seq"])
+
+
+@app.get("/node/ingest/status", status_code=200)
+async def node_ingest_status(
+    node_id: str = Query(...),
+    node_token: str = Query(...),
+    command_id: str = Query(...)
+):
+    """업로드 세션 상태 (재개 지점 = acked_seq + 1)"""
+    _require_node_token(node_id, node_token)
+    tenant_id = await node_store_async.resolve_node_tenant(node_id, _LEGACY_NODE_TENANTS)
+    if not tenant_id:
+        raise HTTPException(status_code=404, detail="Node not found")
+    st = await asyncio.to_thread(node_ingest_sessions.status, tenant_id, node_id, command_id)
+    return {"command_id": command_id, **st, "queue": node_ingest_queue.status()}
+
+
 @app.get("/node/list", status_code=200)
-def node_list(
+async def node_list(
     x_api_key: Optional[str] = Header(None),
     authorization: Optional[str] = Header(None),
     x_org_id: str = Header(...),
@@ -3884,6 +3444,6 @@ def node_list(
     require_api_key(x_api_key, authorization)
     tenant_id = f"{x_org_id}:{x_project_id}"
     
-    nodes = node_store.list_tenant_nodes(tenant_id, status_filter=status_filter)
+    nodes = await node_store_async.list_tenant_nodes(tenant_id, status_filter=status_filter)
     
     return {"nodes": nodes, "total": len(nodes)}
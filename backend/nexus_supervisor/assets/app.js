@@ -0,0 +1,431 @@
+const $ = (id) => document.getElementById(id);
+
+function ensureSessionId() {
+  let sid = localStorage.getItem("nexus_session_id");
+  if (!sid) {
+    sid = "sess_" + Math.random().toString(16).slice(2) + "_" + Date.now().toString(16);
+    localStorage.setItem("nexus_session_id", sid);
+  }
+  $("sessionId").textContent = sid;
+  return sid;
+}
+
+function apiKey() {
+  const v = $("apiKey").value.trim();
+  localStorage.setItem("nexus_api_key", v);
+  return v;
+}
+
+function restoreApiKey() {
+  $("apiKey").value = localStorage.getItem("nexus_api_key") || "";
+}
+
+function addMsg(role, text) {
+  const el = document.createElement("div");
+  el.className = "msg " + role;
+  const meta = document.createElement("div");
+  meta.className = "meta";
+  meta.textContent = role === "user" ? "YOU" : "NEXUS";
+  const bubble = document.createElement("div");
+  bubble.className = "bubble";
+  bubble.textContent = text;
+  el.appendChild(meta);
+  el.appendChild(bubble);
+  $("log").appendChild(el);
+  $("log").scrollTop = $("log").scrollHeight;
+}
+
+// ---------- YouTube queue ----------
+function loadQueue() {
+  try { return JSON.parse(localStorage.getItem("nexus_yt_queue") || "[]"); } catch(e) { return []; }
+}
+function saveQueue(q) { localStorage.setItem("nexus_yt_queue", JSON.stringify(q.slice(0, 50))); }
+function renderQueue() {
+  const q = loadQueue();
+  $("ytQueue").innerHTML = "";
+  if (!q.length) {
+    const empty = document.createElement("div");
+    empty.className = "small";
+    empty.textContent = "큐가 비었습니다.";
+    $("ytQueue").appendChild(empty);
+    return;
+  }
+  q.forEach((it, idx) => {
+    const d = document.createElement("div");
+    d.className = "item";
+    d.innerHTML = `<div class="title">${escapeHtml(it.title || it.video_id || "item")}</div>
+                   <div class="sub">${escapeHtml(it.channel || "")}</div>`;
+    const row = document.createElement("div");
+    row.className = "row";
+    row.style.marginTop = "6px";
+    const play = btn("Play", () => playVideo(it.video_id, 0));
+    const up = btn("Up", () => { if (idx>0){ const qq=loadQueue(); const t=qq[idx-1]; qq[idx-1]=qq[idx]; qq[idx]=t; saveQueue(qq); renderQueue(); }});
+    const del = btn("Remove", () => { const qq=loadQueue(); qq.splice(idx,1); saveQueue(qq); renderQueue(); });
+    row.appendChild(play); row.appendChild(up); row.appendChild(del);
+    d.appendChild(row);
+    $("ytQueue").appendChild(d);
+  });
+}
+
+function _mkCorr() {
+  return "corr-" + Math.random().toString(16).slice(2) + Date.now().toString(16);
+}
+
+async function _sidecar(type, params) {
+  const corr = _mkCorr();
+  const cmd = "cmd-" + corr.slice(5);
+  return postJSON("/sidecar/command", {
+    command_id: cmd,
+    type,
+    context: { ref: "ui", title: "ui" },
+    params: params || {},
+    client_context: { surface: "sidecar", correlation_id: corr, session_id: ensureSessionId() },
+  });
+}
+
+async function enqueue(item) {
+  // Optimistic local update
+  const q = loadQueue();
+  q.push(item);
+  saveQueue(q);
+  renderQueue();
+
+  try {
+    await _sidecar("youtube.queue.add", {
+      video_id: item.video_id,
+      title: item.title || "",
+      channel: item.channel || "",
+    });
+  } catch (e) {
+    // Local queue remains usable
+  }
+}
+
+async function playNext() {
+  try {
+    await _sidecar("youtube.queue.next", {});
+    return;
+  } catch (e) {
+    // Fallback to local queue
+  }
+
+  const q = loadQueue();
+  if (!q.length) { addMsg("assistant", "YouTube 큐가 비었습니다."); return; }
+  const it = q.shift();
+  saveQueue(q);
+  renderQueue();
+  playVideo(it.video_id, 0);
+}
+
+async function clearQueue() {
+  saveQueue([]);
+  renderQueue();
+  try { await _sidecar("youtube.queue.clear", {}); } catch (e) {}
+}
+
+async function syncQueueFromServer() {
+  try { await _sidecar("youtube.queue.list", {}); } catch (e) {}
+}
+
+// ---------- Work canvas ----------
+function restoreCanvas() {
+  const c = localStorage.getItem("nexus_work_canvas") || "";
+  $("canvas").value = c;
+  const ts = localStorage.getItem("nexus_work_canvas_ts") || "";
+  $("canvasMeta").textContent = ts ? ("saved: " + ts) : "";
+}
+function saveCanvas() {
+  localStorage.setItem("nexus_work_canvas", $("canvas").value);
+  const ts = new Date().toISOString();
+  localStorage.setItem("nexus_work_canvas_ts", ts);
+  $("canvasMeta").textContent = "saved: " + ts;
+}
+function clearCanvas() {
+  $("canvas").value = "";
+  saveCanvas();
+}
+
+// ---------- RAG render ----------
+function renderRag(results, query) {
+  $("ragResults").innerHTML = "";
+  if (!results || !results.length) {
+    const empty = document.createElement("div");
+    empty.className = "small";
+    empty.textContent = query ? "결과 없음" : "대기 중";
+    $("ragResults").appendChild(empty);
+    return;
+  }
+  results.forEach(r => {
+    const d = document.createElement("div");
+    d.className = "item";
+    d.innerHTML = `<div class="title">${escapeHtml(r.doc_id)} <span class="sub">(score ${r.score})</span></div>
+                   <div class="sub">${escapeHtml((r.snippet || "").slice(0, 240))}</div>`;
+    $("ragResults").appendChild(d);
+  });
+}
+
+function escapeHtml(s) {
+  return (s || "").replaceAll("&","&amp;").replaceAll("<","&lt;").replaceAll(">","&gt;");
+}
+
+function btn(label, onClick) {
+  const b = document.createElement("button");
+  b.className = "btn";
+  b.textContent = label;
+  b.onclick = onClick;
+  return b;
+}
+
+async function postJSON(url, body) {
+  const res = await fetch(url, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+      "x-api-key": apiKey() || ""
+    },
+    body: JSON.stringify(body)
+  });
+  return await res.json();
+}
+
+async function playVideo(video_id, start_seconds) {
+  await postJSON("/sidecar/command", {
+    command_id: "cmd_" + Math.random().toString(16).slice(2),
+    type: "youtube.play",
+    context: { ref: "ui", title: "youtube.play" },
+    params: { video_id, start_seconds: start_seconds || 0 },
+    client_context: { surface: "ui", correlation_id: "corr_" + Math.random().toString(16).slice(2) }
+  });
+}
+
+async function sendChat() {
+  const msg = $("msg").value.trim();
+  if (!msg) return;
+  $("msg").value = "";
+  await postJSON("/chat/send", {
+    message: msg,
+    session_id: ensureSessionId(),
+    correlation_id: "corr_" + Math.random().toString(16).slice(2),
+    context: {}
+  });
+}
+
+function connectSSE() {
+  const key = apiKey();
+  const url = "/agent/reports/stream" + (key ? ("?api_key=" + encodeURIComponent(key)) : "");
+  const es = new EventSource(url);
+  $("sseStatus").textContent = "SSE: connecting…";
+  es.addEventListener("open", () => $("sseStatus").textContent = "SSE: connected");
+  es.addEventListener("error", () => $("sseStatus").textContent = "SSE: error/reconnecting…");
+
+  es.addEventListener("snapshot", (ev) => {
+    try {
+      uiState = JSON.parse(ev.data || "{}");
+      renderSnapshot(uiState);
+    } catch(e) {}
+  });
+
+  es.addEventListener("report", (ev) => {
+    try {
+      const r = JSON.parse(ev.data || "{}");
+      applyStateDelta((r.data || {}).state);
+      renderReport(r);
+    } catch(e) {}
+  });
+
+  es.addEventListener("ping", () => {});
+}
+
+// UI state: full snapshot on connect, then per-report deltas {version, base_version, ops}
+let uiState = null;
+
+async function refetchState() {
+  const key = apiKey();
+  const res = await fetch("/agent/state", { headers: key ? { "X-API-Key": key } : {} });
+  if (!res.ok) return;
+  uiState = await res.json();
+  renderSnapshot(uiState);
+}
+
+function applyStateDelta(delta) {
+  if (!delta || !uiState) return;
+  const cur = uiState.version || 0;
+  if (delta.version <= cur) return;
+  if (delta.resync || delta.base_version > cur) {
+    refetchState();
+    return;
+  }
+  (delta.ops || []).forEach(op => {
+    if (op.v <= cur) return;
+    if (op.op === "worklog.add") {
+      uiState.worklog = (uiState.worklog || []).concat([op.entry]).slice(-200);
+    } else if (op.op === "ask.put") {
+      uiState.asks = (uiState.asks || []).filter(a => a.ask_id !== op.ask.ask_id).concat([op.ask]);
+    } else if (op.op === "ask.remove") {
+      uiState.asks = (uiState.asks || []).filter(a => a.ask_id !== op.ask_id);
+    } else if (op.op === "autopilot.set") {
+      uiState.autopilot = op.autopilot;
+    }
+  });
+  uiState.version = delta.version;
+  renderSnapshot(uiState);
+}
+
+function renderSnapshot(snap) {
+  if (!snap) return;
+
+  // approvals (asks)
+  const a = $("approvals");
+  a.innerHTML = "";
+  const asks = (snap.asks || []).slice(0, 20);
+  if (!asks.length) {
+    const emptyA = document.createElement("div");
+    emptyA.className = "small";
+    emptyA.textContent = "승인/Ask 없음";
+    a.appendChild(emptyA);
+  } else {
+    asks.forEach(x => {
+      const d = document.createElement("div");
+      d.className = "item";
+      d.innerHTML = `<div class="title">${escapeHtml(x.summary || "Ask")}</div>
+                     <div class="sub">${escapeHtml((x.data && x.data.instructions) || "")}</div>`;
+      a.appendChild(d);
+    });
+  }
+
+  // worklog
+  const w = $("worklog");
+  w.innerHTML = "";
+  const logs = (snap.worklog || []).slice(0, 20);
+  if (!logs.length) {
+    const empty = document.createElement("div");
+    empty.className = "small";
+    empty.textContent = "worklog 비어 있음";
+    w.appendChild(empty);
+    return;
+  }
+  logs.forEach(e => {
+    const d = document.createElement("div");
+    d.className = "item";
+    const title = e.event_type || (e.ui_hint && e.ui_hint.renderer) || "event";
+    const summary = e.summary || (e.payload && (e.payload.summary || e.payload.status)) || "";
+    d.innerHTML = `<div class="title">${escapeHtml(title)}</div>
+                   <div class="sub">${escapeHtml(summary)}</div>`;
+    w.appendChild(d);
+  });
+}
+
+function renderReport(r) {
+  const renderer = (r.ui_hint && r.ui_hint.renderer) || "";
+  const data = r.data || {};
+
+  if (renderer === "chat.message") {
+    addMsg(data.role === "user" ? "user" : "assistant", data.text || "");
+    return;
+  }
+
+  if (renderer === "youtube.search.results") {
+    const results = data.results || data.items || [];
+    $("ytResults").innerHTML = "";
+    if (!results.length) {
+      const empty = document.createElement("div");
+      empty.className = "small";
+      empty.textContent = "검색 결과 없음";
+      $("ytResults").appendChild(empty);
+      return;
+    }
+    results.forEach(it => {
+      const d = document.createElement("div");
+      d.className = "item";
+      d.innerHTML = `<div class="title">${escapeHtml(it.title || "")}</div>
+                     <div class="sub">${escapeHtml(it.channel || "")} • ${escapeHtml(it.duration || "")}</div>`;
+      const row = document.createElement("div");
+      row.className = "row";
+      row.style.marginTop = "6px";
+      row.appendChild(btn("Play", () => playVideo(it.video_id, 0)));
+      row.appendChild(btn("Queue", () => enqueue(it)));
+      d.appendChild(row);
+      $("ytResults").appendChild(d);
+    });
+    return;
+  }
+
+  if (renderer === "youtube.play.embed") {
+    const video_id = data.video_id || (data.queue_item ? (data.queue_item.video_id || "") : "");
+    const start = data.start_seconds || 0;
+    const url = video_id ? `https://www.youtube.com/embed/${video_id}?autoplay=1&start=${start}` : "";
+    $("ytFrame").src = url;
+    if (Array.isArray(data.queue)) {
+      saveQueue(data.queue);
+      renderQueue();
+    }
+    return;
+  }
+
+  if (renderer === "youtube.queue.updated") {
+    if (Array.isArray(data.queue)) {
+      saveQueue(data.queue);
+      renderQueue();
+    }
+    return;
+  }
+
+  if (renderer === "rag.folder.ingest.done") {
+    const r = data.result || {};
+    const errs = (r.errors || []).slice(0, 5).map(e => `${escapeHtml(e.path || "")}: ${escapeHtml(e.error || "")}`).join("<br/>");
+    $("ragResults").innerHTML = `
+      <div><b>Folder ingest</b></div>
+      <div>folder: ${escapeHtml(r.folder || "")}</div>
+      <div>ingested_chunks: ${r.ingested_chunks ?? 0} / candidates: ${r.candidates ?? 0} / skipped: ${r.skipped ?? 0}</div>
+      <div>pending_hwp: ${r.pending_hwp ?? 0}</div>
+      <div>started: ${escapeHtml(r.started_at || "")}</div>
+      <div>finished: ${escapeHtml(r.finished_at || "")}</div>
+      <div style="margin-top:6px;color:#a00">${errs}</div>
+    `;
+    return;
+  }
+
+  if (renderer === "rag.folder.status") {
+    $("ragResults").textContent = data.raw || "(no status)";
+    return;
+  }
+
+  if (renderer === "rag.query.results") {
+    renderRag(data.results || [], data.query || "");
+    return;
+  }
+
+  // Ask-style approvals (minimal)
+  if (renderer.startsWith("ask.")) {
+    const a = document.createElement("div");
+    a.className = "item";
+    a.innerHTML = `<div class="title">${escapeHtml(r.summary || "승인 필요")}</div>
+                   <div class="sub">${escapeHtml((data && data.instructions) || "")}</div>`;
+    $("approvals").prepend(a);
+    return;
+  }
+
+  // fallback to worklog
+  const w = document.createElement("div");
+  w.className = "item";
+  w.innerHTML = `<div class="title">${escapeHtml(renderer || "report")}</div>
+                 <div class="sub">${escapeHtml(r.summary || "")}</div>`;
+  $("worklog").prepend(w);
+}
+
+$("send").onclick = sendChat;
+$("msg").addEventListener("keydown", (e) => { if (e.key === "Enter") sendChat(); });
+
+$("ytClear").onclick = () => { $("ytResults").innerHTML = ""; };
+$("ytNext").onclick = playNext;
+$("ytClearQ").onclick = clearQueue;
+
+$("canvasSave").onclick = saveCanvas;
+$("canvasClear").onclick = clearCanvas;
+
+restoreApiKey();
+ensureSessionId();
+renderQueue();
+restoreCanvas();
+connectSSE();
+syncQueueFromServer();
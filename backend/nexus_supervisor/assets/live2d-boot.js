@@ -0,0 +1,63 @@
+// Live2D bootstrap for the public pages: the initial state comes from the container's
+// data-status attribute (render_live2d_component(page_state)).
+let live2dManager = null;
+
+window.addEventListener('DOMContentLoaded', () => {
+    try {
+        const container = document.getElementById('live2d-container');
+        if (!container) {
+            console.error('❌ Live2D container not found');
+            return;
+        }
+        const pageState = container.dataset.status || 'idle';
+
+        // Show loading state
+        container.classList.add('loading');
+
+        // Initialize Live2D Manager
+        setTimeout(() => {
+            try {
+                live2dManager = new Live2DManager(
+                    'live2d-container',
+                    '/live2d/haru_greeter_t05.model3.json'
+                );
+
+                // Set initial state
+                setTimeout(() => {
+                    if (live2dManager && live2dManager.model) {
+                        live2dManager.setState(pageState);
+                        container.classList.remove('loading');
+                        console.log('✅ Live2D initialized with state: ' + pageState);
+                    }
+                }, 1000);
+
+            } catch (error) {
+                console.error('❌ Live2D initialization error:', error);
+                container.classList.remove('loading');
+                container.classList.add('error');
+            }
+        }, 500);
+
+    } catch (error) {
+        console.error('❌ Live2D setup error:', error);
+    }
+});
+
+// Make globally available for state changes
+window.nexusCharacter = function() {
+    return {
+        setState: (state) => {
+            if (live2dManager) {
+                live2dManager.setState(state);
+            }
+        },
+        hide: () => {
+            const container = document.getElementById('live2d-container');
+            if (container) container.style.display = 'none';
+        },
+        show: () => {
+            const container = document.getElementById('live2d-container');
+            if (container) container.style.display = 'block';
+        }
+    };
+};
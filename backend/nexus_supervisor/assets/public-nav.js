@@ -0,0 +1,7 @@
+function toggleLanguage() {
+    const url = new URL(window.location.href);
+    const currentLang = url.searchParams.get('lang') || 'ko';
+    const newLang = currentLang === 'ko' ? 'en' : 'ko';
+    url.searchParams.set('lang', newLang);
+    window.location.href = url.toString();
+}
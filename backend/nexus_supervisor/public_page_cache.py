@@ -0,0 +1,158 @@
+"""
+Render cache for the public marketing pages (/, /intro, /pricing, /modules, /login, ...).
+
+The i18n page functions build several hundred KB of HTML per call (styles, Live2D component,
+navigation) and their output depends only on the page, the language and the data files
+(data/modules.json, data/benchmark.json). PublicPageCache renders each (page, lang) once,
+keeps the encoded bytes plus precompressed gzip (and brotli, if installed) variants, and
+serves them with a strong ETag per variant:
+
+  - If-None-Match matching the variant's ETag -> 304 without a body
+  - Accept-Encoding br / gzip -> the precompressed variant (Vary: Accept-Encoding)
+  - Cache-Control: no-cache, so browsers revalidate and mostly get 304s
+
+Entries are dropped when the mtime/size of any watched data file changes, so editing
+modules.json or benchmark.json is picked up on the next request without a restart.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+from fastapi import Response
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # optional: gzip only
+    brotli = None
+
+RenderFn = Callable[[str], str]
+
+# below this size compression saves less than the header overhead costs
+_COMPRESS_MIN_BYTES = 1024
+
+
+@dataclass(frozen=True)
+class RenderedPage:
+    body: bytes
+    etag: str
+    gzip_body: Optional[bytes] = None
+    br_body: Optional[bytes] = None
+
+    def variant(self, encoding: str) -> Tuple[bytes, str]:
+        """(bytes, etag) for a content-coding; strong ETags differ per coding (RFC 9110 8.8.3)."""
+        tag = self.etag[:-1]
+        if encoding == "br" and self.br_body is not None:
+            return self.br_body, f'{tag}-br"'
+        if encoding == "gzip" and self.gzip_body is not None:
+            return self.gzip_body, f'{tag}-gz"'
+        return self.body, self.etag
+
+
+def _accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        out[name] = q
+    return out
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # weak comparison, as required for If-None-Match
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return any(c.removeprefix("W/") == etag for c in candidates)
+
+
+class PublicPageCache:
+    """Precompiled public pages keyed by (page, lang), invalidated by data file changes."""
+
+    def __init__(self, data_files: Sequence[os.PathLike] = (), languages: Sequence[str] = ("ko",),
+                 default_lang: str = "ko", media_type: str = "text/html; charset=utf-8"):
+        self.data_files = [os.fspath(p) for p in data_files]
+        self.languages = set(languages)
+        self.default_lang = default_lang
+        self.media_type = media_type
+        self._lock = threading.Lock()
+        self._pages: Dict[Tuple[str, str], RenderedPage] = {}
+        self._version: Optional[Tuple] = None
+
+    def normalize_lang(self, lang: Optional[str]) -> str:
+        # unknown ?lang= values render the default language (and do not add cache entries)
+        lang = (lang or "").strip().lower()
+        return lang if lang in self.languages else self.default_lang
+
+    def _data_version(self) -> Tuple:
+        version = []
+        for path in self.data_files:
+            try:
+                st = os.stat(path)
+                version.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                version.append(None)
+        return tuple(version)
+
+    @staticmethod
+    def _build(html: str) -> RenderedPage:
+        body = html.encode("utf-8")
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        if len(body) < _COMPRESS_MIN_BYTES:
+            return RenderedPage(body, etag)
+        gz = gzip.compress(body, compresslevel=9, mtime=0)
+        br = brotli.compress(body, quality=11) if brotli is not None else None
+        return RenderedPage(body, etag, gz, br)
+
+    def get(self, page: str, lang: str, render: RenderFn) -> RenderedPage:
+        lang = self.normalize_lang(lang)
+        key = (page, lang)
+        version = self._data_version()
+        if version == self._version:
+            cached = self._pages.get(key)
+            if cached is not None:
+                return cached
+        with self._lock:
+            if version != self._version:
+                self._pages.clear()
+                self._version = version
+            cached = self._pages.get(key)
+            if cached is None:
+                cached = self._pages[key] = self._build(render(lang))
+            return cached
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+            self._version = None
+
+    def response(self, headers: Mapping[str, str], page: str, lang: str, render: RenderFn) -> Response:
+        """Cached page for a request's headers (If-None-Match, Accept-Encoding)."""
+        rendered = self.get(page, lang, render)
+        accepted = _accepted_encodings(headers.get("accept-encoding", ""))
+        encoding = "identity"
+        for candidate, data in (("br", rendered.br_body), ("gzip", rendered.gzip_body)):
+            if data is not None and accepted.get(candidate, 0.0) > 0:
+                encoding = candidate
+                break
+        body, etag = rendered.variant(encoding)
+        out_headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if _etag_matches(headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=out_headers)
+        if encoding != "identity":
+            out_headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type=self.media_type, headers=out_headers)
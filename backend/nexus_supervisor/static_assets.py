@@ -0,0 +1,162 @@
+"""
+Content-hashed static bundles for the server-rendered pages.
+
+The shared CSS/JS of the public pages (design system, Live2D bootstrap, language toggle,
+Live2D scripts under static/) and of /app used to be inlined into every response, so
+browsers re-downloaded it on each page. build_assets() copies every source in ASSETS to
+
+    static/dist/<name>.<sha256[:12]><ext>
+
+and writes static/dist/manifest.json ({"public.css": "dist/public.1a2b3c4d5e6f.css", ...}).
+Pages reference the hashed URLs (assets.stylesheet / assets.script), and HashedStaticFiles
+serves static/dist with `Cache-Control: public, max-age=31536000, immutable`: a changed
+source gets a new name, so a cached copy never goes stale and repeat visits only fetch
+the page HTML.
+
+Run the build at deploy time (tools/build_static_assets.py). If it did not run, the first
+page render builds the bundles; if static/ is read-only, the tags fall back to the
+unhashed /static paths or to inline <style>/<script>.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from fastapi.staticfiles import StaticFiles
+
+logger = logging.getLogger("nexus_supervisor")
+
+BACKEND_DIR = Path(__file__).parent.parent
+STATIC_DIR = BACKEND_DIR / "static"
+SOURCE_DIR = Path(__file__).parent / "assets"
+DIST = "dist"
+MANIFEST = "manifest.json"
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# logical name -> source file
+ASSETS: Dict[str, Path] = {
+    "public.css": SOURCE_DIR / "public.css",
+    "public-nav.js": SOURCE_DIR / "public-nav.js",
+    "live2d-boot.js": SOURCE_DIR / "live2d-boot.js",
+    "app.css": SOURCE_DIR / "app.css",
+    "app.js": SOURCE_DIR / "app.js",
+    "live2d.css": STATIC_DIR / "css" / "live2d.css",
+    "pixi-live2d-display.min.js": STATIC_DIR / "js" / "pixi-live2d-display.min.js",
+    "live2d-loader.js": STATIC_DIR / "js" / "live2d-loader.js",
+    "tts-manager.js": STATIC_DIR / "js" / "tts-manager.js",
+}
+
+
+def hashed_name(name: str, content: bytes) -> str:
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:12]}{ext}"
+
+
+def build_assets(static_dir: Path = STATIC_DIR, sources: Optional[Dict[str, Path]] = None) -> Dict[str, str]:
+    """Write the hashed copies and manifest.json under static_dir/dist; returns the manifest.
+
+    Files are written to a temp name and renamed, so concurrent builds (several workers
+    starting at once) never expose a partial file. Older hashed copies are kept for pages
+    still cached by clients; tools/build_static_assets.py --prune removes them.
+    """
+    dist = Path(static_dir) / DIST
+    dist.mkdir(parents=True, exist_ok=True)
+    manifest: Dict[str, str] = {}
+    for name, src in (sources or ASSETS).items():
+        content = Path(src).read_bytes()
+        out = dist / hashed_name(name, content)
+        if not out.exists():
+            tmp = out.with_name(f".{out.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(content)
+            os.replace(tmp, out)
+        manifest[name] = f"{DIST}/{out.name}"
+    tmp = dist / f".{MANIFEST}.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, dist / MANIFEST)
+    return manifest
+
+
+class StaticAssets:
+    """Manifest lookups and <link>/<script> tags for the hashed bundles."""
+
+    def __init__(self, static_dir: Path = STATIC_DIR, url_prefix: str = "/static",
+                 sources: Optional[Dict[str, Path]] = None):
+        self.static_dir = Path(static_dir)
+        self.url_prefix = url_prefix.rstrip("/")
+        self.sources = dict(sources or ASSETS)
+        self._lock = threading.Lock()
+        self._manifest: Optional[Dict[str, str]] = None
+
+    def _load(self) -> Dict[str, str]:
+        manifest = self._manifest
+        if manifest is not None:
+            return manifest
+        with self._lock:
+            if self._manifest is None:
+                try:
+                    self._manifest = build_assets(self.static_dir, self.sources)
+                except OSError as e:
+                    logger.warning(f"⚠️ static bundles not built ({e}); serving unhashed/inline assets")
+                    self._manifest = self._read_manifest()
+            return self._manifest
+
+    def _read_manifest(self) -> Dict[str, str]:
+        try:
+            with open(self.static_dir / DIST / MANIFEST, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except Exception:
+            return {}
+        # a manifest from an older build may point at copies of outdated sources
+        current = {}
+        for name, path in manifest.items():
+            src = self.sources.get(name)
+            try:
+                if src is not None and hashed_name(name, src.read_bytes()) == Path(path).name:
+                    current[name] = path
+            except OSError:
+                continue
+        return current
+
+    def reload(self) -> None:
+        with self._lock:
+            self._manifest = None
+
+    def url(self, name: str) -> Optional[str]:
+        """Hashed URL of an asset, else its unhashed /static URL, else None (inline it)."""
+        path = self._load().get(name)
+        if path:
+            return f"{self.url_prefix}/{path}"
+        src = self.sources[name]
+        try:
+            return f"{self.url_prefix}/{src.relative_to(self.static_dir).as_posix()}"
+        except ValueError:
+            return None
+
+    def stylesheet(self, name: str) -> str:
+        url = self.url(name)
+        if url:
+            return f'<link rel="stylesheet" href="{url}">'
+        return f"<style>\n{self.sources[name].read_text(encoding='utf-8')}</style>"
+
+    def script(self, name: str) -> str:
+        url = self.url(name)
+        if url:
+            return f'<script src="{url}"></script>'
+        return f"<script>\n{self.sources[name].read_text(encoding='utf-8')}</script>"
+
+
+class HashedStaticFiles(StaticFiles):
+    """StaticFiles that marks the content-hashed bundles under dist/ as immutable."""
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if Path(full_path).parent.name == DIST and Path(full_path).name != MANIFEST:
+            response.headers["Cache-Control"] = IMMUTABLE
+        return response
+
+
+assets = StaticAssets()
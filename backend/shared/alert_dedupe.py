@@ -4,8 +4,7 @@ import time
 from dataclasses import dataclass
 from typing import Optional
 
-import redis
-
+from shared.redis_client import get_redis
 from shared.settings import settings
 
 
@@ -19,7 +18,7 @@ class AlertDedupe:
     """Redis-backed dedupe to suppress repeated alerts within a cooldown window."""
 
     def __init__(self):
-        self.r = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+        self.r = get_redis(settings.redis_url)
         self.ttl = int(getattr(settings, "alert_dedupe_ttl_seconds", 900))  # default 15m
 
     def _key(self, dedupe_key: str) -> str:
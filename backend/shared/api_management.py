@@ -9,6 +9,14 @@ from typing import Any, Dict, Optional, Tuple, List
 
 from shared.settings import settings
 from shared.append_only import append_jsonl_with_chain
+from shared.logging_utils import get_logger
+
+try:
+    from shared.redis_client import get_redis, redis_available
+except Exception:  # pragma: no cover
+    get_redis = redis_available = None  # type: ignore
+
+logger = get_logger("api_management")
 
 
 @dataclass
@@ -53,6 +61,111 @@ def estimate_cost_usd(prompt_tokens: int, completion_tokens: int, *, per_1k_usd:
     return ((prompt_tokens + completion_tokens) / 1000.0) * float(per_1k_usd)
 
 
+def _quota_redis():
+    """Shared Redis client for the rate limiter / budget ledger, or None (file / in-process fallback)."""
+    if not bool(getattr(settings, "llm_quota_redis_enabled", True)):
+        return None
+    if redis_available is None or not redis_available(settings.redis_url):
+        return None
+    return get_redis(settings.redis_url)
+
+
+class BudgetLedger:
+    """Daily LLM spend shared by every worker process.
+
+    Redis-first: one float per UTC day under nexus:llm:budget:{YYYY-MM-DD} (expires two days
+    later). reserve() checks the hard limit and INCRBYFLOATs in one Lua call, so concurrent
+    reservations cannot overshoot it; adjust() INCRBYFLOATs the settlement delta, floored at 0.
+    logs/budget_state.json is used only while Redis is unreachable (single process, unlocked).
+    """
+
+    KEY_TTL_S = 2 * 86400
+
+    # KEYS: day / ARGV: amount, limit, ttl -> {allowed (0/1), projected spend}
+    _RESERVE_LUA = """
+local projected = tonumber(redis.call('GET', KEYS[1]) or '0') + tonumber(ARGV[1])
+if projected > tonumber(ARGV[2]) then
+  return {0, tostring(projected)}
+end
+local spent = redis.call('INCRBYFLOAT', KEYS[1], ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return {1, spent}
+"""
+
+    # KEYS: day / ARGV: delta, ttl -> spend after the adjustment
+    _ADJUST_LUA = """
+local spent = tonumber(redis.call('INCRBYFLOAT', KEYS[1], ARGV[1]))
+if spent < 0 then
+  spent = 0
+  redis.call('SET', KEYS[1], '0')
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return tostring(spent)
+"""
+
+    def __init__(self) -> None:
+        self._client: Any = None
+        self._reserve: Any = None
+        self._adjust: Any = None
+
+    @staticmethod
+    def _key(day_key: str) -> str:
+        return f"nexus:llm:budget:{day_key}"
+
+    def _bind(self, r: Any) -> None:
+        if self._client is not r:
+            self._reserve = r.register_script(self._RESERVE_LUA)
+            self._adjust = r.register_script(self._ADJUST_LUA)
+            self._client = r
+
+    def reserve(self, amount_usd: float, limit_usd: float) -> Tuple[bool, float]:
+        """Add amount_usd to today's spend unless that would exceed limit_usd -> (allowed, projected)."""
+        amount = max(0.0, float(amount_usd))
+        r = _quota_redis()
+        if r is not None:
+            try:
+                self._bind(r)
+                allowed, projected = self._reserve(
+                    keys=[self._key(_today_utc_key())], args=[repr(amount), repr(float(limit_usd)), self.KEY_TTL_S]
+                )
+                return bool(int(allowed)), float(projected)
+            except Exception as e:
+                logger.warning("budget reserve via redis failed (%s); using %s", e, _budget_state_path())
+        st = _load_budget_state()
+        projected = st.spent_usd + amount
+        if projected > limit_usd:
+            return False, projected
+        st.spent_usd = projected
+        _save_budget_state(st)
+        return True, projected
+
+    def adjust(self, delta_usd: float) -> float:
+        """Settle a reservation (delta may be negative); returns today's spend."""
+        r = _quota_redis()
+        if r is not None:
+            try:
+                self._bind(r)
+                return float(self._adjust(
+                    keys=[self._key(_today_utc_key())], args=[repr(float(delta_usd)), self.KEY_TTL_S]
+                ))
+            except Exception as e:
+                logger.warning("budget adjust via redis failed (%s); using %s", e, _budget_state_path())
+        st = _load_budget_state()
+        st.spent_usd = max(0.0, st.spent_usd + float(delta_usd))
+        _save_budget_state(st)
+        return st.spent_usd
+
+
+_BUDGET_LEDGER: Optional[BudgetLedger] = None
+
+
+def budget_ledger() -> BudgetLedger:
+    global _BUDGET_LEDGER
+    if _BUDGET_LEDGER is None:
+        _BUDGET_LEDGER = BudgetLedger()
+    return _BUDGET_LEDGER
+
+
 def budget_check_and_reserve(estimated_cost_usd: float) -> Tuple[bool, str]:
     """Returns (allowed, reason). Enforces soft/hard thresholds.
     - soft: allow but will annotate audit (caller should degrade behavior)
@@ -62,13 +175,10 @@ def budget_check_and_reserve(estimated_cost_usd: float) -> Tuple[bool, str]:
     soft = float(getattr(settings, "llm_budget_soft_pct", 0.8) or 0.8)
     hard = float(getattr(settings, "llm_budget_hard_pct", 1.0) or 1.0)
 
-    st = _load_budget_state()
-    projected = st.spent_usd + max(0.0, float(estimated_cost_usd))
-    if projected > daily * hard:
+    # Reserve immediately to avoid thundering herd (atomic across processes via Redis)
+    allowed, projected = budget_ledger().reserve(estimated_cost_usd, daily * hard)
+    if not allowed:
         return False, f"budget_hard_exceeded projected={projected:.2f} daily={daily:.2f}"
-    # Reserve immediately to avoid thundering herd (best-effort, single-process)
-    st.spent_usd = projected
-    _save_budget_state(st)
     if projected > daily * soft:
         return True, f"budget_soft_exceeded projected={projected:.2f} daily={daily:.2f}"
     return True, "ok"
@@ -126,20 +236,54 @@ def audit_prompt_fingerprint(prompt: str) -> str:
     return _hash_payload(prompt[:4000])
 
 class RateLimiter:
-    """Global + per-provider RPM token buckets (in-memory).
+    """Global + per-provider RPM token buckets.
+
+    Redis-first: the buckets live in Redis (nexus:llm:ratelimit:{global|p:<provider>} hashes)
+    and are refilled / consumed by one Lua call using the Redis clock, so the limits hold
+    for all worker processes together instead of per process. The in-memory TokenBuckets
+    are used only while Redis is unreachable.
 
     Env/config:
       - LLM_RATE_LIMIT_RPM: legacy fallback
       - LLM_RATE_LIMIT_RPM_GLOBAL: global bucket (default=LLM_RATE_LIMIT_RPM)
       - LLM_RATE_LIMIT_RPM_MAP: "gemini:60,anthropic:30,openai:30,glm:30"
+      - LLM_QUOTA_REDIS_ENABLED: share buckets through Redis (default true)
     """
 
+    # KEYS: buckets / ARGV: capacity_1, refill_per_s_1, capacity_2, ...
+    # Takes one token from every bucket, or from none of them -> 1 / 0
+    _TAKE_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local tokens = {}
+for i, key in ipairs(KEYS) do
+  local cap = tonumber(ARGV[2 * i - 1])
+  local st = redis.call('HMGET', key, 'tokens', 'ts')
+  local tok, ts = tonumber(st[1]), tonumber(st[2])
+  if tok == nil or ts == nil then
+    tok, ts = cap, now
+  end
+  tokens[i] = math.min(cap, tok + math.max(0, now - ts) * tonumber(ARGV[2 * i]))
+  if tokens[i] < 1 then
+    return 0
+  end
+end
+for i, key in ipairs(KEYS) do
+  local cap, rate = tonumber(ARGV[2 * i - 1]), tonumber(ARGV[2 * i])
+  redis.call('HSET', key, 'tokens', tostring(tokens[i] - 1), 'ts', tostring(now))
+  redis.call('EXPIRE', key, math.ceil(cap / rate) + 60)
+end
+return 1
+"""
+
     def __init__(self) -> None:
         legacy = int(getattr(settings, "llm_rate_limit_rpm", 60) or 60)
         self.global_rpm = int(getattr(settings, "llm_rate_limit_rpm_global", legacy) or legacy)
         self.map_str = str(getattr(settings, "llm_rate_limit_rpm_map", "") or "").strip()
         self.buckets: Dict[str, TokenBucket] = {}
         self.global_bucket = TokenBucket(self.global_rpm)
+        self._client: Any = None
+        self._take: Any = None
 
     def _rpm_for(self, provider: str) -> int:
         legacy = int(getattr(settings, "llm_rate_limit_rpm", 60) or 60)
@@ -158,26 +302,74 @@ class RateLimiter:
                 continue
         return int(m.get(provider.lower(), legacy))
 
+    @staticmethod
+    def _key(name: str) -> str:
+        return f"nexus:llm:ratelimit:{name}"
+
+    def _redis_take(self, buckets: List[Tuple[str, int]]) -> Optional[bool]:
+        """One token from each (name, rpm) bucket in Redis; None if Redis is not usable."""
+        r = _quota_redis()
+        if r is None:
+            return None
+        try:
+            if self._client is not r:
+                self._take = r.register_script(self._TAKE_LUA)
+                self._client = r
+            args: List[Any] = []
+            for _, rpm in buckets:
+                rpm = max(1, int(rpm))
+                args += [rpm, repr(rpm / 60.0)]
+            return bool(self._take(keys=[self._key(name) for name, _ in buckets], args=args))
+        except Exception as e:
+            logger.warning("rate limit via redis failed (%s); using in-process buckets", e)
+            return None
+
+    def _local_bucket(self, provider: str) -> TokenBucket:
+        if provider not in self.buckets:
+            self.buckets[provider] = TokenBucket(self._rpm_for(provider))
+        return self.buckets[provider]
+
     def allow(self, provider: Optional[str] = None) -> bool:
+        p = (provider or "").lower()
+        buckets = [("global", self.global_rpm)]
+        if p:
+            buckets.append((f"p:{p}", self._rpm_for(p)))
+        shared = self._redis_take(buckets)
+        if shared is not None:
+            return shared
         if not self.global_bucket.allow():
             return False
-        if not provider:
+        if not p:
             return True
+        return self._local_bucket(p).allow()
+
+    def allow_provider(self, provider: str) -> bool:
+        """Per-provider bucket only (the global bucket was already charged for this request)."""
         p = provider.lower()
-        if p not in self.buckets:
-            self.buckets[p] = TokenBucket(self._rpm_for(p))
-        return self.buckets[p].allow()
+        shared = self._redis_take([(f"p:{p}", self._rpm_for(p))])
+        if shared is not None:
+            return shared
+        return self._local_bucket(p).allow()
 
 
 _RATE_LIMITER: Optional[RateLimiter] = None
 
 
-def rate_limit_allow(provider: Optional[str] = None) -> bool:
-    """Compatibility: previously global only. Now supports per-provider as well."""
+def _rate_limiter() -> RateLimiter:
     global _RATE_LIMITER
     if _RATE_LIMITER is None:
         _RATE_LIMITER = RateLimiter()
-    return _RATE_LIMITER.allow(provider)
+    return _RATE_LIMITER
+
+
+def rate_limit_allow(provider: Optional[str] = None) -> bool:
+    """Compatibility: previously global only. Now supports per-provider as well."""
+    return _rate_limiter().allow(provider)
+
+
+def provider_rate_limit_allow(provider: str) -> bool:
+    """Per-provider RPM check for a request that already passed rate_limit_allow()."""
+    return _rate_limiter().allow_provider(provider)
 
 
 def budget_soft_exceeded(reason: str) -> bool:
@@ -1,20 +1,29 @@
 from __future__ import annotations
 
+import atexit
 import hashlib
+import hmac
 import json
+import logging
 import os
 import threading
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
-_LOCKS: Dict[str, threading.Lock] = {}
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore
+    import msvcrt
 
-def _lock_for(path: str) -> threading.Lock:
-    if path not in _LOCKS:
-        _LOCKS[path] = threading.Lock()
-    return _LOCKS[path]
+from shared.settings import settings
+
+logger = logging.getLogger(__name__)
+
+ZERO_HASH = "0" * 64
+# tail scanned backwards in blocks of this size when recovering the chain head
+_TAIL_BLOCK = 64 * 1024
 
-def _sidecar_path(path: str) -> str:
-    return path + ".chain"
 
 def _canonical_json(ev: Dict[str, Any]) -> str:
     # stable encoding for hashing (do not use ensure_ascii to preserve unicode deterministically)
@@ -23,22 +32,329 @@ def _canonical_json(ev: Dict[str, Any]) -> str:
 def _sha256_hex(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
 
-def _read_last_hash(sidecar: str) -> str:
-    try:
-        if not os.path.exists(sidecar):
-            return "0" * 64
-        with open(sidecar, "r", encoding="utf-8") as f:
-            h = (f.read() or "").strip()
-        if len(h) == 64:
-            return h
-    except Exception:
-        pass
-    return "0" * 64
-
-def _write_last_hash(sidecar: str, h: str) -> None:
-    os.makedirs(os.path.dirname(sidecar) or ".", exist_ok=True)
-    with open(sidecar, "w", encoding="utf-8") as f:
-        f.write(h)
+def _chain(prev: str, event: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+    ev = dict(event)
+    ev.setdefault("chain_ver", 1)
+    ev["prev_hash"] = prev
+    payload = _canonical_json({k: v for k, v in ev.items() if k != "hash"})
+    ev["hash"] = _sha256_hex(prev + "\n" + payload)
+    return ev, json.dumps(ev, ensure_ascii=False) + "\n"
+
+
+class _FileLock:
+    """Exclusive advisory lock on <path>.lock, shared by every process appending to <path>."""
+
+    def __init__(self, path: str):
+        self.path = path + ".lock"
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def __enter__(self) -> "_FileLock":
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        else:
+            os.lseek(self.fd, 0, os.SEEK_SET)
+            while True:
+                try:
+                    msvcrt.locking(self.fd, msvcrt.LK_LOCK, 1)  # retries for ~10s, then raises
+                    break
+                except OSError:
+                    continue
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self.fd, 0, os.SEEK_SET)
+            msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class _Append:
+    __slots__ = ("event", "result", "error", "done")
+
+    def __init__(self, event: Dict[str, Any]):
+        self.event = event
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+        self.done = False
+
+
+class ChainWriter:
+    """Hash-chained JSONL appender for one file, safe across threads and processes.
+
+    - chain head in memory: the previous hash is not re-read from disk per append; under
+      the file lock the writer only checks (inode, size) and rescans the file tail when
+      another process (or a rotation) changed the file since its own last write
+    - cross-process: every commit holds an exclusive lock on <path>.lock, so workers
+      appending to the same file can no longer interleave and fork the chain
+    - group commit: appends that arrive while a commit is running are written by the next
+      commit as one write(); the caller still gets its hashed record back
+    - durability: fsync every fsync_interval_s by a background thread (0 = on every commit);
+      a crash loses at most the un-fsynced OS buffers, never the chain's consistency
+    - recovery: a torn last line (crash mid-write) is truncated and the head is rebuilt
+      from the last complete record, so the file stays verifiable by verify_jsonl_chain
+
+    Use chain_writer(path) for the process-wide instance.
+    """
+
+    def __init__(self, path: str, fsync_interval_s: Optional[float] = None):
+        self.path = path
+        self.fsync_interval_s = float(
+            settings.append_only_fsync_interval_s if fsync_interval_s is None else fsync_interval_s
+        )
+        self.pid = os.getpid()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._cond = threading.Condition()
+        self._pending: List[_Append] = []
+        self._committing = False
+        self._flock = _FileLock(path)
+        self._fd: Optional[int] = None
+        self._head = ZERO_HASH
+        self._stamp: Optional[Tuple[int, int, int]] = None  # (dev, ino, size) after our last write
+        self._dirty = False
+
+    # ---- public API ----
+    def append(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        item = _Append(event)
+        with self._cond:
+            self._pending.append(item)
+            while not item.done and self._committing:
+                self._cond.wait()
+            if item.done:
+                return self._result(item)
+            self._committing = True
+            batch, self._pending = self._pending, []
+        try:
+            self._commit(batch)
+        except BaseException as e:
+            for a in batch:
+                if a.error is None:
+                    a.error = e
+        finally:
+            with self._cond:
+                for a in batch:
+                    a.done = True
+                self._committing = False
+                self._cond.notify_all()
+        return self._result(item)
+
+    def fsync(self) -> None:
+        with self._cond:
+            fd, dirty = self._fd, self._dirty
+            self._dirty = False
+        if fd is None or not dirty:
+            return
+        try:
+            os.fsync(fd)
+        except BaseException:
+            self._dirty = True
+            raise
+
+    def close(self) -> None:
+        _flusher.unregister(self)
+        try:
+            self.fsync()
+        except OSError as e:
+            logger.warning("append_only: fsync %s on close failed: %s", self.path, e)
+        with self._cond:
+            while self._committing:
+                self._cond.wait()
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            self._flock.close()
+
+    @property
+    def head(self) -> str:
+        return self._head
+
+    # ---- internals ----
+    @staticmethod
+    def _result(item: _Append) -> Dict[str, Any]:
+        if item.error is not None:
+            raise item.error
+        assert item.result is not None
+        return item.result
+
+    def _commit(self, batch: List[_Append]) -> None:
+        with self._flock:
+            fd = self._open()
+            st = os.fstat(fd)
+            if self._stamp != (st.st_dev, st.st_ino, st.st_size):
+                self._head = self._recover(st.st_size)
+            head = self._head
+            lines = []
+            for a in batch:
+                # one bad event (e.g. not JSON-serializable) fails only its own caller
+                try:
+                    ev, line = _chain(head, a.event)
+                except Exception as e:
+                    a.error = e
+                    continue
+                a.result, head = ev, ev["hash"]
+                lines.append(line)
+            if not lines:
+                return
+            data = "".join(lines).encode("utf-8")
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            self._head = head
+            st = os.fstat(fd)
+            self._stamp = (st.st_dev, st.st_ino, st.st_size)
+            self._dirty = True
+            if self.fsync_interval_s <= 0:
+                os.fsync(fd)
+                self._dirty = False
+            else:
+                _flusher.register(self)
+
+    def _open(self) -> int:
+        # (re)open when the file was rotated away or deleted since the last commit
+        if self._fd is not None:
+            try:
+                cur = os.stat(self.path)
+                own = os.fstat(self._fd)
+                if (cur.st_dev, cur.st_ino) == (own.st_dev, own.st_ino):
+                    return self._fd
+            except FileNotFoundError:
+                pass
+            os.close(self._fd)
+            self._fd = None
+            self._stamp = None
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        return self._fd
+
+    def _recover(self, size: int) -> str:
+        """Chain head from the file tail (caller holds the file lock); truncates a torn last line."""
+        if size == 0:
+            return ZERO_HASH
+        with open(self.path, "rb+") as f:
+            f.seek(size - 1)
+            if f.read(1) != b"\n":
+                # the last record has no newline: the write that produced it never completed
+                cut = self._last_newline(f, size) + 1
+                f.seek(cut)
+                torn = f.read(min(size - cut, 200))
+                logger.warning("append_only: truncating %d torn bytes at the end of %s: %r", size - cut, self.path, torn)
+                f.truncate(cut)
+                size = cut
+            end, carry = size, b""
+            while end > 0:
+                start = max(0, end - _TAIL_BLOCK)
+                f.seek(start)
+                lines = (f.read(end - start) + carry).split(b"\n")
+                carry = lines.pop(0) if start > 0 else b""  # may continue in the previous block
+                for line in reversed(lines):
+                    h = self._hash_of(line)
+                    if h:
+                        return h
+                end = start
+        logger.warning("append_only: no chained record found in %s; starting a new chain", self.path)
+        return ZERO_HASH
+
+    @staticmethod
+    def _last_newline(f: Any, size: int) -> int:
+        end = size
+        while end > 0:
+            start = max(0, end - _TAIL_BLOCK)
+            f.seek(start)
+            i = f.read(end - start).rfind(b"\n")
+            if i >= 0:
+                return start + i
+            end = start
+        return -1
+
+    @staticmethod
+    def _hash_of(line: bytes) -> str:
+        line = line.strip()
+        if not line:
+            return ""
+        try:
+            h = str(json.loads(line).get("hash") or "")
+        except Exception:
+            return ""
+        return h if len(h) == 64 else ""
+
+
+class _Flusher:
+    """Background thread that fsyncs dirty writers every fsync_interval_s."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._writers: Dict[int, ChainWriter] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, writer: ChainWriter) -> None:
+        if id(writer) in self._writers:
+            return
+        with self._lock:
+            self._writers[id(writer)] = writer
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="append-only-fsync", daemon=True)
+                self._thread.start()
+
+    def unregister(self, writer: ChainWriter) -> None:
+        with self._lock:
+            self._writers.pop(id(writer), None)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                writers = list(self._writers.values())
+            time.sleep(max(0.01, min((w.fsync_interval_s for w in writers), default=1.0)))
+            for w in writers:
+                try:
+                    w.fsync()
+                except Exception as e:
+                    logger.warning("append_only: fsync %s failed: %s", w.path, e)
+
+
+_flusher = _Flusher()
+_writers_lock = threading.Lock()
+_writers: Dict[str, ChainWriter] = {}
+
+
+def chain_writer(path: str) -> ChainWriter:
+    """Process-wide ChainWriter for path."""
+    key = os.path.abspath(path)
+    w = _writers.get(key)
+    if w is not None and w.pid == os.getpid():
+        return w
+    with _writers_lock:
+        w = _writers.get(key)
+        if w is None or w.pid != os.getpid():
+            w = _writers[key] = ChainWriter(path)
+        return w
+
+
+def close_all() -> None:
+    """fsync and close every writer (process exit)."""
+    with _writers_lock:
+        writers = [w for w in _writers.values() if w.pid == os.getpid()]
+        _writers.clear()
+    for w in writers:
+        w.close()
+
+
+def _after_fork_in_child() -> None:
+    # the parent's descriptors share lock ownership with the child: never reuse them
+    global _flusher, _writers_lock
+    _writers.clear()
+    _writers_lock = threading.Lock()
+    _flusher = _Flusher()
+
+
+atexit.register(close_all)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
 
 def append_jsonl_with_chain(path: str, event: Dict[str, Any]) -> Dict[str, Any]:
     """Append event to JSONL file with an append-only hash chain.
@@ -47,60 +363,77 @@ def append_jsonl_with_chain(path: str, event: Dict[str, Any]) -> Dict[str, Any]:
       - chain_ver: 1
       - prev_hash: sha256 of previous record
       - hash: sha256(prev_hash + "\n" + canonical_json)
-    Sidecar: <path>.chain holds the last hash for efficient append.
+    Written through the process-wide ChainWriter for path (cross-process lock, group
+    commit, interval fsync, chain head recovered from the file tail).
 
     NOTE:
       - Not a full WORM guarantee, but provides tamper-evidence and lightweight verification.
     """
-    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
-    sidecar = _sidecar_path(path)
-    lk = _lock_for(path)
-    with lk:
-        prev = _read_last_hash(sidecar)
-        ev = dict(event)
-        ev.setdefault("chain_ver", 1)
-        ev["prev_hash"] = prev
-        payload = _canonical_json({k: v for k, v in ev.items() if k != "hash"})
-        h = _sha256_hex(prev + "\n" + payload)
-        ev["hash"] = h
-        with open(path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(ev, ensure_ascii=False) + "\n")
-        _write_last_hash(sidecar, h)
-        return ev
+    return chain_writer(path).append(event)
 
-def verify_jsonl_chain(path: str) -> Dict[str, Any]:
-    """Verify chain of <path>. Returns summary."""
+def verify_range(path: str, start: int = 0, end: Optional[int] = None, prev_hash: str = ZERO_HASH,
+                 line_no: int = 0, checkpoint_every: int = 0) -> Dict[str, Any]:
+    """Verify the records in bytes [start, end) of path, chained from prev_hash.
+
+    start must be a line boundary; line_no is the number of lines before it (for error
+    line numbers). Returns {ok, count, errors, last_hash, offset, line, checkpoints}:
+    offset/line are where verification stopped. With checkpoint_every > 0, checkpoints
+    lists (offset, line, count, hash) roughly every checkpoint_every bytes while the range
+    is still error-free (chain_checkpoint stores them).
+    """
     ok = True
-    errors = []
+    errors: List[Dict[str, Any]] = []
     count = 0
-    last = "0" * 64
-    if not os.path.exists(path):
-        return {"ok": False, "count": 0, "errors": [{"line": 0, "error": "missing_file"}]}
-    with open(path, "r", encoding="utf-8") as f:
-        for idx, line in enumerate(f, 1):
-            line = line.strip()
+    last = prev_hash
+    checkpoints: List[Tuple[int, int, int, str]] = []
+    pos = start
+    next_checkpoint = start + checkpoint_every
+    with open(path, "rb") as f:
+        f.seek(start)
+        while end is None or pos < end:
+            raw = f.readline()
+            if not raw:
+                break
+            pos += len(raw)
+            line_no += 1
+            line = raw.strip()
             if not line:
                 continue
             try:
-                ev = json.loads(line)
+                ev = json.loads(line.decode("utf-8"))
             except Exception as e:
                 ok = False
-                errors.append({"line": idx, "error": f"json_parse:{e}"})
+                errors.append({"line": line_no, "error": f"json_parse:{e}"})
                 continue
-            prev_hash = str(ev.get("prev_hash") or "")
+            prev = str(ev.get("prev_hash") or "")
             h = str(ev.get("hash") or "")
-            if len(prev_hash) != 64 or len(h) != 64:
+            if len(prev) != 64 or len(h) != 64:
                 ok = False
-                errors.append({"line": idx, "error": "missing_hash_fields"})
+                errors.append({"line": line_no, "error": "missing_hash_fields"})
                 continue
-            if prev_hash != last:
+            if prev != last:
                 ok = False
-                errors.append({"line": idx, "error": "prev_hash_mismatch"})
+                errors.append({"line": line_no, "error": "prev_hash_mismatch"})
             payload = _canonical_json({k: v for k, v in ev.items() if k != "hash"})
-            expected = _sha256_hex(prev_hash + "\n" + payload)
-            if not hashlib.compare_digest(expected, h):
+            expected = _sha256_hex(prev + "\n" + payload)
+            if not hmac.compare_digest(expected, h):
                 ok = False
-                errors.append({"line": idx, "error": "hash_mismatch"})
+                errors.append({"line": line_no, "error": "hash_mismatch"})
             last = h
             count += 1
-    return {"ok": ok, "count": count, "errors": errors[:20], "last_hash": last}
+            if checkpoint_every > 0 and ok and pos >= next_checkpoint and raw.endswith(b"\n"):
+                checkpoints.append((pos, line_no, count, last))
+                next_checkpoint = pos + checkpoint_every
+    return {"ok": ok, "count": count, "errors": errors, "last_hash": last, "offset": pos, "line": line_no,
+            "checkpoints": checkpoints}
+
+def verify_jsonl_chain(path: str) -> Dict[str, Any]:
+    """Verify chain of <path>. Returns summary.
+
+    Re-hashes the whole file; shared.chain_checkpoint.verify_chain_checkpointed resumes
+    from signed checkpoints instead.
+    """
+    if not os.path.exists(path):
+        return {"ok": False, "count": 0, "errors": [{"line": 0, "error": "missing_file"}]}
+    res = verify_range(path)
+    return {"ok": res["ok"], "count": res["count"], "errors": res["errors"][:20], "last_hash": res["last_hash"]}
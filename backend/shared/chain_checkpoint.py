@@ -0,0 +1,259 @@
+"""
+Incremental verification of hash-chained JSONL logs (shared.append_only) via signed checkpoints.
+
+verify_jsonl_chain re-hashes a log from line 1, which takes minutes once llm_audit.jsonl
+reaches gigabytes. verify_chain_checkpointed records checkpoints next to the log:
+
+  <path>.checkpoints.jsonl, one JSON object per line:
+    {"v": 1, "file": "llm_audit.jsonl", "first": "<hash of the first record>", "line": 120000,
+     "offset": 73400320, "count": 120000, "hash": "<hash of the record ending at offset>",
+     "ts": ..., "sig": "<hmac>"}
+
+first ties a checkpoint to one incarnation of the log: after a rotation the new file starts
+with a different record, so the old checkpoints are ignored rather than reported.
+
+sig is HMAC-SHA256 over the canonical JSON of the other fields, keyed by
+APPEND_ONLY_CHECKPOINT_KEY (falls back to WORM_MANIFEST_HMAC_KEY). A checkpoint is trusted
+only if its signature verifies and the record that ends at its byte offset still carries
+its hash. A run then seeks to the newest trusted checkpoint and verifies only the bytes
+appended since, writing new checkpoints every checkpoint_every bytes of verified,
+error-free records.
+
+Resuming trusts everything before the checkpoint; full=True (or the periodic
+`--full --workers N` run of tools/verify_append_only_chain.py) re-verifies the whole file,
+with workers > 1 splitting the file at line boundaries across processes. Each segment is
+chained from the record just before it, which the previous segment verifies, so the merged
+result is the same as a sequential run (and needs no checkpoints).
+
+Without a key, no checkpoints are read or written and every run is a full verification.
+"""
+
+from __future__ import annotations
+
+import hmac
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from shared.append_only import _TAIL_BLOCK, ZERO_HASH, ChainWriter, _canonical_json, verify_range
+from shared.settings import settings
+
+CHECKPOINT_VERSION = 1
+DEFAULT_CHECKPOINT_EVERY = 8 * 1024 * 1024
+
+
+def checkpoint_path(path: str) -> str:
+    return path + ".checkpoints.jsonl"
+
+
+def checkpoint_key() -> str:
+    return str(settings.append_only_checkpoint_key or settings.worm_manifest_hmac_key or "")
+
+
+def _sign(key: str, record: Dict[str, Any]) -> str:
+    payload = _canonical_json({k: v for k, v in record.items() if k != "sig"})
+    return hmac.new(key.encode("utf-8"), payload.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def _chained_hash(line: bytes) -> str:
+    """hash of a line verify_range would chain from ("" if it skips the line)."""
+    line = line.strip()
+    if not line:
+        return ""
+    try:
+        ev = json.loads(line)
+        h, prev = str(ev.get("hash") or ""), str(ev.get("prev_hash") or "")
+    except Exception:
+        return ""
+    return h if len(h) == 64 and len(prev) == 64 else ""
+
+
+def _head_before(path: str, offset: int, floor: int = 0) -> str:
+    """Chain head at line boundary offset: hash of the last chained record in [floor, offset)."""
+    with open(path, "rb") as f:
+        end, carry = offset, b""
+        while end > floor:
+            start = max(floor, end - _TAIL_BLOCK)
+            f.seek(start)
+            lines = (f.read(end - start) + carry).split(b"\n")
+            carry = lines.pop(0) if start > floor else b""
+            for line in reversed(lines):
+                h = _chained_hash(line)
+                if h:
+                    return h
+            end = start
+    return ""
+
+
+def _anchored(path: str, offset: int, expected_hash: str) -> bool:
+    """True if offset is a line boundary and the record ending there carries expected_hash."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset - 1)
+            if f.read(1) != b"\n":
+                return False
+        return _head_before(path, offset) == expected_hash
+    except OSError:
+        return False
+
+
+def _genesis(path: str) -> str:
+    """hash of the first record; tells a rotated/recreated log apart from a rewritten one."""
+    try:
+        with open(path, "rb") as f:
+            return _chained_hash(f.readline())
+    except OSError:
+        return ""
+
+
+def _complete_end(path: str, size: int) -> int:
+    """Offset just past the last newline within the first size bytes (an append may be in flight)."""
+    if size == 0:
+        return 0
+    with open(path, "rb") as f:
+        return ChainWriter._last_newline(f, size) + 1
+
+
+def load_checkpoints(path: str, key: str) -> List[Dict[str, Any]]:
+    """Correctly signed checkpoints of this log (same file name and first record), ascending by offset.
+
+    Whether each one still matches the file is up to the caller (_anchored).
+    """
+    if not key:
+        return []
+    name, genesis = os.path.basename(path), _genesis(path)
+    try:
+        with open(checkpoint_path(path), "r", encoding="utf-8") as f:
+            lines = f.readlines()
+    except OSError:
+        return []
+    by_offset: Dict[int, Dict[str, Any]] = {}
+    for raw in lines:
+        try:
+            cp = json.loads(raw)
+        except ValueError:
+            continue
+        if not isinstance(cp, dict) or cp.get("v") != CHECKPOINT_VERSION or cp.get("file") != name:
+            continue
+        if not hmac.compare_digest(str(cp.get("sig") or ""), _sign(key, cp)):
+            continue
+        if cp.get("first") != genesis or int(cp.get("offset") or 0) <= 0:
+            continue
+        by_offset[int(cp["offset"])] = cp  # a later record for the same offset wins
+    return [by_offset[o] for o in sorted(by_offset)]
+
+
+def _write_checkpoints(path: str, key: str, found: List[Tuple[int, int, int, str]], after: int) -> int:
+    """Append signed records for the (offset, line, count, hash) candidates past offset after."""
+    found = [c for c in found if c[0] > after]
+    if not key or not found:
+        return 0
+    name, genesis = os.path.basename(path), _genesis(path)
+    ts = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    out = []
+    for offset, line, count, h in found:
+        cp = {"v": CHECKPOINT_VERSION, "file": name, "first": genesis, "line": line, "offset": offset,
+              "count": count, "hash": h, "ts": ts}
+        cp["sig"] = _sign(key, cp)
+        out.append(json.dumps(cp, sort_keys=True) + "\n")
+    with open(checkpoint_path(path), "a", encoding="utf-8") as f:
+        f.write("".join(out))
+    return len(out)
+
+
+def _verify_segment(args: Tuple[str, int, int, str, int]) -> Dict[str, Any]:
+    path, start, end, prev, every = args
+    return verify_range(path, start, end, prev, 0, every)
+
+
+def _verify_parallel(path: str, end: int, workers: int, every: int) -> Dict[str, Any]:
+    """verify_range(path, 0, end) split at line boundaries across worker processes.
+
+    Each segment starts from the head the records before it leave (read back from the file);
+    since the previous segment ends on that same record, the merged result equals a
+    sequential run. Error and checkpoint line numbers are shifted by the preceding segments.
+    """
+    step = max(_TAIL_BLOCK, end // (workers * 4) + 1)
+    bounds = [0]
+    with open(path, "rb") as f:
+        while bounds[-1] + step < end:
+            f.seek(bounds[-1] + step)
+            f.readline()
+            if f.tell() >= end:
+                break
+            bounds.append(f.tell())
+    bounds.append(end)
+    heads = [ZERO_HASH]
+    for at, floor in zip(bounds[1:-1], bounds[:-2]):
+        heads.append(_head_before(path, at, floor) or heads[-1])
+    jobs = [(path, bounds[i], bounds[i + 1], heads[i], every) for i in range(len(bounds) - 1)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(_verify_segment, jobs))
+    res: Dict[str, Any] = {"ok": True, "count": 0, "errors": [], "last_hash": ZERO_HASH, "checkpoints": []}
+    lines = 0
+    for part in parts:
+        res["errors"].extend({**e, "line": e["line"] + lines} for e in part["errors"])
+        if res["ok"]:
+            res["checkpoints"].extend((o, ln + lines, c + res["count"], h) for o, ln, c, h in part["checkpoints"])
+        res["ok"] = res["ok"] and part["ok"]
+        res["count"] += part["count"]
+        res["last_hash"] = part["last_hash"]
+        lines += part["line"]
+    return res
+
+
+def verify_chain_checkpointed(
+    path: str,
+    key: Optional[str] = None,
+    full: bool = False,
+    workers: int = 1,
+    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+) -> Dict[str, Any]:
+    """Verify the chain of <path>, resuming from the newest trusted checkpoint.
+
+    Returns verify_jsonl_chain's {ok, count, errors, last_hash} (count covers the whole log)
+    plus verified (records hashed by this run), resumed_from_line, checkpoints_written and
+    pending_bytes (a trailing line still being written, left for the next run).
+    key defaults to checkpoint_key(); full re-verifies from the start (workers > 1 implies it).
+    """
+    if not os.path.exists(path):
+        return {"ok": False, "count": 0, "errors": [{"line": 0, "error": "missing_file"}]}
+    key = checkpoint_key() if key is None else key
+    size = os.path.getsize(path)
+    end = _complete_end(path, size)
+    every = checkpoint_every if key else 0
+    checkpoints = load_checkpoints(path, key)
+    errors: List[Dict[str, Any]] = []
+
+    base: Optional[Dict[str, Any]] = None
+    for cp in reversed(checkpoints):
+        if cp["offset"] <= end and _anchored(path, cp["offset"], cp["hash"]):
+            base = cp
+            break
+        # signed for this very log, but the record it vouches for is gone: rewritten in place
+        errors.append({"line": cp["line"], "error": "checkpoint_mismatch"})
+    newest = checkpoints[-1]["offset"] if checkpoints else 0
+
+    if full or workers > 1 or base is None:
+        res = _verify_parallel(path, end, workers, every) if workers > 1 else verify_range(path, 0, end, checkpoint_every=every)
+        base_line = base_count = 0
+    else:
+        base_line, base_count = int(base["line"]), int(base["count"])
+        res = verify_range(path, base["offset"], end, base["hash"], base_line, every)
+        res["checkpoints"] = [(o, ln, c + base_count, h) for o, ln, c, h in res["checkpoints"]]
+
+    ok = res["ok"] and not errors
+    errors = sorted(errors + res["errors"], key=lambda e: e["line"])
+    return {
+        "ok": ok,
+        "count": base_count + res["count"],
+        "errors": errors[:20],
+        "last_hash": res["last_hash"],
+        "verified": res["count"],
+        "resumed_from_line": base_line,
+        "checkpoints_written": _write_checkpoints(path, key, res["checkpoints"], newest) if ok else 0,
+        "pending_bytes": size - end,
+    }
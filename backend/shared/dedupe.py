@@ -10,9 +10,9 @@ from shared.settings import settings
 from shared.metrics import llm_dedupe_hits_total, llm_dedupe_sets_total
 
 try:
-    import redis  # type: ignore
+    from shared.redis_client import get_redis, redis_available
 except Exception:  # pragma: no cover
-    redis = None  # type: ignore
+    get_redis = redis_available = None  # type: ignore
 
 
 @dataclass
@@ -35,12 +35,9 @@ class DedupeStore:
         self.ttl_map = str(getattr(settings, "llm_dedupe_ttl_map", "") or "").strip()
         self.enabled = bool(getattr(settings, "llm_dedupe_enabled", True))
         self._redis = None
-        if redis is not None:
-            try:
-                self._redis = redis.Redis.from_url(settings.redis_url, decode_responses=True)
-                self._redis.ping()
-            except Exception:
-                self._redis = None
+        # shared pool; connectivity is checked once per process (cached PING), not per instance
+        if redis_available is not None and redis_available(settings.redis_url):
+            self._redis = get_redis(settings.redis_url)
         self._file_path = "logs/dedupe_cache.json"
 
     def _rkey(self, k: str) -> str:
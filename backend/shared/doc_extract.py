@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import os
 import re
+import xml.etree.ElementTree as ET
+import zipfile
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import IO, Any, Dict, Iterable, Iterator, List
 
 from PyPDF2 import PdfReader
-from docx import Document as DocxDocument
 from pptx import Presentation
 from openpyxl import load_workbook
 
@@ -32,86 +33,154 @@ def _clean(text: str) -> str:
     return text.strip()
 
 
-def _split_text(text: str, max_chars: int) -> List[str]:
-    text = text or ""
-    if len(text) <= max_chars:
-        return [text]
+class _LinePacker:
+    """Packs lines into parts of at most max_chars (joined with newlines), as they arrive.
+
+    Blank lines are dropped and a single line longer than max_chars is hard-split, so memory is
+    bounded by one part regardless of document size.
+    """
 
-    parts: List[str] = []
-    buf: List[str] = []
-    size = 0
-    for line in text.splitlines():
+    def __init__(self, max_chars: int):
+        self.max_chars = max(1, int(max_chars))
+        self._buf: List[str] = []
+        self._size = 0
+
+    def _emit(self, part: str) -> Iterator[str]:
+        if len(part) <= self.max_chars:
+            yield part
+        else:
+            for i in range(0, len(part), self.max_chars):
+                yield part[i:i + self.max_chars]
+
+    def feed(self, line: str) -> Iterator[str]:
         line = (line or "").strip()
         if not line:
-            continue
-        if size + len(line) + 1 > max_chars and buf:
-            parts.append("\n".join(buf))
-            buf = [line]
-            size = len(line)
+            return
+        if self._size + len(line) + 1 > self.max_chars and self._buf:
+            yield from self._emit("\n".join(self._buf))
+            self._buf = [line]
+            self._size = len(line)
         else:
-            buf.append(line)
-            size += len(line) + 1
-    if buf:
-        parts.append("\n".join(buf))
-
-    out: List[str] = []
-    for p in parts:
-        if len(p) <= max_chars:
-            out.append(p)
-        else:
-            for i in range(0, len(p), max_chars):
-                out.append(p[i:i + max_chars])
-    return out
+            self._buf.append(line)
+            self._size += len(line) + 1
 
+    def close(self) -> Iterator[str]:
+        if self._buf:
+            yield from self._emit("\n".join(self._buf))
+            self._buf = []
+            self._size = 0
 
-def extract_chunks(path: str, *, max_chars: int = 12000, xlsx_cell_limit: int = 20000) -> List[DocChunk]:
-    """Extract text chunks from local files for RAG ingestion."""
+
+def _pack_lines(lines: Iterable[str], max_chars: int) -> Iterator[str]:
+    packer = _LinePacker(max_chars)
+    for line in lines:
+        yield from packer.feed(line)
+    yield from packer.close()
+
+
+def _split_text(text: str, max_chars: int) -> List[str]:
+    text = text or ""
+    if len(text) <= max_chars:
+        return [text]
+    return list(_pack_lines(text.splitlines(), max_chars))
+
+
+def _read_lines(f: IO[str], max_chars: int) -> Iterator[str]:
+    # readline(limit) keeps a newline-free (e.g. minified) file from being read in one piece
+    return iter(lambda: f.readline(max(1, max_chars)), "")
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_TEXT = {_W + "t": None, _W + "tab": "\t", _W + "ptab": "\t", _W + "br": "\n", _W + "cr": "\n", _W + "noBreakHyphen": "-"}
+
+
+def _docx_paragraphs(path: str) -> Iterator[str]:
+    """Body-level paragraph texts of a .docx (what Document.paragraphs yields), via iterparse.
+
+    python-docx builds the whole document tree; this keeps one paragraph at a time.
+    """
+    with zipfile.ZipFile(path) as zf, zf.open("word/document.xml") as fh:
+        body = None
+        depth = 0
+        open_ps = 0
+        in_body_p = False
+        parts: List[str] = []
+        for event, el in ET.iterparse(fh, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if depth == 2 and el.tag == _W + "body":
+                    body = el
+                elif el.tag == _W + "p":
+                    open_ps += 1
+                    if depth == 3 and body is not None:
+                        in_body_p = True
+                continue
+            depth -= 1
+            # text directly in the body paragraph (not in a text box paragraph nested inside it)
+            if in_body_p and open_ps == 1 and el.tag in _W_TEXT:
+                fixed = _W_TEXT[el.tag]
+                parts.append((el.text or "") if fixed is None else fixed)
+            elif el.tag == _W + "p":
+                open_ps -= 1
+            if depth == 2 and body is not None:
+                if in_body_p:
+                    yield "".join(parts)
+                    parts = []
+                    in_body_p = False
+                # finished a body child: drop it so the tree never holds more than one block
+                body.remove(el)
+
+
+def iter_chunks(path: str, *, max_chars: int = 12000, xlsx_cell_limit: int = 20000) -> Iterator[DocChunk]:
+    """Extract text chunks from local files for RAG ingestion, yielding each as soon as it is full.
+
+    Files are read line by line / page by page / paragraph by paragraph / row by row, so memory
+    stays around one chunk plus the parser's own state instead of the whole document text.
+    """
     ext = os.path.splitext(path)[1].lower().lstrip(".")
 
     if ext in ("txt", "md", "markdown", "log"):
         with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            raw = (f.read() or "").strip()
-        chunks: List[DocChunk] = []
-        for i, part in enumerate(_split_text(raw, max_chars), start=1):
-            t = _clean(part)
-            if not t:
-                continue
-            chunks.append(DocChunk(chunk_id=f"chunk{i}", text=t, meta={"type": ext, "part": i}))
-        return chunks
-
-    if ext == "pdf":
-        reader = PdfReader(path)
-        chunks: List[DocChunk] = []
-        for pnum, page in enumerate(reader.pages, start=1):
-            try:
-                txt = (page.extract_text() or "").strip()
-            except Exception:
-                txt = ""
-            if not txt:
-                continue
-            for j, part in enumerate(_split_text(txt, max_chars), start=1):
+            for i, part in enumerate(_pack_lines(_read_lines(f, max_chars), max_chars), start=1):
                 t = _clean(part)
                 if not t:
                     continue
-                chunks.append(DocChunk(chunk_id=f"p{pnum}-c{j}", text=t, meta={"type": "pdf", "page": pnum, "chunk": j}))
-        return chunks
+                yield DocChunk(chunk_id=f"chunk{i}", text=t, meta={"type": ext, "part": i})
+        return
+
+    if ext == "pdf":
+        # a file object (not the path) keeps PdfReader from loading the whole file into memory
+        with open(path, "rb") as fh:
+            reader = PdfReader(fh)
+            for pnum, page in enumerate(reader.pages, start=1):
+                try:
+                    txt = (page.extract_text() or "").strip()
+                except Exception:
+                    txt = ""
+                # PdfReader caches every object it resolves (content streams included); drop them per page
+                cache = getattr(reader, "resolved_objects", None)
+                if isinstance(cache, dict):
+                    cache.clear()
+                if not txt:
+                    continue
+                for j, part in enumerate(_split_text(txt, max_chars), start=1):
+                    t = _clean(part)
+                    if not t:
+                        continue
+                    yield DocChunk(chunk_id=f"p{pnum}-c{j}", text=t, meta={"type": "pdf", "page": pnum, "chunk": j})
+            return
 
     if ext == "docx":
-        doc = DocxDocument(path)
-        paras = [(p.text or "").strip() for p in doc.paragraphs]
-        paras = [p for p in paras if p]
-        buf = "\n".join(paras).strip()
-        chunks: List[DocChunk] = []
-        for i, part in enumerate(_split_text(buf, max_chars), start=1):
+        lines = (ln for para in _docx_paragraphs(path) for ln in para.splitlines())
+        for i, part in enumerate(_pack_lines(lines, max_chars), start=1):
             t = _clean(part)
             if not t:
                 continue
-            chunks.append(DocChunk(chunk_id=f"chunk{i}", text=t, meta={"type": "docx", "chunk": i}))
-        return chunks
+            yield DocChunk(chunk_id=f"chunk{i}", text=t, meta={"type": "docx", "chunk": i})
+        return
 
     if ext == "pptx":
         pres = Presentation(path)
-        chunks: List[DocChunk] = []
         for sidx, slide in enumerate(pres.slides, start=1):
             texts: List[str] = []
             for shape in slide.shapes:
@@ -124,35 +193,38 @@ def extract_chunks(path: str, *, max_chars: int = 12000, xlsx_cell_limit: int =
                 t = _clean(part)
                 if not t:
                     continue
-                chunks.append(DocChunk(chunk_id=f"s{sidx}-c{j}", text=t, meta={"type": "pptx", "slide": sidx, "chunk": j}))
-        return chunks
+                yield DocChunk(chunk_id=f"s{sidx}-c{j}", text=t, meta={"type": "pptx", "slide": sidx, "chunk": j})
+        return
 
     if ext in ("xlsx", "xlsm", "xltx", "xltm"):
         wb = load_workbook(path, read_only=True, data_only=True)
-        chunks: List[DocChunk] = []
-        for name in wb.sheetnames:
-            ws = wb[name]
-            lines: List[str] = []
-            cells = 0
-            for row in ws.iter_rows(values_only=True):
-                row_vals = ["" if v is None else str(v) for v in row]
-                line = "\t".join(row_vals).strip()
-                if line:
-                    lines.append(line)
-                cells += len(row_vals)
-                if cells >= xlsx_cell_limit:
-                    break
-            body = "\n".join(lines).strip()
-            if not body:
-                continue
-            for j, part in enumerate(_split_text(body, max_chars), start=1):
-                t = _clean(part)
-                if not t:
-                    continue
-                chunks.append(DocChunk(chunk_id=f"{name}-c{j}", text=t, meta={"type": "xlsx", "sheet": name, "chunk": j}))
-        return chunks
+        try:
+            for name in wb.sheetnames:
+                for j, part in enumerate(_pack_lines(_xlsx_rows(wb[name], xlsx_cell_limit), max_chars), start=1):
+                    t = _clean(part)
+                    if not t:
+                        continue
+                    yield DocChunk(chunk_id=f"{name}-c{j}", text=t, meta={"type": "xlsx", "sheet": name, "chunk": j})
+        finally:
+            wb.close()
+        return
 
     if ext == "hwp":
         raise HwpConversionRequired("HWP requires external conversion to text or PDF before ingest.")
 
     raise ValueError(f"Unsupported file type: {ext}")
+
+
+def _xlsx_rows(ws: Any, cell_limit: int) -> Iterator[str]:
+    cells = 0
+    for row in ws.iter_rows(values_only=True):
+        row_vals = ["" if v is None else str(v) for v in row]
+        yield "\t".join(row_vals)
+        cells += len(row_vals)
+        if cells >= cell_limit:
+            return
+
+
+def extract_chunks(path: str, *, max_chars: int = 12000, xlsx_cell_limit: int = 20000) -> List[DocChunk]:
+    """Extract text chunks from local files for RAG ingestion (materialized iter_chunks)."""
+    return list(iter_chunks(path, max_chars=max_chars, xlsx_cell_limit=xlsx_cell_limit))
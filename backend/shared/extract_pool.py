@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import collections
+import multiprocessing as mp
+import time
+from dataclasses import dataclass, field
+from multiprocessing import connection
+from typing import Any, Deque, List, Optional, Tuple
+
+from shared.doc_extract import DocChunk, HwpConversionRequired, iter_chunks
+from shared.logging_utils import get_logger
+
+logger = get_logger("extract_pool")
+
+
+@dataclass
+class ExtractResult:
+    key: Any
+    chunks: List[DocChunk] = field(default_factory=list)
+    # None on success; otherwise HWP_CONVERSION_REQUIRED / EXTRACT_FAILED / EXTRACT_TIMEOUT / WORKER_DIED
+    error: Optional[str] = None
+    detail: str = ""
+    seconds: float = 0.0  # extraction time of the whole file, set on the final result
+    # False for an intermediate batch of chunks; every file ends with exactly one done=True result
+    done: bool = True
+
+
+def _classify(e: BaseException) -> str:
+    return "HWP_CONVERSION_REQUIRED" if isinstance(e, HwpConversionRequired) else "EXTRACT_FAILED"
+
+
+def _worker_main(
+    tasks: "mp.Queue",
+    results: "connection.Connection",
+    credits: Any,
+    max_chars: int,
+    xlsx_cell_limit: int,
+    batch_chunks: int,
+) -> None:
+    def send(tid: int, done: bool, error: Optional[str], detail: str, chunks: List[DocChunk], seconds: float) -> None:
+        # one credit per message, returned by the parent when it picks the message up, so a slow
+        # consumer stalls the worker instead of piling chunks up in the pipe
+        credits.acquire()
+        results.send((tid, done, error, detail, chunks, seconds))
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        tid, path = task
+        t0 = time.perf_counter()
+        batch: List[DocChunk] = []
+        try:
+            for ch in iter_chunks(path, max_chars=max_chars, xlsx_cell_limit=xlsx_cell_limit):
+                batch.append(ch)
+                if len(batch) >= batch_chunks:
+                    send(tid, False, None, "", batch, 0.0)
+                    batch = []
+            send(tid, True, None, "", batch, time.perf_counter() - t0)
+        except BaseException as e:  # report everything, keep the worker alive
+            send(tid, True, _classify(e), str(e), batch, time.perf_counter() - t0)
+
+
+@dataclass(eq=False)
+class _Worker:
+    wid: int
+    proc: Any
+    tasks: Any
+    # read end of this worker's own result pipe
+    results: Any
+    credits: Any
+    # (task id, key, started monotonic) while busy
+    busy: Optional[Tuple[int, Any, float]] = None
+
+
+class ExtractPool:
+    """extract_chunks on a pool of worker processes, with a per-file timeout.
+
+    Parsing PDF/DOCX/PPTX/XLSX is CPU-bound, so it runs in separate processes while the caller
+    stays the single Redis writer. Each worker takes one file at a time; a file that runs past
+    timeout_s gets its worker killed and respawned and comes back as an EXTRACT_TIMEOUT result,
+    so one pathological document cannot stall or kill the whole run. Every worker writes to its
+    own result pipe, so killing one cannot leave a lock held that the others need.
+
+    Chunks stream back in batches of batch_chunks while a file is being parsed (at most
+    `credits` batches in flight per worker), so neither side holds a whole document.
+
+    submit() only accepts work while fewer than queue_max files are waiting for a worker
+    (check full()); poll() hands back chunk batches and final per-file results.
+
+    workers=0 runs iter_chunks inline on the calling thread, one batch per poll (no timeout).
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        *,
+        timeout_s: float = 120.0,
+        queue_max: int = 0,
+        max_chars: int = 12000,
+        xlsx_cell_limit: int = 20000,
+        batch_chunks: int = 32,
+        credits: int = 4,
+    ):
+        self.workers = max(0, int(workers))
+        self.timeout_s = float(timeout_s)
+        self.queue_max = max(1, int(queue_max or self.workers * 2))
+        self.max_chars = int(max_chars)
+        self.xlsx_cell_limit = int(xlsx_cell_limit)
+        self.batch_chunks = max(1, int(batch_chunks))
+        self.credits = max(1, int(credits))
+        self._pending: Deque[Tuple[int, Any, str]] = collections.deque()
+        # [key, path, chunk iterator (None until started), seconds so far]
+        self._inline: Deque[List[Any]] = collections.deque()
+        self._next_tid = 0
+        self._ctx = mp.get_context("spawn")  # never fork a process holding redis sockets/threads
+        self._workers: List[_Worker] = []
+
+    def __enter__(self) -> "ExtractPool":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _spawn(self, wid: int) -> _Worker:
+        tasks = self._ctx.Queue()
+        credits = self._ctx.Semaphore(self.credits)
+        results, sender = self._ctx.Pipe(duplex=False)
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(tasks, sender, credits, self.max_chars, self.xlsx_cell_limit, self.batch_chunks),
+            name=f"extract-{wid}",
+            daemon=True,
+        )
+        proc.start()
+        sender.close()  # the worker holds the only write end, so its death reads as EOF
+        return _Worker(wid=wid, proc=proc, tasks=tasks, results=results, credits=credits)
+
+    def _respawn(self, w: _Worker) -> None:
+        # safe: the killed worker shares no queue or pipe with the other workers
+        try:
+            w.proc.kill()
+            w.proc.join(timeout=5)
+        except Exception:
+            pass
+        w.results.close()
+        self._workers[w.wid] = self._spawn(w.wid)
+
+    # ---- producer side ----
+    def full(self) -> bool:
+        return len(self._pending) + len(self._inline) >= self.queue_max
+
+    def outstanding(self) -> int:
+        return len(self._pending) + len(self._inline) + sum(1 for w in self._workers if w.busy is not None)
+
+    def submit(self, key: Any, path: str) -> None:
+        if not self.workers:
+            self._inline.append([key, path, None, 0.0])
+            return
+        if not self._workers:
+            # started on first use, so a run with nothing to extract costs no process spawns
+            self._workers = [self._spawn(i) for i in range(self.workers)]
+        self._next_tid += 1
+        self._pending.append((self._next_tid, key, path))
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        for w in self._workers:
+            if not self._pending:
+                return
+            if w.busy is None:
+                tid, key, path = self._pending.popleft()
+                w.tasks.put((tid, path))
+                w.busy = (tid, key, time.monotonic())
+
+    # ---- consumer side ----
+    def poll(self, wait_s: float = 0.5) -> List[ExtractResult]:
+        """Finished results (possibly none); blocks up to wait_s for the first one."""
+        if not self._workers:
+            return self._poll_inline()
+
+        out: List[ExtractResult] = []
+        timeout = max(0.0, wait_s)
+        eof = set()  # dead workers' pipes; handled by the liveness check below
+        while True:
+            busy = {w.results: w for w in self._workers if w.busy is not None and w.wid not in eof}
+            ready = connection.wait(list(busy), timeout=timeout) if busy else []
+            if not ready:
+                break
+            timeout = 0.0
+            for conn in ready:
+                w = busy[conn]
+                try:
+                    tid, done, error, detail, chunks, seconds = conn.recv()
+                except (EOFError, OSError):
+                    eof.add(w.wid)
+                    continue
+                if w.busy is None or w.busy[0] != tid:
+                    continue  # not expected: a respawned worker gets a fresh pipe
+                w.credits.release()
+                out.append(ExtractResult(key=w.busy[1], chunks=chunks, error=error, detail=detail, seconds=seconds, done=done))
+                if done:
+                    w.busy = None
+
+        now = time.monotonic()
+        for w in list(self._workers):
+            if w.busy is None:
+                continue
+            tid, key, started = w.busy
+            if self.timeout_s > 0 and now - started > self.timeout_s:
+                logger.warning("extract worker %s timed out after %.0fs; respawning", w.wid, now - started)
+                out.append(ExtractResult(key=key, error="EXTRACT_TIMEOUT", detail=f"> {self.timeout_s:.0f}s", seconds=now - started))
+                self._respawn(w)
+            elif w.wid in eof or not w.proc.is_alive():
+                w.proc.join(timeout=1)  # EOF can beat the exit status
+                out.append(ExtractResult(key=key, error="WORKER_DIED", detail=f"exitcode={w.proc.exitcode}", seconds=now - started))
+                self._respawn(w)
+        self._dispatch()
+        return out
+
+    def _poll_inline(self) -> List[ExtractResult]:
+        if not self._inline:
+            return []
+        item = self._inline[0]
+        key, path, it, seconds = item
+        t0 = time.perf_counter()
+        chunks: List[DocChunk] = []
+        try:
+            if it is None:
+                it = item[2] = iter_chunks(path, max_chars=self.max_chars, xlsx_cell_limit=self.xlsx_cell_limit)
+            for ch in it:
+                chunks.append(ch)
+                if len(chunks) >= self.batch_chunks:
+                    item[3] = seconds + time.perf_counter() - t0
+                    return [ExtractResult(key=key, chunks=chunks, done=False)]
+            res = ExtractResult(key=key, chunks=chunks)
+        except Exception as e:
+            res = ExtractResult(key=key, chunks=chunks, error=_classify(e), detail=str(e))
+        res.seconds = seconds + time.perf_counter() - t0
+        self._inline.popleft()
+        return [res]
+
+    def close(self) -> None:
+        for w in self._workers:
+            try:
+                if w.busy is None:
+                    w.tasks.put(None)
+                else:
+                    w.proc.kill()
+            except Exception:
+                pass
+        for w in self._workers:
+            w.proc.join(timeout=5)
+            if w.proc.is_alive():
+                w.proc.kill()
+            w.results.close()
+        self._workers = []
+        self._pending.clear()
@@ -0,0 +1,31 @@
+"""Content fingerprint for incremental folder ingest (supervisor and node agent).
+
+Standard library only: the node agent imports it even where the document parsers
+(and Redis) are not installed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+_FULL_HASH_BYTES = 8 * 1024 * 1024
+_SAMPLE_BYTES = 256 * 1024
+
+
+def file_fingerprint(path: str, size: int) -> str:
+    """Content hash for change detection: whole file up to 8MB, else size + head/middle/tail samples.
+
+    Only consulted when size/mtime changed, so the sampled form trades missing a same-size edit
+    confined to an unsampled region of a >8MB file for not re-reading large files on every touch.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(size).encode("ascii"))
+    with open(path, "rb") as f:
+        if size <= _FULL_HASH_BYTES:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(block)
+        else:
+            for off in (0, (size - _SAMPLE_BYTES) // 2, size - _SAMPLE_BYTES):
+                f.seek(off)
+                h.update(f.read(_SAMPLE_BYTES))
+    return h.hexdigest()
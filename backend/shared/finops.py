@@ -8,6 +8,7 @@ from typing import Any, Dict, Optional, Tuple
 
 from shared.settings import settings
 from shared.append_only import append_jsonl_with_chain
+from shared.api_management import budget_ledger
 
 
 @dataclass
@@ -78,40 +79,12 @@ def estimate_cost_usd(provider: str, usage: Usage, model: Optional[str] = None)
     return (usage.prompt_tokens / 1000.0) * float(t["prompt"]) + (usage.completion_tokens / 1000.0) * float(t["completion"])
 
 
-def _budget_state_path() -> str:
-    return "logs/budget_state.json"
-
-
-def _today_utc_key() -> str:
-    return time.strftime("%Y-%m-%d", time.gmtime())
-
-
-def _load_budget() -> Dict[str, Any]:
-    try:
-        if not os.path.exists(_budget_state_path()):
-            return {"day_key": _today_utc_key(), "spent_usd": 0.0}
-        with open(_budget_state_path(), "r", encoding="utf-8") as f:
-            d = json.load(f) or {}
-        if d.get("day_key") != _today_utc_key():
-            return {"day_key": _today_utc_key(), "spent_usd": 0.0}
-        return {"day_key": d.get("day_key"), "spent_usd": float(d.get("spent_usd") or 0.0)}
-    except Exception:
-        return {"day_key": _today_utc_key(), "spent_usd": 0.0}
-
-
-def _save_budget(d: Dict[str, Any]) -> None:
-    os.makedirs("logs", exist_ok=True)
-    with open(_budget_state_path(), "w", encoding="utf-8") as f:
-        json.dump(d, f)
-
-
 def budget_adjust(delta_usd: float) -> None:
     """Best-effort settlement adjust after actual usage is known.
-    delta can be negative or positive.
+    delta can be negative or positive. Applied to the shared daily ledger
+    (Redis INCRBYFLOAT; logs/budget_state.json only when Redis is unreachable).
     """
-    st = _load_budget()
-    st["spent_usd"] = max(0.0, float(st.get("spent_usd") or 0.0) + float(delta_usd))
-    _save_budget(st)
+    budget_ledger().adjust(float(delta_usd))
 
 
 def write_cost_ledger(event: Dict[str, Any]) -> None:
@@ -0,0 +1,365 @@
+"""
+Columnar store for the JSONL ledgers (LLM cost ledger, LLM audit log).
+
+tools/finops_report.py and tools/anomaly_watch.py used to json.loads every line of a ledger and
+strptime every ts_utc on each run. LedgerStore.compact() rolls a ledger into daily partitions of
+NumPy column files, and LedgerStore.aggregate() opens only the partitions its time range
+touches and sums/counts with vectorized group-bys:
+
+  <root>/_manifest.json                 {"v", "source", "columns", "first", "offset", "gen",
+                                         "days": {"YYYY-MM-DD": {"dir", "rows", "min_ts", "max_ts"}}}
+  <root>/<day>.g<gen>/ts.npy            int64 epoch seconds of ts_utc, sorted (the time index)
+  <root>/<day>.g<gen>/<col>.npy         float64 / bool value columns
+  <root>/<day>.g<gen>/<col>.codes.npy   int32 codes of dictionary-encoded string columns,
+  <root>/<day>.g<gen>/<col>.dict.json   with their labels
+
+offset is how far into the source the store has compacted. Lines written since (the tail up to
+the next compaction) are parsed by each query, so results are always current. Compaction
+rewrites only the days it adds rows to, as a new generation directory, then replaces the
+manifest atomically; readers never see a half-written day. When the source is rotated (its
+first line changes or it shrinks) the partitions are kept as history and compaction restarts
+at the top of the new file.
+
+Rows without a valid ts_utc, or whose columns cannot be extracted, are skipped (as the tools
+always did).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from shared.append_only import _FileLock
+
+MANIFEST = "_manifest.json"
+MANIFEST_VERSION = 1
+DAY_S = 86400
+# lines parsed per compaction step; each step is committed (manifest written) on its own
+COMPACT_CHUNK_LINES = 500_000
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    kind: str  # "cat" (string, dictionary-encoded) | "f8" | "bool"
+    get: Callable[[Dict[str, Any]], Any]
+
+
+COST_COLUMNS: Tuple[Column, ...] = (
+    Column("provider", "cat", lambda r: str(r.get("provider") or "unknown")),
+    Column("model", "cat", lambda r: str(r.get("model") or "unknown")),
+    Column("purpose", "cat", lambda r: str(r.get("purpose") or "default")),
+    Column("team", "cat", lambda r: f"{r.get('team', 'default')}/{r.get('project', 'nexus')}"),
+    Column("actual_cost_usd", "f8", lambda r: float(r.get("actual_cost_usd") or 0.0)),
+    Column("approx_tokens", "bool", lambda r: bool(r.get("approx_tokens"))),
+)
+
+AUDIT_COLUMNS: Tuple[Column, ...] = (
+    Column("type", "cat", lambda r: str(r.get("type") or "")),
+    Column("event", "cat", lambda r: str(r.get("event") or "")),
+    Column("reason", "cat", lambda r: str(r.get("reason") or "")),
+    Column("provider", "cat", lambda r: str(r.get("provider") or "")),
+)
+
+
+def default_root(source: str) -> str:
+    """logs/llm_cost_ledger.jsonl -> logs/columnar/llm_cost_ledger"""
+    name = os.path.basename(source)
+    if name.endswith(".jsonl"):
+        name = name[: -len(".jsonl")]
+    return os.path.join(os.path.dirname(source), "columnar", name)
+
+
+def _day(ts: int) -> str:
+    return str(np.datetime64(int(ts), "s").astype("datetime64[D]"))
+
+
+def _parse_ts(values: List[str]) -> np.ndarray:
+    """ISO seconds without the trailing Z -> int64 epoch seconds; unparseable ones -> NaT sentinel."""
+    try:
+        return np.array(values, dtype="datetime64[s]").astype(np.int64)
+    except ValueError:
+        out = np.empty(len(values), dtype=np.int64)
+        for i, v in enumerate(values):
+            try:
+                out[i] = np.datetime64(v, "s").astype(np.int64)
+            except ValueError:
+                out[i] = np.iinfo(np.int64).min
+        return out
+
+
+class _Part:
+    """One columnar chunk: a stored day, or rows parsed from JSONL. ts is sorted."""
+
+    def __init__(self, ts: np.ndarray, cols: Dict[str, np.ndarray], labels: Dict[str, List[str]]):
+        self.ts = ts
+        self.cols = cols
+        self.labels = labels
+
+    @classmethod
+    def from_rows(cls, columns: Sequence[Column], rows: Iterable[Dict[str, Any]]) -> "_Part":
+        ts: List[str] = []
+        values: Dict[str, List[Any]] = {c.name: [] for c in columns}
+        codes: Dict[str, Dict[str, int]] = {c.name: {} for c in columns if c.kind == "cat"}
+        for r in rows:
+            t = r.get("ts_utc")
+            if not isinstance(t, str) or len(t) != 20 or t[-1] != "Z":
+                continue
+            try:
+                row = [c.get(r) for c in columns]
+            except Exception:
+                continue
+            ts.append(t[:-1])
+            for c, v in zip(columns, row):
+                if c.kind == "cat":
+                    d = codes[c.name]
+                    v = d.setdefault(v, len(d))
+                values[c.name].append(v)
+        secs = _parse_ts(ts)
+        keep = secs != np.iinfo(np.int64).min
+        order = np.argsort(secs[keep], kind="stable")
+        dtypes = {"cat": np.int32, "f8": np.float64, "bool": np.bool_}
+        cols = {c.name: np.asarray(values[c.name], dtype=dtypes[c.kind])[keep][order] for c in columns}
+        labels = {name: list(d) for name, d in codes.items()}
+        return cls(secs[keep][order], cols, labels)
+
+    @classmethod
+    def load(cls, path: str, columns: Sequence[Column]) -> "_Part":
+        cols: Dict[str, np.ndarray] = {}
+        labels: Dict[str, List[str]] = {}
+        for c in columns:
+            if c.kind == "cat":
+                cols[c.name] = np.load(os.path.join(path, f"{c.name}.codes.npy"), mmap_mode="r")
+                with open(os.path.join(path, f"{c.name}.dict.json"), "r", encoding="utf-8") as f:
+                    labels[c.name] = json.load(f)
+            else:
+                cols[c.name] = np.load(os.path.join(path, f"{c.name}.npy"), mmap_mode="r")
+        return cls(np.load(os.path.join(path, "ts.npy"), mmap_mode="r"), cols, labels)
+
+    def save(self, path: str) -> None:
+        os.makedirs(path)
+        np.save(os.path.join(path, "ts.npy"), self.ts)
+        for name, arr in self.cols.items():
+            if name in self.labels:
+                np.save(os.path.join(path, f"{name}.codes.npy"), arr)
+                with open(os.path.join(path, f"{name}.dict.json"), "w", encoding="utf-8") as f:
+                    json.dump(self.labels[name], f, ensure_ascii=False)
+            else:
+                np.save(os.path.join(path, f"{name}.npy"), arr)
+
+    def select(self, lo: int, hi: int) -> "_Part":
+        return _Part(self.ts[lo:hi], {k: v[lo:hi] for k, v in self.cols.items()}, self.labels)
+
+    def merge(self, other: "_Part") -> "_Part":
+        """Rows of both, sorted by ts; other's codes are remapped onto this part's labels."""
+        cols: Dict[str, np.ndarray] = {}
+        labels: Dict[str, List[str]] = {}
+        for name, arr in self.cols.items():
+            theirs = other.cols[name]
+            if name in self.labels:
+                merged = list(self.labels[name])
+                index = {v: i for i, v in enumerate(merged)}
+                for v in other.labels[name]:
+                    if v not in index:
+                        index[v] = len(merged)
+                        merged.append(v)
+                remap = np.array([index[v] for v in other.labels[name]], dtype=np.int32)
+                theirs = remap[theirs] if len(remap) else theirs.astype(np.int32)
+                labels[name] = merged
+            cols[name] = np.concatenate([arr, theirs])
+        ts = np.concatenate([self.ts, other.ts])
+        order = np.argsort(ts, kind="stable")
+        return _Part(ts[order], {k: v[order] for k, v in cols.items()}, labels)
+
+
+@dataclass
+class Summary:
+    rows: int = 0
+    sums: Dict[str, float] = field(default_factory=dict)  # every f8/bool column over the matched rows
+    groups: Dict[str, Dict[str, float]] = field(default_factory=dict)  # by column -> label -> value sum (or row count)
+
+
+class LedgerStore:
+    def __init__(self, source: str, columns: Sequence[Column] = COST_COLUMNS, root: Optional[str] = None):
+        self.source = source
+        self.columns = tuple(columns)
+        self.root = root or default_root(source)
+
+    # ---- manifest / source ----
+
+    def _manifest(self) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self.root, MANIFEST), "r", encoding="utf-8") as f:
+                m = json.load(f)
+        except FileNotFoundError:
+            return {"v": MANIFEST_VERSION, "source": os.path.basename(self.source),
+                    "columns": [c.name for c in self.columns], "first": "", "offset": 0, "gen": 0, "days": {}}
+        if m.get("columns") != [c.name for c in self.columns]:
+            raise ValueError(f"{self.root} was compacted with columns {m.get('columns')}; remove it to rebuild")
+        return m
+
+    def _write_manifest(self, m: Dict[str, Any]) -> None:
+        path = os.path.join(self.root, MANIFEST)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(m, f, indent=1, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+
+    def _first_line_id(self) -> str:
+        try:
+            with open(self.source, "rb") as f:
+                line = f.readline()
+        except FileNotFoundError:
+            return ""
+        return hashlib.sha256(line).hexdigest()[:16] if line.endswith(b"\n") else ""
+
+    def _tail_start(self, m: Dict[str, Any]) -> int:
+        """Where the uncompacted part of the source starts (0 after a rotation)."""
+        try:
+            size = os.path.getsize(self.source)
+        except FileNotFoundError:
+            return 0
+        offset = int(m.get("offset") or 0)
+        if offset > size or (offset and m.get("first") != self._first_line_id()):
+            return 0
+        return offset
+
+    def _read_lines(self, start: int, max_lines: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """Parsed complete lines from byte offset start; returns (rows, offset after the last one)."""
+        rows: List[Dict[str, Any]] = []
+        pos = start
+        if not os.path.exists(self.source):
+            return rows, pos
+        with open(self.source, "rb") as f:
+            f.seek(start)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # being written; picked up next time
+                pos += len(raw)
+                raw = raw.strip()
+                if raw:
+                    try:
+                        rows.append(json.loads(raw))
+                    except ValueError:
+                        pass
+                if max_lines and len(rows) >= max_lines:
+                    break
+        return rows, pos
+
+    # ---- compaction ----
+
+    def compact(self, chunk_lines: int = COMPACT_CHUNK_LINES) -> Dict[str, Any]:
+        """Move the source's uncompacted lines into day partitions. Returns {rows, days, offset}."""
+        os.makedirs(self.root, exist_ok=True)
+        lock = _FileLock(os.path.join(self.root, MANIFEST))
+        try:
+            with lock:
+                return self._compact(chunk_lines)
+        finally:
+            lock.close()
+
+    def _compact(self, chunk_lines: int) -> Dict[str, Any]:
+        m = self._manifest()
+        start = self._tail_start(m)
+        if start == 0:
+            m["first"] = self._first_line_id()
+        added, touched = 0, set()
+        while True:
+            rows, end = self._read_lines(start, chunk_lines)
+            if end == start:
+                break
+            part = _Part.from_rows(self.columns, rows)
+            stale: List[str] = []
+            days = part.ts // DAY_S
+            if not len(days):  # nothing datable in this chunk
+                m["offset"] = start = end
+                self._write_manifest(m)
+                continue
+            bounds = np.flatnonzero(np.diff(days)) + 1
+            m["gen"] = int(m["gen"]) + 1
+            for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, len(days)]):
+                chunk = part.select(int(lo), int(hi))
+                day = _day(chunk.ts[0])
+                prev = m["days"].get(day)
+                if prev:
+                    chunk = _Part.load(os.path.join(self.root, prev["dir"]), self.columns).merge(chunk)
+                    stale.append(prev["dir"])
+                d = f"{day}.g{m['gen']}"
+                chunk.save(os.path.join(self.root, d))
+                m["days"][day] = {"dir": d, "rows": int(len(chunk.ts)),
+                                  "min_ts": int(chunk.ts[0]), "max_ts": int(chunk.ts[-1])}
+                touched.add(day)
+            added += len(part.ts)
+            m["offset"] = start = end
+            self._write_manifest(m)
+            for d in stale:
+                shutil.rmtree(os.path.join(self.root, d), ignore_errors=True)
+        return {"rows": added, "days": sorted(touched), "offset": start}
+
+    # ---- queries ----
+
+    def _parts(self, since: Optional[int], until: Optional[int]) -> Iterable[_Part]:
+        m = self._manifest()
+        for info in m["days"].values():
+            if (since is None or info["max_ts"] >= since) and (until is None or info["min_ts"] <= until):
+                yield _Part.load(os.path.join(self.root, info["dir"]), self.columns)
+        rows, _ = self._read_lines(self._tail_start(m))
+        if rows:
+            yield _Part.from_rows(self.columns, rows)
+
+    def aggregate(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        by: Sequence[str] = (),
+        value: Optional[str] = None,
+        where: Optional[Dict[str, Iterable[str]]] = None,
+    ) -> Summary:
+        """Rows with since <= ts_utc <= until (epoch seconds, inclusive) matching where
+        (column -> accepted labels), grouped by each column in by, summing value
+        (row counts when value is None)."""
+        lo = None if since is None else int(np.ceil(since))
+        hi = None if until is None else int(np.floor(until))
+        accept = {name: set(labels) for name, labels in (where or {}).items()}
+        try:
+            return self._aggregate(lo, hi, by, value, accept)
+        except FileNotFoundError:
+            # a compaction replaced a day while we were reading it; the new manifest has it
+            return self._aggregate(lo, hi, by, value, accept)
+
+    def _aggregate(self, lo: Optional[int], hi: Optional[int], by: Sequence[str], value: Optional[str],
+                   where: Dict[str, set]) -> Summary:
+        numeric = [c.name for c in self.columns if c.kind != "cat"]
+        out = Summary(sums={n: 0.0 for n in numeric}, groups={b: {} for b in by})
+        for part in self._parts(lo, hi):
+            i0 = 0 if lo is None else int(np.searchsorted(part.ts, lo, "left"))
+            i1 = len(part.ts) if hi is None else int(np.searchsorted(part.ts, hi, "right"))
+            if i1 <= i0:
+                continue
+            mask = np.ones(i1 - i0, dtype=bool)
+            for name, accepted in where.items():
+                codes = [i for i, v in enumerate(part.labels[name]) if v in accepted]
+                mask &= np.isin(part.cols[name][i0:i1], codes)
+            n = int(mask.sum())
+            if not n:
+                continue
+            out.rows += n
+            for name in numeric:
+                out.sums[name] += float(np.asarray(part.cols[name][i0:i1])[mask].sum())
+            weights = None if value is None else np.asarray(part.cols[value][i0:i1], dtype=np.float64)[mask]
+            for b in by:
+                codes = np.asarray(part.cols[b][i0:i1])[mask]
+                labels = part.labels[b]
+                counts = np.bincount(codes, minlength=len(labels))
+                totals = counts if weights is None else np.bincount(codes, weights=weights, minlength=len(labels))
+                group = out.groups[b]
+                for i in np.flatnonzero(counts):
+                    group[labels[i]] = group.get(labels[i], 0.0) + float(totals[i])
+        return out
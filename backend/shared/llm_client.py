@@ -8,8 +8,14 @@ from shared.settings import settings
 from shared.provider_health import ProviderHealth
 from shared.provider_keys import select_key
 from shared.dedupe import DedupeStore
-from shared.finops import estimate_cost_usd, write_cost_ledger, budget_adjust
-from shared.api_management import budget_check_and_reserve, rate_limit_allow, audit_log, audit_prompt_fingerprint
+from shared.finops import Usage, estimate_cost_usd, write_cost_ledger, budget_adjust
+from shared.api_management import (
+    audit_log,
+    audit_prompt_fingerprint,
+    budget_check_and_reserve,
+    provider_rate_limit_allow,
+    rate_limit_allow,
+)
 from shared.metrics import (
     inc_llm_call,
     observe_llm_latency_ms,
@@ -213,7 +219,7 @@ class LLMClient:
         # estimate with primary provider model; for chain this is a rough upper bound
         est_provider = chain[0]
         est_model = _model_for(est_provider, model_override)
-        est_cost = float(estimate_cost_usd(est_provider, est_model, est_in, est_out) or 0.0)
+        est_cost = float(estimate_cost_usd(est_provider, Usage(est_in, est_out, est_in + est_out), est_model) or 0.0)
         allowed, budget_reason = budget_check_and_reserve(est_cost)
         if not allowed:
             audit_log(
@@ -262,6 +268,19 @@ class LLMClient:
                 )
                 continue
 
+            # rate limit (per provider): a saturated provider is skipped like an open circuit
+            if not provider_rate_limit_allow(provider):
+                last = ProviderResponse(
+                    ok=False,
+                    provider=provider,
+                    model=_model_for(provider, model_override),
+                    text="",
+                    error=f"rate_limited_provider:{provider}",
+                    status_code=429,
+                    failure_code="RATE_LIMITED",
+                )
+                continue
+
             sel = select_key(provider, tenant=tenant, vault=self.vault)
             if sel.missing or not sel.api_key:
                 last = ProviderResponse(
@@ -308,7 +327,7 @@ class LLMClient:
                     actual_cost = None
                     if tokens_in is not None and tokens_out is not None:
                         try:
-                            actual_cost = float(estimate_cost_usd(provider, model, tokens_in, tokens_out) or 0.0)
+                            actual_cost = float(estimate_cost_usd(provider, Usage(tokens_in, tokens_out, tokens_in + tokens_out), model) or 0.0)
                         except Exception:
                             actual_cost = None
 
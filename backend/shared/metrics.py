@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 # Existing metrics in supervisor may import these.
 # LLM provider metrics
@@ -106,3 +106,42 @@ def set_llm_breaker_open(provider: str, is_open: bool) -> None:
         llm_breaker_open.labels(provider=provider).set(1.0 if is_open else 0.0)
     except Exception:
         pass
+
+
+# TTS audio cache (shared.tts_cache)
+tts_cache_hits_total = Counter("nexus_tts_cache_hits_total", "TTS requests served from the audio cache", ["provider"])
+tts_cache_misses_total = Counter("nexus_tts_cache_misses_total", "TTS requests that called the provider", ["provider"])
+tts_cache_evictions_total = Counter("nexus_tts_cache_evictions_total", "TTS audio files evicted (LRU over the byte budget)")
+tts_cache_bytes = Gauge("nexus_tts_cache_bytes", "Bytes of TTS audio on disk")
+tts_cache_files = Gauge("nexus_tts_cache_files", "TTS audio files on disk")
+
+
+def inc_tts_cache(provider: str, hit: bool) -> None:
+    try:
+        (tts_cache_hits_total if hit else tts_cache_misses_total).labels(provider=provider).inc()
+    except Exception:
+        pass
+
+
+def set_tts_cache_usage(total_bytes: int, files: int, evicted: int = 0) -> None:
+    try:
+        tts_cache_bytes.set(float(total_bytes))
+        tts_cache_files.set(float(files))
+        if evicted:
+            tts_cache_evictions_total.inc(evicted)
+    except Exception:
+        pass
+
+
+# Shared Redis connection pools (shared.redis_client), refreshed on /metrics scrape
+redis_pool_connections = Gauge("nexus_redis_pool_connections", "Connections in the shared Redis pool", ["pool", "state"])
+redis_pool_max_connections = Gauge("nexus_redis_pool_max_connections", "Connection limit of the shared Redis pool", ["pool"])
+
+
+def set_redis_pool_usage(pool: str, in_use: int, idle: int, max_connections: int) -> None:
+    try:
+        redis_pool_connections.labels(pool=pool, state="in_use").set(float(in_use))
+        redis_pool_connections.labels(pool=pool, state="idle").set(float(idle))
+        redis_pool_max_connections.labels(pool=pool).set(float(max_connections))
+    except Exception:
+        pass
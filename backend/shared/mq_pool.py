@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pika
+import pika.exceptions
+
+from shared.logging_utils import get_logger
+from shared.mq_utils import publish_json
+
+logger = get_logger("mq_pool")
+
+# (queue, message, correlation_id, headers)
+Publish = Tuple[str, Dict[str, Any], str, Optional[Dict[str, Any]]]
+
+
+@dataclass(eq=False)
+class _Slot:
+    conn: Any = None
+    ch: Any = None
+    confirms: bool = False
+    used_at: float = 0.0
+
+    def is_open(self) -> bool:
+        return self.conn is not None and self.conn.is_open
+
+    def close(self) -> None:
+        conn, self.conn, self.ch = self.conn, None, None
+        if conn is not None:
+            try:
+                if conn.is_open:
+                    conn.close()
+            except Exception:
+                pass
+
+
+class RabbitPool:
+    """Thread-safe pool of long-lived pika BlockingConnections, one channel each.
+
+    pika connections are not thread-safe, so a slot (connection + channel) is checked out by
+    one thread at a time via channel(). Connections are opened lazily, the queue topology is
+    declared once per pool (the queues are durable), and a slot whose connection or channel
+    broke is reopened on its next checkout. A slot idle longer than `idle_check_s` services
+    pending heartbeats before reuse, since BlockingConnection only does so while in use.
+
+    With confirms=True the channels are in publisher-confirm mode and publish()/publish_many()
+    return only after the broker acked every message.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        size: int = 4,
+        declare: Optional[Callable[[Any], None]] = None,
+        confirms: bool = False,
+        checkout_timeout_s: float = 10.0,
+        idle_check_s: float = 15.0,
+    ):
+        self.url = url
+        self.size = max(1, int(size))
+        self.confirms = bool(confirms)
+        self.checkout_timeout_s = float(checkout_timeout_s)
+        self.idle_check_s = float(idle_check_s)
+        self._declare = declare
+        self._declared = False
+        self._lock = threading.Lock()
+        self._slots: List[_Slot] = [_Slot() for _ in range(self.size)]
+        self._idle: "queue.LifoQueue[_Slot]" = queue.LifoQueue()
+        for slot in self._slots:
+            self._idle.put(slot)
+        self._closed = False
+        self.connects = 0
+        self.failures = 0
+        self.last_error = ""
+
+    # ---- slot lifecycle ----
+    def _open(self, slot: _Slot) -> None:
+        slot.close()
+        slot.conn = pika.BlockingConnection(pika.URLParameters(self.url))
+        self.connects += 1
+        self._open_channel(slot)
+
+    def _open_channel(self, slot: _Slot) -> None:
+        slot.ch = slot.conn.channel()
+        slot.confirms = False
+        with self._lock:
+            if not self._declared and self._declare is not None:
+                self._declare(slot.ch)
+                self._declared = True
+        if slot.ch.is_closed:  # a failed declare closes the channel
+            slot.ch = slot.conn.channel()
+        if self.confirms:
+            slot.ch.confirm_delivery()
+            slot.confirms = True
+
+    def _ready(self, slot: _Slot) -> None:
+        if not slot.is_open():
+            self._open(slot)
+            return
+        if time.monotonic() - slot.used_at > self.idle_check_s:
+            slot.conn.process_data_events(time_limit=0)
+        if slot.ch is None or slot.ch.is_closed:
+            self._open_channel(slot)
+
+    @contextmanager
+    def channel(self, timeout_s: Optional[float] = None) -> Iterator[Any]:
+        """Check out a ready channel. On any exception the slot's connection is dropped
+        (unacked deliveries are requeued by the broker) and reopened on next use."""
+        if self._closed:
+            raise RuntimeError("RabbitPool is closed")
+        wait = self.checkout_timeout_s if timeout_s is None else float(timeout_s)
+        try:
+            slot = self._idle.get(timeout=wait)
+        except queue.Empty:
+            raise TimeoutError(f"no idle RabbitMQ channel within {wait:.1f}s") from None
+        try:
+            try:
+                self._ready(slot)
+            except Exception:
+                # stale connection (broker restart, missed heartbeats): one fresh dial
+                self._open(slot)
+            yield slot.ch
+            slot.used_at = time.monotonic()
+        except BaseException as e:
+            if isinstance(e, pika.exceptions.AMQPError):
+                self.failures += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+            slot.close()
+            raise
+        finally:
+            if self._closed:
+                slot.close()
+            self._idle.put(slot)
+
+    # ---- publishing ----
+    def publish(self, queue_name: str, message: Dict[str, Any], correlation_id: str, headers: Optional[Dict[str, Any]] = None) -> None:
+        self.publish_many([(queue_name, message, correlation_id, headers)])
+
+    def publish_many(self, items: Sequence[Publish], retries: int = 1) -> int:
+        """Publish a batch over one checked-out channel. A connection-level failure before the
+        batch completed reconnects and republishes the remaining messages (at-least-once)."""
+        done = 0
+        attempt = 0
+        while done < len(items):
+            try:
+                with self.channel() as ch:
+                    while done < len(items):
+                        q, msg, cid, headers = items[done]
+                        publish_json(ch, q, msg, correlation_id=cid, headers=headers)
+                        done += 1
+            except (pika.exceptions.AMQPConnectionError, pika.exceptions.AMQPChannelError):
+                attempt += 1
+                if attempt > retries:
+                    raise
+                logger.warning("rabbit publish failed (%s); reconnecting", self.last_error)
+        return done
+
+    # ---- health ----
+    def ping(self, timeout_s: float = 2.0) -> bool:
+        """True if a pooled connection is (or can be made) usable; dials only when none is open."""
+        try:
+            with self.channel(timeout_s=timeout_s) as ch:
+                ch.connection.process_data_events(time_limit=0)
+            return True
+        except Exception:
+            return False
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "open": sum(1 for s in self._slots if s.is_open()),
+            "idle": self._idle.qsize(),
+            "confirms": self.confirms,
+            "connects": self.connects,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
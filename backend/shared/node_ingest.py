@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from shared.logging_utils import get_logger
+from shared.rag_naive import AsyncNaiveRAG, RagDoc
+from shared.redis_client import get_redis
+
+logger = get_logger("node_ingest")
+
+
+def _utc_iso() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+class NodeIngestSessions:
+    """Per-command upload state for chunked node folder ingest.
+
+    A node uploads chunk batches with seq = 1, 2, ...; the last one carries final=True.
+    Keys (TTL session_ttl_s, refreshed on every write):
+      - nexus:node:{tenant}:{node}:ingest:{command_id} -> hash
+          received_seq   highest seq accepted so far (seq must be <= received_seq + 1)
+          acked_seq      every seq <= acked_seq is written to the RAG index (resume point)
+          final_seq      seq of the batch sent with final=True (0 until then)
+          chunks_received / chunks_ingested, started_at, updated_at, completed_at
+      - ...:ingest:{command_id}:done -> zset of seqs written ahead of acked_seq
+      - ...:ingest:{command_id}:inflight -> zset seq -> lease expiry (unix s) of queued seqs
+
+    Batches may finish out of order (several ingest workers, several processes); acked_seq
+    only advances over a contiguous run, so a batch lost with a crashed process is re-sent
+    on resume instead of being skipped. Chunk doc_ids are stable, so re-sending is idempotent.
+
+    A node re-sends unacked seqs when acks stall, usually while they still sit in an ingest
+    queue. accept() leases each seq it lets through for inflight_lease_s; a re-send within the
+    lease is answered without being queued again. The lease ends on ack, on release() (queue
+    full, failed write) or by expiry (the process holding it died).
+    """
+
+    # KEYS: session, inflight / ARGV: seq, n_chunks, final, now, ttl, now_s, lease_s
+    #   -> {status, received, acked}
+    # status: 0 accepted (new), 1 accepted (re-send of an unacked seq), 2 already acked,
+    #         3 re-send of a seq still in flight (not to be queued again), -1 gap
+    _ACCEPT_LUA = """
+local seq = tonumber(ARGV[1])
+local received = tonumber(redis.call('HGET', KEYS[1], 'received_seq') or '0')
+local acked = tonumber(redis.call('HGET', KEYS[1], 'acked_seq') or '0')
+if seq <= acked then
+  return {2, received, acked}
+end
+if seq > received + 1 then
+  return {-1, received, acked}
+end
+local status = 1
+if seq == received + 1 then
+  status = 0
+  received = seq
+  redis.call('HSET', KEYS[1], 'received_seq', seq)
+  redis.call('HINCRBY', KEYS[1], 'chunks_received', tonumber(ARGV[2]))
+  redis.call('HSETNX', KEYS[1], 'started_at', ARGV[4])
+end
+if ARGV[3] == '1' then
+  redis.call('HSET', KEYS[1], 'final_seq', seq)
+end
+local now_s = tonumber(ARGV[6])
+if status == 1 and tonumber(redis.call('ZSCORE', KEYS[2], seq) or '0') > now_s then
+  status = 3
+else
+  redis.call('ZADD', KEYS[2], now_s + tonumber(ARGV[7]), seq)
+end
+redis.call('HSET', KEYS[1], 'updated_at', ARGV[4])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[5]))
+redis.call('EXPIRE', KEYS[2], tonumber(ARGV[5]))
+return {status, received, acked}
+"""
+
+    # KEYS: session, done, inflight / ARGV: seq, n_ingested, now, ttl -> {acked, final, completed_now}
+    _ACK_LUA = """
+local seq = tonumber(ARGV[1])
+local acked = tonumber(redis.call('HGET', KEYS[1], 'acked_seq') or '0')
+redis.call('ZREM', KEYS[3], seq)
+if seq > acked and redis.call('ZADD', KEYS[2], seq, seq) == 1 then
+  redis.call('HINCRBY', KEYS[1], 'chunks_ingested', tonumber(ARGV[2]))
+end
+while redis.call('ZSCORE', KEYS[2], acked + 1) do
+  acked = acked + 1
+  redis.call('ZREM', KEYS[2], acked)
+end
+redis.call('HSET', KEYS[1], 'acked_seq', acked, 'updated_at', ARGV[3])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[4]))
+redis.call('EXPIRE', KEYS[2], tonumber(ARGV[4]))
+local final = tonumber(redis.call('HGET', KEYS[1], 'final_seq') or '0')
+local completed = 0
+if final > 0 and acked >= final then
+  completed = redis.call('HSETNX', KEYS[1], 'completed_at', ARGV[3])
+end
+return {acked, final, completed}
+"""
+
+    _INT_FIELDS = ("received_seq", "acked_seq", "final_seq", "chunks_received", "chunks_ingested")
+
+    def __init__(self, redis_url: str, session_ttl_s: int = 86400, inflight_lease_s: int = 300):
+        self.r = get_redis(redis_url)
+        self.session_ttl_s = int(session_ttl_s)
+        self.inflight_lease_s = int(inflight_lease_s)
+        self._accept = self.r.register_script(self._ACCEPT_LUA)
+        self._ack = self.r.register_script(self._ACK_LUA)
+
+    def _k(self, tenant: str, node_id: str, command_id: str) -> str:
+        return f"nexus:node:{tenant}:{node_id}:ingest:{command_id}"
+
+    def accept(self, tenant: str, node_id: str, command_id: str, seq: int, n_chunks: int, final: bool) -> Dict[str, Any]:
+        k = self._k(tenant, node_id, command_id)
+        status, received, acked = self._accept(
+            keys=[k, f"{k}:inflight"],
+            args=[int(seq), int(n_chunks), "1" if final else "0", _utc_iso(), self.session_ttl_s,
+                  int(time.time()), self.inflight_lease_s],
+        )
+        return {"status": int(status), "received_seq": int(received), "acked_seq": int(acked)}
+
+    def release(self, tenant: str, node_id: str, command_id: str, seq: int) -> None:
+        """End the in-flight lease of a seq that will not be written, so its re-send is queued."""
+        self.r.zrem(f"{self._k(tenant, node_id, command_id)}:inflight", int(seq))
+
+    def ack(self, tenant: str, node_id: str, command_id: str, seq: int, n_ingested: int) -> Dict[str, Any]:
+        k = self._k(tenant, node_id, command_id)
+        acked, final, completed = self._ack(
+            keys=[k, f"{k}:done", f"{k}:inflight"], args=[int(seq), int(n_ingested), _utc_iso(), self.session_ttl_s]
+        )
+        return {"acked_seq": int(acked), "final_seq": int(final), "completed": bool(completed)}
+
+    def status(self, tenant: str, node_id: str, command_id: str) -> Dict[str, Any]:
+        raw = self.r.hgetall(self._k(tenant, node_id, command_id))
+        out: Dict[str, Any] = {f: int(raw.get(f) or 0) for f in self._INT_FIELDS}
+        for f in ("started_at", "updated_at", "completed_at"):
+            out[f] = raw.get(f)
+        out["completed"] = bool(raw.get("completed_at"))
+        return out
+
+
+@dataclass
+class IngestBatch:
+    tenant: str
+    node_id: str
+    command_id: str
+    seq: int
+    docs: List[RagDoc]
+    # chunks of changed/removed files to drop from the index in the same write
+    delete_ids: List[str] = field(default_factory=list)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class NodeIngestQueue:
+    """Bounded in-process queue that writes uploaded node batches into the RAG index.
+
+    The upload endpoint only validates and enqueues (try_put); `workers` asyncio tasks run
+    AsyncNaiveRAG.ingest_many and ack the batch in NodeIngestSessions. When the queue
+    is full try_put returns False and the endpoint answers 429 so the node backs off.
+    A batch whose write fails is not acked and its in-flight lease is released; the node
+    re-sends it when it resumes from acked_seq.
+
+    on_complete(batch, ack) is awaited once per upload, after its final batch is acked.
+    """
+
+    def __init__(
+        self,
+        rag: AsyncNaiveRAG,
+        sessions: NodeIngestSessions,
+        queue_max: int = 64,
+        workers: int = 2,
+        on_complete: Optional[Callable[[IngestBatch, Dict[str, Any]], Awaitable[None]]] = None,
+    ):
+        self.rag = rag
+        self.sessions = sessions
+        self.queue_max = max(1, int(queue_max))
+        self.workers = max(1, int(workers))
+        self.on_complete = on_complete
+        self._q: Optional["asyncio.Queue[IngestBatch]"] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+        self.ingested_batches = 0
+        self.failed_batches = 0
+
+    def _ensure_started(self) -> "asyncio.Queue[IngestBatch]":
+        if self._q is None:
+            self._q = asyncio.Queue(maxsize=self.queue_max)
+        self._tasks = [t for t in self._tasks if not t.done()]
+        loop = asyncio.get_running_loop()
+        while len(self._tasks) < self.workers:
+            self._tasks.append(loop.create_task(self._worker()))
+        return self._q
+
+    def try_put(self, batch: IngestBatch) -> bool:
+        q = self._ensure_started()
+        try:
+            q.put_nowait(batch)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def depth(self) -> int:
+        return self._q.qsize() if self._q is not None else 0
+
+    async def _worker(self) -> None:
+        assert self._q is not None
+        while True:
+            batch = await self._q.get()
+            try:
+                await self._write(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed_batches += 1
+                logger.error(
+                    "node ingest batch failed node=%s command=%s seq=%s: %s",
+                    batch.node_id, batch.command_id, batch.seq, e,
+                )
+                await self.release(batch)
+            finally:
+                self._q.task_done()
+
+    async def release(self, batch: IngestBatch) -> None:
+        try:
+            await asyncio.to_thread(self.sessions.release, batch.tenant, batch.node_id, batch.command_id, batch.seq)
+        except Exception as e:  # the lease expires on its own
+            logger.warning("node ingest release failed command=%s seq=%s: %s", batch.command_id, batch.seq, e)
+
+    async def _write(self, batch: IngestBatch) -> None:
+        res = await self.rag.ingest_many(batch.tenant, batch.docs, batch.delete_ids)
+        ack = await asyncio.to_thread(
+            self.sessions.ack, batch.tenant, batch.node_id, batch.command_id, batch.seq, int(res.get("ingested", 0))
+        )
+        self.ingested_batches += 1
+        if ack["completed"] and self.on_complete is not None:
+            await self.on_complete(batch, ack)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "depth": self.depth(),
+            "queue_max": self.queue_max,
+            "workers": len([t for t in self._tasks if not t.done()]),
+            "ingested_batches": self.ingested_batches,
+            "failed_batches": self.failed_batches,
+        }
+
+    async def close(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for t in tasks:
+            t.cancel()
+        for t in tasks:
+            try:
+                await t
+            except (asyncio.CancelledError, Exception):
+                pass
+
+
+def docs_from_chunks(chunks: Sequence[Dict[str, Any]]) -> List[RagDoc]:
+    return [RagDoc(doc_id=str(c["doc_id"]), text=str(c["text"]), meta=dict(c.get("meta") or {})) for c in chunks]
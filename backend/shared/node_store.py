@@ -3,18 +3,75 @@ Node State Store - Redis-backed node state management
 Stores node enrollment, connection state, and command queue.
 """
 import json
+import math
 import secrets
 import string
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Dict, List, Any
-import redis
+from typing import Optional, Dict, List, Any, Iterable
+import redis.asyncio as aioredis
 
+from shared.redis_client import get_async_redis, get_redis
 
-class NodeStore:
+
+class _NodeStoreBase:
+    """NodeStore / AsyncNodeStore 공통 Redis 키 레이아웃"""
+    
+    # ============================================================
+    # Redis Key Helpers
+    # ============================================================
+    
+    def _k_pairing_code(self, code: str) -> str:
+        """nexus:node:pairing:{code}"""
+        return f"nexus:node:pairing:{code}"
+    
+    def _k_node(self, tenant_id: str, node_id: str) -> str:
+        """nexus:node:{tenant_id}:{node_id}:state"""
+        return f"nexus:node:{tenant_id}:{node_id}:state"
+    
+    def _k_tenant_nodes(self, tenant_id: str) -> str:
+        """nexus:node:{tenant_id}:nodes (Set)"""
+        return f"nexus:node:{tenant_id}:nodes"
+    
+    def _k_node_commands(self, tenant_id: str, node_id: str) -> str:
+        """nexus:node:{tenant_id}:{node_id}:commands (List)"""
+        return f"nexus:node:{tenant_id}:{node_id}:commands"
+    
+    def _k_node_tenant_index(self) -> str:
+        """nexus:node:tenant_index (Hash: node_id → tenant_id)"""
+        return "nexus:node:tenant_index"
+    
+    # ============================================================
+    # Utilities
+    # ============================================================
+    
+    def _utc_iso(self, seconds: int = 0) -> str:
+        """UTC ISO 8601 timestamp"""
+        dt = datetime.now(timezone.utc)
+        if seconds:
+            dt += timedelta(seconds=seconds)
+        return dt.isoformat()
+    
+    @staticmethod
+    def _new_pairing_code() -> str:
+        """6자리 대문자+숫자"""
+        alphabet = string.ascii_uppercase + string.digits
+        return ''.join(secrets.choice(alphabet) for _ in range(6))
+    
+    @staticmethod
+    def _decode_node(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """HGETALL 결과 → 노드 상태 (info 필드는 JSON 파싱)"""
+        if not data:
+            return None
+        if "info" in data:
+            data["info"] = json.loads(data["info"])
+        return data
+
+
+class NodeStore(_NodeStoreBase):
     """Redis-backed store for Windows Node state management"""
     
     def __init__(self, redis_url: str = "redis://localhost:6379/0"):
-        self.r = redis.from_url(redis_url, decode_responses=True)
+        self.r = get_redis(redis_url)
     
     # ============================================================
     # Pairing (Enrollment)
@@ -32,9 +89,8 @@ class NodeStore:
             pairing_code: "ABC123" 형식
         """
         # 6자리 랜덤 코드 생성 (충돌 방지)
-        alphabet = string.ascii_uppercase + string.digits
         for _ in range(10):  # 최대 10회 재시도
-            code = ''.join(secrets.choice(alphabet) for _ in range(6))
+            code = self._new_pairing_code()
             key = self._k_pairing_code(code)
             
             # SETNX로 중복 방지
@@ -93,8 +149,29 @@ class NodeStore:
         nodes_key = self._k_tenant_nodes(tenant_id)
         self.r.sadd(nodes_key, node_id)
         
+        # node_id → tenant_id 역색인 (poll/report에서 O(1) 조회)
+        self.r.hset(self._k_node_tenant_index(), node_id, tenant_id)
+        
         return tenant_id
     
+    def get_node_tenant(self, node_id: str) -> Optional[str]:
+        """노드의 테넌트 조회 (claim 시 기록된 역색인, HGET 1회)"""
+        return self.r.hget(self._k_node_tenant_index(), node_id)
+    
+    def resolve_node_tenant(self, node_id: str, candidates: Iterable[str] = ()) -> Optional[str]:
+        """
+        노드의 테넌트 조회. 역색인이 없는 노드(색인 도입 전 등록)는
+        candidates 테넌트를 순서대로 확인하고, 찾으면 색인을 채워 둔다.
+        """
+        tenant_id = self.get_node_tenant(node_id)
+        if tenant_id:
+            return tenant_id
+        for tid in candidates:
+            if self.r.exists(self._k_node(tid, node_id)):
+                self.r.hset(self._k_node_tenant_index(), node_id, tid)
+                return tid
+        return None
+    
     # ============================================================
     # Node Connection State
     # ============================================================
@@ -124,24 +201,16 @@ class NodeStore:
         if connection_type:
             updates["connection_type"] = connection_type
         
-        self.r.hset(node_key, mapping=updates)
-        
         # TTL 갱신 (노드가 오프라인되어도 30일간 보관)
-        self.r.expire(node_key, 30 * 86400)
+        pipe = self.r.pipeline(transaction=False)
+        pipe.hset(node_key, mapping=updates)
+        pipe.expire(node_key, 30 * 86400)
+        pipe.execute()
     
     def get_node_state(self, tenant_id: str, node_id: str) -> Optional[Dict[str, Any]]:
         """노드 상태 조회"""
         node_key = self._k_node(tenant_id, node_id)
-        data = self.r.hgetall(node_key)
-        
-        if not data:
-            return None
-        
-        # info 필드는 JSON 파싱
-        if "info" in data:
-            data["info"] = json.loads(data["info"])
-        
-        return data
+        return self._decode_node(self.r.hgetall(node_key))
     
     def list_tenant_nodes(
         self, 
@@ -190,11 +259,11 @@ class NodeStore:
         commands_key = self._k_node_commands(tenant_id, node_id)
         command["created_at"] = self._utc_iso()
         
-        # RPUSH: 큐의 끝에 추가
-        self.r.rpush(commands_key, json.dumps(command))
-        
-        # TTL 설정 (24시간)
-        self.r.expire(commands_key, 86400)
+        # RPUSH: 큐의 끝에 추가 (대기 중인 BLPOP이 즉시 깨어남) + TTL 설정 (24시간)
+        pipe = self.r.pipeline(transaction=False)
+        pipe.rpush(commands_key, json.dumps(command))
+        pipe.expire(commands_key, 86400)
+        pipe.execute()
     
     def pop_commands(
         self, 
@@ -214,49 +283,231 @@ class NodeStore:
             명령 목록 (FIFO 순서)
         """
         commands_key = self._k_node_commands(tenant_id, node_id)
+        if limit <= 0:
+            return []
         
-        commands = []
-        for _ in range(limit):
-            # LPOP: 큐의 앞에서 제거
-            cmd_raw = self.r.lpop(commands_key)
-            if not cmd_raw:
-                break
-            
-            try:
-                commands.append(json.loads(cmd_raw))
-            except json.JSONDecodeError:
-                # 파싱 실패 시 스킵
-                continue
+        # LRANGE + LTRIM을 MULTI로 묶어 1회 왕복 (동시에 poll해도 중복 전달 없음)
+        pipe = self.r.pipeline(transaction=True)
+        pipe.lrange(commands_key, 0, limit - 1)
+        pipe.ltrim(commands_key, limit, -1)
+        raws, _ = pipe.execute()
         
-        return commands
+        return decode_commands(raws)
+
+
+def decode_commands(raws: Iterable[str]) -> List[Dict[str, Any]]:
+    """큐에서 꺼낸 JSON 명령 디코드 (파싱 실패 시 스킵)"""
+    commands = []
+    for raw in raws:
+        try:
+            commands.append(json.loads(raw))
+        except (TypeError, json.JSONDecodeError):
+            continue
+    return commands
+
+
+class AsyncNodeStore(_NodeStoreBase):
+    """
+    NodeStore의 redis.asyncio 버전 (키 레이아웃/의미 동일)
     
-    # ============================================================
-    # Redis Key Helpers
-    # ============================================================
+    노드 엔드포인트(pairing/poll/command/report/list)가 사용한다. Redis 왕복 동안
+    스레드풀 스레드 대신 이벤트 루프의 소켓에서 대기한다. 에이전트/도구는 NodeStore를 쓴다.
+    """
     
-    def _k_pairing_code(self, code: str) -> str:
-        """nexus:node:pairing:{code}"""
-        return f"nexus:node:pairing:{code}"
+    def __init__(self, redis_url: str = "redis://localhost:6379/0"):
+        self.redis_url = redis_url
     
-    def _k_node(self, tenant_id: str, node_id: str) -> str:
-        """nexus:node:{tenant_id}:{node_id}:state"""
-        return f"nexus:node:{tenant_id}:{node_id}:state"
+    @property
+    def r(self) -> aioredis.Redis:
+        return get_async_redis(self.redis_url)
     
-    def _k_tenant_nodes(self, tenant_id: str) -> str:
-        """nexus:node:{tenant_id}:nodes (Set)"""
-        return f"nexus:node:{tenant_id}:nodes"
+    async def create_pairing_code(self, tenant_id: str, ttl_seconds: int = 300) -> str:
+        """NodeStore.create_pairing_code 참고 (SET NX EX로 생성+TTL 1회 왕복)"""
+        for _ in range(10):
+            code = self._new_pairing_code()
+            created = await self.r.set(self._k_pairing_code(code), json.dumps({
+                "tenant_id": tenant_id,
+                "created_at": self._utc_iso(),
+                "expires_at": self._utc_iso(seconds=ttl_seconds)
+            }), nx=True, ex=ttl_seconds)
+            if created:
+                return code
+        
+        raise RuntimeError("Failed to generate unique pairing code after 10 attempts")
     
-    def _k_node_commands(self, tenant_id: str, node_id: str) -> str:
-        """nexus:node:{tenant_id}:{node_id}:commands (List)"""
-        return f"nexus:node:{tenant_id}:{node_id}:commands"
+    async def claim_pairing_code(
+        self,
+        pairing_code: str,
+        node_id: str,
+        node_info: Dict[str, Any]
+    ) -> Optional[str]:
+        """NodeStore.claim_pairing_code 참고 (GETDEL로 일회용 보장, 등록은 MULTI 1회)"""
+        data_raw = await self.r.getdel(self._k_pairing_code(pairing_code))
+        if not data_raw:
+            return None
+        
+        tenant_id = json.loads(data_raw)["tenant_id"]
+        async with self.r.pipeline(transaction=True) as pipe:
+            pipe.hset(self._k_node(tenant_id, node_id), mapping={
+                "node_id": node_id,
+                "tenant_id": tenant_id,
+                "status": "enrolled",
+                "enrolled_at": self._utc_iso(),
+                "info": json.dumps(node_info)
+            })
+            pipe.sadd(self._k_tenant_nodes(tenant_id), node_id)
+            pipe.hset(self._k_node_tenant_index(), node_id, tenant_id)
+            await pipe.execute()
+        return tenant_id
     
-    # ============================================================
-    # Utilities
-    # ============================================================
+    async def get_node_tenant(self, node_id: str) -> Optional[str]:
+        return await self.r.hget(self._k_node_tenant_index(), node_id)
     
-    def _utc_iso(self, seconds: int = 0) -> str:
-        """UTC ISO 8601 timestamp"""
-        dt = datetime.now(timezone.utc)
-        if seconds:
-            dt += timedelta(seconds=seconds)
-        return dt.isoformat()
+    async def resolve_node_tenant(self, node_id: str, candidates: Iterable[str] = ()) -> Optional[str]:
+        """NodeStore.resolve_node_tenant 참고"""
+        tenant_id = await self.get_node_tenant(node_id)
+        if tenant_id:
+            return tenant_id
+        for tid in candidates:
+            if await self.r.exists(self._k_node(tid, node_id)):
+                await self.r.hset(self._k_node_tenant_index(), node_id, tid)
+                return tid
+        return None
+    
+    async def set_node_state(
+        self,
+        tenant_id: str,
+        node_id: str,
+        status: str,
+        connection_type: Optional[str] = None
+    ) -> None:
+        node_key = self._k_node(tenant_id, node_id)
+        updates = {
+            "status": status,
+            "last_seen": self._utc_iso()
+        }
+        if connection_type:
+            updates["connection_type"] = connection_type
+        
+        async with self.r.pipeline(transaction=False) as pipe:
+            pipe.hset(node_key, mapping=updates)
+            pipe.expire(node_key, 30 * 86400)
+            await pipe.execute()
+    
+    async def get_node_state(self, tenant_id: str, node_id: str) -> Optional[Dict[str, Any]]:
+        return self._decode_node(await self.r.hgetall(self._k_node(tenant_id, node_id)))
+    
+    async def list_tenant_nodes(
+        self,
+        tenant_id: str,
+        status_filter: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """NodeStore.list_tenant_nodes 참고 (노드 상태는 파이프라인 1회 왕복)"""
+        node_ids = list(await self.r.smembers(self._k_tenant_nodes(tenant_id)))
+        if not node_ids:
+            return []
+        async with self.r.pipeline(transaction=False) as pipe:
+            for node_id in node_ids:
+                pipe.hgetall(self._k_node(tenant_id, node_id))
+            rows = await pipe.execute()
+        
+        nodes = []
+        for data in rows:
+            node = self._decode_node(data)
+            if node and (not status_filter or node.get("status") == status_filter):
+                nodes.append(node)
+        return nodes
+    
+    async def push_command(
+        self,
+        tenant_id: str,
+        node_id: str,
+        command: Dict[str, Any]
+    ) -> None:
+        commands_key = self._k_node_commands(tenant_id, node_id)
+        command["created_at"] = self._utc_iso()
+        
+        async with self.r.pipeline(transaction=False) as pipe:
+            pipe.rpush(commands_key, json.dumps(command))
+            pipe.expire(commands_key, 86400)
+            await pipe.execute()
+    
+    async def pop_commands(
+        self,
+        tenant_id: str,
+        node_id: str,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        if limit <= 0:
+            return []
+        commands_key = self._k_node_commands(tenant_id, node_id)
+        async with self.r.pipeline(transaction=True) as pipe:
+            pipe.lrange(commands_key, 0, limit - 1)
+            pipe.ltrim(commands_key, limit, -1)
+            raws, _ = await pipe.execute()
+        return decode_commands(raws)
+
+
+class NodeCommandWaiter:
+    """
+    Long-poll 명령 대기 (asyncio, BLPOP)
+    
+    큐에 명령이 있으면 즉시 일괄 반환하고, 비어 있으면 BLPOP으로 최대 timeout_s 동안
+    대기하다가 push_command의 RPUSH 시점에 깨어난다. 대기 중에는 이벤트 루프나
+    스레드풀을 점유하지 않고, 대기 중인 노드마다 Redis 연결 1개를 사용한다.
+    
+    pop_commands와 마찬가지로 at-most-once: BLPOP 응답을 받기 전에 클라이언트가 끊기면
+    그 명령은 유실될 수 있다.
+    """
+    
+    def __init__(self, redis_url: str, store: _NodeStoreBase):
+        self.redis_url = redis_url
+        self.store = store
+        self._r: Optional[aioredis.Redis] = None
+    
+    def _redis(self) -> aioredis.Redis:
+        if self._r is None:
+            self._r = aioredis.Redis.from_url(self.redis_url, decode_responses=True)
+        return self._r
+    
+    async def _pop(self, key: str, limit: int) -> List[str]:
+        if limit <= 0:
+            return []
+        async with self._redis().pipeline(transaction=True) as pipe:
+            pipe.lrange(key, 0, limit - 1)
+            pipe.ltrim(key, limit, -1)
+            raws, _ = await pipe.execute()
+        return raws
+    
+    async def wait(
+        self,
+        tenant_id: str,
+        node_id: str,
+        timeout_s: float,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        명령이 생길 때까지 대기 후 최대 limit개 반환 (timeout 시 빈 목록)
+        
+        Args:
+            timeout_s: 서버측 대기 시간 (0이면 대기 없이 즉시 반환)
+        """
+        key = self.store._k_node_commands(tenant_id, node_id)
+        raws = await self._pop(key, limit)
+        if raws or timeout_s <= 0 or limit <= 0:
+            return decode_commands(raws)
+        
+        # BLPOP timeout은 정수 초 (Redis < 6 호환)
+        item = await self._redis().blpop([key], timeout=max(1, math.ceil(timeout_s)))
+        if item is None:
+            return []
+        raws = [item[1]] + await self._pop(key, limit - 1)
+        return decode_commands(raws)
+    
+    async def close(self) -> None:
+        if self._r is not None:
+            try:
+                await self._r.aclose()
+            except Exception:
+                pass
+            self._r = None
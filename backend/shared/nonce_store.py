@@ -7,6 +7,8 @@ from typing import Optional
 
 import redis
 
+from shared.redis_client import get_redis
+
 class NonceStore:
     """Replay protection store: NX set with TTL (Redis), with file fallback."""
 
@@ -15,7 +17,7 @@ class NonceStore:
         self.file_path = file_path
         self.r: Optional[redis.Redis] = None
         try:
-            self.r = redis.Redis.from_url(redis_url, decode_responses=True)
+            self.r = get_redis(redis_url)
         except Exception:
             self.r = None
 
@@ -7,7 +7,7 @@ import time
 from dataclasses import dataclass
 from typing import Any, Dict, Optional, Tuple
 
-import redis
+from shared.redis_client import get_redis
 
 
 def _utc_iso() -> str:
@@ -34,7 +34,7 @@ class PlayEngine:
     """
 
     def __init__(self, redis_url: str, ttl_seconds: int = 86400):
-        self.r = redis.Redis.from_url(redis_url, decode_responses=True)
+        self.r = get_redis(redis_url)
         self.ttl = int(ttl_seconds)
 
         self._balance_pairs = [
@@ -11,9 +11,9 @@ from shared.metrics import llm_breaker_open
 logger = get_logger("provider_health")
 
 try:
-    import redis  # type: ignore
+    from shared.redis_client import get_redis, redis_available
 except Exception:  # pragma: no cover
-    redis = None  # type: ignore
+    get_redis = redis_available = None  # type: ignore
 
 
 @dataclass
@@ -36,13 +36,9 @@ class ProviderHealth:
         self.cooldown_seconds = int(getattr(settings, "breaker_cooldown_seconds", 120) or 120)
 
         self._redis = None
-        if redis is not None:
-            try:
-                self._redis = redis.Redis.from_url(settings.redis_url, decode_responses=True)
-                # ping to verify connectivity
-                self._redis.ping()
-            except Exception:
-                self._redis = None
+        # shared pool; connectivity is checked once per process (cached PING), not per instance
+        if redis_available is not None and redis_available(settings.redis_url):
+            self._redis = get_redis(settings.redis_url)
 
         self._file_path = "logs/provider_breaker_state.json"
 
@@ -0,0 +1,90 @@
+"""Text analyzers for the NaiveRAG inverted index.
+
+An analyzer turns text into index terms. Indexing and querying must use the same analyzer,
+so NaiveRAG pins one per tenant (changing it requires a reindex).
+
+  - word:        [A-Za-z0-9가-힣]{2,} runs (the original tokenizer)
+  - ko_particle: word + Korean particle (josa) stripping: "보고서를" -> "보고서를", "보고서"
+  - ko_bigram:   Hangul runs as character bigrams, other scripts as words
+  - ko_trigram:  Hangul runs as character trigrams, other scripts as words
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, Dict, List
+
+_WORD_RE = re.compile(r"[A-Za-z0-9가-힣]{2,}")
+_RUN_RE = re.compile(r"[가-힣]+|[A-Za-z0-9]+")
+_HANGUL_RE = re.compile(r"^[가-힣]+$")
+
+# longest first; only one particle is stripped and the stem must keep >= 2 syllables
+_PARTICLES = sorted(
+    {
+        "에서부터", "으로부터", "에게서", "한테서", "이라고", "에서는", "으로는", "에게는", "에서도",
+        "까지", "부터", "에서", "에게", "한테", "께서", "으로", "처럼", "보다", "이나", "이랑", "라고",
+        "와", "과", "을", "를", "이", "가", "은", "는", "에", "의", "도", "만", "로", "랑",
+    },
+    key=len,
+    reverse=True,
+)
+
+Analyzer = Callable[[str], List[str]]
+
+
+def analyze_word(text: str) -> List[str]:
+    if not text:
+        return []
+    return _WORD_RE.findall(text.lower())
+
+
+def strip_particle(token: str) -> str:
+    if not _HANGUL_RE.match(token):
+        return token
+    for p in _PARTICLES:
+        if token.endswith(p) and len(token) - len(p) >= 2:
+            return token[: -len(p)]
+    return token
+
+
+def analyze_ko_particle(text: str) -> List[str]:
+    out: List[str] = []
+    for tok in analyze_word(text):
+        out.append(tok)
+        stem = strip_particle(tok)
+        if stem != tok:
+            out.append(stem)
+    return out
+
+
+def _ngrams(n: int) -> Analyzer:
+    def analyze(text: str) -> List[str]:
+        if not text:
+            return []
+        out: List[str] = []
+        for run in _RUN_RE.findall(text.lower()):
+            if _HANGUL_RE.match(run):
+                if len(run) <= n:
+                    out.append(run)
+                else:
+                    out.extend(run[i:i + n] for i in range(len(run) - n + 1))
+            elif len(run) >= 2:
+                out.append(run)
+        return out
+
+    return analyze
+
+
+ANALYZERS: Dict[str, Analyzer] = {
+    "word": analyze_word,
+    "ko_particle": analyze_ko_particle,
+    "ko_bigram": _ngrams(2),
+    "ko_trigram": _ngrams(3),
+}
+
+
+def get_analyzer(name: str) -> Analyzer:
+    try:
+        return ANALYZERS[(name or "").strip().lower()]
+    except KeyError:
+        raise ValueError(f"unknown RAG analyzer: {name!r} (expected one of {sorted(ANALYZERS)})") from None
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 import hashlib
+import json
 import os
 import time
-from dataclasses import dataclass
-from typing import Any, Dict, List, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
-import redis
-
-from shared.doc_extract import HwpConversionRequired, extract_chunks
+from shared.doc_extract import extract_chunks
+from shared.extract_pool import ExtractPool, ExtractResult
+from shared.file_fingerprint import file_fingerprint
+from shared.rag_naive import RagDoc
+from shared.redis_client import get_redis
 
 
 def _utc_iso() -> str:
@@ -19,6 +22,20 @@ def _sha1(s: str) -> str:
     return hashlib.sha1(s.encode("utf-8", errors="ignore")).hexdigest()
 
 
+def _manifest_entry(size: int, mtime: int, fingerprint: str, doc_ids: Optional[List[str]]) -> str:
+    return json.dumps({"size": size, "mtime": mtime, "hash": fingerprint, "doc_ids": doc_ids}, ensure_ascii=False)
+
+
+def _parse_manifest(raw: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not raw:
+        return None
+    try:
+        entry = json.loads(raw)
+    except Exception:
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
 @dataclass
 class FolderIngestResult:
     ok: bool
@@ -32,23 +49,52 @@ class FolderIngestResult:
     started_at: str
     finished_at: str
     folder: str
+    unchanged: int = 0  # skipped because size/mtime changed but the content hash did not
+    removed_chunks: int = 0  # chunks deleted because their file no longer produces them
+    # seconds per stage: scan (walk/stat/manifest/hash), extract (summed over workers), write (redis), total (wall)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class _FileJob:
+    path: str  # as walked; file_manifest key
+    path_use: str  # file actually extracted (hwp -> sibling fallback)
+    rel: str
+    mtime: int
+    size: int
+    fingerprint: str
+    old_doc_ids: Optional[List[str]]  # None: unknown (pre-manifest entry)
+    new_ids: List[str] = field(default_factory=list)  # chunk doc_ids written so far
+
+    @property
+    def ext_use(self) -> str:
+        return os.path.splitext(self.path_use)[1].lower().lstrip(".")
 
 
 class RagFolderIngestor:
     """Incremental folder ingest into NaiveRAG.
 
-    - Tracks per-file mtime in Redis (tenant-scoped)
-    - Extracts text from pdf/docx/pptx/xlsx/txt/md
+    - Tracks a per-file manifest in Redis (tenant-scoped): size, mtime, content hash and the chunk
+      doc_ids it produced, read with one HMGET per directory. Files whose size/mtime changed but
+      whose content hash did not are skipped without parsing; a re-ingested file's chunks that
+      it no longer produces are deleted in the same batch.
+    - Chunks are written through NaiveRAG.ingest_many in batches of batch_size
+    - Extracts text from pdf/docx/pptx/xlsx/txt/md, optionally on a process pool (ExtractPool);
+      chunks stream in as each file is parsed and are written in batches
     - HWP requires prior conversion (preferred: sibling .pdf/.txt with same basename)
     """
 
     def __init__(self, redis_url: str, rag_engine: Any):
-        self.r = redis.Redis.from_url(redis_url, decode_responses=True)
+        self.r = get_redis(redis_url)
         self.rag = rag_engine
 
     def _k_index(self, tenant: str) -> str:
+        """Legacy per-file mtime hash; read as a fallback and migrated into the manifest."""
         return f"nexus:rag:{tenant}:file_index"
 
+    def _k_manifest(self, tenant: str) -> str:
+        return f"nexus:rag:{tenant}:file_manifest"
+
     def _k_last(self, tenant: str) -> str:
         return f"nexus:rag:{tenant}:last_ingest"
 
@@ -80,9 +126,20 @@ class RagFolderIngestor:
         max_chars_per_chunk: int = 12000,
         xlsx_cell_limit: int = 20000,
         max_retries: int = 3,
+        batch_size: int = 256,
+        workers: int = 0,
+        file_timeout_s: float = 120.0,
     ) -> FolderIngestResult:
+        """Walk folder -> extract (ExtractPool, `workers` processes; 0 = inline) -> batched writes.
+
+        The walk feeds the pool through its bounded queue and this thread is the only Redis
+        writer. A file whose extraction exceeds file_timeout_s is recorded as EXTRACT_TIMEOUT
+        (and queued for retry) instead of stalling the run.
+        """
         started = _utc_iso()
+        t_run = time.perf_counter()
         folder = os.path.abspath(folder)
+        batch_size = max(1, int(batch_size))
         errors: List[Dict[str, Any]] = []
         failed_files: List[str] = []
 
@@ -109,104 +166,208 @@ class RagFolderIngestor:
         ingested = 0
         skipped = 0
         pending_hwp = 0
+        unchanged = 0
+        removed = 0
+        timings = {"scan_s": 0.0, "extract_s": 0.0, "write_s": 0.0}
 
         idx_key = self._k_index(tenant)
+        manifest_key = self._k_manifest(tenant)
         failed_key = self._k_failed(tenant)
         retry_key = self._k_retry_count(tenant)
         limit_bytes = max_file_mb * 1024 * 1024
 
-        for root, _, files in os.walk(folder):
-            for fn in files:
-                scanned += 1
-                if scanned > max_files:
-                    break
+        # chunks, obsolete chunk ids and manifest entries are buffered and written together, so a
+        # file is only marked as ingested in the same flush that stores (and prunes) its chunks
+        docs: List[RagDoc] = []
+        obsolete: List[str] = []
+        marks: Dict[str, str] = {}
+
+        def flush() -> None:
+            nonlocal removed
+            t0 = time.perf_counter()
+            if docs or obsolete:
+                removed += int(self.rag.ingest_many(tenant, docs, delete_ids=obsolete).get("deleted") or 0)
+                docs.clear()
+                obsolete.clear()
+            if marks:
+                pipe = self.r.pipeline(transaction=False)
+                pipe.hset(manifest_key, mapping=marks)
+                pipe.hdel(idx_key, *marks)
+                pipe.execute()
+                marks.clear()
+            timings["write_s"] += time.perf_counter() - t0
+
+        def record_failure(path: str) -> None:
+            retry_count = int(self.r.hget(retry_key, path) or 0)
+            if retry_count < max_retries:
+                self.r.zadd(failed_key, {path: retry_count + 1})
+                self.r.hset(retry_key, path, str(retry_count + 1))
+                failed_files.append(path)
 
-                path = os.path.join(root, fn)
-                ext = os.path.splitext(fn)[1].lower().lstrip(".")
-                if ext not in allow:
-                    continue
-                candidates += 1
+        def scan() -> Iterator[_FileJob]:
+            nonlocal scanned, candidates, skipped, pending_hwp, unchanged
+            for root, _, files in os.walk(folder):
+                if scanned >= max_files:
+                    return
+                files = files[: max_files - scanned]
+                scanned += len(files)
+
+                # (path, ext, stat) of this directory's eligible files, then one round-trip for their manifest entries
+                eligible: List[Tuple[str, str, os.stat_result]] = []
+                for fn in files:
+                    path = os.path.join(root, fn)
+                    ext = os.path.splitext(fn)[1].lower().lstrip(".")
+                    if ext not in allow:
+                        continue
+                    candidates += 1
 
-                try:
-                    st = os.stat(path)
-                except Exception as e:
-                    skipped += 1
-                    errors.append({"path": path, "error": "STAT_FAILED", "detail": str(e)})
-                    continue
+                    try:
+                        st = os.stat(path)
+                    except Exception as e:
+                        skipped += 1
+                        errors.append({"path": path, "error": "STAT_FAILED", "detail": str(e)})
+                        continue
 
-                if st.st_size <= 0 or st.st_size > limit_bytes:
-                    skipped += 1
-                    continue
+                    if st.st_size <= 0 or st.st_size > limit_bytes:
+                        skipped += 1
+                        continue
+                    eligible.append((path, ext, st))
 
-                mtime = int(st.st_mtime)
-                prev = self.r.hget(idx_key, path)
-                if prev and int(prev) >= mtime:
-                    skipped += 1
+                if not eligible:
                     continue
-
-                path_use = path
-                if ext == "hwp":
-                    fb = self._find_hwp_fallback(path)
-                    if fb:
-                        path_use = fb
-                    else:
-                        pending_hwp += 1
+                paths = [path for path, _, _ in eligible]
+                pipe = self.r.pipeline(transaction=False)
+                pipe.hmget(manifest_key, paths)
+                pipe.hmget(idx_key, paths)
+                entries, legacy = pipe.execute()
+
+                for (path, ext, st), raw, prev in zip(eligible, entries, legacy):
+                    size = int(st.st_size)
+                    mtime = int(st.st_mtime)
+                    entry = _parse_manifest(raw)
+                    if entry and entry.get("size") == size and entry.get("mtime") == mtime:
                         skipped += 1
-                        self.r.hset(idx_key, path, str(mtime))
+                        continue
+                    try:
+                        fp = file_fingerprint(path, size)
+                    except Exception as e:
+                        skipped += 1
+                        errors.append({"path": path, "error": "READ_FAILED", "detail": str(e)})
+                        continue
+                    if entry is None and prev and int(prev) >= mtime:
+                        # ingested before the manifest existed: adopt it; its chunk ids are looked up if it changes
+                        skipped += 1
+                        marks[path] = _manifest_entry(size, mtime, fp, None)
+                        continue
+                    if entry and entry.get("hash") == fp:
+                        # touched (sync tool, copy) but same content
+                        unchanged += 1
+                        skipped += 1
+                        marks[path] = _manifest_entry(size, mtime, fp, entry.get("doc_ids"))
                         continue
 
-                rel = os.path.relpath(path_use, folder).replace(os.sep, "/")
-                base_doc_id = f"{rel}::{_sha1(path_use)}"
-
-                try:
-                    chunks = extract_chunks(path_use, max_chars=max_chars_per_chunk, xlsx_cell_limit=xlsx_cell_limit)
-                except HwpConversionRequired as e:
+                    old_ids = entry.get("doc_ids") if entry else []
+                    path_use = path
+                    if ext == "hwp":
+                        fb = self._find_hwp_fallback(path)
+                        if fb:
+                            path_use = fb
+                        else:
+                            pending_hwp += 1
+                            skipped += 1
+                            marks[path] = _manifest_entry(size, mtime, fp, old_ids)
+                            continue
+
+                    rel = os.path.relpath(path_use, folder).replace(os.sep, "/")
+                    yield _FileJob(
+                        path=path,
+                        path_use=path_use,
+                        rel=rel,
+                        mtime=mtime,
+                        size=size,
+                        fingerprint=fp,
+                        old_doc_ids=old_ids,
+                    )
+
+        def handle(res: ExtractResult) -> None:
+            nonlocal ingested, skipped, pending_hwp
+            job: _FileJob = res.key
+            timings["extract_s"] += res.seconds
+            base_doc_id = f"{job.rel}::{_sha1(job.path_use)}"
+
+            # chunks arrive in batches while the file is parsed; they are written as the buffer fills
+            for ch in res.chunks:
+                doc_id = f"{base_doc_id}::{ch.chunk_id}"
+                meta = {
+                    "source_path": job.path_use,
+                    "source_rel": job.rel,
+                    "source_ext": job.ext_use,
+                    "source_mtime": job.mtime,
+                    "source_size": job.size,
+                    "chunk_id": ch.chunk_id,
+                }
+                meta.update(ch.meta or {})
+                docs.append(RagDoc(doc_id=doc_id, text=ch.text, meta=meta))
+                job.new_ids.append(doc_id)
+                ingested += 1
+            if not res.done:
+                if len(docs) >= batch_size:
+                    flush()
+                return
+
+            new_ids = list(dict.fromkeys(job.new_ids))
+            if res.error:
+                # keep the previous chunks (plus any written before the failure) and leave hash empty so
+                # the content is never seen as unchanged; re-walked when it changes again or retried via failed_files
+                known = None if job.old_doc_ids is None else list(dict.fromkeys(job.old_doc_ids + new_ids))
+                marks[job.path] = _manifest_entry(job.size, job.mtime, "", known)
+                skipped += 1
+                if res.error == "HWP_CONVERSION_REQUIRED":
                     pending_hwp += 1
-                    skipped += 1
-                    self.r.hset(idx_key, path, str(mtime))
-                    errors.append({"path": path, "error": "HWP_CONVERSION_REQUIRED", "detail": str(e)})
-                    
-                    # Add to failed queue for retry
-                    retry_count = int(self.r.hget(retry_key, path) or 0)
-                    if retry_count < max_retries:
-                        self.r.zadd(failed_key, {path: retry_count + 1})
-                        self.r.hset(retry_key, path, str(retry_count + 1))
-                        failed_files.append(path)
-                    continue
-                except Exception as e:
-                    skipped += 1
-                    self.r.hset(idx_key, path, str(mtime))
-                    errors.append({"path": path_use, "error": "EXTRACT_FAILED", "detail": str(e)})
-                    
-                    # Add to failed queue for retry
-                    retry_count = int(self.r.hget(retry_key, path) or 0)
-                    if retry_count < max_retries:
-                        self.r.zadd(failed_key, {path: retry_count + 1})
-                        self.r.hset(retry_key, path, str(retry_count + 1))
-                        failed_files.append(path)
-                    continue
-
-                if not chunks:
-                    skipped += 1
-                    self.r.hset(idx_key, path, str(mtime))
-                    continue
-
-                for ch in chunks:
-                    doc_id = f"{base_doc_id}::{ch.chunk_id}"
-                    meta = {
-                        "source_path": path_use,
-                        "source_rel": rel,
-                        "source_ext": os.path.splitext(path_use)[1].lower().lstrip("."),
-                        "source_mtime": mtime,
-                        "source_size": int(st.st_size),
-                        "chunk_id": ch.chunk_id,
-                    }
-                    meta.update(ch.meta or {})
-                    self.rag.ingest(tenant_id=tenant, doc_id=doc_id, text=ch.text, meta=meta)
-                    ingested += 1
-
-                self.r.hset(idx_key, path, str(mtime))
-
+                    errors.append({"path": job.path, "error": res.error, "detail": res.detail})
+                else:
+                    errors.append({"path": job.path_use, "error": res.error, "detail": res.detail})
+                record_failure(job.path)
+                return
+
+            old_ids = job.old_doc_ids
+            if old_ids is None:
+                old_ids = self.rag.doc_ids_with_prefix(tenant, f"{base_doc_id}::")
+            keep = set(new_ids)
+            obsolete.extend(d for d in old_ids if d not in keep)
+            if not new_ids:
+                skipped += 1
+            marks[job.path] = _manifest_entry(job.size, job.mtime, job.fingerprint, new_ids)
+            if len(docs) + len(obsolete) >= batch_size:
+                flush()
+
+        with ExtractPool(
+            workers,
+            timeout_s=file_timeout_s,
+            max_chars=max_chars_per_chunk,
+            xlsx_cell_limit=xlsx_cell_limit,
+        ) as pool:
+            jobs = scan()
+            while True:
+                t0 = time.perf_counter()
+                job = next(jobs, None)
+                timings["scan_s"] += time.perf_counter() - t0
+                if job is None:
+                    break
+                pool.submit(job, job.path_use)
+                for res in pool.poll(0):
+                    handle(res)
+                while pool.full():
+                    for res in pool.poll():
+                        handle(res)
+            while pool.outstanding():
+                for res in pool.poll():
+                    handle(res)
+
+        flush()
+
+        timings = {k: round(v, 3) for k, v in timings.items()}
+        timings["total_s"] = round(time.perf_counter() - t_run, 3)
         finished = _utc_iso()
         res = FolderIngestResult(
             ok=True,
@@ -220,6 +381,9 @@ class RagFolderIngestor:
             started_at=started,
             finished_at=finished,
             folder=folder,
+            unchanged=unchanged,
+            removed_chunks=removed,
+            timings=timings,
         )
         self.r.set(self._k_last(tenant), str(res.__dict__))
         return res
@@ -270,7 +434,6 @@ class RagFolderIngestor:
         skipped = 0
         pending_hwp = 0
 
-        idx_key = self._k_index(tenant)
         failed_key = self._k_failed(tenant)
         retry_key = self._k_retry_count(tenant)
 
@@ -306,6 +469,7 @@ class RagFolderIngestor:
                 # Success: ingest and remove from failed queue
                 base_doc_id = f"{path}::{_sha1(path_use)}"
                 st = os.stat(path)
+                docs: List[RagDoc] = []
                 for ch in chunks:
                     doc_id = f"{base_doc_id}::{ch.chunk_id}"
                     meta = {
@@ -317,13 +481,18 @@ class RagFolderIngestor:
                         "chunk_id": ch.chunk_id,
                     }
                     meta.update(ch.meta or {})
-                    self.rag.ingest(tenant=tenant, doc_id=doc_id, text=ch.text, meta=meta)
-                    ingested += 1
+                    docs.append(RagDoc(doc_id=doc_id, text=ch.text, meta=meta))
+                new_ids = [d.doc_id for d in docs]
+                prev = _parse_manifest(self.r.hget(self._k_manifest(tenant), path)) or {}
+                self.rag.ingest_many(tenant, docs, delete_ids=[d for d in prev.get("doc_ids") or [] if d not in new_ids])
+                ingested += len(docs)
 
                 # Remove from failed queue
                 self.r.zrem(failed_key, path)
                 self.r.hdel(retry_key, path)
-                self.r.hset(idx_key, path, str(int(st.st_mtime)))
+                size = int(st.st_size)
+                entry = _manifest_entry(size, int(st.st_mtime), file_fingerprint(path, size), new_ids)
+                self.r.hset(self._k_manifest(tenant), path, entry)
 
             except Exception as e:
                 errors.append({"path": path, "error": "RETRY_FAILED", "detail": str(e)})
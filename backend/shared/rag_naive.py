@@ -1,28 +1,27 @@
 from __future__ import annotations
 
+import asyncio
 import json
-import re
+import math
 import time
+from collections import Counter
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
 
 import redis
+import redis.asyncio as aioredis
 
+from shared.logging_utils import get_logger
+from shared.rag_analyzers import Analyzer, get_analyzer
+from shared.redis_client import get_async_redis, get_redis
 
-_TOKEN_RE = re.compile(r"[A-Za-z0-9가-힣]{2,}")
+logger = get_logger("rag_naive")
 
 
 def _utc_iso() -> str:
     return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
 
-def _tokens(text: str) -> List[str]:
-    if not text:
-        return []
-    t = text.lower()
-    return _TOKEN_RE.findall(t)
-
-
 @dataclass
 class RagDoc:
     doc_id: str
@@ -30,72 +29,232 @@ class RagDoc:
     meta: Dict[str, Any]
 
 
-class NaiveRAG:
+class _NaiveRAGBase:
     """
     P0-grade RAG in Redis:
       - stores full text per doc_id
-      - query uses token-overlap scoring (fast, deterministic, no embeddings)
+      - query is BM25 over a per-tenant inverted index (fast, deterministic, no embeddings)
     This is intentionally simple so it can be swapped with vector DB later.
 
+    The index is maintained at ingest/delete time; query reads only the postings of the
+    query terms plus the lengths/payloads of the candidate docs (no per-document scan).
+
     Keys (per tenant):
       - nexus:rag:{tenant}:docs  (hash) doc_id -> json({text, meta, ingested_at})
+      - nexus:rag:{tenant}:idx:t:{term}  (hash) doc_id -> term frequency  (df = HLEN)
+      - nexus:rag:{tenant}:idx:len  (hash) doc_id -> length in tokens
+      - nexus:rag:{tenant}:idx:terms  (hash) doc_id -> json([term, ...])  (forward index, for delete)
+      - nexus:rag:{tenant}:idx:stats  (hash) n_docs, total_len
+      - nexus:rag:{tenant}:idx:analyzer  (string) analyzer name the index was built with
+
+    Terms come from a pluggable analyzer (shared.rag_analyzers), pinned per tenant on first
+    ingest; set_analyzer() switches it and rebuilds that tenant's index.
+
+    Index writes (ingest, delete, reindex) read the old index entries of their docs and the
+    analyzer pin under WATCH of idx:terms + idx:analyzer and commit in one MULTI, retried when
+    another writer got in between: concurrent writes of the same doc_id cannot count it twice
+    in idx:stats, and a write tokenized with a stale (cached) analyzer is re-tokenized with
+    the pinned one instead of mixing token schemes in one index.
+
+    Docs stored before the index existed have no index entries. A query that sees fewer
+    entries in idx:len than docs in the docs hash logs a warning and rebuilds that tenant's
+    index once per process (reindex()) before answering; tools/rag_reindex.py does the same
+    ahead of time.
+
+    NaiveRAG (sync redis-py) and AsyncNaiveRAG (redis.asyncio) share this layout, the index
+    writes and the scoring; only the round-trips differ.
     """
 
-    def __init__(self, redis_url: str):
-        self.r = redis.Redis.from_url(redis_url, decode_responses=True)
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+
+    ANALYZER_CACHE_TTL_S = 60.0
+    INDEX_WRITE_RETRIES = 50
+
+    def __init__(self, redis_url: str, default_analyzer: str = "ko_particle"):
+        get_analyzer(default_analyzer)
+        self.default_analyzer = default_analyzer
+        self._analyzer_cache: Dict[str, Tuple[float, str]] = {}
+        self._backfilled: Set[str] = set()
 
     def _k(self, tenant: str) -> str:
         return f"nexus:rag:{tenant}:docs"
 
-    def ingest(self, tenant: str, doc_id: str, text: str, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        if not doc_id:
+    def _ki(self, tenant: str, suffix: str) -> str:
+        return f"nexus:rag:{tenant}:idx:{suffix}"
+
+    def _kt(self, tenant: str, term: str) -> str:
+        return self._ki(tenant, f"t:{term}")
+
+    # ---- analyzer (per tenant) ----
+    def _cached_analyzer(self, tenant: str) -> Optional[str]:
+        hit = self._analyzer_cache.get(tenant)
+        if hit and time.monotonic() - hit[0] < self.ANALYZER_CACHE_TTL_S:
+            return hit[1]
+        return None
+
+    def _cache_analyzer(self, tenant: str, stored: Optional[str]) -> str:
+        name = stored or self.default_analyzer
+        self._analyzer_cache[tenant] = (time.monotonic(), name)
+        return name
+
+    def _write_analyzer(self, tenant: str, pinned: Optional[str], current: str) -> str:
+        """Analyzer an index write must use, given the pin read under WATCH (current if unpinned)."""
+        if pinned and pinned != current:
+            return self._cache_analyzer(tenant, pinned)
+        return current
+
+    # ---- index maintenance ----
+    def _unindex(self, pipe: Any, tenant: str, doc_id: str, old_terms_raw: Optional[str], old_len: Optional[str]) -> None:
+        if old_terms_raw is None:
+            return
+        try:
+            old_terms = json.loads(old_terms_raw)
+        except Exception:
+            old_terms = []
+        for term in old_terms:
+            pipe.hdel(self._kt(tenant, term), doc_id)
+        pipe.hdel(self._ki(tenant, "terms"), doc_id)
+        pipe.hdel(self._ki(tenant, "len"), doc_id)
+        pipe.hincrby(self._ki(tenant, "stats"), "n_docs", -1)
+        pipe.hincrby(self._ki(tenant, "stats"), "total_len", -int(old_len or 0))
+
+    def _index(self, pipe: Any, tenant: str, doc_id: str, tf: Counter) -> None:
+        length = sum(tf.values())
+        for term, n in tf.items():
+            pipe.hset(self._kt(tenant, term), doc_id, n)
+        pipe.hset(self._ki(tenant, "terms"), doc_id, json.dumps(sorted(tf), ensure_ascii=False))
+        pipe.hset(self._ki(tenant, "len"), doc_id, length)
+        pipe.hincrby(self._ki(tenant, "stats"), "n_docs", 1)
+        pipe.hincrby(self._ki(tenant, "stats"), "total_len", length)
+
+    @staticmethod
+    def _term_freqs(texts: Sequence[str], analyze: Analyzer) -> List[Counter]:
+        return [Counter(analyze(text)) for text in texts]
+
+    def _watch_keys(self, tenant: str) -> List[str]:
+        # every index write changes idx:terms; set_analyzer() changes idx:analyzer
+        return [self._ki(tenant, "terms"), self._ki(tenant, "analyzer")]
+
+    def _index_write_failed(self, tenant: str) -> RuntimeError:
+        return RuntimeError(f"rag index of {tenant}: gave up after {self.INDEX_WRITE_RETRIES} concurrent-write retries")
+
+    @staticmethod
+    def _payload(doc: RagDoc) -> Dict[str, Any]:
+        if not doc.doc_id:
             raise ValueError("doc_id required")
-        if not text or not text.strip():
+        if not doc.text or not doc.text.strip():
             raise ValueError("text required")
-
-        payload = {
-            "doc_id": doc_id,
-            "text": text,
-            "meta": meta or {},
+        return {
+            "doc_id": doc.doc_id,
+            "text": doc.text,
+            "meta": doc.meta or {},
             "ingested_at": _utc_iso(),
-            "len": len(text),
+            "len": len(doc.text),
         }
-        self.r.hset(self._k(tenant), doc_id, json.dumps(payload, ensure_ascii=False))
-        return {"ok": True, "doc_id": doc_id, "len": len(text)}
 
-    def delete(self, tenant: str, doc_id: str) -> Dict[str, Any]:
-        removed = self.r.hdel(self._k(tenant), doc_id)
-        return {"ok": True, "doc_id": doc_id, "removed": int(removed)}
+    def _batch(self, docs: Sequence[RagDoc], delete_ids: Sequence[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        batch: Dict[str, Dict[str, Any]] = {}
+        for doc in docs:
+            batch[doc.doc_id] = self._payload(doc)
+        drop = [d for d in dict.fromkeys(delete_ids) if d and d not in batch]
+        return batch, drop
 
-    def list_docs(self, tenant: str, limit: int = 50) -> List[Dict[str, Any]]:
-        k = self._k(tenant)
-        ids = self.r.hkeys(k)[: int(limit)]
-        out = []
-        for doc_id in ids:
-            raw = self.r.hget(k, doc_id)
-            if not raw:
-                continue
-            try:
-                j = json.loads(raw)
-            except Exception:
+    def _queue_ingest(
+        self,
+        pipe: Any,
+        tenant: str,
+        analyzer: str,
+        batch: Dict[str, Dict[str, Any]],
+        drop: List[str],
+        olds: List[Tuple[Optional[str], Optional[str]]],
+        tfs: List[Counter],
+    ) -> None:
+        pipe.set(self._ki(tenant, "analyzer"), analyzer, nx=True)
+        if drop:
+            pipe.hdel(self._k(tenant), *drop)
+        if batch:
+            pipe.hset(self._k(tenant), mapping={d: json.dumps(p, ensure_ascii=False) for d, p in batch.items()})
+        for i, (doc_id, (old_terms, old_len)) in enumerate(zip(list(batch) + drop, olds)):
+            self._unindex(pipe, tenant, doc_id, old_terms, old_len)
+            if doc_id in batch:
+                self._index(pipe, tenant, doc_id, tfs[i])
+
+    @staticmethod
+    def _doc_summary(doc_id: str, raw: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not raw:
+            return None
+        try:
+            j = json.loads(raw)
+        except Exception:
+            return None
+        return {"doc_id": j.get("doc_id", doc_id), "len": j.get("len", 0), "meta": j.get("meta", {}), "ingested_at": j.get("ingested_at", "")}
+
+    # ---- query ----
+    @staticmethod
+    def _query_terms(q: str, analyze: Analyzer) -> List[str]:
+        return sorted(set(analyze(q)))
+
+    def _queue_postings(self, pipe: Any, tenant: str, qterms: List[str]) -> None:
+        pipe.hlen(self._k(tenant))
+        pipe.hlen(self._ki(tenant, "len"))
+        pipe.hmget(self._ki(tenant, "stats"), "n_docs", "total_len")
+        for term in qterms:
+            pipe.hgetall(self._kt(tenant, term))
+
+    def _needs_backfill(self, tenant: str, n_stored: int, n_indexed: int) -> bool:
+        """True (once per tenant and process) when stored docs are missing from the index."""
+        missing = int(n_stored) - int(n_indexed)
+        if missing <= 0 or tenant in self._backfilled:
+            return False
+        self._backfilled.add(tenant)
+        logger.warning("rag %s: %d of %d docs are not indexed (stored before the BM25 index?); reindexing", tenant, missing, n_stored)
+        return True
+
+    def _backfill_failed(self, tenant: str, e: Exception) -> None:
+        self._backfilled.discard(tenant)  # retried by the next query
+        logger.error("rag %s: reindex failed, answering from the partial index: %s", tenant, e)
+
+    def _rank(self, n_docs: int, avgdl: float, postings: List[Dict[str, str]], dl: Dict[str, float]) -> List[Tuple[float, str]]:
+        k1, b = self.BM25_K1, self.BM25_B
+        scores: Dict[str, float] = {}
+        for p in postings:
+            df = len(p)
+            if df <= 0:
                 continue
-            out.append({"doc_id": j.get("doc_id", doc_id), "len": j.get("len", 0), "meta": j.get("meta", {}), "ingested_at": j.get("ingested_at", "")})
-        return out
+            idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf_raw in p.items():
+                tf = float(tf_raw)
+                norm = tf + k1 * (1.0 - b + b * dl[doc_id] / avgdl)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * (tf * (k1 + 1.0)) / norm
+        ranked = [(sc, doc_id) for doc_id, sc in scores.items()]
+        ranked.sort(key=lambda x: (-x[0], x[1]))
+        return ranked
 
-    def query(self, tenant: str, q: str, top_k: int = 5, max_docs_scan: int = 200) -> List[Dict[str, Any]]:
-        q = (q or "").strip()
-        if not q:
-            raise ValueError("query required")
-        qtok = set(_tokens(q))
-        if not qtok:
-            # fallback: short query -> treat as raw substring
-            qtok = {q.lower()}
+    @staticmethod
+    def _collection_stats(stats: List[Any]) -> Tuple[int, float]:
+        n_raw, total_raw = stats
+        n_docs = max(0, int(n_raw or 0))
+        return n_docs, max(1.0, float(total_raw or 0) / n_docs) if n_docs > 0 else 1.0
 
-        k = self._k(tenant)
-        doc_ids = self.r.hkeys(k)[: int(max_docs_scan)]
-        scored = []
-        for doc_id in doc_ids:
-            raw = self.r.hget(k, doc_id)
+    @staticmethod
+    def _snippet(text: str, q: str, qterms: List[str]) -> Tuple[str, int]:
+        # only runs on the top_k hits, never as a recall path
+        tl = text.lower()
+        idx = tl.find(q.lower())
+        if idx < 0:
+            hits = [i for i in (tl.find(t) for t in qterms) if i >= 0]
+            idx = min(hits) if hits else -1
+        if idx < 0:
+            # best-effort snippet: first 240 chars
+            return text[:240], 0
+        lo = max(0, idx - 80)
+        hi = min(len(text), idx + 160)
+        return text[lo:hi], idx
+
+    def _hits(self, ranked: List[Tuple[float, str]], raws: List[Optional[str]], q: str, qterms: List[str]) -> List[Dict[str, Any]]:
+        out = []
+        for (score, doc_id), raw in zip(ranked, raws):
             if not raw:
                 continue
             try:
@@ -103,33 +262,9 @@ class NaiveRAG:
             except Exception:
                 continue
             text = j.get("text", "") or ""
-            tok = set(_tokens(text))
-            overlap = len(qtok.intersection(tok))
-            if overlap <= 0:
-                # substring boost
-                if q.lower() in text.lower():
-                    overlap = 1
-                else:
-                    continue
-            scored.append((overlap, j))
-
-        scored.sort(key=lambda x: x[0], reverse=True)
-        out = []
-        for score, j in scored[: int(top_k)]:
-            text = j.get("text", "") or ""
             meta = j.get("meta", {})
-            qlower = q.lower()
-            idx = text.lower().find(qlower)
-            if idx < 0:
-                # best-effort snippet: first 240 chars
-                snippet = text[:240]
-                offset = 0
-            else:
-                lo = max(0, idx - 80)
-                hi = min(len(text), idx + 160)
-                snippet = text[lo:hi]
-                offset = idx
-            
+            snippet, offset = self._snippet(text, q, qterms)
+
             # Evidence: doc_id, chunk_id, page, offset
             evidence = {
                 "doc_id": j.get("doc_id", ""),
@@ -139,13 +274,313 @@ class NaiveRAG:
                 "source_path": meta.get("source_path", ""),
                 "source_rel": meta.get("source_rel", ""),
             }
-            
+
             out.append({
                 "doc_id": j.get("doc_id", ""),
-                "score": int(score),
+                "score": round(score, 4),
                 "snippet": snippet.replace("\n", " ").strip(),
                 "evidence": evidence,
                 "meta": meta,
                 "ingested_at": j.get("ingested_at", ""),
             })
         return out
+
+
+class NaiveRAG(_NaiveRAGBase):
+    """BM25 RAG on the sync redis-py client (agents, tools, folder ingest, the command endpoint)."""
+
+    def __init__(self, redis_url: str, default_analyzer: str = "ko_particle"):
+        super().__init__(redis_url, default_analyzer)
+        self.r = get_redis(redis_url)
+
+    # ---- analyzer (per tenant) ----
+    def analyzer_name(self, tenant: str) -> str:
+        name = self._cached_analyzer(tenant)
+        if name is None:
+            name = self._cache_analyzer(tenant, self.r.get(self._ki(tenant, "analyzer")))
+        return name
+
+    def _analyzer(self, tenant: str) -> Analyzer:
+        return get_analyzer(self.analyzer_name(tenant))
+
+    def set_analyzer(self, tenant: str, name: str) -> Dict[str, Any]:
+        """Switch the tenant's analyzer and rebuild its index with it."""
+        get_analyzer(name)
+        self.r.set(self._ki(tenant, "analyzer"), name)
+        self._analyzer_cache.pop(tenant, None)
+        res = self.reindex(tenant)
+        return {**res, "analyzer": name}
+
+    # ---- index maintenance ----
+    def _index_write(self, tenant: str, doc_ids: Sequence[str], queue: Callable[[Any, Optional[str], List[Any]], None]) -> List[Any]:
+        """Run queue(pipe, pinned analyzer, [(old terms json, old length) per doc_id]) as one MULTI.
+
+        The pin and the old index entries are read under WATCH (see the class docstring); the
+        whole read + queue is retried if another writer changed the index in between.
+        """
+        with self.r.pipeline(transaction=True) as pipe:
+            for _ in range(self.INDEX_WRITE_RETRIES):
+                try:
+                    pipe.watch(*self._watch_keys(tenant))
+                    pinned = pipe.get(self._ki(tenant, "analyzer"))
+                    olds: List[Any] = []
+                    if doc_ids:
+                        olds = list(zip(pipe.hmget(self._ki(tenant, "terms"), list(doc_ids)),
+                                        pipe.hmget(self._ki(tenant, "len"), list(doc_ids))))
+                    pipe.multi()
+                    queue(pipe, pinned, olds)
+                    return pipe.execute()
+                except redis.WatchError:
+                    continue
+        raise self._index_write_failed(tenant)
+
+    def ingest(self, tenant: str, doc_id: str, text: str, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        self.ingest_many(tenant, [RagDoc(doc_id=doc_id, text=text, meta=meta or {})])
+        return {"ok": True, "doc_id": doc_id, "len": len(text)}
+
+    def ingest_many(self, tenant: str, docs: Sequence[RagDoc], delete_ids: Sequence[str] = ()) -> Dict[str, Any]:
+        """Store + index a batch of docs: one read of their old index entries, one MULTI for all writes.
+
+        delete_ids (e.g. chunks a changed file no longer produces) are removed in the same MULTI;
+        ids that are also in docs are kept. Raises ValueError (nothing written) if any doc lacks
+        doc_id/text. Later duplicates win.
+        """
+        batch, drop = self._batch(docs, delete_ids)
+        if not batch and not drop:
+            return {"ok": True, "ingested": 0, "deleted": 0}
+
+        texts = [p["text"] for p in batch.values()]
+        analyzer = self.analyzer_name(tenant)
+        tfs = self._term_freqs(texts, get_analyzer(analyzer))
+
+        def queue(pipe: Any, pinned: Optional[str], olds: List[Any]) -> None:
+            nonlocal analyzer, tfs
+            use = self._write_analyzer(tenant, pinned, analyzer)
+            if use != analyzer:
+                analyzer, tfs = use, self._term_freqs(texts, get_analyzer(use))
+            self._queue_ingest(pipe, tenant, analyzer, batch, drop, olds, tfs)
+
+        res = self._index_write(tenant, list(batch) + drop, queue)
+        return {"ok": True, "ingested": len(batch), "deleted": int(res[1]) if drop else 0}
+
+    def doc_ids_with_prefix(self, tenant: str, prefix: str, count: int = 500) -> List[str]:
+        """Doc ids starting with prefix (HSCAN MATCH; walks the whole docs hash, use sparingly)."""
+        pattern = "".join("\\" + c if c in "*?[]\\" else c for c in prefix) + "*"
+        return list(dict.fromkeys(d for d, _ in self.r.hscan_iter(self._k(tenant), match=pattern, count=count)))
+
+    def delete(self, tenant: str, doc_id: str) -> Dict[str, Any]:
+        def queue(pipe: Any, pinned: Optional[str], olds: List[Any]) -> None:
+            pipe.hdel(self._k(tenant), doc_id)
+            self._unindex(pipe, tenant, doc_id, *olds[0])
+
+        removed = self._index_write(tenant, [doc_id], queue)[0]
+        return {"ok": True, "doc_id": doc_id, "removed": int(removed)}
+
+    def reindex(self, tenant: str, batch: int = 200) -> Dict[str, Any]:
+        """(Re)build the inverted index from the docs hash, e.g. for docs ingested before the index existed."""
+        k = self._k(tenant)
+        analyzer = self.analyzer_name(tenant)
+        analyze = get_analyzer(analyzer)
+        self.r.set(self._ki(tenant, "analyzer"), analyzer, nx=True)
+        indexed = 0
+        pending: Dict[str, str] = {}  # HSCAN may repeat keys
+
+        def flush() -> None:
+            nonlocal analyzer, analyze
+            tfs = self._term_freqs(list(pending.values()), analyze)
+
+            def queue(pipe: Any, pinned: Optional[str], olds: List[Any]) -> None:
+                nonlocal analyzer, analyze, tfs
+                use = self._write_analyzer(tenant, pinned, analyzer)
+                if use != analyzer:  # set_analyzer() again mid-reindex; it rebuilds after us
+                    analyzer, analyze = use, get_analyzer(use)
+                    tfs = self._term_freqs(list(pending.values()), analyze)
+                for doc_id, (old_terms, old_len), tf in zip(pending, olds, tfs):
+                    self._unindex(pipe, tenant, doc_id, old_terms, old_len)
+                    self._index(pipe, tenant, doc_id, tf)
+
+            self._index_write(tenant, list(pending), queue)
+            pending.clear()
+
+        for doc_id, raw in self.r.hscan_iter(k, count=batch):
+            try:
+                text = json.loads(raw).get("text", "") or ""
+            except Exception:
+                continue
+            if doc_id not in pending:
+                indexed += 1
+            pending[doc_id] = text
+            if len(pending) >= batch:
+                flush()
+        if pending:
+            flush()
+        return {"ok": True, "tenant": tenant, "indexed": indexed, "analyzer": analyzer}
+
+    def list_docs(self, tenant: str, limit: int = 50) -> List[Dict[str, Any]]:
+        k = self._k(tenant)
+        ids = self.r.hkeys(k)[: int(limit)]
+        out = []
+        for doc_id in ids:
+            doc = self._doc_summary(doc_id, self.r.hget(k, doc_id))
+            if doc is not None:
+                out.append(doc)
+        return out
+
+    # ---- query ----
+    def _bm25(self, tenant: str, qterms: List[str]) -> List[Tuple[float, str]]:
+        pipe = self.r.pipeline(transaction=False)
+        self._queue_postings(pipe, tenant, qterms)
+        res = pipe.execute()
+        if self._needs_backfill(tenant, res[0], res[1]):
+            try:
+                self.reindex(tenant)
+            except Exception as e:
+                self._backfill_failed(tenant, e)
+            else:
+                return self._bm25(tenant, qterms)
+        n_docs, avgdl = self._collection_stats(res[2])
+        if n_docs <= 0:
+            return []
+        postings: List[Dict[str, str]] = res[3:]
+
+        candidates = sorted({doc_id for p in postings for doc_id in p})
+        if not candidates:
+            return []
+        lengths = self.r.hmget(self._ki(tenant, "len"), candidates)
+        dl = {doc_id: float(v or avgdl) for doc_id, v in zip(candidates, lengths)}
+        return self._rank(n_docs, avgdl, postings, dl)
+
+    def query(self, tenant: str, q: str, top_k: int = 5, max_docs_scan: int = 200) -> List[Dict[str, Any]]:
+        """BM25 top_k. max_docs_scan is kept for call compatibility; no documents are scanned linearly."""
+        q = (q or "").strip()
+        if not q:
+            raise ValueError("query required")
+        qterms = self._query_terms(q, self._analyzer(tenant))
+        if not qterms:
+            return []
+
+        ranked = self._bm25(tenant, qterms)[: int(top_k)]
+        if not ranked:
+            return []
+        raws = self.r.hmget(self._k(tenant), [doc_id for _, doc_id in ranked])
+        return self._hits(ranked, raws, q, qterms)
+
+
+class AsyncNaiveRAG(_NaiveRAGBase):
+    """NaiveRAG on redis.asyncio for request handlers: query, ingest, delete, list.
+
+    Same keys and results as NaiveRAG. Tokenizing an ingest batch is CPU work and runs in a
+    thread; everything else waits on the loop's Redis sockets. Analyzer switches and full
+    reindexes stay on the sync class.
+    """
+
+    def __init__(self, redis_url: str, default_analyzer: str = "ko_particle"):
+        super().__init__(redis_url, default_analyzer)
+        self.redis_url = redis_url
+
+    @property
+    def r(self) -> aioredis.Redis:
+        return get_async_redis(self.redis_url)
+
+    async def analyzer_name(self, tenant: str) -> str:
+        name = self._cached_analyzer(tenant)
+        if name is None:
+            name = self._cache_analyzer(tenant, await self.r.get(self._ki(tenant, "analyzer")))
+        return name
+
+    async def _index_write(self, tenant: str, doc_ids: Sequence[str], queue: Callable[[Any, Optional[str], List[Any]], Any]) -> List[Any]:
+        """See NaiveRAG._index_write; queue is a coroutine function here."""
+        async with self.r.pipeline(transaction=True) as pipe:
+            for _ in range(self.INDEX_WRITE_RETRIES):
+                try:
+                    await pipe.watch(*self._watch_keys(tenant))
+                    pinned = await pipe.get(self._ki(tenant, "analyzer"))
+                    olds: List[Any] = []
+                    if doc_ids:
+                        olds = list(zip(await pipe.hmget(self._ki(tenant, "terms"), list(doc_ids)),
+                                        await pipe.hmget(self._ki(tenant, "len"), list(doc_ids))))
+                    pipe.multi()
+                    await queue(pipe, pinned, olds)
+                    return await pipe.execute()
+                except redis.WatchError:
+                    continue
+        raise self._index_write_failed(tenant)
+
+    async def ingest(self, tenant: str, doc_id: str, text: str, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        await self.ingest_many(tenant, [RagDoc(doc_id=doc_id, text=text, meta=meta or {})])
+        return {"ok": True, "doc_id": doc_id, "len": len(text)}
+
+    async def ingest_many(self, tenant: str, docs: Sequence[RagDoc], delete_ids: Sequence[str] = ()) -> Dict[str, Any]:
+        """See NaiveRAG.ingest_many."""
+        batch, drop = self._batch(docs, delete_ids)
+        if not batch and not drop:
+            return {"ok": True, "ingested": 0, "deleted": 0}
+
+        texts = [p["text"] for p in batch.values()]
+        analyzer = await self.analyzer_name(tenant)
+        tfs = await asyncio.to_thread(self._term_freqs, texts, get_analyzer(analyzer))
+
+        async def queue(pipe: Any, pinned: Optional[str], olds: List[Any]) -> None:
+            nonlocal analyzer, tfs
+            use = self._write_analyzer(tenant, pinned, analyzer)
+            if use != analyzer:
+                analyzer, tfs = use, await asyncio.to_thread(self._term_freqs, texts, get_analyzer(use))
+            self._queue_ingest(pipe, tenant, analyzer, batch, drop, olds, tfs)
+
+        res = await self._index_write(tenant, list(batch) + drop, queue)
+        return {"ok": True, "ingested": len(batch), "deleted": int(res[1]) if drop else 0}
+
+    async def delete(self, tenant: str, doc_id: str) -> Dict[str, Any]:
+        async def queue(pipe: Any, pinned: Optional[str], olds: List[Any]) -> None:
+            pipe.hdel(self._k(tenant), doc_id)
+            self._unindex(pipe, tenant, doc_id, *olds[0])
+
+        removed = (await self._index_write(tenant, [doc_id], queue))[0]
+        return {"ok": True, "doc_id": doc_id, "removed": int(removed)}
+
+    async def list_docs(self, tenant: str, limit: int = 50) -> List[Dict[str, Any]]:
+        k = self._k(tenant)
+        ids = (await self.r.hkeys(k))[: int(limit)]
+        if not ids:
+            return []
+        raws = await self.r.hmget(k, ids)
+        return [d for d in (self._doc_summary(i, raw) for i, raw in zip(ids, raws)) if d is not None]
+
+    async def _bm25(self, tenant: str, qterms: List[str]) -> List[Tuple[float, str]]:
+        async with self.r.pipeline(transaction=False) as pipe:
+            self._queue_postings(pipe, tenant, qterms)
+            res = await pipe.execute()
+        if self._needs_backfill(tenant, res[0], res[1]):
+            try:
+                # reindex stays on the sync class; concurrent queries meanwhile see the partial index
+                await asyncio.to_thread(NaiveRAG(self.redis_url, self.default_analyzer).reindex, tenant)
+            except Exception as e:
+                self._backfill_failed(tenant, e)
+            else:
+                return await self._bm25(tenant, qterms)
+        n_docs, avgdl = self._collection_stats(res[2])
+        if n_docs <= 0:
+            return []
+        postings: List[Dict[str, str]] = res[3:]
+
+        candidates = sorted({doc_id for p in postings for doc_id in p})
+        if not candidates:
+            return []
+        lengths = await self.r.hmget(self._ki(tenant, "len"), candidates)
+        dl = {doc_id: float(v or avgdl) for doc_id, v in zip(candidates, lengths)}
+        return self._rank(n_docs, avgdl, postings, dl)
+
+    async def query(self, tenant: str, q: str, top_k: int = 5, max_docs_scan: int = 200) -> List[Dict[str, Any]]:
+        """See NaiveRAG.query."""
+        q = (q or "").strip()
+        if not q:
+            raise ValueError("query required")
+        qterms = self._query_terms(q, get_analyzer(await self.analyzer_name(tenant)))
+        if not qterms:
+            return []
+
+        ranked = (await self._bm25(tenant, qterms))[: int(top_k)]
+        if not ranked:
+            return []
+        raws = await self.r.hmget(self._k(tenant), [doc_id for _, doc_id in ranked])
+        return self._hits(ranked, raws, q, qterms)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+import redis
+import redis.asyncio as aioredis
+
+from shared.logging_utils import get_logger
+from shared.metrics import set_redis_pool_usage
+from shared.settings import settings
+
+logger = get_logger("redis_client")
+
+_lock = threading.Lock()
+_clients: Dict[Tuple[str, bool], redis.Redis] = {}
+_ping_cache: Dict[str, Tuple[float, bool]] = {}
+# asyncio connections belong to the loop that opened them: one async client per (loop, url, decode)
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, bool], aioredis.Redis]]" = weakref.WeakKeyDictionary()
+
+
+def _pool_kwargs() -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {
+        "max_connections": max(1, int(settings.redis_max_connections)),
+        "timeout": float(settings.redis_pool_timeout_s),  # wait this long for a free connection, then raise
+        "socket_keepalive": True,
+        "socket_connect_timeout": float(settings.redis_connect_timeout_s),
+        "health_check_interval": int(settings.redis_health_check_interval_s),
+    }
+    if settings.redis_socket_timeout_s > 0:
+        kwargs["socket_timeout"] = float(settings.redis_socket_timeout_s)
+    return kwargs
+
+
+def _client_cache_kwargs() -> Dict[str, Any]:
+    # RESP3 client-side caching (redis-py >= 5.1, Redis >= 6): reads are served locally and
+    # invalidated by server push messages
+    if not settings.redis_client_cache:
+        return {}
+    try:
+        from redis.cache import CacheConfig  # type: ignore
+    except ImportError:
+        logger.warning("REDIS_CLIENT_CACHE is set but redis-py has no client-side caching; disabled")
+        return {}
+    return {"protocol": 3, "cache_config": CacheConfig(max_size=int(settings.redis_client_cache_max_keys))}
+
+
+def get_redis(url: Optional[str] = None, decode_responses: bool = True) -> redis.Redis:
+    """Process-wide Redis client for `url` (default REDIS_URL), one tuned connection pool per URL.
+
+    Stores share the returned client instead of calling redis.Redis.from_url, so a process
+    holds one pool (bounded by REDIS_MAX_CONNECTIONS) rather than one per store. The pool is
+    a BlockingConnectionPool: when every connection is busy, callers wait up to
+    REDIS_POOL_TIMEOUT seconds instead of failing with "Too many connections".
+    """
+    url = url or settings.redis_url
+    key = (url, bool(decode_responses))
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            kwargs = _pool_kwargs()
+            cache_kwargs = _client_cache_kwargs()
+            try:
+                pool = redis.BlockingConnectionPool.from_url(url, decode_responses=decode_responses, **kwargs, **cache_kwargs)
+            except Exception as e:
+                if not cache_kwargs:
+                    raise
+                logger.warning("redis client-side caching unavailable (%s); using a plain pool", e)
+                pool = redis.BlockingConnectionPool.from_url(url, decode_responses=decode_responses, **kwargs)
+            client = redis.Redis(connection_pool=pool)
+            _clients[key] = client
+    return client
+
+
+def get_async_redis(url: Optional[str] = None, decode_responses: bool = True) -> aioredis.Redis:
+    """redis.asyncio counterpart of get_redis for the running event loop (same pool settings).
+
+    Async stores (AsyncStreamStore, AsyncTaskStore, ...) use it so that request handlers wait on
+    sockets instead of holding a threadpool thread per Redis round-trip. REDIS_MAX_CONNECTIONS
+    bounds the loop's pool; coroutines beyond it wait up to REDIS_POOL_TIMEOUT for a connection.
+    Client-side caching (REDIS_CLIENT_CACHE) applies to the sync clients only.
+    """
+    url = url or settings.redis_url
+    key = (url, bool(decode_responses))
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.get(loop)
+    if clients is None:
+        clients = _async_clients.setdefault(loop, {})
+    client = clients.get(key)
+    if client is None:
+        pool = aioredis.BlockingConnectionPool.from_url(url, decode_responses=decode_responses, **_pool_kwargs())
+        client = aioredis.Redis(connection_pool=pool)
+        clients[key] = client
+    return client
+
+
+def redis_available(url: Optional[str] = None, ttl_s: float = 30.0) -> bool:
+    """PING through the shared client, cached for ttl_s per URL (stores that fall back to files
+    call this on construction instead of pinging each time)."""
+    url = url or settings.redis_url
+    now = time.monotonic()
+    cached = _ping_cache.get(url)
+    if cached is not None and now - cached[0] < ttl_s:
+        return cached[1]
+    try:
+        ok = bool(get_redis(url).ping())
+    except Exception:
+        ok = False
+    _ping_cache[url] = (now, ok)
+    return ok
+
+
+def _pool_usage(pool: Any) -> Tuple[int, int, int]:
+    # (in_use, idle, max); BlockingConnectionPool keeps created connections in _connections and
+    # idle ones (plus None placeholders) in the LIFO queue `pool`; the asyncio pool tracks
+    # _in_use_connections / _available_connections instead
+    if hasattr(pool, "_in_use_connections"):
+        in_use = len(pool._in_use_connections)
+        idle = len(getattr(pool, "_available_connections", []) or [])
+        return in_use, idle, int(getattr(pool, "max_connections", 0) or 0)
+    created = len(getattr(pool, "_connections", []) or [])
+    queue = getattr(getattr(pool, "pool", None), "queue", []) or []
+    idle = sum(1 for c in list(queue) if c is not None)
+    return max(0, created - idle), idle, int(getattr(pool, "max_connections", 0) or 0)
+
+
+def pool_stats() -> Dict[str, Dict[str, int]]:
+    out: Dict[str, Dict[str, int]] = {}
+    for (url, decoded), client in list(_clients.items()):
+        in_use, idle, max_connections = _pool_usage(client.connection_pool)
+        name = _pool_name(url, decoded)
+        out[name] = {"in_use": in_use, "idle": idle, "max": max_connections}
+    for clients in list(_async_clients.values()):
+        for (url, decoded), client in list(clients.items()):
+            in_use, idle, max_connections = _pool_usage(client.connection_pool)
+            name = f"{_pool_name(url, decoded)} (async)"
+            s = out.setdefault(name, {"in_use": 0, "idle": 0, "max": 0})
+            s["in_use"] += in_use
+            s["idle"] += idle
+            s["max"] += max_connections
+    return out
+
+
+def _pool_name(url: str, decoded: bool) -> str:
+    # host:port/db without credentials
+    rest = url.split("@", 1)[-1].split("://", 1)[-1]
+    return f"{rest}{'' if decoded else ' (bytes)'}"
+
+
+def update_pool_metrics() -> None:
+    """Export pool utilization (called on /metrics scrape)."""
+    for name, s in pool_stats().items():
+        set_redis_pool_usage(name, s["in_use"], s["idle"], s["max"])
+
+
+def close_all() -> None:
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        _ping_cache.clear()
+    for client in clients:
+        try:
+            client.connection_pool.disconnect()
+        except Exception:
+            pass
+
+
+async def aclose_all() -> None:
+    """Close the running loop's async clients (app shutdown)."""
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        try:
+            await client.connection_pool.disconnect()
+        except Exception:
+            pass
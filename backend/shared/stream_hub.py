@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+import redis.asyncio as aioredis
+
+from shared.logging_utils import get_logger
+from shared.redis_client import get_async_redis
+from shared.stream_store import AgentEvent, AsyncStreamStore
+
+logger = get_logger("stream_hub")
+
+# (seq, rendered SSE frame)
+Frame = Tuple[int, str]
+# queued after a subscription is marked lagged, so its consumer resyncs right away
+_WAKE: Frame = (0, "")
+
+
+def sse_frame(seq: int, event_type: str, data: Dict[str, Any]) -> str:
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"id: {seq}\nevent: {event_type}\ndata: {payload}\n\n"
+
+
+def ping_frame(ts: str) -> str:
+    return f"event: ping\ndata: {json.dumps({'ts': ts}, ensure_ascii=False)}\n\n"
+
+
+@dataclass(eq=False)
+class Subscription:
+    tenant: str
+    queue: "asyncio.Queue[Frame]"
+    # set when the queue overflowed or the feed reconnected; the client resyncs from the store
+    lagged: bool = False
+
+
+@dataclass(eq=False)
+class _TenantFeed:
+    subscribers: Set[Subscription] = field(default_factory=set)
+    ready: asyncio.Event = field(default_factory=asyncio.Event)
+    task: Optional["asyncio.Task[None]"] = None
+
+
+class StreamHub:
+    """Push-based fan-out of StreamStore events to SSE clients.
+
+    One Redis Pub/Sub subscription per tenant (channel nexus:stream:{tenant}:pub) feeds
+    every connected client of that tenant through bounded asyncio queues. Each published
+    envelope is decoded and rendered into an SSE frame once, not once per client.
+
+    The store (AsyncStreamStore) stays the source of truth: cursor/backlog replay, seq gaps (pub/sub is
+    at-most-once) and slow clients whose queue overflowed are all repaired via replay().
+
+    Feeds use the shared get_async_redis pool, one connection per tenant with clients while it
+    is subscribed, and read with a short timeout so the pool's socket_timeout never trips on a
+    quiet channel.
+    """
+
+    LISTEN_POLL_S = 1.0
+
+    def __init__(
+        self,
+        redis_url: str,
+        store: AsyncStreamStore,
+        queue_max: int = 1000,
+        ping_every_s: float = 15.0,
+        backlog_limit: int = 1000,
+        reconnect_s: float = 1.0,
+    ):
+        self.redis_url = redis_url
+        self.store = store
+        self.queue_max = max(1, int(queue_max))
+        self.ping_every_s = float(ping_every_s)
+        self.backlog_limit = int(backlog_limit)
+        self.reconnect_s = float(reconnect_s)
+        self._feeds: Dict[str, _TenantFeed] = {}
+
+    def _redis(self) -> aioredis.Redis:
+        return get_async_redis(self.redis_url)
+
+    # ---- feed lifecycle (event-loop only; no awaits between check and mutate) ----
+    async def subscribe(self, tenant: str, ready_timeout_s: float = 5.0) -> Subscription:
+        sub = Subscription(tenant=tenant, queue=asyncio.Queue(maxsize=self.queue_max))
+        feed = self._feeds.get(tenant)
+        if feed is None:
+            feed = _TenantFeed()
+            self._feeds[tenant] = feed
+        feed.subscribers.add(sub)
+        if feed.task is None or feed.task.done():
+            feed.ready.clear()
+            feed.task = asyncio.get_running_loop().create_task(self._pump(tenant, feed))
+        # wait until SUBSCRIBE is acknowledged so nothing falls between backlog replay and live delivery;
+        # on timeout (redis down) the client still works off gap repair + resync
+        try:
+            await asyncio.wait_for(feed.ready.wait(), timeout=ready_timeout_s)
+        except asyncio.TimeoutError:
+            self._mark_lagged(sub)
+        except BaseException:
+            self.unsubscribe(sub)
+            raise
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        feed = self._feeds.get(sub.tenant)
+        if feed is None:
+            return
+        feed.subscribers.discard(sub)
+        if not feed.subscribers:
+            self._feeds.pop(sub.tenant, None)
+            if feed.task is not None:
+                feed.task.cancel()
+
+    def subscriber_count(self, tenant: Optional[str] = None) -> int:
+        if tenant is not None:
+            feed = self._feeds.get(tenant)
+            return len(feed.subscribers) if feed else 0
+        return sum(len(f.subscribers) for f in self._feeds.values())
+
+    async def close(self) -> None:
+        feeds = list(self._feeds.values())
+        self._feeds.clear()
+        for feed in feeds:
+            if feed.task is not None:
+                feed.task.cancel()
+        for feed in feeds:
+            if feed.task is not None:
+                try:
+                    await feed.task
+                except (asyncio.CancelledError, Exception):
+                    pass
+
+    # ---- per-tenant pump ----
+    async def _pump(self, tenant: str, feed: _TenantFeed) -> None:
+        channel = self.store.channel(tenant)
+        while True:
+            pubsub = None
+            try:
+                pubsub = self._redis().pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(channel)
+                feed.ready.set()
+                while True:
+                    msg = await pubsub.get_message(ignore_subscribe_messages=True, timeout=self.LISTEN_POLL_S)
+                    if msg is None or msg.get("type") != "message":
+                        continue
+                    frame = self._decode(msg.get("data"))
+                    if frame is not None:
+                        self._fanout(feed, frame)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("stream hub feed for %s dropped: %s", tenant, e)
+                feed.ready.clear()
+                for sub in list(feed.subscribers):
+                    self._mark_lagged(sub)
+                await asyncio.sleep(self.reconnect_s)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+    @staticmethod
+    def _decode(raw: Any) -> Optional[Frame]:
+        try:
+            env = json.loads(raw)
+            seq = int(env["seq"])
+            return seq, sse_frame(seq, env["event_type"], env["payload"])
+        except Exception:
+            return None
+
+    @staticmethod
+    def _mark_lagged(sub: Subscription) -> None:
+        """Flag sub for a resync from the store and wake its consumer now, not at the next frame or ping."""
+        if sub.lagged:
+            return
+        sub.lagged = True
+        while not sub.queue.empty():
+            sub.queue.get_nowait()  # replaced by the resync anyway
+        sub.queue.put_nowait(_WAKE)
+
+    @classmethod
+    def _fanout(cls, feed: _TenantFeed, frame: Frame) -> None:
+        for sub in list(feed.subscribers):
+            if sub.lagged:
+                continue
+            try:
+                sub.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                cls._mark_lagged(sub)
+
+    # ---- client side ----
+    async def _replay(self, tenant: str, after_seq: int, limit: int) -> List[AgentEvent]:
+        return await self.store.replay(tenant, after_seq, limit)
+
+    async def stream(self, tenant: str, after_seq: int, now_iso: Optional[Callable[[], str]] = None) -> AsyncIterator[str]:
+        """Yield SSE frames for events with seq > after_seq, then live events and pings, forever."""
+        sub = await self.subscribe(tenant)
+        try:
+            last = int(after_seq)
+            # backlog (subscribed first, so anything appended meanwhile is queued or replayed)
+            for ev in await self._replay(tenant, last, self.backlog_limit):
+                yield sse_frame(ev.seq, ev.event_type, ev.payload)
+                last = ev.seq
+
+            last_ping = time.monotonic()
+            while True:
+                if sub.lagged:
+                    sub.lagged = False
+                    while not sub.queue.empty():
+                        sub.queue.get_nowait()
+                    for ev in await self._replay(tenant, last, self.backlog_limit):
+                        yield sse_frame(ev.seq, ev.event_type, ev.payload)
+                        last = ev.seq
+
+                timeout = max(0.0, self.ping_every_s - (time.monotonic() - last_ping))
+                try:
+                    seq, frame = await asyncio.wait_for(sub.queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    yield ping_frame(now_iso() if now_iso else time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
+                    last_ping = time.monotonic()
+                    continue
+
+                if sub.lagged or seq <= last:
+                    continue
+                if seq > last + 1:
+                    # a message was missed on the pub/sub path; fill the hole from the store
+                    for ev in await self._replay(tenant, last, seq - last - 1):
+                        if ev.seq >= seq:
+                            break
+                        yield sse_frame(ev.seq, ev.event_type, ev.payload)
+                        last = ev.seq
+                yield frame
+                last = seq
+        finally:
+            self.unsubscribe(sub)
@@ -3,7 +3,9 @@ import time
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
-import redis
+import redis.asyncio as aioredis
+
+from shared.redis_client import get_async_redis, get_redis
 
 
 def _utc_iso() -> str:
@@ -17,21 +19,94 @@ class AgentEvent:
     payload: Dict[str, Any]
 
 
-class StreamStore:
+class _StreamStoreBase:
     """Tenant-scoped event log + minimal UI state (asks/worklog/autopilot) in Redis.
 
     Keys:
       - nexus:stream:{tenant}:seq -> integer
-      - nexus:stream:{tenant}:z -> zset(score=seq, value=json)
+      - nexus:stream:{tenant}:z -> zset(score=seq, value=json)            (backend=zset)
+      - nexus:stream:{tenant}:x -> stream(id="{seq}-0", t/p/c fields)      (backend=stream)
+      - nexus:stream:{tenant}:pub -> pub/sub channel (envelope json, for live fan-out)
       - nexus:stream:{tenant}:asks -> hash(ask_id -> json)
       - nexus:stream:{tenant}:worklog -> list(json)
       - nexus:stream:{tenant}:autopilot -> string(json)
+      - nexus:stream:{tenant}:ver -> integer (UI state version, bumped by every asks/worklog/autopilot write)
+      - nexus:stream:{tenant}:ops -> zset(score=version, value="{version}:{op json}"), last state_ops_keep
+      - nexus:stream:{tenant}:ver_pub -> integer (version carried by the last state_delta())
+
+    Event log backends:
+      - zset: legacy layout; one EVALSHA per append (INCR + ZADD + ZREMRANGEBYRANK + PUBLISH), JSON
+        decode per replayed event.
+      - stream: Redis Streams; one EVALSHA per append (INCR + XADD MAXLEN ~ + PUBLISH), stream id
+        "{seq}-0" so the seq cursor maps 1:1 onto XRANGE bounds.
+    Both append scripts allocate the seq, store the event and publish it atomically: event N is
+    always replayable before N+1 reaches a subscriber, which StreamHub's gap repair relies on
+    when several writers (chat handlers, TTS worker threads) append to one tenant.
+
+    StreamStore (sync redis-py, agents/tools/threadpool code) and AsyncStreamStore (redis.asyncio,
+    request handlers) share this key layout, the Lua scripts and the decoding below.
     """
 
-    def __init__(self, redis_url: str, event_keep: int = 2000, worklog_keep: int = 200):
-        self.r = redis.Redis.from_url(redis_url, decode_responses=True)
+    BACKENDS = ("zset", "stream")
+
+    # KEYS: seq, stream, channel / ARGV: event_type, payload_json, created_at, keep
+    _XAPPEND_LUA = """
+local seq = redis.call('INCR', KEYS[1])
+local keep = tonumber(ARGV[4])
+if keep > 0 then
+  redis.call('XADD', KEYS[2], 'MAXLEN', '~', keep, seq .. '-0', 't', ARGV[1], 'p', ARGV[2], 'c', ARGV[3])
+else
+  redis.call('XADD', KEYS[2], seq .. '-0', 't', ARGV[1], 'p', ARGV[2], 'c', ARGV[3])
+end
+local env = '{"seq":' .. seq .. ',"event_type":' .. cjson.encode(ARGV[1]) .. ',"payload":' .. ARGV[2] .. ',"created_at":"' .. ARGV[3] .. '"}'
+redis.call('PUBLISH', KEYS[3], env)
+return seq
+"""
+
+    # KEYS: seq, zset, channel / ARGV: event_type, payload_json, created_at, keep
+    _ZAPPEND_LUA = """
+local seq = redis.call('INCR', KEYS[1])
+local env = '{"seq":' .. seq .. ',"event_type":' .. cjson.encode(ARGV[1]) .. ',"payload":' .. ARGV[2] .. ',"created_at":"' .. ARGV[3] .. '"}'
+redis.call('ZADD', KEYS[2], seq, env)
+local keep = tonumber(ARGV[4])
+if keep > 0 then
+  redis.call('ZREMRANGEBYRANK', KEYS[2], 0, -(keep + 1))
+end
+redis.call('PUBLISH', KEYS[3], env)
+return seq
+"""
+
+    # KEYS: ver, ops / ARGV: op_json, keep
+    _STATE_BUMP_LUA = """
+local v = redis.call('INCR', KEYS[1])
+redis.call('ZADD', KEYS[2], v, v .. ':' .. ARGV[1])
+local keep = tonumber(ARGV[2])
+if keep > 0 then
+  redis.call('ZREMRANGEBYRANK', KEYS[2], 0, -(keep + 1))
+end
+return v
+"""
+
+    # KEYS: ver, ver_pub, ops -> {ver, base, ops in (base, ver]}
+    _STATE_DELTA_LUA = """
+local v = tonumber(redis.call('GET', KEYS[1]) or '0')
+local base = tonumber(redis.call('GET', KEYS[2]) or '0')
+if base > v then base = v end
+local ops = {}
+if v > base then
+  ops = redis.call('ZRANGEBYSCORE', KEYS[3], '(' .. base, v)
+  redis.call('SET', KEYS[2], v)
+end
+return {v, base, ops}
+"""
+
+    def __init__(self, redis_url: str, event_keep: int = 2000, worklog_keep: int = 200, backend: str = "zset", state_ops_keep: int = 500):
         self.event_keep = int(event_keep)
         self.worklog_keep = int(worklog_keep)
+        self.backend = (backend or "zset").strip().lower()
+        if self.backend not in self.BACKENDS:
+            raise ValueError(f"unknown stream backend: {backend!r} (expected one of {self.BACKENDS})")
+        self.state_ops_keep = int(state_ops_keep)
 
     @staticmethod
     def tenant_id(org_id: str, project_id: str) -> str:
@@ -40,27 +115,23 @@ class StreamStore:
     def _k(self, tenant: str, suffix: str) -> str:
         return f"nexus:stream:{tenant}:{suffix}"
 
-    def alloc_seq(self, tenant: str) -> int:
-        return int(self.r.incr(self._k(tenant, "seq")))
+    def channel(self, tenant: str) -> str:
+        return self._k(tenant, "pub")
 
-    def append_event(self, tenant: str, event_type: str, payload: Dict[str, Any]) -> AgentEvent:
-        seq = self.alloc_seq(tenant)
-        envelope = {
-            "seq": seq,
-            "event_type": event_type,
-            "payload": payload,
-            "created_at": _utc_iso(),
+    # ---- decoding shared by both clients ----
+    @property
+    def _append_script(self) -> str:
+        return "xappend" if self.backend == "stream" else "zappend"
+
+    def _append_args(self, tenant: str, event_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        log = "x" if self.backend == "stream" else "z"
+        return {
+            "keys": [self._k(tenant, "seq"), self._k(tenant, log), self.channel(tenant)],
+            "args": [event_type, json.dumps(payload, ensure_ascii=False), _utc_iso(), self.event_keep],
         }
-        zkey = self._k(tenant, "z")
-        self.r.zadd(zkey, {json.dumps(envelope, ensure_ascii=False): seq})
-        # keep last N
-        if self.event_keep > 0:
-            self.r.zremrangebyrank(zkey, 0, -(self.event_keep + 1))
-        return AgentEvent(seq=seq, event_type=event_type, payload=payload)
 
-    def replay(self, tenant: str, after_seq: int, limit: int = 1000) -> List[AgentEvent]:
-        zkey = self._k(tenant, "z")
-        raw = self.r.zrangebyscore(zkey, min=after_seq + 1, max="+inf", start=0, num=int(limit))
+    @staticmethod
+    def _decode_zset(raw: List[str]) -> List[AgentEvent]:
         out: List[AgentEvent] = []
         for s in raw:
             try:
@@ -70,68 +141,309 @@ class StreamStore:
                 continue
         return out
 
-    def current_seq(self, tenant: str) -> int:
-        v = self.r.get(self._k(tenant, "seq"))
-        return int(v) if v else 0
+    @staticmethod
+    def _decode_stream(entries: List[Any]) -> List[AgentEvent]:
+        out: List[AgentEvent] = []
+        for entry_id, fields in entries:
+            try:
+                out.append(AgentEvent(seq=int(entry_id.split("-", 1)[0]), event_type=fields["t"], payload=json.loads(fields["p"])))
+            except Exception:
+                continue
+        return out
 
-    # ---- UI state ----
-    def get_autopilot(self, tenant: str) -> Dict[str, Any]:
-        k = self._k(tenant, "autopilot")
-        raw = self.r.get(k)
+    @staticmethod
+    def _replay_min(after_seq: int) -> str:
+        # ids are "{seq}-0": an incomplete id "n" means "n-0", so seq > after_seq <=> id >= after_seq+1
+        return str(max(0, int(after_seq)) + 1)
+
+    @staticmethod
+    def _decode_list(raw: List[str]) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for s in raw:
+            try:
+                out.append(json.loads(s))
+            except Exception:
+                continue
+        return out
+
+    @classmethod
+    def _sorted_asks(cls, raw: Dict[str, str]) -> List[Dict[str, Any]]:
+        out = cls._decode_list(list(raw.values()))
+        out.sort(key=lambda a: (a.get("created_at") or ""))
+        return out
+
+    @staticmethod
+    def _default_autopilot_state() -> Dict[str, Any]:
+        return {"state": "idle", "blocked_by_red": False, "updated_at": _utc_iso()}
+
+    @staticmethod
+    def _load_autopilot(raw: Optional[str]) -> Optional[Dict[str, Any]]:
         if raw:
             try:
                 return json.loads(raw)
             except Exception:
                 pass
-        default = {"state": "idle", "blocked_by_red": False, "updated_at": _utc_iso()}
-        self.set_autopilot(tenant, default)
+        return None
+
+    def _snapshot_keys(self, tenant: str) -> Dict[str, str]:
+        return {s: self._k(tenant, s) for s in ("ver", "asks", "worklog", "autopilot")}
+
+    def _snapshot(self, ver: Optional[str], asks: Dict[str, str], worklog: List[str], autopilot: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "report_id": f"snapshot-{int(time.time()*1000)}",
+            "ts": _utc_iso(),
+            "version": int(ver) if ver else 0,
+            "asks": self._sorted_asks(asks),
+            "worklog": self._decode_list(worklog),
+            "autopilot": autopilot,
+        }
+
+    def _delta_keys(self, tenant: str) -> List[str]:
+        return [self._k(tenant, "ver"), self._k(tenant, "ver_pub"), self._k(tenant, "ops")]
+
+    @staticmethod
+    def _decode_delta(ver: Any, base: Any, raw_ops: List[str]) -> Dict[str, Any]:
+        ver, base = int(ver), int(base)
+        ops: List[Dict[str, Any]] = []
+        expect = base + 1
+        resync = False
+        for member in raw_ops:
+            v, _, body = member.partition(":")
+            if int(v) != expect:
+                resync = True
+                break
+            try:
+                ops.append({"v": int(v), **json.loads(body)})
+            except Exception:
+                resync = True
+                break
+            expect += 1
+        if resync or expect != ver + 1:
+            return {"version": ver, "base_version": base, "ops": [], "resync": True}
+        return {"version": ver, "base_version": base, "ops": ops}
+
+
+class StreamStore(_StreamStoreBase):
+    """Tenant-scoped event log + UI state on the sync redis-py client (agents, tools, worker threads)."""
+
+    def __init__(self, redis_url: str, event_keep: int = 2000, worklog_keep: int = 200, backend: str = "zset", state_ops_keep: int = 500):
+        super().__init__(redis_url, event_keep=event_keep, worklog_keep=worklog_keep, backend=backend, state_ops_keep=state_ops_keep)
+        self.r = get_redis(redis_url)
+        self._appends = {
+            "xappend": self.r.register_script(self._XAPPEND_LUA),
+            "zappend": self.r.register_script(self._ZAPPEND_LUA),
+        }
+        self._bump = self.r.register_script(self._STATE_BUMP_LUA)
+        self._delta = self.r.register_script(self._STATE_DELTA_LUA)
+
+    def append_event(self, tenant: str, event_type: str, payload: Dict[str, Any]) -> AgentEvent:
+        seq = self._appends[self._append_script](**self._append_args(tenant, event_type, payload))
+        return AgentEvent(seq=int(seq), event_type=event_type, payload=payload)
+
+    def replay(self, tenant: str, after_seq: int, limit: int = 1000) -> List[AgentEvent]:
+        if self.backend == "stream":
+            return self._replay_stream(tenant, after_seq, limit)
+        zkey = self._k(tenant, "z")
+        return self._decode_zset(self.r.zrangebyscore(zkey, min=after_seq + 1, max="+inf", start=0, num=int(limit)))
+
+    def _replay_stream(self, tenant: str, after_seq: int, limit: int) -> List[AgentEvent]:
+        return self._decode_stream(self.r.xrange(self._k(tenant, "x"), min=self._replay_min(after_seq), max="+", count=int(limit)))
+
+    def current_seq(self, tenant: str) -> int:
+        v = self.r.get(self._k(tenant, "seq"))
+        return int(v) if v else 0
+
+    # ---- UI state ----
+    # Every mutation bumps nexus:stream:{tenant}:ver and records a small op in the same round-trip, so
+    # reports can carry {version, base_version, ops} (state_delta) instead of a full snapshot().
+    def _state_write(self, tenant: str, op: Dict[str, Any], write: Any) -> Any:
+        pipe = self.r.pipeline(transaction=True)
+        write(pipe)
+        self._bump(
+            keys=[self._k(tenant, "ver"), self._k(tenant, "ops")],
+            args=[json.dumps(op, ensure_ascii=False), self.state_ops_keep],
+            client=pipe,
+        )
+        return pipe.execute()[0]
+
+    def get_autopilot(self, tenant: str) -> Dict[str, Any]:
+        autopilot = self._load_autopilot(self.r.get(self._k(tenant, "autopilot")))
+        return autopilot if autopilot is not None else self._default_autopilot(tenant)
+
+    def _default_autopilot(self, tenant: str) -> Dict[str, Any]:
+        # initialization is not a state change: no version bump
+        default = self._default_autopilot_state()
+        self.r.set(self._k(tenant, "autopilot"), json.dumps(default, ensure_ascii=False))
         return default
 
     def set_autopilot(self, tenant: str, state: Dict[str, Any]) -> None:
         state = {**state, "updated_at": _utc_iso()}
-        self.r.set(self._k(tenant, "autopilot"), json.dumps(state, ensure_ascii=False))
+        raw = json.dumps(state, ensure_ascii=False)
+        self._state_write(tenant, {"op": "autopilot.set", "autopilot": state}, lambda p: p.set(self._k(tenant, "autopilot"), raw))
 
     def add_worklog(self, tenant: str, entry: Dict[str, Any]) -> None:
         entry = {**entry, "ts": entry.get("ts") or _utc_iso()}
         k = self._k(tenant, "worklog")
-        self.r.rpush(k, json.dumps(entry, ensure_ascii=False))
-        if self.worklog_keep > 0:
-            self.r.ltrim(k, -self.worklog_keep, -1)
+
+        def write(p: Any) -> None:
+            p.rpush(k, json.dumps(entry, ensure_ascii=False))
+            if self.worklog_keep > 0:
+                p.ltrim(k, -self.worklog_keep, -1)
+
+        self._state_write(tenant, {"op": "worklog.add", "entry": entry}, write)
 
     def list_worklog(self, tenant: str, limit: int = 200) -> List[Dict[str, Any]]:
         k = self._k(tenant, "worklog")
-        raw = self.r.lrange(k, max(-int(limit), -10000), -1)
-        out: List[Dict[str, Any]] = []
-        for s in raw:
-            try:
-                out.append(json.loads(s))
-            except Exception:
-                continue
-        return out
+        return self._decode_list(self.r.lrange(k, max(-int(limit), -10000), -1))
 
     def add_ask(self, tenant: str, ask: Dict[str, Any]) -> None:
         ask = {**ask, "created_at": ask.get("created_at") or _utc_iso()}
-        self.r.hset(self._k(tenant, "asks"), ask["ask_id"], json.dumps(ask, ensure_ascii=False))
+        raw = json.dumps(ask, ensure_ascii=False)
+        self._state_write(tenant, {"op": "ask.put", "ask": ask}, lambda p: p.hset(self._k(tenant, "asks"), ask["ask_id"], raw))
 
     def list_asks(self, tenant: str) -> List[Dict[str, Any]]:
-        raw = self.r.hgetall(self._k(tenant, "asks"))
-        out: List[Dict[str, Any]] = []
-        for _, s in raw.items():
-            try:
-                out.append(json.loads(s))
-            except Exception:
-                continue
-        out.sort(key=lambda a: (a.get("created_at") or ""))
-        return out
+        return self._sorted_asks(self.r.hgetall(self._k(tenant, "asks")))
 
     def remove_ask(self, tenant: str, ask_id: str) -> bool:
-        return bool(self.r.hdel(self._k(tenant, "asks"), ask_id))
+        return bool(self._state_write(tenant, {"op": "ask.remove", "ask_id": ask_id}, lambda p: p.hdel(self._k(tenant, "asks"), ask_id)))
+
+    def state_version(self, tenant: str) -> int:
+        v = self.r.get(self._k(tenant, "ver"))
+        return int(v) if v else 0
 
     def snapshot(self, tenant: str) -> Dict[str, Any]:
-        return {
-            "report_id": f"snapshot-{int(time.time()*1000)}",
-            "ts": _utc_iso(),
-            "asks": self.list_asks(tenant),
-            "worklog": self.list_worklog(tenant),
-            "autopilot": self.get_autopilot(tenant),
-        }
+        """Full UI state; one MULTI round-trip, consistent with the returned version."""
+        k = self._snapshot_keys(tenant)
+        pipe = self.r.pipeline(transaction=True)
+        pipe.get(k["ver"])
+        pipe.hgetall(k["asks"])
+        pipe.lrange(k["worklog"], -200, -1)
+        pipe.get(k["autopilot"])
+        ver, asks, worklog, autopilot_raw = pipe.execute()
+        autopilot = self._load_autopilot(autopilot_raw)
+        return self._snapshot(ver, asks, worklog, autopilot if autopilot is not None else self._default_autopilot(tenant))
+
+    def state_delta(self, tenant: str) -> Dict[str, Any]:
+        """UI state changes since the previous state_delta() of this tenant (what the last report carried).
+
+        Returns {"version", "base_version", "ops"}. A client at base_version applies ops in order and
+        ends at version; a client behind base_version (or a delta with "resync": true, when ops were
+        trimmed) fetches snapshot() instead (GET /agent/state).
+        """
+        return self._decode_delta(*self._delta(keys=self._delta_keys(tenant)))
+
+
+class AsyncStreamStore(_StreamStoreBase):
+    """StreamStore on redis.asyncio: same keys, scripts and semantics, awaitable methods.
+
+    Used by request handlers (chat, SSE, node endpoints) so a slow Redis round-trip parks a
+    coroutine on its socket instead of a threadpool thread. The client comes from
+    get_async_redis() per call, i.e. from the running loop's pool.
+    """
+
+    def __init__(self, redis_url: str, event_keep: int = 2000, worklog_keep: int = 200, backend: str = "zset", state_ops_keep: int = 500):
+        super().__init__(redis_url, event_keep=event_keep, worklog_keep=worklog_keep, backend=backend, state_ops_keep=state_ops_keep)
+        self.redis_url = redis_url
+        self._scripts: Optional[Dict[str, Any]] = None
+
+    @property
+    def r(self) -> aioredis.Redis:
+        return get_async_redis(self.redis_url)
+
+    def _script(self, name: str) -> Any:
+        # AsyncScript only uses its registered client for the encoder; calls pass client= explicitly
+        if self._scripts is None:
+            r = self.r
+            self._scripts = {
+                "xappend": r.register_script(self._XAPPEND_LUA),
+                "zappend": r.register_script(self._ZAPPEND_LUA),
+                "bump": r.register_script(self._STATE_BUMP_LUA),
+                "delta": r.register_script(self._STATE_DELTA_LUA),
+            }
+        return self._scripts[name]
+
+    async def append_event(self, tenant: str, event_type: str, payload: Dict[str, Any]) -> AgentEvent:
+        seq = await self._script(self._append_script)(**self._append_args(tenant, event_type, payload), client=self.r)
+        return AgentEvent(seq=int(seq), event_type=event_type, payload=payload)
+
+    async def replay(self, tenant: str, after_seq: int, limit: int = 1000) -> List[AgentEvent]:
+        if self.backend == "stream":
+            entries = await self.r.xrange(self._k(tenant, "x"), min=self._replay_min(after_seq), max="+", count=int(limit))
+            return self._decode_stream(entries)
+        zkey = self._k(tenant, "z")
+        return self._decode_zset(await self.r.zrangebyscore(zkey, min=after_seq + 1, max="+inf", start=0, num=int(limit)))
+
+    async def current_seq(self, tenant: str) -> int:
+        v = await self.r.get(self._k(tenant, "seq"))
+        return int(v) if v else 0
+
+    # ---- UI state ----
+    async def _state_write(self, tenant: str, op: Dict[str, Any], write: Any) -> Any:
+        async with self.r.pipeline(transaction=True) as pipe:
+            write(pipe)
+            await self._script("bump")(
+                keys=[self._k(tenant, "ver"), self._k(tenant, "ops")],
+                args=[json.dumps(op, ensure_ascii=False), self.state_ops_keep],
+                client=pipe,
+            )
+            return (await pipe.execute())[0]
+
+    async def get_autopilot(self, tenant: str) -> Dict[str, Any]:
+        autopilot = self._load_autopilot(await self.r.get(self._k(tenant, "autopilot")))
+        return autopilot if autopilot is not None else await self._default_autopilot(tenant)
+
+    async def _default_autopilot(self, tenant: str) -> Dict[str, Any]:
+        default = self._default_autopilot_state()
+        await self.r.set(self._k(tenant, "autopilot"), json.dumps(default, ensure_ascii=False))
+        return default
+
+    async def set_autopilot(self, tenant: str, state: Dict[str, Any]) -> None:
+        state = {**state, "updated_at": _utc_iso()}
+        raw = json.dumps(state, ensure_ascii=False)
+        await self._state_write(tenant, {"op": "autopilot.set", "autopilot": state}, lambda p: p.set(self._k(tenant, "autopilot"), raw))
+
+    async def add_worklog(self, tenant: str, entry: Dict[str, Any]) -> None:
+        entry = {**entry, "ts": entry.get("ts") or _utc_iso()}
+        k = self._k(tenant, "worklog")
+
+        def write(p: Any) -> None:
+            p.rpush(k, json.dumps(entry, ensure_ascii=False))
+            if self.worklog_keep > 0:
+                p.ltrim(k, -self.worklog_keep, -1)
+
+        await self._state_write(tenant, {"op": "worklog.add", "entry": entry}, write)
+
+    async def list_worklog(self, tenant: str, limit: int = 200) -> List[Dict[str, Any]]:
+        k = self._k(tenant, "worklog")
+        return self._decode_list(await self.r.lrange(k, max(-int(limit), -10000), -1))
+
+    async def add_ask(self, tenant: str, ask: Dict[str, Any]) -> None:
+        ask = {**ask, "created_at": ask.get("created_at") or _utc_iso()}
+        raw = json.dumps(ask, ensure_ascii=False)
+        await self._state_write(tenant, {"op": "ask.put", "ask": ask}, lambda p: p.hset(self._k(tenant, "asks"), ask["ask_id"], raw))
+
+    async def list_asks(self, tenant: str) -> List[Dict[str, Any]]:
+        return self._sorted_asks(await self.r.hgetall(self._k(tenant, "asks")))
+
+    async def remove_ask(self, tenant: str, ask_id: str) -> bool:
+        return bool(await self._state_write(tenant, {"op": "ask.remove", "ask_id": ask_id}, lambda p: p.hdel(self._k(tenant, "asks"), ask_id)))
+
+    async def state_version(self, tenant: str) -> int:
+        v = await self.r.get(self._k(tenant, "ver"))
+        return int(v) if v else 0
+
+    async def snapshot(self, tenant: str) -> Dict[str, Any]:
+        """Full UI state; one MULTI round-trip, consistent with the returned version."""
+        k = self._snapshot_keys(tenant)
+        async with self.r.pipeline(transaction=True) as pipe:
+            pipe.get(k["ver"])
+            pipe.hgetall(k["asks"])
+            pipe.lrange(k["worklog"], -200, -1)
+            pipe.get(k["autopilot"])
+            ver, asks, worklog, autopilot_raw = await pipe.execute()
+        autopilot = self._load_autopilot(autopilot_raw)
+        return self._snapshot(ver, asks, worklog, autopilot if autopilot is not None else await self._default_autopilot(tenant))
+
+    async def state_delta(self, tenant: str) -> Dict[str, Any]:
+        """See StreamStore.state_delta; both stores advance the same ver_pub cursor."""
+        return self._decode_delta(*await self._script("delta")(keys=self._delta_keys(tenant), client=self.r))
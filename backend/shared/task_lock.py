@@ -4,8 +4,7 @@ import time
 from dataclasses import dataclass
 from typing import Optional
 
-import redis
-
+from shared.redis_client import get_redis
 from shared.settings import settings
 
 @dataclass
@@ -17,7 +16,7 @@ class TaskLock:
     """Redis-backed lock to prevent infinite retry loops (per task_id)."""
 
     def __init__(self):
-        self.r = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+        self.r = get_redis(settings.redis_url)
         self.ttl = int(getattr(settings, "task_lock_ttl_seconds", 900))  # default 15m
 
     def _key(self, task_id: str) -> str:
@@ -1,31 +1,236 @@
 import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence
+
 import redis
+import redis.asyncio as aioredis
+
+from shared.redis_client import get_async_redis, get_redis
+
+
+class _TaskStoreBase:
+    """Task records in Redis, one hash per task.
+
+    Key: task:{task_id} -> hash(field -> JSON value), expiring ttl seconds after the last write.
+
+    Every top-level task field is its own hash field, so update() writes only the patched
+    fields: one EVALSHA that HSETs the patch, refreshes the TTL and returns the merged
+    record, atomically. Concurrent callbacks for one task (running -> succeeded, result vs
+    status) can no longer overwrite each other's fields, which the former
+    GET/merge/SET/EXPIRE sequence allowed.
+
+    Records written before the hash layout (a JSON string under the same key) are still
+    read, and converted to a hash the first time they are updated.
+    """
+
+    # KEYS: task / ARGV: ttl, field1, value1, ... -> {"ok", f1, v1, ...} | {"missing"} | {"legacy"}
+    _UPDATE_LUA = """
+local t = redis.call('TYPE', KEYS[1])['ok']
+if t == 'none' then return {'missing'} end
+if t ~= 'hash' then return {'legacy'} end
+if #ARGV > 1 then
+  redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+local out = redis.call('HGETALL', KEYS[1])
+table.insert(out, 1, 'ok')
+return out
+"""
 
-class TaskStore:
     def __init__(self, redis_url: str, ttl_seconds: int):
-        self.r = redis.Redis.from_url(redis_url, decode_responses=True)
         self.ttl = ttl_seconds
 
+    @staticmethod
+    def _key(task_id: str) -> str:
+        return f"task:{task_id}"
+
+    @staticmethod
+    def _encode(task: Dict[str, Any]) -> Dict[str, str]:
+        return {k: json.dumps(v, ensure_ascii=False) for k, v in task.items()}
+
+    @staticmethod
+    def _decode(fields: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        if not fields:
+            return None
+        return {k: json.loads(v) for k, v in fields.items()}
+
+    def _update_args(self, patch: Dict[str, Any]) -> List[Any]:
+        args: List[Any] = [int(self.ttl)]
+        for k, v in self._encode(patch).items():
+            args += [k, v]
+        return args
+
+    @staticmethod
+    def _flat_to_dict(flat: Sequence[str]) -> Dict[str, str]:
+        return dict(zip(flat[::2], flat[1::2]))
+
+    @staticmethod
+    def _is_wrongtype(e: Exception) -> bool:
+        return isinstance(e, redis.ResponseError) and str(e).startswith("WRONGTYPE")
+
+
+class TaskStore(_TaskStoreBase):
+    def __init__(self, redis_url: str, ttl_seconds: int):
+        super().__init__(redis_url, ttl_seconds)
+        self.r = get_redis(redis_url)
+        self._update = self.r.register_script(self._UPDATE_LUA)
+
     def ping(self) -> bool:
         return bool(self.r.ping())
 
     def put(self, task_id: str, task: Dict[str, Any]) -> None:
-        key = f"task:{task_id}"
-        self.r.set(key, json.dumps(task, ensure_ascii=False))
-        self.r.expire(key, self.ttl)
+        """Replace the whole record (DEL + HSET + EXPIRE in one MULTI)."""
+        key = self._key(task_id)
+        pipe = self.r.pipeline(transaction=True)
+        pipe.delete(key)
+        if task:
+            pipe.hset(key, mapping=self._encode(task))
+            pipe.expire(key, self.ttl)
+        pipe.execute()
 
     def get(self, task_id: str) -> Optional[Dict[str, Any]]:
-        key = f"task:{task_id}"
-        raw = self.r.get(key)
-        if not raw:
-            return None
-        return json.loads(raw)
+        key = self._key(task_id)
+        try:
+            return self._decode(self.r.hgetall(key))
+        except redis.ResponseError as e:
+            if not self._is_wrongtype(e):
+                raise
+            raw = self.r.get(key)
+            return json.loads(raw) if raw else None
+
+    def get_many(self, task_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Tasks by id in one pipelined round-trip (missing ids are left out), e.g. for dashboards."""
+        ids = list(dict.fromkeys(task_ids))
+        if not ids:
+            return {}
+        pipe = self.r.pipeline(transaction=False)
+        for task_id in ids:
+            pipe.hgetall(self._key(task_id))
+        rows = pipe.execute(raise_on_error=False)
+        out: Dict[str, Dict[str, Any]] = {}
+        for task_id, row in zip(ids, rows):
+            if isinstance(row, Exception):
+                if not self._is_wrongtype(row):
+                    raise row
+                task = self.get(task_id)
+            else:
+                task = self._decode(row)
+            if task is not None:
+                out[task_id] = task
+        return out
 
     def update(self, task_id: str, patch: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        task = self.get(task_id)
-        if not task:
-            return None
-        task.update(patch)
-        self.put(task_id, task)
-        return task
+        """Merge patch into the record atomically; returns the merged task, or None if it does not exist."""
+        args = self._update_args(patch)
+        for _ in range(3):
+            res = self._update(keys=[self._key(task_id)], args=args)
+            if res[0] == "ok":
+                return self._decode(self._flat_to_dict(res[1:]))
+            if res[0] == "missing":
+                return None
+            self._convert_legacy(task_id)
+        raise RuntimeError(f"task {task_id}: legacy record changed concurrently during conversion")
+
+    def _convert_legacy(self, task_id: str) -> None:
+        # JSON-string record -> hash, guarded by WATCH so a concurrent put()/conversion wins
+        key = self._key(task_id)
+        with self.r.pipeline(transaction=True) as pipe:
+            try:
+                pipe.watch(key)
+                if pipe.type(key) != "string":
+                    return
+                raw = pipe.get(key)
+                task = json.loads(raw) if raw else {}
+                pipe.multi()
+                pipe.delete(key)
+                if task:
+                    pipe.hset(key, mapping=self._encode(task))
+                    pipe.expire(key, self.ttl)
+                pipe.execute()
+            except redis.WatchError:
+                pass
+
+
+class AsyncTaskStore(_TaskStoreBase):
+    """TaskStore on redis.asyncio (same task:{id} hashes, script and TTL) for request handlers."""
+
+    def __init__(self, redis_url: str, ttl_seconds: int):
+        super().__init__(redis_url, ttl_seconds)
+        self.redis_url = redis_url
+        self._update: Any = None
+
+    @property
+    def r(self) -> aioredis.Redis:
+        return get_async_redis(self.redis_url)
+
+    async def ping(self) -> bool:
+        return bool(await self.r.ping())
+
+    async def put(self, task_id: str, task: Dict[str, Any]) -> None:
+        key = self._key(task_id)
+        async with self.r.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            if task:
+                pipe.hset(key, mapping=self._encode(task))
+                pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    async def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        key = self._key(task_id)
+        try:
+            return self._decode(await self.r.hgetall(key))
+        except redis.ResponseError as e:
+            if not self._is_wrongtype(e):
+                raise
+            raw = await self.r.get(key)
+            return json.loads(raw) if raw else None
+
+    async def get_many(self, task_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        ids = list(dict.fromkeys(task_ids))
+        if not ids:
+            return {}
+        async with self.r.pipeline(transaction=False) as pipe:
+            for task_id in ids:
+                pipe.hgetall(self._key(task_id))
+            rows = await pipe.execute(raise_on_error=False)
+        out: Dict[str, Dict[str, Any]] = {}
+        for task_id, row in zip(ids, rows):
+            if isinstance(row, Exception):
+                if not self._is_wrongtype(row):
+                    raise row
+                task = await self.get(task_id)
+            else:
+                task = self._decode(row)
+            if task is not None:
+                out[task_id] = task
+        return out
+
+    async def update(self, task_id: str, patch: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if self._update is None:
+            self._update = self.r.register_script(self._UPDATE_LUA)
+        args = self._update_args(patch)
+        for _ in range(3):
+            res = await self._update(keys=[self._key(task_id)], args=args, client=self.r)
+            if res[0] == "ok":
+                return self._decode(self._flat_to_dict(res[1:]))
+            if res[0] == "missing":
+                return None
+            await self._convert_legacy(task_id)
+        raise RuntimeError(f"task {task_id}: legacy record changed concurrently during conversion")
+
+    async def _convert_legacy(self, task_id: str) -> None:
+        key = self._key(task_id)
+        async with self.r.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                if await pipe.type(key) != "string":
+                    return
+                raw = await pipe.get(key)
+                task = json.loads(raw) if raw else {}
+                pipe.multi()
+                pipe.delete(key)
+                if task:
+                    pipe.hset(key, mapping=self._encode(task))
+                    pipe.expire(key, self.ttl)
+                await pipe.execute()
+            except redis.WatchError:
+                pass
@@ -0,0 +1,372 @@
+"""
+Content-addressed TTS audio cache shared by all TTS providers.
+
+Audio is stored as tts_{key}.mp3 in one directory (served by GET /tts/{filename}), where key is
+a hash of provider, voice, model, text and every synthesis setting. A hit returns the existing
+file without calling the provider; concurrent misses for the same key synthesize once. Files are
+evicted least-recently-used first once the directory exceeds the byte budget (a hit refreshes
+the file's mtime, so the order survives restarts).
+
+Streaming: start_stream() runs a provider's chunk iterator on a dedicated worker pool and
+returns at once. While it runs, the clip is "in flight": iter_audio() lets any number of readers
+(e.g. GET /tts/{filename}) stream the bytes received so far and then follow the producer, and
+subscribe() delivers chunk/done callbacks (tts_chunk events). The file is committed to the cache
+only once the producer finished, so a failed synthesis never leaves a truncated clip behind.
+
+Config (env): TTS_CACHE_DIR (default: {tempdir}/nexus_tts), TTS_CACHE_MAX_MB (default: 512),
+TTS_WORKERS (synthesis threads for start_stream, default: 4).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from shared.metrics import inc_tts_cache, set_tts_cache_usage
+
+logger = logging.getLogger(__name__)
+
+
+# on_chunk(index, chunk), on_done(error or None, total_bytes)
+ChunkCallback = Callable[[int, bytes], None]
+DoneCallback = Callable[[Optional[str], int], None]
+
+
+class _Inflight:
+    """Chunks of a clip still being synthesized, for readers that arrive while it streams."""
+
+    def __init__(self) -> None:
+        self.chunks: List[bytes] = []
+        self.total = 0
+        self.done = False
+        self.error: Optional[str] = None
+        self.cond = threading.Condition()
+        self.listeners: List[Tuple[Optional[ChunkCallback], Optional[DoneCallback]]] = []
+
+    def append(self, chunk: bytes) -> None:
+        with self.cond:
+            index = len(self.chunks)
+            self.chunks.append(chunk)
+            self.total += len(chunk)
+            self.cond.notify_all()
+            for on_chunk, _ in self.listeners:
+                if on_chunk is not None:
+                    _safe_call(on_chunk, index, chunk)
+
+    def finish(self, error: Optional[str] = None) -> None:
+        with self.cond:
+            self.done = True
+            self.error = error
+            self.cond.notify_all()
+            listeners, self.listeners = self.listeners, []
+            for _, on_done in listeners:
+                if on_done is not None:
+                    _safe_call(on_done, error, self.total)
+
+    def subscribe(self, on_chunk: Optional[ChunkCallback], on_done: Optional[DoneCallback]) -> None:
+        # replays chunks received so far under the lock, so callbacks see every chunk once and in order
+        with self.cond:
+            if on_chunk is not None:
+                for index, chunk in enumerate(self.chunks):
+                    _safe_call(on_chunk, index, chunk)
+            if self.done:
+                if on_done is not None:
+                    _safe_call(on_done, self.error, self.total)
+            else:
+                self.listeners.append((on_chunk, on_done))
+
+    def iter(self, idle_timeout_s: float) -> Iterator[bytes]:
+        i = 0
+        while True:
+            with self.cond:
+                while i >= len(self.chunks) and not self.done:
+                    if not self.cond.wait(timeout=idle_timeout_s):
+                        return  # producer stalled; end the response rather than hang the reader
+                if i >= len(self.chunks):
+                    return
+                chunk = self.chunks[i]
+            i += 1
+            yield chunk
+
+
+def _safe_call(fn: Callable[..., None], *args: Any) -> None:
+    try:
+        fn(*args)
+    except Exception as e:
+        logger.warning(f"TTS stream callback failed: {e}")
+
+
+class TTSCache:
+    """On-disk LRU cache of synthesized audio, bounded by total bytes."""
+
+    PREFIX = "tts_"
+    SUFFIX = ".mp3"
+
+    def __init__(self, root: Path, max_bytes: int, workers: int = 4):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max(0, int(max_bytes))
+        self.workers = max(1, int(workers))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._inflight: Dict[str, _Inflight] = {}  # filename -> clip being streamed
+        self._index: "OrderedDict[str, int]" = OrderedDict()  # filename -> size, LRU first
+        self._bytes = 0
+        self._loaded = False
+
+    @staticmethod
+    def key(provider: str, voice: str, model: str, text: str, **settings: Any) -> str:
+        """Stable key over everything that changes the audio."""
+        material = json.dumps(
+            {"provider": provider, "voice": voice, "model": model, "text": text, "settings": settings},
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()[:32]
+
+    def filename(self, key: str) -> str:
+        return f"{self.PREFIX}{key}{self.SUFFIX}"
+
+    # ---- index ----
+    def _load(self) -> None:
+        # caller holds self._lock; files from earlier runs (and other processes) count against the budget
+        if self._loaded:
+            return
+        entries = []
+        for p in self.root.glob(f"{self.PREFIX}*{self.SUFFIX}"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, p.name, st.st_size))
+        entries.sort()
+        self._index = OrderedDict((name, size) for _, name, size in entries)
+        self._bytes = sum(size for _, _, size in entries)
+        self._loaded = True
+        self._evict()
+
+    def _evict(self) -> None:
+        # caller holds self._lock
+        evicted = 0
+        while self._index and self._bytes > self.max_bytes:
+            name, size = self._index.popitem(last=False)
+            self._bytes -= size
+            try:
+                (self.root / name).unlink()
+                evicted += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"TTS cache eviction failed for {name}: {e}")
+        set_tts_cache_usage(self._bytes, len(self._index), evicted)
+
+    def _forget(self, name: str) -> None:
+        # caller holds self._lock
+        size = self._index.pop(name, None)
+        if size is not None:
+            self._bytes -= size
+
+    # ---- lookup / store ----
+    def _lookup(self, key: str) -> Optional[Path]:
+        name = self.filename(key)
+        path = self.root / name
+        with self._lock:
+            self._load()
+            try:
+                st = path.stat()
+            except OSError:
+                self._forget(name)  # evicted by another process or cleaned up
+                return None
+            if name not in self._index:
+                self._index[name] = st.st_size
+                self._bytes += st.st_size
+            self._index.move_to_end(name)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def get(self, key: str, provider: str = "") -> Optional[Path]:
+        path = self._lookup(key)
+        inc_tts_cache(provider, hit=path is not None)
+        return path
+
+    def put(self, key: str, data: bytes) -> Path:
+        name = self.filename(key)
+        path = self.root / name
+        tmp = self.root / f".{name}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            self._load()
+            self._forget(name)
+            self._index[name] = len(data)
+            self._bytes += len(data)
+            self._evict()
+        return path
+
+    def get_or_create(self, key: str, produce: Callable[[], Optional[bytes]], provider: str = "") -> Tuple[Optional[Path], bool]:
+        """(path, hit). On a miss produce() is called once per key even under concurrency;
+        a falsy result is not cached and returns (None, False)."""
+        path = self._lookup(key)
+        if path is not None:
+            inc_tts_cache(provider, hit=True)
+            return path, True
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                path = self._lookup(key)  # filled while waiting for the key
+                if path is not None:
+                    inc_tts_cache(provider, hit=True)
+                    return path, True
+                inc_tts_cache(provider, hit=False)
+                data = produce()
+                if not data:
+                    return None, False
+                return self.put(key, data), False
+        finally:
+            with self._lock:
+                if not key_lock.locked():
+                    self._key_locks.pop(key, None)
+
+    # ---- streaming ----
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tts")
+            return self._executor
+
+    def start_stream(
+        self,
+        key: str,
+        produce: Callable[[], Iterable[bytes]],
+        provider: str = "",
+        on_chunk: Optional[ChunkCallback] = None,
+        on_done: Optional[DoneCallback] = None,
+    ) -> Tuple[str, bool]:
+        """Start (or join) synthesis of `key` on the TTS worker pool without waiting for it.
+
+        Returns (filename, hit). On a hit the callbacks run before returning, with the cached file
+        as a single chunk. Otherwise they run on the worker thread as chunks arrive; a caller that
+        joins a clip already in flight first receives the chunks streamed so far.
+        """
+        name = self.filename(key)
+        path = self._lookup(key)
+        if path is not None:
+            inc_tts_cache(provider, hit=True)
+            if on_chunk is not None or on_done is not None:
+                try:
+                    data = path.read_bytes()
+                except OSError:
+                    data = b""
+                if on_chunk is not None and data:
+                    _safe_call(on_chunk, 0, data)
+                if on_done is not None:
+                    _safe_call(on_done, None, len(data))
+            return name, True
+        with self._lock:
+            inflight = self._inflight.get(name)
+            leader = inflight is None
+            if leader:
+                inflight = self._inflight[name] = _Inflight()
+        inflight.subscribe(on_chunk, on_done)
+        if leader:
+            inc_tts_cache(provider, hit=False)
+            self._pool().submit(self._fill, key, produce, inflight)
+        return name, False
+
+    def _fill(self, key: str, produce: Callable[[], Iterable[bytes]], inflight: _Inflight) -> None:
+        name = self.filename(key)
+        path = self.root / name
+        tmp = self.root / f".{name}.{threading.get_ident()}.tmp"
+        error: Optional[str] = None
+        try:
+            with open(tmp, "wb") as f:
+                for chunk in produce() or ():
+                    if chunk:
+                        f.write(chunk)
+                        inflight.append(chunk)
+            if inflight.total == 0:
+                raise RuntimeError("provider returned no audio")
+            os.replace(tmp, path)
+            with self._lock:
+                self._load()
+                self._forget(name)
+                self._index[name] = inflight.total
+                self._bytes += inflight.total
+                self._evict()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            logger.error(f"❌ TTS stream failed for {name}: {error}")
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+        finally:
+            # committed (or failed) before leaving the registry, so late readers find the file
+            with self._lock:
+                self._inflight.pop(name, None)
+            inflight.finish(error)
+
+    def iter_audio(self, filename: str, idle_timeout_s: float = 30.0) -> Optional[Iterator[bytes]]:
+        """Bytes of a clip: follows a clip still in flight, else reads the cached file; None if unknown."""
+        with self._lock:
+            inflight = self._inflight.get(filename)
+        if inflight is not None:
+            return inflight.iter(idle_timeout_s)
+        path = self.root / filename
+        if not path.is_file():
+            return None
+
+        def read() -> Iterator[bytes]:
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(64 * 1024), b""):
+                    yield block
+
+        return read()
+
+    def is_streaming(self, filename: str) -> bool:
+        with self._lock:
+            return filename in self._inflight
+
+    def prune(self, max_age_s: float) -> int:
+        """Drop files not used for max_age_s (in addition to the byte budget)."""
+        cutoff = time.time() - max_age_s
+        removed = 0
+        with self._lock:
+            self._load()
+            for name in list(self._index):
+                path = self.root / name
+                try:
+                    if path.stat().st_mtime >= cutoff:
+                        break  # LRU order: everything after is newer
+                    path.unlink()
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+                self._forget(name)
+            set_tts_cache_usage(self._bytes, len(self._index))
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._load()
+            return {"dir": str(self.root), "files": len(self._index), "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+
+tts_cache = TTSCache(
+    Path(os.getenv("TTS_CACHE_DIR") or Path(tempfile.gettempdir()) / "nexus_tts"),
+    max_bytes=int(float(os.getenv("TTS_CACHE_MAX_MB", "512")) * 1024 * 1024),
+    workers=int(os.getenv("TTS_WORKERS", "4")),
+)
@@ -16,10 +16,9 @@ Recommended Korean Voices:
 
 import os
 import logging
-import hashlib
-import tempfile
-from typing import Optional, Dict, Any
-from pathlib import Path
+from typing import Optional, Dict, Any, Iterator
+
+from shared.tts_cache import ChunkCallback, DoneCallback, tts_cache
 
 logger = logging.getLogger(__name__)
 
@@ -41,8 +40,7 @@ class ElevenLabsTTSService:
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv("ELEVENLABS_API_KEY")
         self.enabled = bool(self.api_key and ELEVENLABS_AVAILABLE)
-        self.temp_dir = Path(tempfile.gettempdir()) / "nexus_tts"
-        self.temp_dir.mkdir(exist_ok=True)
+        self.temp_dir = tts_cache.root
         
         if self.enabled:
             self.client = ElevenLabs(api_key=self.api_key)
@@ -87,62 +85,109 @@ class ElevenLabsTTSService:
             return None
         
         try:
-            # Generate audio using text_to_speech (v2 API)
-            logger.info(f"🎤 Generating TTS (ElevenLabs) for: {text[:50]}...")
-            
-            # Use the text_to_speech.convert method
-            audio_generator = self.client.text_to_speech.convert(
-                voice_id=voice_id,
-                text=text,
-                model_id=model,
-                voice_settings={
-                    "stability": stability,
-                    "similarity_boost": similarity_boost,
-                }
-            )
-            
-            # Collect audio bytes from generator
-            audio_bytes = b"".join(audio_generator)
-            
-            # Save to file
-            audio_hash = hashlib.md5(
-                f"{text}{voice_id}{speaking_rate}{stability}".encode()
-            ).hexdigest()[:12]
-            audio_filename = f"tts_{audio_hash}.mp3"
-            audio_path = self.temp_dir / audio_filename
+            def synthesize() -> bytes:
+                # Collect audio bytes from generator
+                return b"".join(self._convert(text, voice_id, model, stability, similarity_boost))
             
-            # Write audio to file
-            with open(audio_path, "wb") as f:
-                f.write(audio_bytes)
+            # Reuse cached audio for the same text/voice/model/settings (no API call on hit)
+            key = self._cache_key(text, voice_id, model, speaking_rate, stability, similarity_boost)
+            audio_path, cached = tts_cache.get_or_create(key, synthesize, provider="elevenlabs")
+            if audio_path is None:
+                logger.error("❌ ElevenLabs TTS returned no audio")
+                return None
             
             # Estimate duration (rough approximation)
             estimated_duration_ms = int(len(text) * 100 * (1.0 / speaking_rate))
             
-            logger.info(f"✅ TTS generated: {audio_path} (~{estimated_duration_ms}ms)")
+            logger.info(f"✅ TTS {'cache hit' if cached else 'generated'}: {audio_path} (~{estimated_duration_ms}ms)")
             
             return {
                 "audio_path": str(audio_path),
-                "audio_url": f"/tts/{audio_filename}",
+                "audio_url": f"/tts/{audio_path.name}",
                 "duration_ms": estimated_duration_ms,
                 "text": text,
                 "voice": voice_id,
                 "model": model,
+                "cached": cached,
             }
             
         except Exception as e:
             logger.error(f"❌ ElevenLabs TTS generation failed: {e}")
             return None
     
+    def stream_speech(
+        self,
+        text: str,
+        voice_id: str = "EXAVITQu4vr4xnSDxMaL",  # Rachel (default)
+        model: str = "eleven_multilingual_v2",
+        speaking_rate: float = 1.0,
+        stability: float = 0.5,
+        similarity_boost: float = 0.75,
+        on_chunk: Optional[ChunkCallback] = None,
+        on_done: Optional[DoneCallback] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Start TTS on the TTS worker pool and return immediately.
+        
+        The ElevenLabs generator is consumed chunk by chunk as the API sends it: audio_url
+        can be fetched right away (GET /tts/{filename} follows the synthesis), and
+        on_chunk(index, chunk) / on_done(error, total_bytes) are called from the worker.
+        
+        Returns:
+            Same dict as generate_speech (without audio_path), plus "streaming"
+            (True while audio is still being synthesized).
+        """
+        if not self.enabled:
+            logger.warning("ElevenLabs TTS service not enabled - skipping")
+            return None
+        
+        try:
+            key = self._cache_key(text, voice_id, model, speaking_rate, stability, similarity_boost)
+            filename, cached = tts_cache.start_stream(
+                key,
+                lambda: self._convert(text, voice_id, model, stability, similarity_boost),
+                provider="elevenlabs",
+                on_chunk=on_chunk,
+                on_done=on_done,
+            )
+        except Exception as e:
+            logger.error(f"❌ ElevenLabs TTS stream failed to start: {e}")
+            return None
+        
+        return {
+            "audio_url": f"/tts/{filename}",
+            "duration_ms": int(len(text) * 100 * (1.0 / speaking_rate)),
+            "text": text,
+            "voice": voice_id,
+            "model": model,
+            "cached": cached,
+            "streaming": not cached,
+        }
+    
+    def _convert(self, text: str, voice_id: str, model: str, stability: float, similarity_boost: float) -> Iterator[bytes]:
+        # Generate audio using text_to_speech (v2 API); the SDK yields chunks as they arrive
+        logger.info(f"🎤 Generating TTS (ElevenLabs) for: {text[:50]}...")
+        return self.client.text_to_speech.convert(
+            voice_id=voice_id,
+            text=text,
+            model_id=model,
+            voice_settings={
+                "stability": stability,
+                "similarity_boost": similarity_boost,
+            }
+        )
+    
+    @staticmethod
+    def _cache_key(text: str, voice_id: str, model: str, speaking_rate: float, stability: float, similarity_boost: float) -> str:
+        return tts_cache.key(
+            "elevenlabs", voice_id, model, text,
+            speaking_rate=speaking_rate, stability=stability, similarity_boost=similarity_boost,
+        )
+    
     def cleanup_old_files(self, max_age_hours: int = 24):
-        """Clean up old TTS files."""
-        import time
+        """Clean up TTS files unused for max_age_hours (the cache also evicts by size)."""
         try:
-            now = time.time()
-            max_age_seconds = max_age_hours * 3600
-            for audio_file in self.temp_dir.glob("tts_*.mp3"):
-                if now - audio_file.stat().st_mtime > max_age_seconds:
-                    audio_file.unlink()
-                    logger.debug(f"🗑️ Deleted old TTS file: {audio_file}")
+            tts_cache.prune(max_age_hours * 3600)
         except Exception as e:
             logger.error(f"❌ Cleanup failed: {e}")
 
@@ -174,6 +219,19 @@ def generate_tts_elevenlabs(
     )
 
 
+def stream_tts_elevenlabs(
+    text: str,
+    voice_id: str = "EXAVITQu4vr4xnSDxMaL",  # Rachel
+    speaking_rate: float = 1.0,
+    on_chunk: Optional[ChunkCallback] = None,
+    on_done: Optional[DoneCallback] = None,
+) -> Optional[Dict[str, Any]]:
+    """Start streamed TTS using ElevenLabs (see ElevenLabsTTSService.stream_speech)."""
+    return elevenlabs_tts_service.stream_speech(
+        text, voice_id, speaking_rate=speaking_rate, on_chunk=on_chunk, on_done=on_done
+    )
+
+
 # Voice presets for easy use
 VOICE_PRESETS = {
     "rachel": "EXAVITQu4vr4xnSDxMaL",  # Versatile, natural
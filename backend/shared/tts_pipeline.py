@@ -0,0 +1,244 @@
+"""
+Sentence-level pipelined TTS for assistant replies.
+
+A reply is split into sentences (split_sentences) and each sentence is synthesized as its own
+clip through a streaming TTS provider (stream_tts / stream_speech), so the first sentence can
+play while later ones are still being synthesized. SentencePipeline emits, for one reply:
+
+  tts_start  {text, segments, duration_ms}                  before any audio
+  tts_chunk  {seq, text, audio_url, duration_ms, voice}     one per sentence, in order, once its
+                                                            first audio bytes arrived
+  tts_end    {duration_ms, segments, failed}                after every sentence finished synthesis
+
+Provider calls are bounded per tenant by TenantTTSLimiter (FIFO per tenant, shared by all
+replies of that tenant), so one long reply cannot take over the TTS worker pool.
+"""
+
+import logging
+import re
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# sentence end: terminal punctuation (incl. CJK / ellipsis / Korean "~") followed by space, or a newline
+_SENTENCE_END = re.compile(r"(?<=[.!?。！？…~])\s+|\n+")
+_CLAUSE_END = re.compile(r"(?<=[,，、;；:])\s+")
+
+# start(text, on_chunk, on_done) -> result dict with audio_url / duration_ms / voice, or None
+StartFn = Callable[..., Optional[Dict[str, Any]]]
+EmitFn = Callable[[str, Dict[str, Any]], None]
+
+
+def split_sentences(text: str, min_chars: int = 12, max_chars: int = 160) -> List[str]:
+    """Split text into speakable segments of roughly min_chars..max_chars characters.
+
+    Sentences shorter than min_chars are merged into the next one (very short clips sound
+    choppy and cost a provider call each); sentences longer than max_chars are split at
+    clause punctuation, then at spaces.
+    """
+    pieces: List[str] = []
+    for sentence in _SENTENCE_END.split(text or ""):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        for clause in _CLAUSE_END.split(sentence):
+            clause = clause.strip()
+            while len(clause) > max_chars:
+                cut = clause.rfind(" ", 0, max_chars + 1)
+                if cut <= 0:
+                    cut = max_chars
+                pieces.append(clause[:cut].strip())
+                clause = clause[cut:].strip()
+            if clause:
+                pieces.append(clause)
+
+    segments: List[str] = []
+    carry = ""
+    for piece in pieces:
+        carry = f"{carry} {piece}" if carry else piece
+        if len(carry) >= min_chars:
+            segments.append(carry)
+            carry = ""
+    if carry:
+        if segments and len(segments[-1]) + len(carry) < max_chars:
+            segments[-1] = f"{segments[-1]} {carry}"
+        else:
+            segments.append(carry)
+    return segments
+
+
+class TenantTTSLimiter:
+    """Runs TTS jobs with at most `limit` provider calls in flight per tenant.
+
+    submit(tenant, job) queues job(release); the job starts a synthesis and must call
+    release() once it finished (or failed to start). Jobs of one tenant start in FIFO order.
+    Jobs run on the thread that freed the slot, which is the caller of submit() or a TTS
+    worker thread; release() may be called synchronously from inside the job (cache hit).
+    """
+
+    def __init__(self, limit: int = 2):
+        self.limit = max(1, int(limit))
+        self._lock = threading.Lock()
+        self._active: Dict[str, int] = {}
+        self._queues: Dict[str, Deque[Callable[[Callable[[], None]], None]]] = {}
+        self._pumping: set = set()
+
+    def submit(self, tenant_id: str, job: Callable[[Callable[[], None]], None]) -> None:
+        with self._lock:
+            self._queues.setdefault(tenant_id, deque()).append(job)
+        self._pump(tenant_id)
+
+    def _release(self, tenant_id: str) -> None:
+        with self._lock:
+            self._active[tenant_id] = self._active.get(tenant_id, 1) - 1
+        self._pump(tenant_id)
+
+    def _pump(self, tenant_id: str) -> None:
+        while True:
+            with self._lock:
+                if tenant_id in self._pumping:
+                    return  # the frame already pumping this tenant re-checks after its job
+                q = self._queues.get(tenant_id)
+                if not q or self._active.get(tenant_id, 0) >= self.limit:
+                    if not q:
+                        self._queues.pop(tenant_id, None)
+                    if not self._active.get(tenant_id):
+                        self._active.pop(tenant_id, None)
+                    return
+                job = q.popleft()
+                self._active[tenant_id] = self._active.get(tenant_id, 0) + 1
+                self._pumping.add(tenant_id)
+            released = threading.Event()
+
+            def release(tenant_id: str = tenant_id, released: threading.Event = released) -> None:
+                if not released.is_set():
+                    released.set()
+                    self._release(tenant_id)
+
+            try:
+                job(release)
+            except Exception as e:
+                logger.error(f"❌ TTS job failed to start: {e}")
+                release()
+            finally:
+                with self._lock:
+                    self._pumping.discard(tenant_id)
+
+    def active(self, tenant_id: str) -> int:
+        with self._lock:
+            return self._active.get(tenant_id, 0)
+
+
+class SentencePipeline:
+    """Ordered per-sentence TTS events for one reply (see module docstring)."""
+
+    def __init__(self, tenant_id: str, text: str, start: StartFn, emit: EmitFn, limiter: TenantTTSLimiter,
+                 max_chars: int = 160):
+        self.tenant_id = tenant_id
+        self.text = text
+        self.segments = split_sentences(text, max_chars=max_chars) or [text]
+        self.start_fn = start
+        self.emit = emit
+        self.limiter = limiter
+        self._lock = threading.Lock()
+        n = len(self.segments)
+        self._results: List[Optional[Dict[str, Any]]] = [None] * n
+        self._has_audio = [False] * n
+        self._ready: List[Optional[Dict[str, Any]]] = [None] * n  # tts_chunk payload, or {} if failed
+        self._next = 0  # next seq to emit
+        self._finished = 0  # sentences whose synthesis ended (or never started)
+        self._failed = 0
+        self._duration_ms = 0
+        self._ended = False
+
+    @staticmethod
+    def estimate_ms(text: str) -> int:
+        return len(text) * 100
+
+    def run(self) -> None:
+        """Emit tts_start and queue every sentence; returns without waiting for audio."""
+        self.emit("tts_start", {
+            "text": self.text,
+            "segments": len(self.segments),
+            "duration_ms": sum(self.estimate_ms(s) for s in self.segments),
+            "streaming": True,
+        })
+        for seq in range(len(self.segments)):
+            self.limiter.submit(self.tenant_id, lambda release, seq=seq: self._start(seq, release))
+
+    def _start(self, seq: int, release: Callable[[], None]) -> None:
+        def on_chunk(index: int, chunk: bytes) -> None:
+            with self._lock:
+                self._has_audio[seq] = True
+                self._mark_ready(seq)
+
+        def on_done(error: Optional[str], total_bytes: int) -> None:
+            release()  # before taking self._lock: it may start the next sentence on this thread
+            with self._lock:
+                self._finished += 1
+                if error or not total_bytes:
+                    self._fail(seq, error or "no audio")
+                else:
+                    self._has_audio[seq] = True
+                    self._mark_ready(seq)
+                self._maybe_end()
+
+        try:
+            result = self.start_fn(text=self.segments[seq], on_chunk=on_chunk, on_done=on_done)
+        except Exception as e:
+            result = None
+            logger.warning(f"TTS segment {seq} failed to start: {e}")
+        with self._lock:
+            if not result:
+                self._finished += 1
+                self._fail(seq, "failed to start")
+                self._maybe_end()
+            else:
+                self._results[seq] = result
+                self._mark_ready(seq)
+        if not result:
+            release()
+
+    # ---- ordering (caller holds self._lock) ----
+    def _mark_ready(self, seq: int) -> None:
+        result = self._results[seq]
+        if self._ready[seq] is not None or result is None or not self._has_audio[seq]:
+            return
+        self._ready[seq] = {
+            "seq": seq,
+            "text": self.segments[seq],
+            "audio_url": result["audio_url"],
+            "duration_ms": result["duration_ms"],
+            "voice": result.get("voice", ""),
+            "cached": result.get("cached", False),
+        }
+        self._flush()
+
+    def _fail(self, seq: int, reason: str) -> None:
+        if self._ready[seq] is not None:
+            return  # audio already announced; the client's stream of that clip ends early
+        logger.warning(f"TTS segment {seq} for {self.tenant_id} skipped: {reason}")
+        self._ready[seq] = {}
+        self._failed += 1
+        self._flush()
+
+    def _flush(self) -> None:
+        n = len(self.segments)
+        while self._next < n and self._ready[self._next] is not None:
+            data = self._ready[self._next]
+            if data:
+                self._duration_ms += data["duration_ms"]
+                self.emit("tts_chunk", data)
+            self._next += 1
+        self._maybe_end()
+
+    def _maybe_end(self) -> None:
+        n = len(self.segments)
+        if not self._ended and self._next == n and self._finished == n:
+            self._ended = True
+            self.emit("tts_end", {"duration_ms": self._duration_ms, "segments": n, "failed": self._failed})
@@ -14,10 +14,9 @@ Date: 2026-02-04
 
 import os
 import logging
-import hashlib
-import tempfile
-from typing import Optional, Dict, Any
-from pathlib import Path
+from typing import Optional, Dict, Any, Iterator
+
+from shared.tts_cache import ChunkCallback, DoneCallback, tts_cache
 
 logger = logging.getLogger(__name__)
 
@@ -36,8 +35,7 @@ class TTSService:
     def __init__(self):
         self.enabled = False
         self.client = None
-        self.temp_dir = Path(tempfile.gettempdir()) / "nexus_tts"
-        self.temp_dir.mkdir(exist_ok=True)
+        self.temp_dir = tts_cache.root
         
         # Initialize Google Cloud TTS client
         try:
@@ -86,74 +84,124 @@ class TTSService:
             return None
         
         try:
-            # Prepare input
-            synthesis_input = self.texttospeech.SynthesisInput(text=text)
-            
-            # Voice configuration
-            voice = self.texttospeech.VoiceSelectionParams(
-                language_code=language_code,
-                name=voice_name,
-                ssml_gender=self.texttospeech.SsmlVoiceGender.FEMALE
-            )
-            
-            # Audio configuration
-            audio_config = self.texttospeech.AudioConfig(
-                audio_encoding=self.texttospeech.AudioEncoding.MP3,
-                speaking_rate=speaking_rate,
-                pitch=pitch,
-            )
-            
-            # Perform TTS request
-            logger.info(f"🎤 Generating TTS for text (length: {len(text)}): {text[:50]}...")
-            response = self.client.synthesize_speech(
-                input=synthesis_input,
-                voice=voice,
-                audio_config=audio_config
-            )
-            
-            # Save audio to temporary file
-            audio_hash = hashlib.md5(f"{text}{voice_name}{speaking_rate}{pitch}".encode()).hexdigest()[:12]
-            audio_filename = f"tts_{audio_hash}.mp3"
-            audio_path = self.temp_dir / audio_filename
+            def synthesize() -> bytes:
+                return self._synthesize(text, voice_name, language_code, speaking_rate, pitch)
             
-            with open(audio_path, "wb") as out:
-                out.write(response.audio_content)
+            # Reuse cached audio for the same text/voice/settings (no API call on hit)
+            key = self._cache_key(text, voice_name, language_code, speaking_rate, pitch)
+            audio_path, cached = tts_cache.get_or_create(key, synthesize, provider="google_cloud_service_account")
+            if audio_path is None:
+                logger.error("❌ TTS returned no audio")
+                return None
             
             # Estimate duration (roughly 100ms per character for Korean)
             estimated_duration_ms = int(len(text) * 100 * (1.0 / speaking_rate))
             
-            logger.info(f"✅ TTS generated successfully: {audio_path} ({estimated_duration_ms}ms)")
+            logger.info(f"✅ TTS {'cache hit' if cached else 'generated successfully'}: {audio_path} ({estimated_duration_ms}ms)")
             
             return {
                 "audio_path": str(audio_path),
-                "audio_url": f"/tts/{audio_filename}",  # URL for serving
+                "audio_url": f"/tts/{audio_path.name}",  # URL for serving
                 "duration_ms": estimated_duration_ms,
                 "text": text,
                 "voice": voice_name,
+                "cached": cached,
             }
             
         except Exception as e:
             logger.error(f"❌ TTS generation failed: {e}")
             return None
     
+    def stream_speech(
+        self,
+        text: str,
+        voice_name: str = "ko-KR-Wavenet-A",
+        language_code: str = "ko-KR",
+        speaking_rate: float = 1.0,
+        pitch: float = 0.0,
+        on_chunk: Optional[ChunkCallback] = None,
+        on_done: Optional[DoneCallback] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Start TTS on the TTS worker pool and return immediately.
+        
+        Google Cloud TTS returns the clip in one response, so on_chunk is called once
+        with the whole clip; the request still runs off the caller's thread and
+        audio_url can be fetched right away (GET /tts/{filename} waits for the audio).
+        
+        Returns:
+            Same dict as generate_speech (without audio_path), plus "streaming".
+        """
+        if not self.enabled:
+            logger.warning("TTS service not enabled - skipping speech generation")
+            return None
+        
+        def produce() -> Iterator[bytes]:
+            audio = self._synthesize(text, voice_name, language_code, speaking_rate, pitch)
+            if audio:
+                yield audio
+        
+        try:
+            key = self._cache_key(text, voice_name, language_code, speaking_rate, pitch)
+            filename, cached = tts_cache.start_stream(
+                key, produce, provider="google_cloud_service_account", on_chunk=on_chunk, on_done=on_done
+            )
+        except Exception as e:
+            logger.error(f"❌ TTS stream failed to start: {e}")
+            return None
+        
+        return {
+            "audio_url": f"/tts/{filename}",
+            "duration_ms": int(len(text) * 100 * (1.0 / speaking_rate)),
+            "text": text,
+            "voice": voice_name,
+            "cached": cached,
+            "streaming": not cached,
+        }
+    
+    def _synthesize(self, text: str, voice_name: str, language_code: str, speaking_rate: float, pitch: float) -> bytes:
+        # Prepare input
+        synthesis_input = self.texttospeech.SynthesisInput(text=text)
+        
+        # Voice configuration
+        voice = self.texttospeech.VoiceSelectionParams(
+            language_code=language_code,
+            name=voice_name,
+            ssml_gender=self.texttospeech.SsmlVoiceGender.FEMALE
+        )
+        
+        # Audio configuration
+        audio_config = self.texttospeech.AudioConfig(
+            audio_encoding=self.texttospeech.AudioEncoding.MP3,
+            speaking_rate=speaking_rate,
+            pitch=pitch,
+        )
+        
+        # Perform TTS request
+        logger.info(f"🎤 Generating TTS for text (length: {len(text)}): {text[:50]}...")
+        response = self.client.synthesize_speech(
+            input=synthesis_input,
+            voice=voice,
+            audio_config=audio_config
+        )
+        return response.audio_content
+    
+    @staticmethod
+    def _cache_key(text: str, voice_name: str, language_code: str, speaking_rate: float, pitch: float) -> str:
+        return tts_cache.key(
+            "google_cloud", voice_name, "", text,
+            language_code=language_code, speaking_rate=speaking_rate, pitch=pitch,
+        )
+    
     def cleanup_old_files(self, max_age_hours: int = 24):
         """
-        Clean up old TTS audio files.
+        Clean up TTS audio files unused for max_age_hours (the cache also evicts by size).
         
         Args:
             max_age_hours: Maximum age in hours before deletion
         """
-        import time
-        
         try:
-            now = time.time()
-            max_age_seconds = max_age_hours * 3600
-            
-            for audio_file in self.temp_dir.glob("tts_*.mp3"):
-                file_age = now - audio_file.stat().st_mtime
-                if file_age > max_age_seconds:
-                    audio_file.unlink()
-                    logger.debug(f"🗑️ Deleted old TTS file: {audio_file}")
+            tts_cache.prune(max_age_hours * 3600)
         except Exception as e:
             logger.error(f"❌ Failed to cleanup TTS files: {e}")
 
@@ -181,4 +229,18 @@ def generate_tts(
     Returns:
         TTS result dict or None if failed
     """
-    return tts_service.generate_speech(text, voice_name, speaking_rate, pitch)
+    return tts_service.generate_speech(text, voice_name, speaking_rate=speaking_rate, pitch=pitch)
+
+
+def stream_tts(
+    text: str,
+    voice_name: str = "ko-KR-Wavenet-A",
+    speaking_rate: float = 1.0,
+    pitch: float = 0.0,
+    on_chunk: Optional[ChunkCallback] = None,
+    on_done: Optional[DoneCallback] = None,
+) -> Optional[Dict[str, Any]]:
+    """Start streamed TTS (see TTSService.stream_speech)."""
+    return tts_service.stream_speech(
+        text, voice_name, speaking_rate=speaking_rate, pitch=pitch, on_chunk=on_chunk, on_done=on_done
+    )
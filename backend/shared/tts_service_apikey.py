@@ -13,11 +13,10 @@ Note: This is a fallback option. Service account is still recommended.
 
 import os
 import logging
-import hashlib
-import tempfile
 import requests
-from typing import Optional, Dict, Any
-from pathlib import Path
+from typing import Optional, Dict, Any, Iterator
+
+from shared.tts_cache import ChunkCallback, DoneCallback, tts_cache
 
 logger = logging.getLogger(__name__)
 
@@ -32,8 +31,7 @@ class TTSServiceWithAPIKey:
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv("GOOGLE_CLOUD_API_KEY")
         self.enabled = bool(self.api_key)
-        self.temp_dir = Path(tempfile.gettempdir()) / "nexus_tts"
-        self.temp_dir.mkdir(exist_ok=True)
+        self.temp_dir = tts_cache.root
         self.api_url = "https://texttospeech.googleapis.com/v1/text:synthesize"
         
         if self.enabled:
@@ -67,73 +65,122 @@ class TTSServiceWithAPIKey:
             return None
         
         try:
-            # Prepare request payload
-            payload = {
-                "input": {"text": text},
-                "voice": {
-                    "languageCode": language_code,
-                    "name": voice_name,
-                    "ssmlGender": "FEMALE"
-                },
-                "audioConfig": {
-                    "audioEncoding": "MP3",
-                    "speakingRate": speaking_rate,
-                    "pitch": pitch
-                }
-            }
-            
-            # Make API request
-            logger.info(f"🎤 Generating TTS (API Key) for: {text[:50]}...")
-            response = requests.post(
-                f"{self.api_url}?key={self.api_key}",
-                json=payload,
-                timeout=10
-            )
+            def synthesize() -> Optional[bytes]:
+                return self._synthesize(text, voice_name, language_code, speaking_rate, pitch)
             
-            if response.status_code != 200:
-                logger.error(f"❌ TTS API error: {response.status_code} - {response.text}")
+            # Reuse cached audio for the same text/voice/settings (no API call on hit)
+            key = self._cache_key(text, voice_name, language_code, speaking_rate, pitch)
+            audio_path, cached = tts_cache.get_or_create(key, synthesize, provider="google_cloud_api_key")
+            if audio_path is None:
                 return None
             
-            # Extract audio content (base64 encoded)
-            import base64
-            result = response.json()
-            audio_content = base64.b64decode(result["audioContent"])
-            
-            # Save to file
-            audio_hash = hashlib.md5(f"{text}{voice_name}{speaking_rate}{pitch}".encode()).hexdigest()[:12]
-            audio_filename = f"tts_{audio_hash}.mp3"
-            audio_path = self.temp_dir / audio_filename
-            
-            with open(audio_path, "wb") as f:
-                f.write(audio_content)
-            
             # Estimate duration
             estimated_duration_ms = int(len(text) * 100 * (1.0 / speaking_rate))
             
-            logger.info(f"✅ TTS generated: {audio_path} ({estimated_duration_ms}ms)")
+            logger.info(f"✅ TTS {'cache hit' if cached else 'generated'}: {audio_path} ({estimated_duration_ms}ms)")
             
             return {
                 "audio_path": str(audio_path),
-                "audio_url": f"/tts/{audio_filename}",
+                "audio_url": f"/tts/{audio_path.name}",
                 "duration_ms": estimated_duration_ms,
                 "text": text,
                 "voice": voice_name,
+                "cached": cached,
             }
             
         except Exception as e:
             logger.error(f"❌ TTS generation failed: {e}")
             return None
     
+    def stream_speech(
+        self,
+        text: str,
+        voice_name: str = "ko-KR-Wavenet-A",
+        language_code: str = "ko-KR",
+        speaking_rate: float = 1.0,
+        pitch: float = 0.0,
+        on_chunk: Optional[ChunkCallback] = None,
+        on_done: Optional[DoneCallback] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Start TTS on the TTS worker pool and return immediately.
+        
+        The REST API returns the clip in one response, so on_chunk is called once with
+        the whole clip; audio_url can be fetched right away (GET /tts/{filename} waits).
+        
+        Returns:
+            Same dict as generate_speech (without audio_path), plus "streaming".
+        """
+        if not self.enabled:
+            logger.warning("TTS service not enabled - skipping")
+            return None
+        
+        def produce() -> Iterator[bytes]:
+            audio = self._synthesize(text, voice_name, language_code, speaking_rate, pitch)
+            if audio:
+                yield audio
+        
+        try:
+            key = self._cache_key(text, voice_name, language_code, speaking_rate, pitch)
+            filename, cached = tts_cache.start_stream(
+                key, produce, provider="google_cloud_api_key", on_chunk=on_chunk, on_done=on_done
+            )
+        except Exception as e:
+            logger.error(f"❌ TTS stream failed to start: {e}")
+            return None
+        
+        return {
+            "audio_url": f"/tts/{filename}",
+            "duration_ms": int(len(text) * 100 * (1.0 / speaking_rate)),
+            "text": text,
+            "voice": voice_name,
+            "cached": cached,
+            "streaming": not cached,
+        }
+    
+    def _synthesize(self, text: str, voice_name: str, language_code: str, speaking_rate: float, pitch: float) -> Optional[bytes]:
+        # Prepare request payload
+        payload = {
+            "input": {"text": text},
+            "voice": {
+                "languageCode": language_code,
+                "name": voice_name,
+                "ssmlGender": "FEMALE"
+            },
+            "audioConfig": {
+                "audioEncoding": "MP3",
+                "speakingRate": speaking_rate,
+                "pitch": pitch
+            }
+        }
+        
+        # Make API request
+        logger.info(f"🎤 Generating TTS (API Key) for: {text[:50]}...")
+        response = requests.post(
+            f"{self.api_url}?key={self.api_key}",
+            json=payload,
+            timeout=10
+        )
+        
+        if response.status_code != 200:
+            logger.error(f"❌ TTS API error: {response.status_code} - {response.text}")
+            return None
+        
+        # Extract audio content (base64 encoded)
+        import base64
+        return base64.b64decode(response.json()["audioContent"])
+    
+    @staticmethod
+    def _cache_key(text: str, voice_name: str, language_code: str, speaking_rate: float, pitch: float) -> str:
+        return tts_cache.key(
+            "google_cloud", voice_name, "", text,
+            language_code=language_code, speaking_rate=speaking_rate, pitch=pitch,
+        )
+    
     def cleanup_old_files(self, max_age_hours: int = 24):
-        """Clean up old TTS files."""
-        import time
+        """Clean up TTS files unused for max_age_hours (the cache also evicts by size)."""
         try:
-            now = time.time()
-            max_age_seconds = max_age_hours * 3600
-            for audio_file in self.temp_dir.glob("tts_*.mp3"):
-                if now - audio_file.stat().st_mtime > max_age_seconds:
-                    audio_file.unlink()
-                    logger.debug(f"🗑️ Deleted old TTS file: {audio_file}")
+            tts_cache.prune(max_age_hours * 3600)
         except Exception as e:
             logger.error(f"❌ Cleanup failed: {e}")
 
@@ -149,4 +196,18 @@ def generate_tts_with_apikey(
     pitch: float = 0.0,
 ) -> Optional[Dict[str, Any]]:
     """Generate TTS using API Key (fallback)."""
-    return tts_service_apikey.generate_speech(text, voice_name, speaking_rate, pitch)
+    return tts_service_apikey.generate_speech(text, voice_name, speaking_rate=speaking_rate, pitch=pitch)
+
+
+def stream_tts_with_apikey(
+    text: str,
+    voice_name: str = "ko-KR-Wavenet-A",
+    speaking_rate: float = 1.0,
+    pitch: float = 0.0,
+    on_chunk: Optional[ChunkCallback] = None,
+    on_done: Optional[DoneCallback] = None,
+) -> Optional[Dict[str, Any]]:
+    """Start streamed TTS using API Key (see TTSServiceWithAPIKey.stream_speech)."""
+    return tts_service_apikey.stream_speech(
+        text, voice_name, speaking_rate=speaking_rate, pitch=pitch, on_chunk=on_chunk, on_done=on_done
+    )
@@ -4,7 +4,8 @@ import time
 from typing import Any, Dict, List, Optional
 
 import requests
-import redis
+
+from shared.redis_client import get_redis
 
 
 _ISO8601_RE = re.compile(r"PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?")
@@ -35,7 +36,7 @@ class YouTubeClient:
     def __init__(self, redis_url: str, api_key: str, base_url: str = "https://www.googleapis.com/youtube/v3"):
         self.api_key = (api_key or "").strip()
         self.base_url = base_url.rstrip("/")
-        self.r = redis.Redis.from_url(redis_url, decode_responses=True)
+        self.r = get_redis(redis_url)
 
     def enabled(self) -> bool:
         return bool(self.api_key)
@@ -4,7 +4,7 @@ import json
 import time
 from typing import Any, Dict, List, Optional
 
-import redis
+from shared.redis_client import get_redis
 
 
 def _utc_iso() -> str:
@@ -15,7 +15,7 @@ class YouTubeQueueStore:
     """Tenant+session scoped YouTube queue backed by Redis."""
 
     def __init__(self, redis_url: str):
-        self.r = redis.Redis.from_url(redis_url, decode_responses=True)
+        self.r = get_redis(redis_url)
 
     def _k(self, tenant_id: str, session_id: str) -> str:
         return f"nexus:ytq:{tenant_id}:{session_id}"
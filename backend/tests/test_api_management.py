@@ -1,5 +1,17 @@
+import threading
+import time
 import unittest
-from shared.api_management import TokenBucket, budget_check_and_reserve
+from unittest import mock
+
+import redis
+
+try:
+    import fakeredis
+except ImportError:  # optional test dependency
+    fakeredis = None
+
+from shared.api_management import BudgetLedger, RateLimiter, TokenBucket, budget_check_and_reserve
+from shared.settings import settings
 
 class TestAPIManagement(unittest.TestCase):
     def test_token_bucket_allows(self):
@@ -9,3 +21,56 @@ class TestAPIManagement(unittest.TestCase):
     def test_budget_reserve(self):
         ok, _ = budget_check_and_reserve(0.0)
         self.assertTrue(ok)
+
+
+@unittest.skipIf(fakeredis is None, "needs fakeredis (with lupa for Lua scripts)")
+class TestSharedQuota(unittest.TestCase):
+    def setUp(self):
+        self.r = fakeredis.FakeRedis(decode_responses=True)
+        patcher = mock.patch("shared.api_management._quota_redis", return_value=self.r)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_buckets_shared_between_limiters(self):
+        # two limiters stand in for two worker processes
+        with mock.patch.multiple(settings, llm_rate_limit_rpm_global=5, llm_rate_limit_rpm_map=""):
+            a, b = RateLimiter(), RateLimiter()
+        allowed = [lim.allow() for lim in (a, b) * 5]
+        self.assertEqual(allowed.count(True), 5)
+        self.assertFalse(any(allowed[5:]))
+
+    def test_denied_provider_keeps_global_token(self):
+        with mock.patch.multiple(settings, llm_rate_limit_rpm_global=3, llm_rate_limit_rpm_map="openai:1"):
+            lim = RateLimiter()
+        self.assertTrue(lim.allow("openai"))
+        self.assertFalse(lim.allow("openai"))
+        self.assertFalse(lim.allow_provider("openai"))
+        self.assertTrue(lim.allow())
+        self.assertTrue(lim.allow())
+        self.assertFalse(lim.allow())
+
+    def test_budget_reservations_never_overshoot(self):
+        ledger = BudgetLedger()
+        barrier = threading.Barrier(20)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(ledger.reserve(1.0, 10.0)[0])
+
+        threads = [threading.Thread(target=worker) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results.count(True), 10)
+        key = BudgetLedger._key(time.strftime("%Y-%m-%d", time.gmtime()))
+        self.assertEqual(float(self.r.get(key)), 10.0)
+        self.assertGreater(self.r.ttl(key), 86400)
+        self.assertEqual(ledger.adjust(-2.5), 7.5)
+        self.assertEqual(ledger.adjust(-100.0), 0.0)  # refunds never go below zero
+
+    def test_redis_error_falls_back_to_local(self):
+        with mock.patch.object(self.r, "evalsha", side_effect=redis.ConnectionError("down")), \
+                mock.patch.object(self.r, "eval", side_effect=redis.ConnectionError("down")):
+            self.assertTrue(RateLimiter().allow("gemini"))
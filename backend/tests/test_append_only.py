@@ -0,0 +1,124 @@
+import multiprocessing
+import os
+import tempfile
+import threading
+import unittest
+
+from shared.append_only import ZERO_HASH, ChainWriter, _Append, append_jsonl_with_chain, chain_writer, verify_jsonl_chain
+
+
+def _append_many(path, n, tag):
+    for i in range(n):
+        append_jsonl_with_chain(path, {"proc": tag, "i": i})
+
+
+class TestChainWriter(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "audit.jsonl")
+
+    def writer(self, **kw):
+        w = ChainWriter(self.path, **kw)
+        self.addCleanup(w.close)
+        return w
+
+    def test_records_chain_and_verify(self):
+        w = self.writer(fsync_interval_s=0)
+        a = w.append({"event": "a"})
+        b = w.append({"event": "b", "hash": "ignored"})
+        self.assertEqual(a["prev_hash"], ZERO_HASH)
+        self.assertEqual(b["prev_hash"], a["hash"])
+        self.assertEqual(w.head, b["hash"])
+        res = verify_jsonl_chain(self.path)
+        self.assertTrue(res["ok"], res)
+        self.assertEqual((res["count"], res["last_hash"]), (2, b["hash"]))
+
+    def test_concurrent_threads_group_commit(self):
+        w = self.writer()
+        barrier = threading.Barrier(16)
+
+        def worker(t):
+            barrier.wait()
+            for i in range(50):
+                w.append({"t": t, "i": i})
+
+        threads = [threading.Thread(target=worker, args=(t,)) for t in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        res = verify_jsonl_chain(self.path)
+        self.assertTrue(res["ok"], res)
+        self.assertEqual(res["count"], 800)
+
+    def test_writers_sharing_a_file_follow_each_other(self):
+        # two writers stand in for two processes: each must pick up the other's head
+        a, b = self.writer(), self.writer()
+        for i in range(5):
+            a.append({"w": "a", "i": i})
+            b.append({"w": "b", "i": i})
+        res = verify_jsonl_chain(self.path)
+        self.assertTrue(res["ok"], res)
+        self.assertEqual(res["count"], 10)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs fork")
+    def test_processes_do_not_fork_the_chain(self):
+        chain_writer(self.path)  # a parent writer must not leak into the children
+        ctx = multiprocessing.get_context("fork")
+        procs = [ctx.Process(target=_append_many, args=(self.path, 100, p)) for p in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+            self.assertEqual(p.exitcode, 0)
+        res = verify_jsonl_chain(self.path)
+        self.assertTrue(res["ok"], res)
+        self.assertEqual(res["count"], 400)
+
+    def test_bad_event_fails_only_its_caller(self):
+        w = self.writer()
+        batch = [_Append({"i": 0}), _Append({"i": 1, "bad": object()}), _Append({"i": 2})]
+        w._commit(batch)
+        self.assertIsInstance(batch[1].error, TypeError)
+        self.assertIsNone(batch[1].result)
+        self.assertEqual(batch[2].result["prev_hash"], batch[0].result["hash"])
+
+        barrier = threading.Barrier(8)
+        errors = []
+
+        def worker(t):
+            barrier.wait()
+            for i in range(20):
+                event = {"t": t, "i": i, "bad": object()} if (t, i) == (3, 7) else {"t": t, "i": i}
+                try:
+                    w.append(event)
+                except TypeError as e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(t,)) for t in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(errors), 1)
+        res = verify_jsonl_chain(self.path)
+        self.assertTrue(res["ok"], res)
+        self.assertEqual(res["count"], 161)
+
+    def test_torn_tail_recovered(self):
+        w = self.writer()
+        for i in range(3):
+            w.append({"i": i})
+        w.close()
+        with open(self.path, "ab") as f:
+            f.write(b'{"i": 3, "chain_ver": 1, "prev_ha')  # crash mid-write
+        w = self.writer()
+        w.append({"i": "after"})
+        res = verify_jsonl_chain(self.path)
+        self.assertTrue(res["ok"], res)
+        self.assertEqual(res["count"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
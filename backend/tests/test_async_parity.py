@@ -0,0 +1,155 @@
+"""Sync/async parity: each Async* store must leave Redis exactly as its sync twin does.
+
+Every scenario is one list of (method, *args) steps, run against the sync class on one fake
+server and awaited against the async class on another; the return values and the whole
+resulting keyspace (types, values, TTL set or not) must match, timestamps aside.
+"""
+
+import asyncio
+import json
+import re
+import unittest
+from unittest import mock
+
+try:
+    import fakeredis
+except ImportError:  # optional test dependency
+    fakeredis = None
+
+from shared.node_store import AsyncNodeStore, NodeStore, _NodeStoreBase
+from shared.rag_naive import AsyncNaiveRAG, NaiveRAG, RagDoc
+from shared.stream_store import AsyncStreamStore, StreamStore
+from shared.task_store import AsyncTaskStore, TaskStore
+
+TENANT = "org::proj"
+_VOLATILE = re.compile(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d(?:\.\d+)?(?:Z|[+-]\d\d:\d\d)?|snapshot-\d+")
+
+
+def _norm(value):
+    return json.loads(_VOLATILE.sub("<ts>", json.dumps(value, sort_keys=True, ensure_ascii=False, default=vars)))
+
+
+def _dump(r):
+    out = {}
+    for key in sorted(r.keys("*")):
+        kind = r.type(key)
+        if kind == "string":
+            value = r.get(key)
+        elif kind == "hash":
+            value = r.hgetall(key)
+        elif kind == "list":
+            value = r.lrange(key, 0, -1)
+        elif kind == "set":
+            value = sorted(r.smembers(key))
+        elif kind == "zset":
+            value = r.zrange(key, 0, -1, withscores=True)
+        else:
+            value = r.xrange(key)
+        out[key] = (kind, value, r.ttl(key) > 0)
+    return _norm(out)
+
+
+@unittest.skipIf(fakeredis is None, "needs fakeredis (with lupa for Lua scripts)")
+class TestAsyncParity(unittest.TestCase):
+    def assert_parity(self, module, make_sync, make_async, steps):
+        sync_r = fakeredis.FakeRedis(decode_responses=True)
+        with mock.patch(f"{module}.get_redis", return_value=sync_r):
+            store = make_sync()
+            sync_out = [getattr(store, name)(*args) for name, *args in steps]
+
+        server = fakeredis.FakeServer()
+
+        async def main():
+            async_r = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+            with mock.patch(f"{module}.get_async_redis", return_value=async_r):
+                store = make_async()
+                return [await getattr(store, name)(*args) for name, *args in steps]
+
+        async_out = asyncio.run(main())
+        for step, s, a in zip(steps, _norm(sync_out), _norm(async_out), strict=True):
+            self.assertEqual(a, s, f"{step[0]} returned differently")
+        self.assertEqual(_dump(fakeredis.FakeRedis(server=server, decode_responses=True)), _dump(sync_r))
+
+    def test_task_store(self):
+        steps = [
+            ("put", "t1", {"status": "queued", "result": None, "retry_count": 0}),
+            ("update", "t1", {"status": "succeeded", "result": {"rows": [1, 2]}}),
+            ("update", "missing", {"status": "failed"}),
+            ("get", "t1"),
+            ("put", "t2", {"status": "running"}),
+            ("get_many", ["t1", "t2", "t1", "nope"]),
+            ("put", "t3", {}),
+            ("get", "t3"),
+        ]
+        self.assert_parity("shared.task_store", lambda: TaskStore("redis://fake", 60), lambda: AsyncTaskStore("redis://fake", 60), steps)
+
+    def test_stream_store(self):
+        steps = [
+            ("append_event", TENANT, "report", {"i": 1, "text": "한글"}),
+            ("append_event", TENANT, "tts_chunk", {"i": 2}),
+            ("append_event", TENANT, "report", {"i": 3}),
+            ("replay", TENANT, 1),
+            ("current_seq", TENANT),
+            ("get_autopilot", TENANT),
+            ("set_autopilot", TENANT, {"enabled": True}),
+            ("add_worklog", TENANT, {"text": "step 1"}),
+            ("add_ask", TENANT, {"ask_id": "a1", "question": "ok?"}),
+            ("add_ask", TENANT, {"ask_id": "a2", "question": "sure?"}),
+            ("remove_ask", TENANT, "a1"),
+            ("list_asks", TENANT),
+            ("list_worklog", TENANT),
+            ("state_delta", TENANT),
+            ("add_worklog", TENANT, {"text": "step 2"}),
+            ("state_delta", TENANT),
+            ("state_version", TENANT),
+            ("snapshot", TENANT),
+        ]
+        for backend in StreamStore.BACKENDS:
+            with self.subTest(backend=backend):
+                self.assert_parity(
+                    "shared.stream_store",
+                    lambda backend=backend: StreamStore("redis://fake", event_keep=2, backend=backend),
+                    lambda backend=backend: AsyncStreamStore("redis://fake", event_keep=2, backend=backend),
+                    steps,
+                )
+
+    def test_node_store(self):
+        steps = [
+            ("create_pairing_code", TENANT),
+            ("claim_pairing_code", "CODE01", "node-1", {"hostname": "pc1"}),
+            ("claim_pairing_code", "CODE01", "node-2", {}),
+            ("set_node_state", TENANT, "node-1", "online", "poll"),
+            ("get_node_state", TENANT, "node-1"),
+            ("list_tenant_nodes", TENANT, "online"),
+            ("get_node_tenant", "node-1"),
+            ("resolve_node_tenant", "node-legacy", ["other::proj", TENANT]),
+            ("push_command", TENANT, "node-1", {"command_id": "c1", "type": "ping"}),
+            ("push_command", TENANT, "node-1", {"command_id": "c2", "type": "ping"}),
+            ("pop_commands", TENANT, "node-1", 1),
+            ("pop_commands", TENANT, "node-1", 10),
+            ("pop_commands", TENANT, "node-1", 0),
+        ]
+        codes = mock.patch.object(_NodeStoreBase, "_new_pairing_code", return_value="CODE01")
+        with codes:
+            self.assert_parity("shared.node_store", lambda: NodeStore("redis://fake"), lambda: AsyncNodeStore("redis://fake"), steps)
+
+    def test_naive_rag(self):
+        steps = [
+            ("ingest_many", TENANT, [RagDoc("a", "redis stream replay", {"src": "a"}), RagDoc("b", "redis cluster", {})]),
+            ("ingest", TENANT, "c", "postgres vacuum redis", {}),
+            ("ingest_many", TENANT, [RagDoc("a", "redis streams only", {})], ["b", "gone"]),
+            ("query", TENANT, "redis stream"),
+            ("delete", TENANT, "c"),
+            ("list_docs", TENANT),
+            ("analyzer_name", TENANT),
+        ]
+        self.assert_parity(
+            "shared.rag_naive",
+            lambda: NaiveRAG("redis://fake", default_analyzer="word"),
+            lambda: AsyncNaiveRAG("redis://fake", default_analyzer="word"),
+            steps,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+import unittest
+
+from shared.append_only import ChainWriter, verify_jsonl_chain
+from shared.chain_checkpoint import checkpoint_path, load_checkpoints, verify_chain_checkpointed
+
+KEY = "test-key"
+EVERY = 4096
+
+
+class TestChainCheckpoint(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "audit.jsonl")
+        self.writer = ChainWriter(self.path, fsync_interval_s=0)
+        self.addCleanup(self.writer.close)
+        self.append(0, 1000)
+
+    def append(self, start, stop):
+        for i in range(start, stop):
+            self.writer.append({"event": "llm_generate_ok", "i": i})
+
+    def verify(self, **kw):
+        return verify_chain_checkpointed(self.path, key=KEY, checkpoint_every=EVERY, **kw)
+
+    def test_resumes_from_last_checkpoint(self):
+        first = self.verify()
+        self.assertTrue(first["ok"], first)
+        self.assertEqual((first["count"], first["verified"]), (1000, 1000))
+        self.assertGreater(first["checkpoints_written"], 1)
+
+        self.append(1000, 1050)
+        res = self.verify()
+        full = verify_jsonl_chain(self.path)
+        self.assertTrue(res["ok"], res)
+        self.assertEqual((res["count"], res["last_hash"]), (full["count"], full["last_hash"]))
+        self.assertLess(res["verified"], 200)
+        self.assertGreater(res["resumed_from_line"], 0)
+
+    def test_forged_checkpoint_is_ignored(self):
+        self.verify()
+        cps = load_checkpoints(self.path, KEY)
+        forged = dict(cps[-1], line=1, count=1)
+        with open(checkpoint_path(self.path), "a", encoding="utf-8") as f:
+            f.write(json.dumps(forged) + "\n")
+        self.assertEqual(load_checkpoints(self.path, KEY), cps)
+        self.assertEqual(load_checkpoints(self.path, "other-key"), [])
+
+    def test_rewritten_log_fails_even_when_rechained(self):
+        self.verify()
+        # rebuild the log with a different tail: every hash is valid, but checkpoints no longer anchor
+        with open(self.path, "rb") as f:
+            head = f.readlines()[:100]
+        self.writer.close()
+        with open(self.path, "wb") as f:
+            f.writelines(head)
+        self.writer = ChainWriter(self.path, fsync_interval_s=0)
+        self.addCleanup(self.writer.close)
+        self.append(5000, 6000)
+        self.assertTrue(verify_jsonl_chain(self.path)["ok"])
+        res = self.verify()
+        self.assertFalse(res["ok"])
+        self.assertEqual(res["errors"][0]["error"], "checkpoint_mismatch")
+        self.assertEqual(res["checkpoints_written"], 0)
+
+    def test_in_flight_line_is_left_for_next_run(self):
+        with open(self.path, "ab") as f:
+            f.write(b'{"event": "llm_gen')
+        res = self.verify()
+        self.assertTrue(res["ok"], res)
+        self.assertEqual((res["count"], res["pending_bytes"]), (1000, 18))
+
+    def test_parallel_full_matches_sequential(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        with open(self.path, "wb") as f:
+            f.write(data.replace(b'"i": 700,', b'"i": 7000,', 1))
+        seq = verify_jsonl_chain(self.path)
+        par = verify_chain_checkpointed(self.path, key="", workers=3)
+        self.assertFalse(par["ok"])
+        for k in ("ok", "count", "errors", "last_hash"):
+            self.assertEqual(par[k], seq[k])
+        self.assertEqual(seq["errors"], [{"line": 701, "error": "hash_mismatch"}])
+
+    def test_without_key_every_run_is_full(self):
+        res = verify_chain_checkpointed(self.path, key="")
+        self.assertEqual((res["ok"], res["verified"], res["checkpoints_written"]), (True, 1000, 0))
+        self.assertFalse(os.path.exists(checkpoint_path(self.path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import tempfile
+import time
+import unittest
+
+from shared.extract_pool import ExtractPool
+
+
+def _drain(pool, deadline_s=60.0):
+    out = []
+    end = time.monotonic() + deadline_s
+    while pool.outstanding() and time.monotonic() < end:
+        out.extend(pool.poll(0.2))
+    return out
+
+
+class TestExtractPool(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = []
+        for i in range(5):
+            p = os.path.join(self.tmp.name, f"doc{i}.txt")
+            with open(p, "w", encoding="utf-8") as f:
+                f.write(f"문서 {i} 내용\n" * 10)
+            self.paths.append(p)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_inline(self):
+        with ExtractPool(0) as pool:
+            for p in self.paths:
+                pool.submit(p, p)
+            res = _drain(pool)
+        self.assertEqual(sorted(r.key for r in res), sorted(self.paths))
+        self.assertTrue(all(r.error is None and r.chunks for r in res))
+
+    def test_workers_and_errors(self):
+        bad = os.path.join(self.tmp.name, "x.hwp")
+        with open(bad, "wb") as f:
+            f.write(b"x")
+        got = []
+        with ExtractPool(2, queue_max=2) as pool:
+            for p in self.paths + [bad]:
+                while pool.full():
+                    got.extend(pool.poll(0.1))
+                pool.submit(p, p)
+            got.extend(_drain(pool))
+        res = {r.key: r for r in got}
+        self.assertEqual(len(got), len(res))
+        self.assertEqual(set(res), set(self.paths) | {bad})
+        self.assertEqual(res[bad].error, "HWP_CONVERSION_REQUIRED")
+        self.assertTrue(res[self.paths[0]].chunks[0].text.startswith("문서 0"))
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "needs mkfifo")
+    def test_timeout_respawns_worker(self):
+        # reading a fifo with no writer blocks forever
+        hang = os.path.join(self.tmp.name, "hang.txt")
+        os.mkfifo(hang)
+        with ExtractPool(1, timeout_s=1.0) as pool:
+            pool.submit("hang", hang)
+            pool.submit("ok", self.paths[0])
+            res = {r.key: r for r in _drain(pool)}
+        self.assertEqual(res["hang"].error, "EXTRACT_TIMEOUT")
+        self.assertIsNone(res["ok"].error)
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "needs mkfifo")
+    def test_killed_worker_does_not_block_the_others(self):
+        hang = os.path.join(self.tmp.name, "hang.txt")
+        os.mkfifo(hang)
+        with ExtractPool(2, timeout_s=2.0, queue_max=10) as pool:
+            for p in self.paths:  # warm both workers up, so only the fifo can time out
+                pool.submit(p, p)
+            self.assertTrue(all(r.error is None for r in _drain(pool)))
+            pool.submit("hang", hang)
+            for p in self.paths:
+                pool.submit(p, p)
+            res = {r.key: r for r in _drain(pool)}
+        self.assertEqual(res.pop("hang").error, "EXTRACT_TIMEOUT")
+        self.assertEqual({k: r.error for k, r in res.items()}, dict.fromkeys(self.paths))
+
+        # a worker SIGKILLed mid-file (OOM killer, ...) is reported and replaced
+        with ExtractPool(2, timeout_s=0) as pool:
+            pool.submit("hang", hang)
+            pool.submit("ok", self.paths[0])
+            time.sleep(0.5)
+            next(w for w in pool._workers if w.busy and w.busy[1] == "hang").proc.kill()
+            pool.submit("after", self.paths[1])
+            res = {r.key: r for r in _drain(pool)}
+        self.assertEqual(res["hang"].error, "WORKER_DIED")
+        self.assertEqual((res["ok"].error, res["after"].error), (None, None))
+
+    def test_chunks_stream_in_batches(self):
+        from shared.doc_extract import extract_chunks
+
+        big = os.path.join(self.tmp.name, "big.txt")
+        with open(big, "w", encoding="utf-8") as f:
+            for i in range(200):
+                f.write(f"line {i} " + "x" * 40 + "\n")
+        want = [c.text for c in extract_chunks(big, max_chars=100)]
+        for workers in (0, 1):
+            with ExtractPool(workers, max_chars=100, batch_chunks=10, credits=2) as pool:
+                pool.submit("big", big)
+                res = _drain(pool)
+            self.assertGreater(len(res), 1)
+            self.assertEqual([r.done for r in res], [False] * (len(res) - 1) + [True])
+            self.assertEqual([c.text for r in res for c in r.chunks], want)
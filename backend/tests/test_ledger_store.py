@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from shared.ledger_store import AUDIT_COLUMNS, LedgerStore
+
+T0 = 1767225600  # 2026-01-01T00:00:00Z
+
+
+def _ts(t):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(t))
+
+
+class TestLedgerStore(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "llm_cost_ledger.jsonl")
+        self.store = LedgerStore(self.path)
+        # three days, 6h apart; provider cycles gemini/openai/(missing)
+        self.rows = []
+        for i in range(12):
+            r = {"ts_utc": _ts(T0 + i * 6 * 3600), "provider": ["gemini", "openai", None][i % 3],
+                 "model": "m", "purpose": "chat", "actual_cost_usd": i / 100}
+            if i % 4 == 0:
+                r["approx_tokens"] = True
+            self.rows.append(r)
+        self.append(self.rows)
+
+    def append(self, rows, raw=""):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(r) + "\n" for r in rows) + raw)
+
+    def report(self, since=None, until=None):
+        res = self.store.aggregate(since, until, by=("provider", "team"), value="actual_cost_usd")
+        return res.rows, round(res.sums["actual_cost_usd"], 6), {k: round(v, 6) for k, v in res.groups["provider"].items()}
+
+    def test_compacted_and_raw_give_same_answer(self):
+        before = self.report(T0 + 86400, T0 + 2 * 86400)
+        self.assertEqual(before, (5, 0.3, {"gemini": 0.06, "openai": 0.11, "unknown": 0.13}))
+        res = self.store.compact()
+        self.assertEqual(res["days"], ["2026-01-01", "2026-01-02", "2026-01-03"])
+        self.assertEqual(self.report(T0 + 86400, T0 + 2 * 86400), before)
+        full = self.store.aggregate(by=("team",))
+        self.assertEqual((full.rows, full.sums["approx_tokens"]), (12, 3.0))
+        self.assertEqual(full.groups["team"], {"default/nexus": 12.0})
+
+    def test_tail_after_compaction_is_included(self):
+        self.store.compact(chunk_lines=5)
+        late = {"ts_utc": _ts(T0 + 12 * 6 * 3600), "provider": "glm", "actual_cost_usd": 1.0}
+        self.append([late, {"ts_utc": "not a time"}], raw='{"ts_utc": "2026-01-04T0')
+        self.assertEqual(self.report()[:2], (13, 1.66))
+        self.assertEqual(self.store.compact()["rows"], 1)
+        self.assertEqual(self.report()[:2], (13, 1.66))
+        self.assertEqual(len([d for d in os.listdir(self.store.root) if ".g" in d]), 4)
+
+    def test_rotation_keeps_history(self):
+        self.store.compact()
+        os.replace(self.path, self.path + ".1")
+        self.append([{"ts_utc": _ts(T0 + 5 * 86400), "provider": "glm", "actual_cost_usd": 0.5}])
+        self.assertEqual(self.report()[:2], (13, 1.16))
+        self.store.compact()
+        self.assertEqual(self.report()[:2], (13, 1.16))
+
+    def test_where_filters_audit_rows(self):
+        path = os.path.join(os.path.dirname(self.path), "llm_audit.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for i, (typ, reason) in enumerate([("llm_fail", "PROVIDER_RATE_LIMIT"), ("llm_provider_error", "PROVIDER_RATE_LIMIT"),
+                                               ("llm_fail", "PROVIDER_TIMEOUT"), ("llm_ok", "PROVIDER_RATE_LIMIT")]):
+                f.write(json.dumps({"ts_utc": _ts(T0 + i), "type": typ, "reason": reason}) + "\n")
+        audit = LedgerStore(path, AUDIT_COLUMNS)
+        where = {"type": ("llm_fail", "llm_provider_error"), "reason": ("PROVIDER_RATE_LIMIT",)}
+        self.assertEqual(audit.aggregate(T0, T0 + 60, where=where).rows, 2)
+        audit.compact()
+        self.assertEqual(audit.aggregate(T0, T0 + 60, where=where).rows, 2)
+        self.assertEqual(audit.aggregate(T0 + 1, T0 + 60, where=where).rows, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from unittest import mock
+
+import pika.exceptions
+
+from shared.mq_pool import RabbitPool
+
+
+class _FakeChannel:
+    def __init__(self, conn):
+        self.connection = conn
+        self.is_closed = False
+        self.published = []
+        self.fail_next = 0
+
+    def basic_publish(self, exchange, routing_key, body, properties=None):
+        if self.fail_next:
+            self.fail_next -= 1
+            raise pika.exceptions.StreamLostError("lost")
+        self.published.append(routing_key)
+
+    def confirm_delivery(self):
+        pass
+
+
+class _FakeConnection:
+    def __init__(self, params):
+        self.is_open = True
+        self.ch = None
+
+    def channel(self):
+        self.ch = _FakeChannel(self)
+        return self.ch
+
+    def process_data_events(self, time_limit=None):
+        pass
+
+    def close(self):
+        self.is_open = False
+
+
+class TestRabbitPool(unittest.TestCase):
+    def setUp(self):
+        self.conns = []
+
+        def dial(params):
+            c = _FakeConnection(params)
+            self.conns.append(c)
+            return c
+
+        patcher = mock.patch("shared.mq_pool.pika.BlockingConnection", side_effect=dial)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.declared = []
+        self.pool = RabbitPool("amqp://x/", size=2, declare=self.declared.append)
+
+    def test_connection_reused_and_topology_declared_once(self):
+        for i in range(5):
+            self.pool.publish("q", {"i": i}, correlation_id=str(i))
+        self.assertEqual(len(self.conns), 1)
+        self.assertEqual(len(self.declared), 1)
+        self.assertEqual(self.conns[0].ch.published, ["q"] * 5)
+        self.assertEqual(self.pool.status()["connects"], 1)
+
+    def test_publish_many_reconnects_and_resumes(self):
+        with self.pool.channel() as ch:
+            ch.fail_next = 1
+        n = self.pool.publish_many([("q", {"i": i}, str(i), None) for i in range(3)])
+        self.assertEqual(n, 3)
+        self.assertEqual(len(self.conns), 2)
+        self.assertFalse(self.conns[0].is_open)
+        self.assertEqual(self.conns[1].ch.published, ["q"] * 3)
+        self.assertEqual(self.pool.status()["failures"], 1)
+
+    def test_checkout_timeout_when_exhausted(self):
+        with self.pool.channel(), self.pool.channel():
+            with self.assertRaises(TimeoutError):
+                with self.pool.channel(timeout_s=0.01):
+                    pass
+
+    def test_close_drops_connections(self):
+        self.pool.publish("q", {}, correlation_id="c")
+        self.pool.close()
+        self.assertFalse(self.conns[0].is_open)
+        with self.assertRaises(RuntimeError):
+            with self.pool.channel():
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main()
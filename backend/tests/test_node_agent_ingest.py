@@ -0,0 +1,107 @@
+import os
+import sys
+import tempfile
+import unittest
+
+NODE_AGENT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "node_agent")
+if NODE_AGENT_DIR not in sys.path:
+    sys.path.insert(0, NODE_AGENT_DIR)
+
+import node_agent  # noqa: E402
+
+
+class _Resp:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self._body = body
+        self.headers = {}
+        self.text = ""
+
+    def json(self):
+        return self._body
+
+
+class _Server:
+    """Stands in for /node/ingest/batch and /node/ingest/status, acking every batch at once."""
+
+    def __init__(self):
+        self.batches = []
+
+    def post(self, url, json, timeout):
+        self.batches.append(json)
+        return _Resp(202, {"acked_seq": json["seq"]})
+
+    def get(self, url, params, timeout):
+        return _Resp(200, {"acked_seq": len(self.batches)})
+
+    def uploaded(self):
+        return {c["doc_id"]: c["text"] for b in self.batches for c in b["chunks"]}
+
+    def deleted(self):
+        return [d for b in self.batches for d in b["delete_ids"]]
+
+
+class TestNodeAgentFolderIngest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.folder = os.path.join(tmp.name, "docs")
+        os.makedirs(self.folder)
+        self.agent = node_agent.NodeAgent(os.path.join(tmp.name, "node_config.json"))
+        self.agent.node_token = "tok"
+        self.reports = []
+        self.agent._send_report = lambda command_id, status, **kw: self.reports.append((status, kw))
+
+    def write(self, name, text):
+        path = os.path.join(self.folder, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.utime(path, (1_700_000_000 + len(self.reports), 1_700_000_000 + len(self.reports)))
+        return path
+
+    def sync(self):
+        server = _Server()
+        self.agent.session = server
+        self.agent._execute_folder_ingest("cmd", {"folder": self.folder, "extensions": "txt,md", "workers": 0})
+        self.assertEqual(self.reports[-1][0], "completed", self.reports[-1])
+        return server, node_agent.LocalManifest(self.agent.manifest_path).files
+
+    def test_first_sync_replaces_legacy_ids(self):
+        os.makedirs(os.path.join(self.folder, "sub"))
+        a = self.write("sub/a.txt", "alpha " * 1000)  # 6000 bytes: legacy chunk0 + chunk1
+        b = self.write("b.md", "beta")
+        server, manifest = self.sync()
+        legacy = node_agent.legacy_doc_ids(a, 6000) + node_agent.legacy_doc_ids(b, 4)
+        self.assertEqual([d.split("::")[0] for d in legacy], ["a.txt", "a.txt", "b.md"])
+        # a top-level file's new ids can coincide with its legacy ones; those are overwritten, not deleted
+        self.assertEqual(set(server.deleted()), set(legacy) - set(server.uploaded()))
+        self.assertTrue(set(node_agent.legacy_doc_ids(a, 6000)) <= set(server.deleted()))
+        self.assertEqual(set(server.uploaded()), {d for e in manifest.values() for d in e["doc_ids"]})
+        self.assertTrue(all(d.startswith(("sub/a.txt::", "b.md::")) for d in server.uploaded()))
+
+        # nothing changed: nothing uploaded or deleted
+        server, again = self.sync()
+        self.assertEqual((server.uploaded(), server.deleted()), ({}, []))
+        self.assertEqual(again, manifest)
+
+    def test_changed_and_removed_files_delete_their_old_chunks(self):
+        self.write("a.txt", "x " * (node_agent.CHUNK_CHARS * 2))
+        b = self.write("b.md", "beta")
+        _, manifest = self.sync()
+        old_a = next(e["doc_ids"] for p, e in manifest.items() if p.endswith("a.txt"))
+        self.assertGreater(len(old_a), 1)
+
+        self.write("a.txt", "short now")
+        os.remove(b)
+        server, manifest = self.sync()
+        new_a = manifest[os.path.join(self.folder, "a.txt")]["doc_ids"]
+        self.assertEqual(set(server.uploaded()), set(new_a))
+        old_b = [d for d in server.deleted() if d.startswith("b.md::")]
+        self.assertEqual(sorted(server.deleted()), sorted([d for d in old_a if d not in new_a] + old_b))
+        self.assertTrue(old_b)
+        self.assertEqual(list(manifest), [os.path.join(self.folder, "a.txt")])
+        self.assertEqual(self.reports[-1][1]["result"]["removed_files"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import asyncio
+import unittest
+from unittest import mock
+
+try:
+    import fakeredis
+except ImportError:  # optional test dependency
+    fakeredis = None
+
+from shared.node_ingest import IngestBatch, NodeIngestQueue, NodeIngestSessions
+from shared.rag_naive import RagDoc
+
+ARGS = ("org::proj", "node-1", "cmd-1")
+
+
+@unittest.skipIf(fakeredis is None, "needs fakeredis (with lupa for Lua scripts)")
+class TestNodeIngestSessions(unittest.TestCase):
+    def setUp(self):
+        self.r = fakeredis.FakeRedis(decode_responses=True)
+        with mock.patch("shared.node_ingest.get_redis", return_value=self.r):
+            self.sessions = NodeIngestSessions("redis://fake", inflight_lease_s=60)
+
+    def accept(self, seq, n=2, final=False):
+        return self.sessions.accept(*ARGS, seq=seq, n_chunks=n, final=final)["status"]
+
+    def test_accept_in_order_and_gap(self):
+        self.assertEqual([self.accept(1), self.accept(2)], [0, 0])
+        self.assertEqual(self.accept(4), -1)
+        st = self.sessions.status(*ARGS)
+        self.assertEqual((st["received_seq"], st["acked_seq"], st["chunks_received"]), (2, 0, 4))
+
+    def test_out_of_order_acks_advance_over_contiguous_run(self):
+        for seq in (1, 2, 3):
+            self.accept(seq, final=seq == 3)
+        self.assertEqual(self.sessions.ack(*ARGS, seq=2, n_ingested=2)["acked_seq"], 0)
+        self.assertEqual(self.sessions.ack(*ARGS, seq=1, n_ingested=2)["acked_seq"], 2)
+        # resume point for a reconnecting node is acked_seq + 1
+        self.assertEqual(self.sessions.status(*ARGS)["acked_seq"], 2)
+        ack = self.sessions.ack(*ARGS, seq=3, n_ingested=2)
+        self.assertEqual((ack["acked_seq"], ack["final_seq"], ack["completed"]), (3, 3, True))
+        self.assertFalse(self.sessions.ack(*ARGS, seq=3, n_ingested=2)["completed"])
+        st = self.sessions.status(*ARGS)
+        self.assertEqual((st["chunks_ingested"], st["completed"]), (6, True))
+
+    def test_resend_in_flight_is_not_requeued(self):
+        self.accept(1)
+        self.accept(2)
+        self.assertEqual(self.accept(2), 3)  # still queued
+        self.sessions.release(*ARGS, seq=2)  # e.g. the write failed
+        self.assertEqual(self.accept(2), 1)
+        self.assertEqual(self.accept(2), 3)
+        self.sessions.ack(*ARGS, seq=1, n_ingested=2)
+        self.sessions.ack(*ARGS, seq=2, n_ingested=2)
+        self.assertEqual(self.accept(2), 2)
+        self.assertEqual(self.sessions.status(*ARGS)["chunks_received"], 4)
+
+    def test_expired_lease_allows_requeue(self):
+        self.sessions.inflight_lease_s = 0  # leases expire at once
+        self.accept(1)
+        # the process holding it is presumed dead
+        self.assertEqual(self.accept(1), 1)
+        self.assertEqual(self.accept(1), 1)
+
+
+class _Rag:
+    def __init__(self, fail_seqs=()):
+        self.fail = {f"d{s}" for s in fail_seqs}
+        self.writes = []
+
+    async def ingest_many(self, tenant, docs, delete_ids=()):
+        if docs[0].doc_id in self.fail:
+            raise RuntimeError("redis down")
+        self.writes.append(docs[0].doc_id)
+        return {"ok": True, "ingested": len(docs), "deleted": 0}
+
+
+@unittest.skipIf(fakeredis is None, "needs fakeredis (with lupa for Lua scripts)")
+class TestNodeIngestQueue(unittest.TestCase):
+    def test_failed_write_releases_lease_and_is_resent(self):
+        r = fakeredis.FakeRedis(decode_responses=True)
+        with mock.patch("shared.node_ingest.get_redis", return_value=r):
+            sessions = NodeIngestSessions("redis://fake")
+        rag = _Rag(fail_seqs=[2])
+        done = []
+
+        async def on_complete(batch, ack):
+            done.append(ack["acked_seq"])
+
+        def batch(seq):
+            return IngestBatch(*ARGS, seq=seq, docs=[RagDoc(f"d{seq}", "text", {})])
+
+        async def main():
+            q = NodeIngestQueue(rag, sessions, workers=1, on_complete=on_complete)
+            try:
+                for seq in (1, 2):
+                    sessions.accept(*ARGS, seq=seq, n_chunks=1, final=seq == 2)
+                    self.assertTrue(q.try_put(batch(seq)))
+                await q._q.join()
+                self.assertEqual(q.failed_batches, 1)
+                rag.fail.clear()
+                self.assertEqual(sessions.accept(*ARGS, seq=2, n_chunks=1, final=True)["status"], 1)
+                q.try_put(batch(2))
+                await q._q.join()
+            finally:
+                await q.close()
+
+        asyncio.run(main())
+        self.assertEqual(rag.writes, ["d1", "d2"])
+        self.assertEqual(done, [2])
+        self.assertEqual(sessions.status(*ARGS)["acked_seq"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
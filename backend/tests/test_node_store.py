@@ -0,0 +1,100 @@
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+try:
+    import fakeredis
+except ImportError:  # optional test dependency
+    fakeredis = None
+
+from shared.node_store import AsyncNodeStore, NodeCommandWaiter, NodeStore
+
+TENANT = "org::proj"
+
+
+@unittest.skipIf(fakeredis is None, "needs fakeredis (with lupa for Lua scripts)")
+class TestNodeCommandWaiter(unittest.TestCase):
+    def run_waiter(self, scenario):
+        server = fakeredis.FakeServer()
+
+        async def main():
+            store = AsyncNodeStore("redis://fake")
+            waiter = NodeCommandWaiter("redis://fake", store)
+            waiter._r = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)  # its own connection, as in prod
+            store_r = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+            try:
+                with mock.patch("shared.node_store.get_async_redis", return_value=store_r):
+                    return await scenario(store, waiter)
+            finally:
+                await waiter.close()
+
+        return asyncio.run(main())
+
+    def test_queued_commands_return_at_once(self):
+        async def scenario(store, waiter):
+            for i in range(3):
+                await store.push_command(TENANT, "node-1", {"command_id": f"c{i}"})
+            first = await waiter.wait(TENANT, "node-1", timeout_s=5, limit=2)
+            rest = await waiter.wait(TENANT, "node-1", timeout_s=0)
+            return first, rest
+
+        first, rest = self.run_waiter(scenario)
+        self.assertEqual([c["command_id"] for c in first], ["c0", "c1"])
+        self.assertEqual([c["command_id"] for c in rest], ["c2"])
+
+    def test_push_wakes_blocked_wait(self):
+        async def scenario(store, waiter):
+            started = time.monotonic()
+            task = asyncio.create_task(waiter.wait(TENANT, "node-1", timeout_s=10))
+            await asyncio.sleep(0.2)
+            self.assertFalse(task.done())
+            await store.push_command(TENANT, "node-1", {"command_id": "c1", "type": "ping"})
+            got = await asyncio.wait_for(task, 5)
+            return got, time.monotonic() - started, await store.pop_commands(TENANT, "node-1")
+
+        got, elapsed, left = self.run_waiter(scenario)
+        self.assertEqual([(c["command_id"], c["type"]) for c in got], [("c1", "ping")])
+        self.assertLess(elapsed, 5)
+        self.assertEqual(left, [])
+
+    def test_timeout_returns_empty(self):
+        async def scenario(store, waiter):
+            started = time.monotonic()
+            got = await waiter.wait(TENANT, "node-1", timeout_s=0.3)  # BLPOP rounds up to 1s
+            elapsed = time.monotonic() - started
+            # another tenant's node with the same id has its own queue
+            await store.push_command("other::proj", "node-1", {"command_id": "x"})
+            return got, elapsed, await waiter.wait(TENANT, "node-1", timeout_s=0)
+
+        got, elapsed, other = self.run_waiter(scenario)
+        self.assertEqual(got, [])
+        self.assertGreaterEqual(elapsed, 0.9)
+        self.assertEqual(other, [])
+
+
+@unittest.skipIf(fakeredis is None, "needs fakeredis (with lupa for Lua scripts)")
+class TestNodeTenantIndex(unittest.TestCase):
+    def setUp(self):
+        self.r = fakeredis.FakeRedis(decode_responses=True)
+        with mock.patch("shared.node_store.get_redis", return_value=self.r):
+            self.store = NodeStore("redis://fake")
+
+    def test_claim_records_tenant(self):
+        code = self.store.create_pairing_code(TENANT)
+        self.assertEqual(self.store.claim_pairing_code(code, "node-1", {"hostname": "pc1"}), TENANT)
+        self.assertEqual(self.store.get_node_tenant("node-1"), TENANT)
+        self.assertEqual(self.store.resolve_node_tenant("node-1", ["other::proj"]), TENANT)
+        self.assertIsNone(self.store.get_node_tenant("node-2"))
+
+    def test_legacy_node_is_resolved_and_indexed(self):
+        # enrolled before the index existed: only the node hash is there
+        self.r.hset(self.store._k_node(TENANT, "node-legacy"), mapping={"node_id": "node-legacy", "tenant_id": TENANT})
+        self.assertIsNone(self.store.get_node_tenant("node-legacy"))
+        self.assertIsNone(self.store.resolve_node_tenant("node-legacy", ["other::proj"]))
+        self.assertEqual(self.store.resolve_node_tenant("node-legacy", ["other::proj", TENANT]), TENANT)
+        self.assertEqual(self.store.get_node_tenant("node-legacy"), TENANT)
+
+
+if __name__ == "__main__":
+    unittest.main()
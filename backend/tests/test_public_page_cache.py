@@ -0,0 +1,61 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from nexus_supervisor.public_page_cache import PublicPageCache
+
+
+class TestPublicPageCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.data = os.path.join(self.tmp.name, "modules.json")
+        with open(self.data, "w", encoding="utf-8") as f:
+            f.write("[]")
+        self.calls = []
+        self.cache = PublicPageCache([self.data], languages=("ko", "en"))
+
+    def render(self, lang):
+        self.calls.append(lang)
+        return f"<html lang=\"{lang}\">" + "페이지 " * 500 + f"{len(self.calls)}</html>"
+
+    def test_rendered_once_per_page_and_lang(self):
+        a = self.cache.get("landing", "en", self.render)
+        self.assertIs(a, self.cache.get("landing", "en", self.render))
+        self.cache.get("landing", "ko", self.render)
+        self.cache.get("landing", "<script>", self.render)  # unknown lang -> default, no new entry
+        self.assertEqual(self.calls, ["en", "ko"])
+
+    def test_etag_and_conditional_get(self):
+        first = self.cache.response({}, "intro", "ko", self.render)
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers["etag"]
+        self.assertTrue(etag.startswith('"'))
+        self.assertEqual(first.headers["cache-control"], "no-cache")
+
+        again = self.cache.response({"if-none-match": f'"other", W/{etag}'}, "intro", "ko", self.render)
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.body, b"")
+        self.assertEqual(again.headers["etag"], etag)
+
+    def test_gzip_variant(self):
+        plain = self.cache.response({}, "intro", "ko", self.render)
+        zipped = self.cache.response({"accept-encoding": "gzip, deflate"}, "intro", "ko", self.render)
+        self.assertEqual(zipped.headers["content-encoding"], "gzip")
+        self.assertEqual(gzip.decompress(zipped.body), plain.body)
+        self.assertNotEqual(zipped.headers["etag"], plain.headers["etag"])  # strong ETag per coding
+        self.assertEqual(zipped.headers["vary"], "Accept-Encoding")
+        refused = self.cache.response({"accept-encoding": "gzip;q=0"}, "intro", "ko", self.render)
+        self.assertNotIn("content-encoding", refused.headers)
+
+    def test_data_file_change_invalidates(self):
+        etag = self.cache.get("modules", "ko", self.render).etag
+        with open(self.data, "w", encoding="utf-8") as f:
+            f.write('[{"module_id": "m1"}]')
+        self.assertNotEqual(self.cache.get("modules", "ko", self.render).etag, etag)
+        self.assertEqual(self.calls, ["ko", "ko"])
+
+
+if __name__ == "__main__":
+    unittest.main()
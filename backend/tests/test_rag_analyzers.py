@@ -0,0 +1,35 @@
+import unittest
+
+from shared.rag_analyzers import ANALYZERS, analyze_ko_particle, analyze_word, get_analyzer, strip_particle
+
+
+class TestRagAnalyzers(unittest.TestCase):
+    def test_word_matches_legacy_tokenizer(self):
+        self.assertEqual(analyze_word("Sales 보고서를 a 2024"), ["sales", "보고서를", "2024"])
+
+    def test_particle_stripping(self):
+        self.assertEqual(strip_particle("보고서를"), "보고서")
+        self.assertEqual(strip_particle("보고서는"), "보고서")
+        self.assertEqual(strip_particle("서울에서"), "서울")
+        # stem must keep two syllables
+        self.assertEqual(strip_particle("아이"), "아이")
+        self.assertEqual(strip_particle("report"), "report")
+
+    def test_particle_query_and_doc_share_terms(self):
+        doc = set(analyze_ko_particle("분기 보고서를 제출했습니다"))
+        self.assertIn("보고서", doc)
+        self.assertTrue(set(analyze_ko_particle("보고서는")) & doc)
+
+    def test_ngrams(self):
+        self.assertEqual(ANALYZERS["ko_bigram"]("보고서를 KPI"), ["보고", "고서", "서를", "kpi"])
+        self.assertEqual(ANALYZERS["ko_trigram"]("보고서 책"), ["보고서", "책"])
+        doc = set(ANALYZERS["ko_bigram"]("보고서를"))
+        self.assertTrue(set(ANALYZERS["ko_bigram"]("보고서")) <= doc)
+
+    def test_unknown_analyzer(self):
+        with self.assertRaises(ValueError):
+            get_analyzer("nope")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+
+from shared import file_fingerprint as fingerprint_mod
+from shared.file_fingerprint import file_fingerprint
+
+
+class TestFileFingerprint(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, name, data):
+        p = os.path.join(self.tmp.name, name)
+        with open(p, "wb") as f:
+            f.write(data)
+        return p
+
+    def test_same_content_same_hash(self):
+        a = self._write("a.txt", b"hello world" * 100)
+        b = self._write("b.txt", b"hello world" * 100)
+        os.utime(b, (1, 1))
+        self.assertEqual(file_fingerprint(a, os.path.getsize(a)), file_fingerprint(b, os.path.getsize(b)))
+
+    def test_small_file_any_edit_changes_hash(self):
+        a = self._write("a.txt", b"x" * 5000 + b"A" + b"x" * 5000)
+        b = self._write("b.txt", b"x" * 5000 + b"B" + b"x" * 5000)
+        self.assertNotEqual(file_fingerprint(a, os.path.getsize(a)), file_fingerprint(b, os.path.getsize(b)))
+
+    def test_large_file_is_sampled(self):
+        old = fingerprint_mod._FULL_HASH_BYTES, fingerprint_mod._SAMPLE_BYTES
+        fingerprint_mod._FULL_HASH_BYTES, fingerprint_mod._SAMPLE_BYTES = 1000, 100
+        try:
+            base = bytearray(b"." * 5000)
+            p = self._write("big.bin", bytes(base))
+            h0 = file_fingerprint(p, 5000)
+            base[10] = ord("!")  # head sample
+            p2 = self._write("big2.bin", bytes(base))
+            self.assertNotEqual(h0, file_fingerprint(p2, 5000))
+            base = bytearray(b"." * 5000)
+            base[1000] = ord("!")  # between samples
+            p3 = self._write("big3.bin", bytes(base))
+            self.assertEqual(h0, file_fingerprint(p3, 5000))
+        finally:
+            fingerprint_mod._FULL_HASH_BYTES, fingerprint_mod._SAMPLE_BYTES = old
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import threading
+import unittest
+from unittest import mock
+
+try:
+    import fakeredis
+except ImportError:  # optional test dependency
+    fakeredis = None
+
+from shared.rag_naive import AsyncNaiveRAG, NaiveRAG, RagDoc
+from tests.test_task_store import _SlowRedis
+
+TENANT = "org::proj"
+
+
+@unittest.skipIf(fakeredis is None, "needs fakeredis (with lupa for Lua scripts)")
+class TestNaiveRAG(unittest.TestCase):
+    def setUp(self):
+        self.r = fakeredis.FakeRedis(decode_responses=True)
+        self.rag = self.make(self.r)
+
+    @staticmethod
+    def make(r):
+        with mock.patch("shared.rag_naive.get_redis", return_value=r):
+            return NaiveRAG("redis://fake", default_analyzer="word")
+
+    def assert_stats_consistent(self):
+        """idx:stats and the postings match the forward index, and every indexed doc is stored."""
+        postings = {}
+        for key in self.r.scan_iter(match=self.rag._kt(TENANT, "*")):
+            for doc_id in self.r.hkeys(key):
+                postings.setdefault(doc_id, set()).add(key)
+        forward = {d: {self.rag._kt(TENANT, t) for t in json.loads(v)} for d, v in self.r.hgetall(self.rag._ki(TENANT, "terms")).items()}
+        self.assertEqual(postings, {d: ts for d, ts in forward.items() if ts})
+        stats = self.r.hgetall(self.rag._ki(TENANT, "stats"))
+        lengths = self.r.hgetall(self.rag._ki(TENANT, "len"))
+        self.assertEqual(int(stats.get("n_docs", 0)), len(lengths))
+        self.assertEqual(int(stats.get("total_len", 0)), sum(int(v) for v in lengths.values()))
+        self.assertEqual(set(lengths), set(self.r.hkeys(self.rag._k(TENANT))))
+        self.assertEqual(set(lengths), set(self.r.hkeys(self.rag._ki(TENANT, "terms"))))
+
+    def test_query_ranks_by_bm25(self):
+        self.rag.ingest_many(TENANT, [
+            RagDoc("a", "redis stream replay redis", {"src": "a"}),
+            RagDoc("b", "redis cluster", {}),
+            RagDoc("c", "postgres vacuum", {}),
+        ])
+        hits = self.rag.query(TENANT, "redis replay")
+        self.assertEqual([h["doc_id"] for h in hits], ["a", "b"])
+        self.assertGreater(hits[0]["score"], hits[1]["score"])
+        self.assertEqual(hits[0]["meta"], {"src": "a"})
+        self.assertEqual(self.rag.query(TENANT, "kafka"), [])
+
+    def test_overwrite_and_delete_keep_stats(self):
+        self.rag.ingest(TENANT, "a", "one two three")
+        self.rag.ingest(TENANT, "a", "one two")
+        self.rag.ingest(TENANT, "b", "two")
+        self.assert_stats_consistent()
+        self.assertEqual(self.r.hget(self.rag._ki(TENANT, "stats"), "total_len"), "3")
+        self.assertFalse(self.r.exists(self.rag._kt(TENANT, "three")))
+
+        self.assertEqual(self.rag.delete(TENANT, "a")["removed"], 1)
+        self.assertEqual(self.rag.delete(TENANT, "a")["removed"], 0)
+        self.assert_stats_consistent()
+        self.assertEqual([h["doc_id"] for h in self.rag.query(TENANT, "two")], ["b"])
+
+    def test_ingest_many_with_delete_ids_keeps_stats(self):
+        self.rag.ingest_many(TENANT, [RagDoc(f"f::chunk{i}", f"part {i} shared words", {}) for i in range(4)])
+        # the file shrank to two chunks: chunk1 rewritten, chunk2/chunk3 dropped, chunk1 also listed
+        # for delete and an unknown id must not count
+        res = self.rag.ingest_many(
+            TENANT,
+            [RagDoc("f::chunk0", "part zero", {}), RagDoc("f::chunk1", "part one shared", {})],
+            ["f::chunk1", "f::chunk2", "f::chunk3", "never-indexed"],
+        )
+        self.assertEqual((res["ingested"], res["deleted"]), (2, 2))
+        self.assert_stats_consistent()
+        stats = self.r.hgetall(self.rag._ki(TENANT, "stats"))
+        self.assertEqual((stats["n_docs"], stats["total_len"]), ("2", "5"))
+        self.assertFalse(self.r.exists(self.rag._kt(TENANT, "words")))
+        self.assertEqual(self.r.hkeys(self.rag._kt(TENANT, "shared")), ["f::chunk1"])
+        self.assertEqual(sorted(h["doc_id"] for h in self.rag.query(TENANT, "part")), ["f::chunk0", "f::chunk1"])
+
+        # a delete-only batch
+        res = self.rag.ingest_many(TENANT, [], ["f::chunk0", "f::chunk1"])
+        self.assertEqual((res["ingested"], res["deleted"]), (0, 2))
+        self.assert_stats_consistent()
+        self.assertEqual(self.r.hget(self.rag._ki(TENANT, "stats"), "n_docs"), "0")
+        self.assertEqual(self.rag.query(TENANT, "part"), [])
+
+    def store_legacy(self, r, doc_id, text):
+        """A doc as stored before the inverted index existed: docs hash only."""
+        r.hset(self.rag._k(TENANT), doc_id, json.dumps({"doc_id": doc_id, "text": text, "meta": {}, "len": len(text)}))
+
+    def test_query_backfills_docs_stored_before_the_index(self):
+        self.store_legacy(self.r, "old", "redis replay from before")
+        self.rag.ingest(TENANT, "new", "redis cluster")  # the tenant already has idx:stats
+        with mock.patch.object(NaiveRAG, "reindex", side_effect=NaiveRAG.reindex, autospec=True) as reindex:
+            self.assertEqual([h["doc_id"] for h in self.rag.query(TENANT, "replay")], ["old"])
+            self.assertEqual({h["doc_id"] for h in self.rag.query(TENANT, "redis")}, {"old", "new"})
+        self.assertEqual(reindex.call_count, 1)
+        self.assert_stats_consistent()
+
+    def test_async_query_backfills_docs_stored_before_the_index(self):
+        server = fakeredis.FakeServer()
+        self.r = fakeredis.FakeRedis(server=server, decode_responses=True)
+        self.store_legacy(self.r, "old", "redis replay from before")
+
+        async def main():
+            ar = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+            with mock.patch("shared.rag_naive.get_async_redis", return_value=ar), \
+                    mock.patch("shared.rag_naive.get_redis", return_value=self.r):
+                return await AsyncNaiveRAG("redis://fake", default_analyzer="word").query(TENANT, "replay")
+
+        self.assertEqual([h["doc_id"] for h in asyncio.run(main())], ["old"])
+        self.assert_stats_consistent()
+
+    def test_ingest_with_stale_analyzer_cache_uses_the_pin(self):
+        self.rag.ingest(TENANT, "a", "보고서를 제출")
+        other = self.make(self.r)
+        other.set_analyzer(TENANT, "ko_bigram")
+        # self.rag still has "word" cached for ANALYZER_CACHE_TTL_S
+        self.rag.ingest(TENANT, "b", "보고서를 검토")
+        terms = json.loads(self.r.hget(self.rag._ki(TENANT, "terms"), "b"))
+        self.assertEqual(terms, sorted(["보고", "고서", "서를", "검토"]))
+        self.assertEqual(self.rag.analyzer_name(TENANT), "ko_bigram")
+        self.assertEqual({h["doc_id"] for h in other.query(TENANT, "보고서")}, {"a", "b"})
+        self.assert_stats_consistent()
+
+    def test_concurrent_ingests_of_one_doc_count_it_once(self):
+        # reading the old entry outside the MULTI let two writers both see "not indexed yet"
+        # and both add it to n_docs
+        rag = self.make(_SlowRedis(self.r))
+        n = 16
+        barrier = threading.Barrier(n)
+
+        def worker(i):
+            barrier.wait()
+            rag.ingest(TENANT, "same", " ".join(["word"] * (i + 1)))
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(self.r.hget(self.rag._ki(TENANT, "stats"), "n_docs"), "1")
+        self.assert_stats_consistent()
+        text = json.loads(self.r.hget(self.rag._k(TENANT), "same"))["text"]
+        self.assertEqual(self.r.hget(self.rag._ki(TENANT, "len"), "same"), str(len(text.split())))
+
+
+if __name__ == "__main__":
+    unittest.main()
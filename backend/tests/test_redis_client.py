@@ -0,0 +1,58 @@
+import asyncio
+import unittest
+
+import redis
+import redis.asyncio as aioredis
+
+from shared import redis_client
+from shared.settings import settings
+
+# nothing listens here: connection attempts fail fast with "connection refused"
+DEAD_URL = "redis://127.0.0.1:1/0"
+
+
+class TestRedisClient(unittest.TestCase):
+    def tearDown(self):
+        redis_client.close_all()
+
+    def test_one_client_per_url(self):
+        a = redis_client.get_redis(DEAD_URL)
+        self.assertIs(a, redis_client.get_redis(DEAD_URL))
+        self.assertIsNot(a, redis_client.get_redis(DEAD_URL, decode_responses=False))
+        self.assertIsNot(a, redis_client.get_redis("redis://127.0.0.1:1/1"))
+
+    def test_pool_settings(self):
+        pool = redis_client.get_redis(DEAD_URL).connection_pool
+        self.assertIsInstance(pool, redis.BlockingConnectionPool)
+        self.assertEqual(pool.max_connections, settings.redis_max_connections)
+        kw = pool.connection_kwargs
+        self.assertTrue(kw["socket_keepalive"])
+        self.assertTrue(kw["decode_responses"])
+        self.assertEqual(kw["health_check_interval"], settings.redis_health_check_interval_s)
+
+    def test_pool_stats_and_unreachable_ping_cached(self):
+        self.assertFalse(redis_client.redis_available(DEAD_URL))
+        self.assertFalse(redis_client.redis_available(DEAD_URL))
+        stats = redis_client.pool_stats()
+        self.assertEqual(stats["127.0.0.1:1/0"]["in_use"], 0)  # failed PING released its connection
+        self.assertEqual(stats["127.0.0.1:1/0"]["max"], settings.redis_max_connections)
+        redis_client.update_pool_metrics()  # must not raise
+
+    def test_async_client_per_loop(self):
+        async def clients():
+            a = redis_client.get_async_redis(DEAD_URL)
+            self.assertIs(a, redis_client.get_async_redis(DEAD_URL))
+            self.assertIn("127.0.0.1:1/0 (async)", redis_client.pool_stats())
+            await redis_client.aclose_all()
+            return a
+
+        first = asyncio.run(clients())
+        self.assertIsNot(first, asyncio.run(clients()))  # connections never cross event loops
+        pool = first.connection_pool
+        self.assertIsInstance(pool, aioredis.BlockingConnectionPool)
+        self.assertEqual(pool.max_connections, settings.redis_max_connections)
+        self.assertTrue(pool.connection_kwargs["socket_keepalive"])
+
+
+if __name__ == "__main__":
+    unittest.main()
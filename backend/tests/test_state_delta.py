@@ -0,0 +1,122 @@
+import json
+import shutil
+import subprocess
+import unittest
+from pathlib import Path
+from unittest import mock
+
+try:
+    import fakeredis
+except ImportError:  # optional test dependency
+    fakeredis = None
+
+from shared.stream_store import StreamStore
+
+TENANT = "org::proj"
+APP_JS = Path(__file__).resolve().parents[1] / "nexus_supervisor" / "assets" / "app.js"
+
+
+def _js_function(src, name):
+    """Source of a top-level `function name(...) {...}` in src (brace matching)."""
+    start = src.index(f"function {name}(")
+    depth = 0
+    for i in range(src.index("{", start), len(src)):
+        depth += {"{": 1, "}": -1}.get(src[i], 0)
+        if depth == 0:
+            return src[start:i + 1]
+    raise ValueError(name)
+
+
+@unittest.skipIf(fakeredis is None, "needs fakeredis (with lupa for Lua scripts)")
+@unittest.skipIf(shutil.which("node") is None, "needs node to run the page's applyStateDelta")
+class TestStateDelta(unittest.TestCase):
+    """StreamStore.state_delta() (what every report carries) applied by the page's applyStateDelta."""
+
+    def setUp(self):
+        self.r = fakeredis.FakeRedis(decode_responses=True)
+        self.store = self.make()
+        self.apply_src = _js_function(APP_JS.read_text(encoding="utf-8"), "applyStateDelta")
+
+    def make(self, **kw):
+        with mock.patch("shared.stream_store.get_redis", return_value=self.r):
+            return StreamStore("redis://fake", **kw)
+
+    def apply(self, state, deltas):
+        """Run applyStateDelta over deltas from state; returns (uiState, number of refetchState calls)."""
+        script = "\n".join([
+            f"let uiState = {json.dumps(state)};",
+            "let refetched = 0;",
+            "function renderSnapshot(s) {}",
+            "function refetchState() { refetched += 1; }",
+            self.apply_src,
+            f"for (const d of {json.dumps(deltas)}) applyStateDelta(d);",
+            "console.log(JSON.stringify({state: uiState, refetched}));",
+        ])
+        out = subprocess.run(["node"], input=script, capture_output=True, text=True, timeout=30, check=True)
+        res = json.loads(out.stdout)
+        return res["state"], res["refetched"]
+
+    @staticmethod
+    def view(state):
+        return {
+            "version": state["version"],
+            "asks": sorted(state["asks"], key=lambda a: a["ask_id"]),
+            "worklog": state["worklog"],
+            "autopilot": state["autopilot"],
+        }
+
+    def ask(self, ask_id, summary, n):
+        self.store.add_ask(TENANT, {"ask_id": ask_id, "summary": summary, "created_at": f"2026-01-01T00:00:0{n}Z"})
+
+    def seed(self):
+        self.ask("a1", "first", 1)
+        self.ask("a2", "second", 2)
+        self.store.add_worklog(TENANT, {"summary": "w1"})
+        self.store.state_delta(TENANT)  # carried by an earlier report
+        return self.store.snapshot(TENANT)
+
+    def test_added_changed_removed_keys(self):
+        client = self.seed()
+        self.ask("a3", "third", 3)  # added
+        self.ask("a1", "first, edited", 1)  # changed
+        first = self.store.state_delta(TENANT)
+        self.store.remove_ask(TENANT, "a2")  # removed
+        self.store.add_worklog(TENANT, {"summary": "w2"})
+        self.store.set_autopilot(TENANT, {"state": "running", "blocked_by_red": False})
+        second = self.store.state_delta(TENANT)
+        self.assertEqual(second["base_version"], first["version"])
+        self.assertEqual([op["op"] for op in second["ops"]], ["ask.remove", "worklog.add", "autopilot.set"])
+
+        # a duplicated (already applied) report must not re-apply its ops
+        state, refetched = self.apply(client, [first, second, first])
+        self.assertEqual(refetched, 0)
+        self.assertEqual(self.view(state), self.view(self.store.snapshot(TENANT)))
+        self.assertEqual([a["summary"] for a in sorted(state["asks"], key=lambda a: a["ask_id"])], ["first, edited", "third"])
+
+    def test_no_change_is_an_empty_delta(self):
+        client = self.seed()
+        delta = self.store.state_delta(TENANT)
+        self.assertEqual(delta, {"version": client["version"], "base_version": client["version"], "ops": []})
+        self.assertEqual(self.apply(client, [delta]), (client, 0))
+
+    def test_trimmed_ops_fall_back_to_snapshot(self):
+        self.store = self.make(state_ops_keep=2)
+        client = self.seed()
+        for i in range(3):
+            self.store.add_worklog(TENANT, {"summary": f"more {i}"})
+        delta = self.store.state_delta(TENANT)
+        self.assertTrue(delta["resync"])
+        state, refetched = self.apply(client, [delta])
+        self.assertEqual((state, refetched), (client, 1))
+
+    def test_client_behind_base_version_refetches(self):
+        client = self.seed()
+        self.ask("a3", "third", 3)
+        self.store.state_delta(TENANT)  # a report this client missed
+        self.store.remove_ask(TENANT, "a1")
+        state, refetched = self.apply(client, [self.store.state_delta(TENANT)])
+        self.assertEqual((state, refetched), (client, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from nexus_supervisor import public_pages_i18n
+from nexus_supervisor.static_assets import IMMUTABLE, HashedStaticFiles, StaticAssets, build_assets, hashed_name
+
+
+class TestStaticAssets(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.static = self.root / "static"
+        (self.static / "js").mkdir(parents=True)
+        self.css = self.root / "site.css"
+        self.css.write_text("body { color: red; }\n", encoding="utf-8")
+        self.js = self.static / "js" / "boot.js"
+        self.js.write_text("console.log('boot');\n", encoding="utf-8")
+        self.sources = {"site.css": self.css, "boot.js": self.js}
+
+    def test_build_writes_hashed_copies_and_manifest(self):
+        manifest = build_assets(self.static, self.sources)
+        self.assertEqual(manifest["site.css"], f"dist/{hashed_name('site.css', self.css.read_bytes())}")
+        self.assertEqual((self.static / manifest["boot.js"]).read_bytes(), self.js.read_bytes())
+        with open(self.static / "dist" / "manifest.json", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), manifest)
+
+        self.css.write_text("body { color: blue; }\n", encoding="utf-8")
+        rebuilt = build_assets(self.static, self.sources)
+        self.assertNotEqual(rebuilt["site.css"], manifest["site.css"])
+        self.assertTrue((self.static / manifest["site.css"]).exists())  # old copy kept for cached pages
+
+    def test_tags_use_hashed_urls(self):
+        assets = StaticAssets(self.static, sources=self.sources)
+        self.assertRegex(assets.stylesheet("site.css"), r'^<link rel="stylesheet" href="/static/dist/site\.[0-9a-f]{12}\.css">$')
+        self.assertRegex(assets.script("boot.js"), r'^<script src="/static/dist/boot\.[0-9a-f]{12}\.js"></script>$')
+
+    def test_read_only_static_falls_back(self):
+        assets = StaticAssets(self.static, sources=self.sources)
+        with mock.patch("nexus_supervisor.static_assets.build_assets", side_effect=PermissionError("read-only")):
+            self.assertEqual(assets.script("boot.js"), '<script src="/static/js/boot.js"></script>')
+            self.assertEqual(assets.stylesheet("site.css"), "<style>\nbody { color: red; }\n</style>")
+
+    def test_hashed_files_are_immutable(self):
+        manifest = build_assets(self.static, self.sources)
+        app = FastAPI()
+        app.mount("/static", HashedStaticFiles(directory=str(self.static)), name="static")
+        client = TestClient(app)
+        self.assertEqual(client.get(f"/static/{manifest['boot.js']}").headers["cache-control"], IMMUTABLE)
+        self.assertNotIn("cache-control", client.get("/static/js/boot.js").headers)
+        self.assertNotIn("cache-control", client.get("/static/dist/manifest.json").headers)
+
+
+class TestPublicPagesReferenceBundles(unittest.TestCase):
+    def test_landing_page_has_no_inline_design_system(self):
+        html = public_pages_i18n.landing_page("en")
+        self.assertNotIn("--nav-bg", html)
+        self.assertRegex(html, r'<link rel="stylesheet" href="/static/dist/public\.[0-9a-f]{12}\.css">')
+        self.assertIn('data-status="idle"', html)
+        self.assertNotIn("function toggleLanguage", html)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from unittest import mock
+
+try:
+    import fakeredis
+except ImportError:  # optional test dependency
+    fakeredis = None
+
+from shared.stream_hub import StreamHub
+from shared.stream_store import AsyncStreamStore, StreamStore
+
+TENANT = "org::proj"
+
+
+@unittest.skipIf(fakeredis is None, "needs fakeredis (with lupa for Lua scripts)")
+class TestStreamStore(unittest.TestCase):
+    def setUp(self):
+        self.r = fakeredis.FakeRedis(decode_responses=True)
+
+    def store(self, backend, keep=2000):
+        with mock.patch("shared.stream_store.get_redis", return_value=self.r):
+            return StreamStore("redis://fake", event_keep=keep, backend=backend)
+
+    def test_append_replay_in_seq_order(self):
+        for backend in StreamStore.BACKENDS:
+            with self.subTest(backend=backend):
+                self.r.flushall()
+                s = self.store(backend)
+                seqs = [s.append_event(TENANT, "report", {"i": i, "text": "한글"}).seq for i in range(5)]
+                self.assertEqual(seqs, [1, 2, 3, 4, 5])
+                evs = s.replay(TENANT, after_seq=2)
+                self.assertEqual([(e.seq, e.payload["i"]) for e in evs], [(3, 2), (4, 3), (5, 4)])
+                self.assertEqual(evs[0].payload["text"], "한글")
+                self.assertEqual([e.seq for e in s.replay(TENANT, 0, limit=2)], [1, 2])
+                self.assertEqual(s.current_seq(TENANT), 5)
+
+    def test_trim_keeps_last_events(self):
+        for backend in StreamStore.BACKENDS:
+            with self.subTest(backend=backend):
+                self.r.flushall()
+                s = self.store(backend, keep=10)
+                for i in range(300):
+                    s.append_event(TENANT, "report", {"i": i})
+                evs = s.replay(TENANT, 0)
+                # XADD MAXLEN ~ trims whole stream nodes, so it may keep more than asked;
+                # the newest are always there and contiguous
+                self.assertGreaterEqual(len(evs), 10)
+                self.assertLess(len(evs), 300)
+                if backend == "zset":
+                    self.assertEqual(len(evs), 10)
+                self.assertEqual([e.seq for e in evs], list(range(301 - len(evs), 301)))
+
+    def test_concurrent_writers_publish_after_store(self):
+        # every published seq is already replayable and seqs reach subscribers in order
+        s = self.store("zset")
+        pubsub = self.r.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(s.channel(TENANT))
+
+        def writer(t):
+            for i in range(50):
+                s.append_event(TENANT, "tts_chunk" if t % 2 else "report", {"t": t, "i": i})
+
+        threads = [threading.Thread(target=writer, args=(t,)) for t in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        published = []
+        deadline = time.monotonic() + 2
+        while len(published) < 200 and time.monotonic() < deadline:
+            msg = pubsub.get_message(timeout=0.1)  # None also for the subscribe confirmation
+            if msg is not None:
+                published.append(json.loads(msg["data"])["seq"])
+        self.assertEqual(published, list(range(1, 201)))
+        self.assertEqual([e.seq for e in s.replay(TENANT, 0)], list(range(1, 201)))
+
+    def test_migrate_zset_to_stream(self):
+        from tools.migrate_stream_zset_to_streams import migrate_tenant
+
+        z = self.store("zset")
+        for i in range(7):
+            z.append_event(TENANT, "report", {"i": i})
+        res = migrate_tenant(self.r, TENANT, keep=0, batch=3, dry_run=False, delete_zset=False)
+        self.assertEqual((res["copied"], res["bad"], res["last_seq"]), (7, 0, 7))
+        # idempotent: a second run copies only what was appended since
+        z.append_event(TENANT, "report", {"i": 7})
+        res = migrate_tenant(self.r, TENANT, keep=0, batch=3, dry_run=False, delete_zset=True)
+        self.assertEqual((res["copied"], res["skipped"]), (1, 7))
+        self.assertFalse(self.r.exists(z._k(TENANT, "z")))
+
+        x = self.store("stream")
+        self.assertEqual([(e.seq, e.payload["i"]) for e in x.replay(TENANT, 5)], [(6, 5), (7, 6), (8, 7)])
+        self.assertEqual(x.append_event(TENANT, "report", {"i": 8}).seq, 9)
+
+
+@unittest.skipIf(fakeredis is None, "needs fakeredis (with lupa for Lua scripts)")
+class TestStreamHub(unittest.TestCase):
+    def run_hub(self, scenario, backend="zset", **hub_kw):
+        async def main():
+            server = fakeredis.FakeServer()
+            r = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+            with mock.patch("shared.stream_store.get_async_redis", return_value=r):
+                store = AsyncStreamStore("redis://fake", backend=backend)
+                hub = StreamHub("redis://fake", store, ping_every_s=60, **hub_kw)
+                feed_r = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+                try:
+                    with mock.patch("shared.stream_hub.get_async_redis", return_value=feed_r):
+                        return await scenario(store, hub)
+                finally:
+                    await hub.close()
+
+        return asyncio.run(main())
+
+    @staticmethod
+    async def take(frames, n):
+        out = []
+        for _ in range(n):
+            frame = await asyncio.wait_for(frames.__anext__(), timeout=2)
+            out.append(int(frame.split("\n", 1)[0][len("id: "):]))
+        return out
+
+    def test_backlog_then_live(self):
+        async def scenario(store, hub):
+            for i in range(3):
+                await store.append_event(TENANT, "report", {"i": i})
+            frames = hub.stream(TENANT, after_seq=1)
+            first = await self.take(frames, 2)
+            for i in range(2):
+                await store.append_event(TENANT, "report", {"i": i})
+            return first + await self.take(frames, 2)
+
+        self.assertEqual(self.run_hub(scenario), [2, 3, 4, 5])
+
+    def test_gap_is_filled_from_store(self):
+        async def scenario(store, hub):
+            frames = hub.stream(TENANT, after_seq=0)
+            first = asyncio.ensure_future(self.take(frames, 3))
+            await asyncio.sleep(0.05)  # subscribed
+            # seq 1 is stored but its PUBLISH is lost (redirected to another channel)
+            args = store._append_args(TENANT, "report", {"lost": True})
+            args["keys"][2] = "elsewhere"
+            await store._script("zappend")(**args, client=store.r)
+            await store.append_event(TENANT, "report", {"i": 2})
+            await store.append_event(TENANT, "report", {"i": 3})
+            return await first
+
+        self.assertEqual(self.run_hub(scenario), [1, 2, 3])
+
+    def test_overflow_resyncs_from_store(self):
+        async def scenario(store, hub):
+            frames = hub.stream(TENANT, after_seq=0)
+            await store.append_event(TENANT, "report", {"i": 0})
+            first = await self.take(frames, 1)
+            for i in range(5):  # queue_max=2: the subscriber lags and replays the rest
+                await store.append_event(TENANT, "report", {"i": i})
+            await asyncio.sleep(0.05)
+            return first + await self.take(frames, 5)
+
+        self.assertEqual(self.run_hub(scenario, queue_max=2), [1, 2, 3, 4, 5, 6])
+
+    def test_lagged_quiet_subscriber_resyncs_at_once(self):
+        async def scenario(store, hub):
+            frames = hub.stream(TENANT, after_seq=0)
+            first = asyncio.ensure_future(self.take(frames, 1))
+            await asyncio.sleep(0.05)  # subscribed, waiting on an empty queue
+            args = store._append_args(TENANT, "report", {"lost": True})
+            args["keys"][2] = "elsewhere"
+            await store._script("zappend")(**args, client=store.r)
+            # what the pump does when its connection drops; no further event or ping (60s) follows
+            for sub in list(hub._feeds[TENANT].subscribers):
+                hub._mark_lagged(sub)
+            return await first
+
+        self.assertEqual(self.run_hub(scenario), [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import json
+import threading
+import time
+import unittest
+from unittest import mock
+
+try:
+    import fakeredis
+except ImportError:  # optional test dependency
+    fakeredis = None
+
+from shared.task_store import TaskStore
+
+
+class _SlowRedis:
+    """Adds a network-like delay to every command, widening any read-modify-write window."""
+
+    def __init__(self, r, delay_s=0.002):
+        self._r = r
+        self._delay_s = delay_s
+
+    def __getattr__(self, name):
+        attr = getattr(self._r, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            time.sleep(self._delay_s)
+            return attr(*args, **kwargs)
+
+        return call
+
+
+@unittest.skipIf(fakeredis is None, "needs fakeredis (with lupa for Lua scripts)")
+class TestTaskStore(unittest.TestCase):
+    def setUp(self):
+        self.r = fakeredis.FakeRedis(decode_responses=True)
+        with mock.patch("shared.task_store.get_redis", return_value=self.r):
+            self.store = TaskStore("redis://fake", ttl_seconds=60)
+
+    def test_put_get_update(self):
+        self.store.put("t1", {"status": "queued", "result": None, "retry_count": 0})
+        self.assertEqual(self.r.type("task:t1"), "hash")
+        updated = self.store.update("t1", {"status": "succeeded", "result": {"rows": [1, 2]}})
+        self.assertEqual(updated, {"status": "succeeded", "result": {"rows": [1, 2]}, "retry_count": 0})
+        self.assertEqual(self.store.get("t1"), updated)
+        self.assertGreater(self.r.ttl("task:t1"), 0)
+        self.assertIsNone(self.store.update("missing", {"status": "failed"}))
+        self.assertFalse(self.r.exists("task:missing"))
+
+    def test_concurrent_updates_lose_nothing(self):
+        # a GET/merge/SET update keeps ~2 of these 32 fields with this delay
+        with mock.patch("shared.task_store.get_redis", return_value=_SlowRedis(self.r)):
+            self.store = TaskStore("redis://fake", ttl_seconds=60)
+        self.store.put("t", {"status": "running"})
+        n = 32
+        barrier = threading.Barrier(n)
+
+        def worker(i):
+            barrier.wait()
+            self.store.update("t", {f"step_{i}": i})
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        task = self.store.get("t")
+        self.assertEqual({k: v for k, v in task.items() if k.startswith("step_")}, {f"step_{i}": i for i in range(n)})
+
+    def test_legacy_json_record(self):
+        self.r.set("task:old", json.dumps({"status": "queued", "error": None}), ex=60)
+        self.assertEqual(self.store.get("old"), {"status": "queued", "error": None})
+        self.store.put("new", {"status": "running"})
+        self.assertEqual(set(self.store.get_many(["old", "new", "gone", "old"])), {"old", "new"})
+        self.assertEqual(self.store.update("old", {"status": "failed"}), {"status": "failed", "error": None})
+        self.assertEqual(self.r.type("task:old"), "hash")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from shared.tts_cache import TTSCache
+
+
+class TestTTSCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_covers_settings(self):
+        k = TTSCache.key("elevenlabs", "v1", "m1", "좋아요", stability=0.5)
+        self.assertEqual(k, TTSCache.key("elevenlabs", "v1", "m1", "좋아요", stability=0.5))
+        self.assertNotEqual(k, TTSCache.key("elevenlabs", "v1", "m1", "좋아요", stability=0.6))
+        self.assertNotEqual(k, TTSCache.key("google_cloud", "v1", "m1", "좋아요", stability=0.5))
+
+    def test_hit_skips_producer(self):
+        cache = TTSCache(self.root, max_bytes=1024)
+        calls = []
+        produce = lambda: calls.append(1) or b"audio"
+        p1, hit1 = cache.get_or_create("k", produce)
+        p2, hit2 = cache.get_or_create("k", produce)
+        self.assertEqual((hit1, hit2), (False, True))
+        self.assertEqual(p1, p2)
+        self.assertEqual(p1.read_bytes(), b"audio")
+        self.assertEqual(len(calls), 1)
+
+    def test_failed_produce_not_cached(self):
+        cache = TTSCache(self.root, max_bytes=1024)
+        self.assertEqual(cache.get_or_create("k", lambda: None), (None, False))
+        self.assertIsNone(cache.get("k"))
+
+    def test_lru_eviction_by_bytes(self):
+        cache = TTSCache(self.root, max_bytes=250)
+        cache.put("a", b"x" * 100)
+        cache.put("b", b"x" * 100)
+        self.assertIsNotNone(cache.get("a"))  # a is now most recently used
+        cache.put("c", b"x" * 100)
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertLessEqual(cache.stats()["bytes"], 250)
+
+    def test_existing_files_count_against_budget(self):
+        for i, name in enumerate(("old", "new")):
+            p = self.root / f"tts_{name}.mp3"
+            p.write_bytes(b"x" * 100)
+            os.utime(p, (time.time() - 100 + i, time.time() - 100 + i))
+        cache = TTSCache(self.root, max_bytes=150)
+        self.assertEqual(cache.stats()["files"], 1)
+        self.assertFalse((self.root / "tts_old.mp3").exists())
+        self.assertTrue((self.root / "tts_new.mp3").exists())
+
+    def test_concurrent_misses_produce_once(self):
+        cache = TTSCache(self.root, max_bytes=1024)
+        calls = []
+
+        def produce():
+            calls.append(1)
+            time.sleep(0.05)
+            return b"audio"
+
+        threads = [threading.Thread(target=cache.get_or_create, args=("k", produce)) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(calls), 1)
+
+    def test_stream_readers_follow_producer(self):
+        cache = TTSCache(self.root, max_bytes=1024, workers=2)
+        gate = threading.Event()
+        seen, done = [], threading.Event()
+
+        def produce():
+            yield b"ab"
+            gate.wait(2)
+            yield b"cd"
+
+        name, hit = cache.start_stream(
+            "k", produce, on_chunk=lambda i, c: seen.append((i, c)), on_done=lambda err, n: done.set()
+        )
+        self.assertFalse(hit)
+        reader = cache.iter_audio(name)
+        self.assertEqual(next(reader), b"ab")  # first chunk before the clip is complete
+        self.assertTrue(cache.is_streaming(name))
+        gate.set()
+        self.assertEqual(b"".join(reader), b"cd")
+        self.assertTrue(done.wait(2))
+        self.assertEqual(seen, [(0, b"ab"), (1, b"cd")])
+        self.assertEqual(cache.get("k").read_bytes(), b"abcd")
+        again = []
+        self.assertEqual(cache.start_stream("k", produce, on_chunk=lambda i, c: again.append(c)), (name, True))
+        self.assertEqual(again, [b"abcd"])
+
+    def test_failed_stream_not_cached(self):
+        cache = TTSCache(self.root, max_bytes=1024)
+        result = []
+        done = threading.Event()
+
+        def produce():
+            yield b"partial"
+            raise RuntimeError("provider down")
+
+        cache.start_stream("k", produce, on_done=lambda err, n: (result.append(err), done.set()))
+        self.assertTrue(done.wait(2))
+        self.assertIn("provider down", result[0])
+        self.assertIsNone(cache.get("k"))
+        self.assertEqual(list(self.root.iterdir()), [])
+
+    def test_prune_by_age(self):
+        cache = TTSCache(self.root, max_bytes=1024)
+        p = cache.put("a", b"x")
+        os.utime(p, (time.time() - 7200, time.time() - 7200))
+        cache.put("b", b"y")
+        cache = TTSCache(self.root, max_bytes=1024)
+        self.assertEqual(cache.prune(3600), 1)
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("b"))
+
+
+if __name__ == "__main__":
+    unittest.main()
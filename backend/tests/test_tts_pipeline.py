@@ -0,0 +1,109 @@
+import threading
+import unittest
+
+from shared.tts_pipeline import SentencePipeline, TenantTTSLimiter, split_sentences
+
+
+class _FakeTTS:
+    """stream_tts stand-in: records starts; the test completes clips explicitly."""
+
+    def __init__(self, hits=()):
+        self.lock = threading.Lock()
+        self.started = []  # (text, on_chunk, on_done)
+        self.hits = set(hits)
+
+    def __call__(self, text, on_chunk=None, on_done=None):
+        if text in self.hits:
+            on_chunk(0, b"x")
+            on_done(None, 1)
+        else:
+            with self.lock:
+                self.started.append((text, on_chunk, on_done))
+        return {"audio_url": f"/tts/{len(text)}.mp3", "duration_ms": len(text) * 100, "voice": "v"}
+
+    def finish(self, text, error=None):
+        for t, on_chunk, on_done in list(self.started):
+            if t == text:
+                if not error:
+                    on_chunk(0, b"x")
+                on_done(error, 0 if error else 1)
+
+
+class TestSplitSentences(unittest.TestCase):
+    def test_splits_on_terminators_and_newlines(self):
+        text = "안녕하세요, 오늘 기분은 어떠세요? 저는 오늘 아주 좋아요!\n새로운 소식을 알려드릴게요."
+        self.assertEqual(
+            split_sentences(text),
+            ["안녕하세요, 오늘 기분은 어떠세요?", "저는 오늘 아주 좋아요!", "새로운 소식을 알려드릴게요."],
+        )
+
+    def test_short_sentences_merged(self):
+        self.assertEqual(split_sentences("네! 좋아요. 그럼 바로 시작해 볼까요?"), ["네! 좋아요. 그럼 바로 시작해 볼까요?"])
+
+    def test_long_sentence_split_at_clauses(self):
+        text = ", ".join(["가나다라마바사 아자차카타파하"] * 10) + "."
+        segments = split_sentences(text, max_chars=40)
+        self.assertTrue(all(len(s) <= 40 for s in segments))
+        self.assertEqual(" ".join(segments).replace(" ", ""), text.replace(" ", ""))
+
+
+class TestTenantTTSLimiter(unittest.TestCase):
+    def test_bounds_per_tenant_fifo(self):
+        limiter = TenantTTSLimiter(limit=2)
+        running, order = [], []
+        for i in range(4):
+            limiter.submit("t1", lambda release, i=i: (order.append(i), running.append(release)))
+        limiter.submit("t2", lambda release: order.append("t2"))
+        self.assertEqual(order, [0, 1, "t2"])
+        self.assertEqual(limiter.active("t1"), 2)
+        running.pop(0)()
+        running[0]()  # releasing twice is a no-op
+        running[0]()
+        self.assertEqual(order, [0, 1, "t2", 2, 3])
+
+    def test_synchronous_release_drains_queue(self):
+        limiter = TenantTTSLimiter(limit=1)
+        order = []
+        for i in range(50):
+            limiter.submit("t", lambda release, i=i: (order.append(i), release()))
+        self.assertEqual(order, list(range(50)))
+        self.assertEqual(limiter.active("t"), 0)
+
+
+class TestSentencePipeline(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+        self.emit = lambda event_type, data: self.events.append((event_type, data))
+
+    def test_chunks_emitted_in_order(self):
+        tts = _FakeTTS()
+        text = "첫 번째 문장을 말할게요. 두 번째 문장은 조금 더 길어요. 세 번째 문장으로 마칠게요."
+        SentencePipeline("t", text, tts, self.emit, TenantTTSLimiter(limit=2)).run()
+        self.assertEqual([e for e, _ in self.events], ["tts_start"])
+        self.assertEqual(self.events[0][1]["segments"], 3)
+        self.assertEqual(len(tts.started), 2)  # per-tenant bound
+
+        tts.finish("두 번째 문장은 조금 더 길어요.")  # finishes first, must wait for sentence 0
+        self.assertEqual([e for e, _ in self.events], ["tts_start"])
+        self.assertEqual(len(tts.started), 3)  # freed slot started sentence 2
+        tts.finish("첫 번째 문장을 말할게요.")
+        tts.finish("세 번째 문장으로 마칠게요.")
+
+        kinds = [e for e, _ in self.events]
+        self.assertEqual(kinds, ["tts_start", "tts_chunk", "tts_chunk", "tts_chunk", "tts_end"])
+        self.assertEqual([d["seq"] for e, d in self.events if e == "tts_chunk"], [0, 1, 2])
+        self.assertTrue(all(d["audio_url"] for e, d in self.events if e == "tts_chunk"))
+        self.assertEqual(self.events[-1][1]["failed"], 0)
+
+    def test_cache_hits_and_failures(self):
+        text = "캐시에 있는 문장입니다. 합성에 실패하는 문장입니다."
+        tts = _FakeTTS(hits={"캐시에 있는 문장입니다."})
+        SentencePipeline("t", text, tts, self.emit, TenantTTSLimiter(limit=1)).run()
+        self.assertEqual([e for e, _ in self.events], ["tts_start", "tts_chunk"])
+        tts.finish("합성에 실패하는 문장입니다.", error="RuntimeError: down")
+        self.assertEqual([e for e, _ in self.events], ["tts_start", "tts_chunk", "tts_end"])
+        self.assertEqual(self.events[-1][1]["failed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
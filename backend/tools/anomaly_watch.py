@@ -4,42 +4,28 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import sys
 import time
 from datetime import datetime, timezone, timedelta
-from collections import defaultdict
-from typing import Any, Dict, List, Tuple
+
+# Ensure repository root is importable when executed as a script
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
 
 from shared.settings import settings
 from shared.notify import notify
+from shared.ledger_store import AUDIT_COLUMNS, COST_COLUMNS, LedgerStore
 
 LEDGER_DEFAULT = "logs/llm_cost_ledger.jsonl"
 AUDIT_DEFAULT = "logs/llm_audit.jsonl"
 
 
-def load_jsonl(path: str) -> List[Dict[str, Any]]:
-    if not os.path.exists(path):
-        return []
-    out: List[Dict[str, Any]] = []
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                out.append(json.loads(line))
-            except Exception:
-                continue
-    return out
-
-
-def parse_ts(ts: str) -> datetime:
-    return datetime.strptime(ts, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
-
-
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--ledger", default=LEDGER_DEFAULT)
     ap.add_argument("--audit", default=AUDIT_DEFAULT)
+    ap.add_argument("--compact", action="store_true", help="compact both logs into their columnar stores first")
     ap.add_argument("--dry-run", action="store_true")
     args = ap.parse_args()
 
@@ -47,17 +33,23 @@ def main() -> None:
     now = datetime.now(timezone.utc)
     since = now - timedelta(minutes=window_min)
 
-    ledger = [r for r in load_jsonl(args.ledger) if r.get("ts_utc")]
-    recent_cost = [r for r in ledger if since <= parse_ts(r["ts_utc"]) <= now]
+    # the window touches today's (maybe yesterday's) partition and the uncompacted tail only
+    ledger = LedgerStore(args.ledger, COST_COLUMNS)
+    audit = LedgerStore(args.audit, AUDIT_COLUMNS)
+    if args.compact:
+        ledger.compact()
+        audit.compact()
 
-    total_cost = sum(float(r.get("actual_cost_usd") or 0.0) for r in recent_cost)
+    total_cost = ledger.aggregate(since.timestamp(), now.timestamp()).sums["actual_cost_usd"]
     rate_threshold = float(getattr(settings, "anomaly_cost_usd_rate_threshold", 2.0) or 2.0)
     cost_spike = total_cost >= rate_threshold
 
     # 429 burst from audit (llm_fail with reason PROVIDER_RATE_LIMIT)
-    audit = [r for r in load_jsonl(args.audit) if r.get("ts_utc")]
-    recent_audit = [r for r in audit if since <= parse_ts(r["ts_utc"]) <= now]
-    rate_limit_fails = sum(1 for r in recent_audit if r.get("type") in ("llm_fail", "llm_provider_error") and r.get("reason") == "PROVIDER_RATE_LIMIT")
+    rate_limit_fails = audit.aggregate(
+        since.timestamp(),
+        now.timestamp(),
+        where={"type": ("llm_fail", "llm_provider_error"), "reason": ("PROVIDER_RATE_LIMIT",)},
+    ).rows
     burst_threshold = int(getattr(settings, "anomaly_429_burst_threshold", 20) or 20)
     burst_429 = rate_limit_fails >= burst_threshold
 
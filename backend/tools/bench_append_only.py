@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Benchmark hash-chained JSONL appends: former sidecar appender vs ChainWriter.
+
+For each mode, --procs processes x --threads threads append --n records each (an
+audit-sized event) to one scratch file, then the file is checked with verify_jsonl_chain:
+  - legacy: per-append .chain sidecar read + JSONL open/append + sidecar rewrite, with a
+    per-process lock only (the former append_jsonl_with_chain)
+  - writer: append_jsonl_with_chain through ChainWriter (file lock, in-memory head,
+    group commit, fsync every --fsync-interval seconds)
+Reported as appends/second, verify ok/errors (forked chains show up as prev_hash_mismatch).
+
+Uses a temp directory; nothing else is touched:
+  python tools/bench_append_only.py --procs 4 --threads 8 --n 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict
+
+# Ensure repository root is importable when executed as a script
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from shared import append_only
+from shared.append_only import ZERO_HASH, _chain, verify_jsonl_chain
+
+_legacy_lock = threading.Lock()
+
+
+def legacy_append(path: str, event: Dict[str, Any]) -> Dict[str, Any]:
+    """The former append_jsonl_with_chain: sidecar holds the head, per-process lock only."""
+    sidecar = path + ".chain"
+    with _legacy_lock:
+        try:
+            with open(sidecar, "r", encoding="utf-8") as f:
+                prev = (f.read() or "").strip() or ZERO_HASH
+        except FileNotFoundError:
+            prev = ZERO_HASH
+        ev, line = _chain(prev, event)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+        with open(sidecar, "w", encoding="utf-8") as f:
+            f.write(ev["hash"])
+        return ev
+
+
+def _event(i: int) -> Dict[str, Any]:
+    return {
+        "event": "llm_generate_ok",
+        "purpose": "chat",
+        "provider": "gemini",
+        "model": "gemini-2.0-flash",
+        "tokens_in": 812,
+        "tokens_out": 240,
+        "fp": f"{i:016x}",
+        "tenant": {"tenant_id": "t1", "user_id": "u1"},
+    }
+
+
+def _worker(mode: str, path: str, threads: int, n: int, fsync_interval: float) -> None:
+    append_only.settings.append_only_fsync_interval_s = fsync_interval
+    append: Callable[[str, Dict[str, Any]], Any] = legacy_append if mode == "legacy" else append_only.append_jsonl_with_chain
+
+    def run() -> None:
+        for i in range(n):
+            append(path, _event(i))
+
+    ts = [threading.Thread(target=run) for _ in range(threads)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    append_only.close_all()
+
+
+def _run(mode: str, args: argparse.Namespace, tmp: str) -> Dict[str, Any]:
+    path = os.path.join(tmp, f"{mode}.jsonl")
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_worker, args=(mode, path, args.threads, args.n, args.fsync_interval))
+             for _ in range(args.procs)]
+    t0 = time.perf_counter()
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    elapsed = time.perf_counter() - t0
+    total = args.procs * args.threads * args.n
+    res = verify_jsonl_chain(path)
+    return {
+        "appends": total,
+        "appends_per_s": round(total / elapsed, 1),
+        "records": res["count"],
+        "verify_ok": res["ok"],
+        "verify_errors": len(res["errors"]),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--procs", type=int, default=4)
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--n", type=int, default=500, help="appends per thread")
+    ap.add_argument("--fsync-interval", type=float, default=1.0)
+    args = ap.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        out = {mode: _run(mode, args, tmp) for mode in ("legacy", "writer")}
+    print(json.dumps(out, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
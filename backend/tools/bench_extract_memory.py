@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Peak-RSS benchmark for streaming document extraction (doc_extract.iter_chunks).
+
+Generates a large synthetic .xlsx (--xlsx-rows rows) and .pdf (--pdf-pages pages) in a temp
+dir, then extracts each one in a fresh child process, consuming iter_chunks() one chunk at
+a time, and reports the child's peak RSS above its post-import baseline. For reference the
+materialized extract_chunks() list is measured as well. Exits 1 if any streaming run grows
+by more than --max-growth-mb.
+
+What remains after streaming is parser state that scales with the file itself rather than
+copies of its text: openpyxl keeps the workbook's shared-strings table, PyPDF2 the xref
+and page tree (a few KB per page).
+
+  python tools/bench_extract_memory.py --xlsx-rows 300000 --pdf-pages 3000 --max-growth-mb 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+_LOREM = "분기 매출 보고서 budget forecast review 고객 계약 일정 incident release".split()
+
+
+def make_xlsx(path: str, rows: int) -> None:
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("data")
+    for r in range(rows):
+        ws.append([r, _LOREM[r % len(_LOREM)], f"row {r} " + " ".join(_LOREM), r * 1.25, None])
+    wb.save(path)
+
+
+def _pdf_escape(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(path: str, pages: int, lines_per_page: int = 45) -> None:
+    """Plain text pages (Helvetica, ASCII) written object by object with a hand-built xref."""
+    offsets: List[int] = []
+    n_objs = 3 + 2 * pages  # catalog, pages, font, then (page, content) pairs
+    with open(path, "wb") as f:
+
+        def obj(num: int, body: bytes) -> None:
+            offsets.append(f.tell())
+            f.write(f"{num} 0 obj\n".encode("ascii") + body + b"\nendobj\n")
+
+        f.write(b"%PDF-1.4\n")
+        obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(pages))
+        obj(2, f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode("ascii"))
+        obj(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+        words = [w for w in " ".join(_LOREM).split() if w.isascii()]
+        for i in range(pages):
+            lines = [f"page {i} line {j} " + " ".join(words[(i + j) % len(words):] + words) for j in range(lines_per_page)]
+            text = "".join(f"({_pdf_escape(ln)}) '\n" for ln in lines)
+            stream = f"BT /F1 9 Tf 12 TL 40 760 Td\n{text}ET".encode("ascii")
+            obj(
+                4 + 2 * i,
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode("ascii"),
+            )
+            obj(5 + 2 * i, f"<< /Length {len(stream)} >>\nstream\n".encode("ascii") + stream + b"\nendstream")
+        xref = f.tell()
+        f.write(f"xref\n0 {n_objs + 1}\n0000000000 65535 f \n".encode("ascii"))
+        for off in offsets:
+            f.write(f"{off:010d} 00000 n \n".encode("ascii"))
+        f.write(f"trailer\n<< /Size {n_objs + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("ascii"))
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _child(mode: str, path: str, max_chars: int, cell_limit: int) -> Dict[str, Any]:
+    from shared.doc_extract import extract_chunks, iter_chunks
+
+    baseline = _peak_rss_mb()
+    chunks = 0
+    chars = 0
+    if mode == "stream":
+        for ch in iter_chunks(path, max_chars=max_chars, xlsx_cell_limit=cell_limit):
+            chunks += 1
+            chars += len(ch.text)
+    else:
+        out = extract_chunks(path, max_chars=max_chars, xlsx_cell_limit=cell_limit)
+        chunks = len(out)
+        chars = sum(len(c.text) for c in out)
+    peak = _peak_rss_mb()
+    return {"baseline_mb": round(baseline, 1), "peak_mb": round(peak, 1), "growth_mb": round(peak - baseline, 1), "chunks": chunks, "chars": chars}
+
+
+def run_child(mode: str, path: str, max_chars: int, cell_limit: int) -> Dict[str, Any]:
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [here, os.environ.get("PYTHONPATH", "")])))
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", mode, path, "--chunk-chars", str(max_chars), "--cell-limit", str(cell_limit)]
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True, env=env)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--xlsx-rows", type=int, default=200000)
+    ap.add_argument("--pdf-pages", type=int, default=2000)
+    ap.add_argument("--chunk-chars", type=int, default=12000)
+    ap.add_argument("--cell-limit", type=int, default=10**9, help="xlsx_cell_limit (default: effectively unlimited)")
+    ap.add_argument("--max-growth-mb", type=float, default=200.0)
+    ap.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        print(json.dumps(_child(args.child[0], args.child[1], args.chunk_chars, args.cell_limit)))
+        return 0
+
+    tmp = tempfile.mkdtemp(prefix="extract-mem-")
+    try:
+        files = {}
+        if args.xlsx_rows > 0:
+            files["xlsx"] = os.path.join(tmp, "big.xlsx")
+            make_xlsx(files["xlsx"], args.xlsx_rows)
+        if args.pdf_pages > 0:
+            files["pdf"] = os.path.join(tmp, "big.pdf")
+            make_pdf(files["pdf"], args.pdf_pages)
+
+        results = []
+        ok = True
+        for kind, path in files.items():
+            row: Dict[str, Any] = {"file": kind, "size_mb": round(os.path.getsize(path) / 1e6, 1)}
+            for mode in ("stream", "list"):
+                row[mode] = run_child(mode, path, args.chunk_chars, args.cell_limit)
+            row["stream_ok"] = row["stream"]["growth_mb"] <= args.max_growth_mb
+            ok = ok and row["stream_ok"]
+            results.append(row)
+        print(json.dumps({"max_growth_mb": args.max_growth_mb, "results": results}, ensure_ascii=False, indent=2))
+        return 0 if ok else 1
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Benchmark the columnar ledger store against the former load_jsonl + strptime scans.
+
+Writes a synthetic cost ledger (--rows records over --days days, ledger-shaped rows including
+chain fields), then times:
+  - compact: first full compaction, and an incremental one after --tail more rows
+  - report: a 30-day finops_report aggregation (provider/model/purpose/team)
+  - anomaly: the last-15-minute cost sum anomaly_watch computes
+each for the store and for the former code path (load the whole JSONL into a list, strptime
+every ts_utc, filter, aggregate in Python). The former path holds every row in memory, so it
+runs on the first --legacy-rows rows only and its time is scaled linearly to --rows
+(reported as "legacy_s_scaled").
+
+Uses a temp directory; nothing else is touched:
+  python tools/bench_ledger_store.py --rows 10000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+# Ensure repository root is importable when executed as a script
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from shared.ledger_store import COST_COLUMNS, LedgerStore
+
+PROVIDERS = ["gemini", "openai", "anthropic", "glm"]
+MODELS = ["gemini-2.0-flash", "gpt-4o-mini", "claude-3-5-haiku", "glm-4-flash", "gpt-4o", "gemini-1.5-pro"]
+PURPOSES = ["chat", "summarize", "classify", "codegen", "rag"]
+TEAMS = ["default", "growth", "platform", "research"]
+HASH = "ab" * 32
+
+
+def write_rows(path: str, start: int, n: int, t0: int, step: float, rng: random.Random) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        buf: List[str] = []
+        for i in range(start, start + n):
+            t = t0 + int(i * step)
+            row = {
+                "ts": float(t),
+                "purpose": rng.choice(PURPOSES),
+                "provider": rng.choice(PROVIDERS),
+                "model": rng.choice(MODELS),
+                "fp": f"{i:016x}",
+                "tenant": {"tenant_id": "t1", "user_id": f"u{i % 97}"},
+                "team": rng.choice(TEAMS),
+                "project": "nexus",
+                "estimated_cost_usd": 0.002,
+                "actual_cost_usd": round(rng.random() * 0.01, 6),
+                "tokens_in": 812,
+                "tokens_out": 240,
+                "latency_ms": 730,
+                "ts_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(t)),
+                "chain_ver": 1,
+                "prev_hash": HASH,
+                "hash": HASH,
+            }
+            if i % 50 == 0:
+                row["approx_tokens"] = True
+            buf.append(json.dumps(row, ensure_ascii=False))
+            if len(buf) >= 100_000:
+                f.write("\n".join(buf) + "\n")
+                buf = []
+        if buf:
+            f.write("\n".join(buf) + "\n")
+
+
+def legacy_load(path: str, limit: int) -> List[Dict[str, Any]]:
+    """tools/*: load_jsonl (first limit lines)."""
+    out = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if len(out) >= limit:
+                break
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                out.append(json.loads(line))
+            except Exception:
+                continue
+    return out
+
+
+def parse_ts(ts: str) -> datetime:
+    return datetime.strptime(ts, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+
+
+def legacy_report(rows: List[Dict[str, Any]], dfrom: datetime, dto: datetime) -> float:
+    by = {k: defaultdict(float) for k in ("provider", "model", "purpose", "team")}
+    total = 0.0
+    for r in rows:
+        t = parse_ts(r["ts_utc"])
+        if dfrom <= t <= dto:
+            cost = float(r.get("actual_cost_usd") or 0.0)
+            total += cost
+            by["provider"][str(r.get("provider") or "unknown")] += cost
+            by["model"][str(r.get("model") or "unknown")] += cost
+            by["purpose"][str(r.get("purpose") or "default")] += cost
+            by["team"][f"{r.get('team','default')}/{r.get('project','nexus')}"] += cost
+    return total
+
+
+def legacy_window(rows: List[Dict[str, Any]], since: datetime, now: datetime) -> float:
+    return sum(float(r.get("actual_cost_usd") or 0.0) for r in rows if since <= parse_ts(r["ts_utc"]) <= now)
+
+
+def timed(fn: Any) -> tuple:
+    t = time.perf_counter()
+    res = fn()
+    return res, round(time.perf_counter() - t, 3)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=10_000_000)
+    ap.add_argument("--days", type=int, default=90)
+    ap.add_argument("--tail", type=int, default=10_000, help="rows appended after the first compaction")
+    ap.add_argument("--legacy-rows", type=int, default=1_000_000)
+    ap.add_argument("--dir", default=None, help="work dir (default: a temp dir, removed afterwards)")
+    args = ap.parse_args()
+
+    tmp = None if args.dir else tempfile.TemporaryDirectory()
+    work = args.dir or tmp.name
+    path = os.path.join(work, "llm_cost_ledger.jsonl")
+    rng = random.Random(7)
+    t_end = int(time.time()) // 60 * 60
+    t0 = t_end - args.days * 86400
+    step = args.days * 86400 / (args.rows + args.tail)
+    out: Dict[str, Any] = {"rows": args.rows, "days": args.days}
+    try:
+        _, out["generate_s"] = timed(lambda: write_rows(path, 0, args.rows, t0, step, rng))
+        out["jsonl_mb"] = round(os.path.getsize(path) / 1e6, 1)
+        store = LedgerStore(path, COST_COLUMNS, root=os.path.join(work, "columnar"))
+        _, out["compact_full_s"] = timed(store.compact)
+        write_rows(path, args.rows, args.tail, t0, step, rng)
+        res, out["compact_incremental_s"] = timed(store.compact)
+        out["compact_incremental_rows"] = res["rows"]
+
+        now = datetime.fromtimestamp(t_end, timezone.utc)
+        dfrom = datetime.fromtimestamp(t_end - 30 * 86400, timezone.utc)
+        since = datetime.fromtimestamp(t_end - 15 * 60, timezone.utc)
+        report, out["store_report_s"] = timed(lambda: store.aggregate(
+            dfrom.timestamp(), now.timestamp(), by=("provider", "model", "purpose", "team"), value="actual_cost_usd"))
+        window, out["store_anomaly_s"] = timed(lambda: store.aggregate(since.timestamp(), now.timestamp()))
+        out["report_rows"] = report.rows
+        out["anomaly_rows"] = window.rows
+
+        n = min(args.legacy_rows, args.rows)
+        scale = args.rows / n
+        rows, load_s = timed(lambda: legacy_load(path, n))
+        _, rep_s = timed(lambda rows=rows: legacy_report(rows, dfrom, dto=now))
+        _, win_s = timed(lambda rows=rows: legacy_window(rows, since, now))
+        out["legacy_rows_measured"] = n
+        out["legacy_report_s_scaled"] = round((load_s + rep_s) * scale, 1)
+        out["legacy_anomaly_s_scaled"] = round((load_s + win_s) * scale, 1)
+        del rows
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+    print(json.dumps(out, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
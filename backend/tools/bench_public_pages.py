@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Benchmark the public i18n pages: render per request vs PublicPageCache.
+
+For every public page and language:
+  - handler_*: the route body called directly, --n times (server-side cost only)
+      before: HTMLResponse(page(lang)), as the former route handlers did
+      cached: PublicPageCache.response() for a gzip-accepting client
+  - http_*: a scratch FastAPI app driven in-process by TestClient (includes ASGI/client
+    overhead, which dominates for ~30 KB pages)
+      before / cached (identity) / cached_gzip / revalidate (If-None-Match -> 304)
+Reported as requests/second, plus identity and gzip body sizes.
+
+No Redis or data changes needed:
+  python tools/bench_public_pages.py --n 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse
+from fastapi.testclient import TestClient
+
+from nexus_supervisor import public_pages_i18n as pages
+from nexus_supervisor.public_page_cache import PublicPageCache
+
+PAGES: Dict[str, Callable[[str], str]] = {
+    "landing": pages.landing_page,
+    "intro": pages.intro_page,
+    "developer": pages.developer_page,
+    "modules": pages.modules_page,
+    "pricing": pages.pricing_page,
+    "dashboard-preview": pages.dashboard_preview_page,
+    "canvas-preview": pages.canvas_preview_page,
+    "login": pages.login_page,
+}
+
+
+def _app(cache: PublicPageCache) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before/{page}")
+    def before(page: str, lang: str = "ko"):
+        return HTMLResponse(PAGES[page](lang))
+
+    @app.get("/cached/{page}")
+    def cached(page: str, request: Request, lang: str = "ko"):
+        return cache.response(request.headers, page, lang, PAGES[page])
+
+    return app
+
+
+def _rps(fn: Callable[[], Any], n: int) -> float:
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return round(n / (time.perf_counter() - t0), 1)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=300, help="requests per page, language and mode")
+    ap.add_argument("--langs", default="ko,en")
+    args = ap.parse_args()
+
+    cache = PublicPageCache(pages.DATA_FILES, languages=pages.TRANSLATIONS.keys())
+    client = TestClient(_app(cache))
+    identity = {"accept-encoding": "identity"}
+    gzip_ok = {"accept-encoding": "gzip"}
+    out: Dict[str, Any] = {}
+    totals: Dict[str, float] = {}
+    for page, render in PAGES.items():
+        for lang in args.langs.split(","):
+            etag = client.get(f"/cached/{page}?lang={lang}", headers=identity).headers["etag"]
+            revalidate = {**identity, "if-none-match": etag}
+            before_url, cached_url = f"/before/{page}?lang={lang}", f"/cached/{page}?lang={lang}"
+            rps = {
+                "handler_before": _rps(lambda render=render, lang=lang: HTMLResponse(render(lang)), args.n),
+                "handler_cached": _rps(lambda page=page, lang=lang, render=render: cache.response(gzip_ok, page, lang, render), args.n),
+                "http_before": _rps(lambda url=before_url: client.get(url, headers=identity), args.n),
+                "http_cached": _rps(lambda url=cached_url: client.get(url, headers=identity), args.n),
+                "http_cached_gzip": _rps(lambda url=cached_url: client.get(url, headers=gzip_ok), args.n),
+                "http_revalidate": _rps(lambda url=cached_url, h=revalidate: client.get(url, headers=h), args.n),
+            }
+            assert client.get(cached_url, headers=revalidate).status_code == 304
+            rendered = cache.get(page, lang, render)
+            out[f"{page}?lang={lang}"] = {
+                "rps": rps,
+                "bytes": len(rendered.body),
+                "gzip_bytes": len(rendered.gzip_body or b""),
+            }
+            for mode, value in rps.items():
+                totals[mode] = totals.get(mode, 0.0) + value
+    runs = max(1, len(out))
+    mean = {mode: round(total / runs, 1) for mode, total in totals.items()}
+    out["mean_rps"] = mean
+    out["speedup"] = {
+        "handler": round(mean["handler_cached"] / max(1e-9, mean["handler_before"]), 2),
+        "http": round(mean["http_cached"] / max(1e-9, mean["http_before"]), 2),
+    }
+    print(json.dumps(out, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Benchmark RagFolderIngestor over a synthetic folder tree.
+
+Generates --dirs directories x --files-per-dir .txt/.md files (each ~--file-bytes, so a
+few chunks with --chunk-chars) in a temp dir, then for each --batch-sizes value ingests
+the tree into a scratch tenant twice: cold (everything new) and warm (nothing changed,
+only the per-directory manifest lookups). batch_size=1 approximates the old
+one-write-per-chunk behaviour; --workers sets the extraction process pool (0 = inline). Scratch keys and the temp tree are deleted afterwards.
+
+Run against a real Redis (not production):
+  python tools/bench_rag_folder_ingest.py --redis-url redis://localhost:6379/15 --dirs 50 --files-per-dir 100 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, List
+
+from shared.rag_folder_ingest import RagFolderIngestor
+from shared.rag_naive import NaiveRAG
+from shared.settings import settings
+
+_WORDS = (
+    "report sales budget meeting contract invoice roadmap release incident review "
+    "보고서 매출 예산 회의 계약서 청구서 일정 배포 장애 검토 고객 품질"
+).split()
+
+
+def make_tree(root: str, dirs: int, files_per_dir: int, file_bytes: int, seed: int = 7) -> int:
+    rnd = random.Random(seed)
+    n = 0
+    for d in range(dirs):
+        path = os.path.join(root, f"team{d % 8}", f"dir{d:04d}")
+        os.makedirs(path, exist_ok=True)
+        for f in range(files_per_dir):
+            words: List[str] = []
+            size = 0
+            while size < file_bytes:
+                w = rnd.choice(_WORDS)
+                words.append(w)
+                size += len(w.encode("utf-8")) + 1
+            with open(os.path.join(path, f"doc{f:04d}.{'md' if f % 3 == 0 else 'txt'}"), "w", encoding="utf-8") as fh:
+                fh.write(" ".join(words))
+            n += 1
+    return n
+
+
+def _cleanup(ingestor: RagFolderIngestor, tenant: str) -> None:
+    keys = list(ingestor.r.scan_iter(match=f"nexus:rag:{tenant}:*", count=1000))
+    for i in range(0, len(keys), 500):
+        ingestor.r.delete(*keys[i:i + 500])
+
+
+def bench(redis_url: str, folder: str, batch_size: int, max_files: int, chunk_chars: int, workers: int = 0) -> Dict[str, Any]:
+    rag = NaiveRAG(redis_url, default_analyzer=settings.rag_analyzer)
+    ingestor = RagFolderIngestor(redis_url, rag)
+    tenant = f"bench-ingest-{uuid.uuid4().hex[:8]}"
+    out: Dict[str, Any] = {"batch_size": batch_size, "workers": workers}
+    try:
+        for phase in ("cold", "warm"):
+            t0 = time.perf_counter()
+            res = ingestor.ingest_folder(
+                tenant=tenant,
+                folder=folder,
+                allowed_exts=["txt", "md"],
+                max_files=max_files,
+                max_chars_per_chunk=chunk_chars,
+                batch_size=batch_size,
+                workers=workers,
+            )
+            dt = time.perf_counter() - t0
+            out[phase] = {
+                "seconds": round(dt, 3),
+                "scanned": res.scanned,
+                "ingested_chunks": res.ingested_chunks,
+                "skipped": res.skipped,
+                "chunks_per_s": round(res.ingested_chunks / dt, 1) if dt and res.ingested_chunks else None,
+                "timings": res.timings,
+            }
+        return out
+    finally:
+        _cleanup(ingestor, tenant)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--redis-url", default="redis://localhost:6379/15")
+    ap.add_argument("--dirs", type=int, default=50)
+    ap.add_argument("--files-per-dir", type=int, default=100)
+    ap.add_argument("--file-bytes", type=int, default=4000)
+    ap.add_argument("--chunk-chars", type=int, default=1500)
+    ap.add_argument("--batch-sizes", default="1,256")
+    ap.add_argument("--workers", type=int, default=0)
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="rag-bench-")
+    try:
+        n_files = make_tree(tmp, args.dirs, args.files_per_dir, args.file_bytes)
+        results = [
+            bench(args.redis_url, tmp, int(b), max_files=n_files, chunk_chars=args.chunk_chars, workers=args.workers)
+            for b in args.batch_sizes.split(",")
+            if b.strip()
+        ]
+        print(json.dumps({"files": n_files, "results": results}, ensure_ascii=False, indent=2))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
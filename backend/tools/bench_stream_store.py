@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark StreamStore event-log backends (zset vs Redis Streams).
+
+Appends --n events of roughly --payload-bytes each into a scratch tenant per backend,
+then replays the whole log in --page sized pages, and reports throughput, per-append
+round-trips and the MEMORY USAGE of the log key. Scratch keys are deleted afterwards.
+
+Run against a real Redis (not production):
+  python tools/bench_stream_store.py --redis-url redis://localhost:6379/15 --n 20000 --keep 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import uuid
+from typing import Any, Dict
+
+from shared.stream_store import StreamStore
+
+# round-trips per append_event on each backend (one EVALSHA each)
+_APPEND_RTTS = {"zset": 1, "stream": 1}
+
+
+def bench(redis_url: str, backend: str, n: int, keep: int, payload_bytes: int, page: int) -> Dict[str, Any]:
+    store = StreamStore(redis_url, event_keep=keep, backend=backend)
+    tenant = f"bench-{backend}-{uuid.uuid4().hex[:8]}"
+    payload = {"summary": "bench", "data": {"text": "x" * max(0, payload_bytes)}}
+    log_key = store._k(tenant, "z" if backend == "zset" else "x")
+    try:
+        t0 = time.perf_counter()
+        for _ in range(n):
+            store.append_event(tenant, "report", payload)
+        append_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        cursor = 0
+        replayed = 0
+        while True:
+            evs = store.replay(tenant, after_seq=cursor, limit=page)
+            if not evs:
+                break
+            replayed += len(evs)
+            cursor = evs[-1].seq
+        replay_s = time.perf_counter() - t0
+
+        try:
+            mem = int(store.r.memory_usage(log_key) or 0)
+        except Exception:
+            mem = -1
+        return {
+            "backend": backend,
+            "events": n,
+            "append_per_s": round(n / append_s, 1) if append_s else None,
+            "append_rtts_per_event": _APPEND_RTTS[backend],
+            "replayed": replayed,
+            "replay_events_per_s": round(replayed / replay_s, 1) if replay_s else None,
+            "log_key_bytes": mem,
+        }
+    finally:
+        store.r.delete(*(store._k(tenant, s) for s in ("seq", "z", "x")))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--redis-url", default="redis://localhost:6379/15")
+    ap.add_argument("--n", type=int, default=20000)
+    ap.add_argument("--keep", type=int, default=2000)
+    ap.add_argument("--payload-bytes", type=int, default=512)
+    ap.add_argument("--page", type=int, default=200)
+    ap.add_argument("--backends", default="zset,stream")
+    args = ap.parse_args()
+
+    out = [
+        bench(args.redis_url, b.strip(), args.n, args.keep, args.payload_bytes, args.page)
+        for b in args.backends.split(",")
+        if b.strip()
+    ]
+    print(json.dumps(out, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
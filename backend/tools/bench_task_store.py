@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Benchmark TaskStore updates: hash records + one EVALSHA vs the former JSON GET/merge/SET/EXPIRE.
+
+Creates --tasks scratch task records of ~--result-bytes each (a callback-sized result
+field), then for each mode:
+  - latency: --n sequential status updates, reported as p50/p95/p99 in milliseconds
+  - contention: --threads threads each write their own field into one shared task at the
+    same time; "lost" counts fields missing afterwards (lost updates)
+  - get_many: reading all --tasks records, pipelined (hash) vs one GET per id (legacy)
+Scratch keys are deleted afterwards.
+
+Run against a real Redis (not production):
+  python tools/bench_task_store.py --redis-url redis://localhost:6379/15 --n 5000 --threads 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List
+
+from shared.task_store import TaskStore
+
+
+class LegacyTaskStore:
+    """The pre-hash TaskStore: whole record as one JSON string, read-modify-write updates."""
+
+    def __init__(self, store: TaskStore):
+        self.r = store.r
+        self.ttl = store.ttl
+
+    def put(self, task_id: str, task: Dict[str, Any]) -> None:
+        key = f"task:{task_id}"
+        self.r.set(key, json.dumps(task, ensure_ascii=False))
+        self.r.expire(key, self.ttl)
+
+    def get(self, task_id: str) -> Any:
+        raw = self.r.get(f"task:{task_id}")
+        return json.loads(raw) if raw else None
+
+    def update(self, task_id: str, patch: Dict[str, Any]) -> Any:
+        task = self.get(task_id)
+        if not task:
+            return None
+        task.update(patch)
+        self.put(task_id, task)
+        return task
+
+    def get_many(self, task_ids: List[str]) -> Dict[str, Any]:
+        return {t: v for t in task_ids if (v := self.get(t)) is not None}
+
+
+def _pct(samples: List[float], p: float) -> float:
+    s = sorted(samples)
+    return round(s[min(len(s) - 1, int(len(s) * p))] * 1000.0, 3)
+
+
+def _contention(store: Any, task_id: str, threads: int) -> int:
+    barrier = threading.Barrier(threads)
+
+    def worker(i: int) -> None:
+        barrier.wait()
+        store.update(task_id, {f"step_{i}": i})
+
+    ts = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    task = store.get(task_id) or {}
+    return sum(1 for i in range(threads) if f"step_{i}" not in task)
+
+
+def bench(mode: str, store: Any, ids: List[str], n: int, threads: int, result_bytes: int) -> Dict[str, Any]:
+    record = {"task_type": "bench", "status": "queued", "result": {"text": "x" * max(0, result_bytes)}, "error": None}
+    for task_id in ids:
+        store.put(task_id, record)
+
+    samples: List[float] = []
+    update: Callable[..., Any] = store.update
+    for i in range(n):
+        t0 = time.perf_counter()
+        update(ids[i % len(ids)], {"status": "running" if i % 2 else "succeeded", "retry_count": i})
+        samples.append(time.perf_counter() - t0)
+
+    lost = _contention(store, ids[0], threads)
+
+    t0 = time.perf_counter()
+    got = store.get_many(ids)
+    get_many_s = time.perf_counter() - t0
+    return {
+        "mode": mode,
+        "updates": n,
+        "update_ms_p50": _pct(samples, 0.50),
+        "update_ms_p95": _pct(samples, 0.95),
+        "update_ms_p99": _pct(samples, 0.99),
+        "update_round_trips": 1 if mode == "hash" else 3,
+        "contention_threads": threads,
+        "contention_lost_updates": lost,
+        "get_many_tasks": len(got),
+        "get_many_ms": round(get_many_s * 1000.0, 3),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--redis-url", default="redis://localhost:6379/15")
+    ap.add_argument("--tasks", type=int, default=200)
+    ap.add_argument("--n", type=int, default=5000)
+    ap.add_argument("--threads", type=int, default=32)
+    ap.add_argument("--result-bytes", type=int, default=2048)
+    args = ap.parse_args()
+
+    store = TaskStore(args.redis_url, ttl_seconds=600)
+    out = []
+    for mode, impl in (("legacy", LegacyTaskStore(store)), ("hash", store)):
+        ids = [f"bench-{mode}-{uuid.uuid4().hex[:12]}" for _ in range(max(1, args.tasks))]
+        try:
+            out.append(bench(mode, impl, ids, args.n, args.threads, args.result_bytes))
+        finally:
+            for i in range(0, len(ids), 500):
+                store.r.delete(*(f"task:{t}" for t in ids[i:i + 500]))
+    print(json.dumps(out, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
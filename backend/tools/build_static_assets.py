@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Build the content-hashed static bundles (static/dist/*.<hash>.* + manifest.json).
+
+Copies every source listed in nexus_supervisor.static_assets.ASSETS (shared CSS/JS of the
+public pages and /app, Live2D scripts) to static/dist under a content-hashed name and
+writes static/dist/manifest.json, which the pages use to reference them. Run at deploy
+time, after installing requirements (the supervisor builds missing bundles on first use,
+but cannot if static/ is read-only):
+
+  python tools/build_static_assets.py
+  python tools/build_static_assets.py --prune   # also delete hashed copies not in the manifest
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+# Ensure repository root is importable when executed as a script
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from nexus_supervisor.static_assets import DIST, MANIFEST, STATIC_DIR, build_assets
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--static-dir", default=str(STATIC_DIR))
+    ap.add_argument("--prune", action="store_true", help="delete hashed copies of older builds")
+    args = ap.parse_args()
+
+    static_dir = Path(args.static_dir)
+    manifest = build_assets(static_dir)
+    pruned = []
+    if args.prune:
+        keep = {Path(p).name for p in manifest.values()} | {MANIFEST}
+        for f in (static_dir / DIST).iterdir():
+            if f.is_file() and f.name not in keep:
+                f.unlink()
+                pruned.append(f.name)
+    sizes = {name: (static_dir / path).stat().st_size for name, path in manifest.items()}
+    print(json.dumps({"manifest": manifest, "bytes": sizes, "pruned": pruned}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Compact the LLM cost ledger and audit log into their columnar stores (shared.ledger_store).
+
+Incremental: only lines appended since the previous run are parsed. Run from cron, e.g. hourly:
+  python tools/compact_ledgers.py
+  python tools/compact_ledgers.py --ledger logs/llm_cost_ledger.jsonl --audit logs/llm_audit.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+# Ensure repository root is importable when executed as a script
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from shared.ledger_store import AUDIT_COLUMNS, COST_COLUMNS, LedgerStore
+from shared.settings import settings
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ledger", default=str(getattr(settings, "llm_cost_ledger_path", "logs/llm_cost_ledger.jsonl")))
+    ap.add_argument("--audit", default=str(getattr(settings, "llm_audit_log_path", "logs/llm_audit.jsonl")))
+    args = ap.parse_args()
+    out = {}
+    for name, path, columns in (("ledger", args.ledger, COST_COLUMNS), ("audit", args.audit, AUDIT_COLUMNS)):
+        if not os.path.exists(path):
+            out[name] = {"skipped": "missing_file", "path": path}
+            continue
+        res = LedgerStore(path, columns).compact()
+        out[name] = {"path": path, "rows": res["rows"], "days": len(res["days"]), "offset": res["offset"]}
+    print(json.dumps(out, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
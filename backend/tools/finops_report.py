@@ -2,44 +2,30 @@
 from __future__ import annotations
 
 import argparse
-import json
 import os
-import re
+import sys
 from datetime import datetime, timezone
-from collections import defaultdict
-from typing import Any, Dict, Tuple
 
-def parse_ts(ts: str) -> datetime:
-    # expected: 2026-01-31T12:34:56Z
-    return datetime.strptime(ts, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+# Ensure repository root is importable when executed as a script
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
 
-def load_jsonl(path: str):
-    if not os.path.exists(path):
-        return []
-    out = []
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                out.append(json.loads(line))
-            except Exception:
-                continue
-    return out
+from shared.ledger_store import COST_COLUMNS, LedgerStore
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--from", dest="date_from", default=None, help="YYYY-MM-DD (UTC)")
     ap.add_argument("--to", dest="date_to", default=None, help="YYYY-MM-DD (UTC, inclusive)")
     ap.add_argument("--ledger", default="logs/llm_cost_ledger.jsonl")
+    ap.add_argument("--store", default=None, help="columnar store dir (default: logs/columnar/<ledger name>)")
+    ap.add_argument("--compact", action="store_true", help="compact the ledger into the store first")
     ap.add_argument("--out", default="logs/finops_report.md")
     args = ap.parse_args()
 
-    rows = load_jsonl(args.ledger)
-    if not rows:
-        print("No ledger rows found.")
-        return
+    store = LedgerStore(args.ledger, COST_COLUMNS, root=args.store)
+    if args.compact:
+        store.compact()
 
     dfrom = datetime.min.replace(tzinfo=timezone.utc)
     dto = datetime.max.replace(tzinfo=timezone.utc)
@@ -50,36 +36,24 @@ def main():
         dto = datetime.strptime(args.date_to, "%Y-%m-%d").replace(tzinfo=timezone.utc)
         dto = dto.replace(hour=23, minute=59, second=59)
 
-    filt = []
-    for r in rows:
-        ts = r.get("ts_utc")
-        if not ts:
-            continue
-        try:
-            t = parse_ts(ts)
-        except Exception:
-            continue
-        if dfrom <= t <= dto:
-            filt.append(r)
-
-    totals = defaultdict(float)
-    by_provider = defaultdict(float)
-    by_model = defaultdict(float)
-    by_purpose = defaultdict(float)
-    by_team = defaultdict(float)
-    approx_count = 0
-    n = 0
+    # only the day partitions in the window are read (plus the not yet compacted tail)
+    res = store.aggregate(
+        since=dfrom.timestamp() if args.date_from else None,
+        until=dto.timestamp() if args.date_to else None,
+        by=("provider", "model", "purpose", "team"),
+        value="actual_cost_usd",
+    )
+    if not res.rows and not (args.date_from or args.date_to):
+        print("No ledger rows found.")
+        return
 
-    for r in filt:
-        n += 1
-        cost = float(r.get("actual_cost_usd") or 0.0)
-        totals["total"] += cost
-        by_provider[str(r.get("provider") or "unknown")] += cost
-        by_model[str(r.get("model") or "unknown")] += cost
-        by_purpose[str(r.get("purpose") or "default")] += cost
-        by_team[f"{r.get('team','default')}/{r.get('project','nexus')}"] += cost
-        if r.get("approx_tokens"):
-            approx_count += 1
+    n = res.rows
+    totals = {"total": res.sums["actual_cost_usd"]}
+    approx_count = int(res.sums["approx_tokens"])
+    by_provider = res.groups["provider"]
+    by_model = res.groups["model"]
+    by_purpose = res.groups["purpose"]
+    by_team = res.groups["team"]
 
     def topk(d, k=10):
         return sorted(d.items(), key=lambda x: x[1], reverse=True)[:k]
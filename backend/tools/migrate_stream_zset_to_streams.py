@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Migrate StreamStore event logs from the zset layout to Redis Streams.
+
+Copies every nexus:stream:{tenant}:z (score=seq, value=envelope json) into
+nexus:stream:{tenant}:x with stream id "{seq}-0", so SSE cursors keep working after
+switching STREAM_BACKEND=stream. Idempotent: entries at or below the stream's last id
+are skipped, so it can be re-run (e.g. once before and once right after the switch).
+
+The seq counter (nexus:stream:{tenant}:seq) is shared by both layouts and left untouched.
+
+Example:
+  python tools/migrate_stream_zset_to_streams.py --redis-url redis://localhost:6379/0 --dry-run
+  python tools/migrate_stream_zset_to_streams.py --tenant default::nexus --delete-zset
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from typing import Any, Dict, List
+
+import redis
+
+from shared.settings import settings
+
+PREFIX = "nexus:stream:"
+
+
+def _tenants(r: "redis.Redis", only: str) -> List[str]:
+    if only:
+        return [only]
+    out: List[str] = []
+    for key in r.scan_iter(match=f"{PREFIX}*:z", count=500):
+        out.append(key[len(PREFIX):-len(":z")])
+    return sorted(set(out))
+
+
+def _last_seq(r: "redis.Redis", xkey: str) -> int:
+    last = r.xrevrange(xkey, count=1)
+    if not last:
+        return 0
+    return int(last[0][0].split("-", 1)[0])
+
+
+def migrate_tenant(r: "redis.Redis", tenant: str, keep: int, batch: int, dry_run: bool, delete_zset: bool) -> Dict[str, Any]:
+    zkey = f"{PREFIX}{tenant}:z"
+    xkey = f"{PREFIX}{tenant}:x"
+    floor = _last_seq(r, xkey)
+    copied = 0
+    skipped = 0
+    bad = 0
+    start = 0
+    while True:
+        rows = r.zrange(zkey, start, start + batch - 1, withscores=True)
+        if not rows:
+            break
+        start += len(rows)
+        pipe = r.pipeline(transaction=False)
+        n = 0
+        for raw, score in rows:
+            seq = int(score)
+            if seq <= floor:
+                skipped += 1
+                continue
+            try:
+                env = json.loads(raw)
+                fields = {
+                    "t": str(env["event_type"]),
+                    "p": json.dumps(env.get("payload") or {}, ensure_ascii=False),
+                    "c": str(env.get("created_at") or ""),
+                }
+            except Exception:
+                bad += 1
+                continue
+            pipe.xadd(xkey, fields, id=f"{seq}-0")
+            floor = seq
+            n += 1
+        if n and not dry_run:
+            pipe.execute()
+        copied += n
+    if not dry_run:
+        if keep > 0 and copied:
+            r.xtrim(xkey, maxlen=keep, approximate=True)
+        if delete_zset:
+            r.delete(zkey)
+    return {"tenant": tenant, "copied": copied, "skipped": skipped, "bad": bad, "last_seq": floor}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--redis-url", default=settings.redis_url)
+    ap.add_argument("--tenant", default="", help="migrate a single tenant id (org::project); default: all")
+    ap.add_argument("--keep", type=int, default=int(settings.stream_event_keep))
+    ap.add_argument("--batch", type=int, default=500)
+    ap.add_argument("--dry-run", action="store_true")
+    ap.add_argument("--delete-zset", action="store_true", help="drop the zset after copying")
+    args = ap.parse_args()
+
+    r = redis.Redis.from_url(args.redis_url, decode_responses=True)
+    results = [
+        migrate_tenant(r, t, keep=args.keep, batch=max(1, args.batch), dry_run=args.dry_run, delete_zset=args.delete_zset)
+        for t in _tenants(r, args.tenant)
+    ]
+    print(json.dumps({"dry_run": args.dry_run, "tenants": results}, ensure_ascii=False, indent=2))
+    return 1 if any(x["bad"] for x in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
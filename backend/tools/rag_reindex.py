@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Rebuild the NaiveRAG inverted index (BM25) from the stored docs.
+
+Needed once per tenant for docs ingested before the index existed; safe to re-run. The first
+query of such a tenant also does it (once per process, see shared/rag_naive.py), so running this
+after a deploy only keeps that rebuild off the query path.
+
+Example:
+  python tools/rag_reindex.py --tenant default::nexus
+  python tools/rag_reindex.py --all
+  python tools/rag_reindex.py --tenant default::nexus --analyzer ko_bigram
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+
+from shared.rag_naive import NaiveRAG
+from shared.settings import settings
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--redis-url", default=settings.redis_url)
+    ap.add_argument("--tenant", default="", help="tenant id (org::project)")
+    ap.add_argument("--all", action="store_true", help="reindex every tenant that has nexus:rag:*:docs")
+    ap.add_argument("--batch", type=int, default=200)
+    ap.add_argument("--analyzer", default="", help="switch to this analyzer before rebuilding (word|ko_particle|ko_bigram|ko_trigram)")
+    args = ap.parse_args()
+
+    rag = NaiveRAG(args.redis_url, default_analyzer=settings.rag_analyzer)
+    if args.all:
+        tenants = sorted({k[len("nexus:rag:"):-len(":docs")] for k in rag.r.scan_iter(match="nexus:rag:*:docs", count=500)})
+    elif args.tenant:
+        tenants = [args.tenant]
+    else:
+        ap.error("--tenant or --all required")
+    if args.analyzer:
+        out = [rag.set_analyzer(t, args.analyzer) for t in tenants]
+    else:
+        out = [rag.reindex(t, batch=max(1, args.batch)) for t in tenants]
+    print(json.dumps(out, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
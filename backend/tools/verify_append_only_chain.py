@@ -1,15 +1,51 @@
 #!/usr/bin/env python3
+"""Verify a hash-chained JSONL log (LLM audit log, cost ledger).
+
+  python tools/verify_append_only_chain.py logs/llm_audit.jsonl
+      resumes from the newest signed checkpoint (<path>.checkpoints.jsonl) and records new
+      ones; without APPEND_ONLY_CHECKPOINT_KEY / WORM_MANIFEST_HMAC_KEY (or --hmac-key) this
+      is a full verification
+  python tools/verify_append_only_chain.py logs/llm_audit.jsonl --full --workers 8
+      periodic full re-verification, split across 8 processes
+  python tools/verify_append_only_chain.py logs/llm_audit.jsonl --no-checkpoints
+      the plain single-pass verify_jsonl_chain
+
+Exits 2 when the chain does not verify.
+"""
 from __future__ import annotations
 
 import argparse
 import json
+import os
+import sys
+
+# Ensure repository root is importable when executed as a script
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
 from shared.append_only import verify_jsonl_chain
+from shared.chain_checkpoint import DEFAULT_CHECKPOINT_EVERY, verify_chain_checkpointed
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("path", help="jsonl path to verify")
+    ap.add_argument("--no-checkpoints", action="store_true", help="plain full verification, no checkpoint file")
+    ap.add_argument("--full", action="store_true", help="re-verify from the first record")
+    ap.add_argument("--workers", type=int, default=1, help="processes for a full verification (implies --full)")
+    ap.add_argument("--hmac-key", default=None, help="checkpoint signing key (default: from settings)")
+    ap.add_argument("--checkpoint-every-mb", type=int, default=DEFAULT_CHECKPOINT_EVERY // (1024 * 1024))
     args = ap.parse_args()
-    res = verify_jsonl_chain(args.path)
+    if args.no_checkpoints:
+        res = verify_jsonl_chain(args.path)
+    else:
+        res = verify_chain_checkpointed(
+            args.path,
+            key=args.hmac_key,
+            full=args.full,
+            workers=max(1, args.workers),
+            checkpoint_every=max(1, args.checkpoint_every_mb) * 1024 * 1024,
+        )
     print(json.dumps(res, ensure_ascii=False, indent=2))
     if not res.get("ok"):
         raise SystemExit(2)
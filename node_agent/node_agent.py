@@ -2,7 +2,8 @@
 Windows Node Agent (Prototype)
 - 페어링 (Enrollment)
 - Poll 기반 명령 수신 (WSS는 미래 구현)
-- 로컬 폴더 스캔 + 텍스트 추출
+- 로컬 폴더 스캔 + 문서 추출 (supervisor와 같은 shared.doc_extract, 로컬 프로세스 풀)
+- 로컬 manifest로 변경된 파일만 업로드
 - 리포트 업로드
 
 Usage:
@@ -10,15 +11,270 @@ Usage:
     python node_agent.py --run
 """
 import argparse
+import hashlib
 import json
+import multiprocessing
 import os
+import sys
 import time
 import uuid
 import platform
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import requests
 
+# 문서 추출: backend의 shared 패키지 재사용 (설치되어 있거나 저장소 체크아웃의 backend/)
+try:
+    from shared.extract_pool import ExtractPool
+except ImportError:
+    _BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+    if (_BACKEND_DIR / "shared" / "doc_extract.py").exists():
+        sys.path.insert(0, str(_BACKEND_DIR))
+    try:
+        from shared.extract_pool import ExtractPool
+    except ImportError:  # 파서 미설치: .txt/.md만 처리
+        ExtractPool = None
+# 변경 감지 해시 (표준 라이브러리만 사용, supervisor 폴더 인제스트와 같은 함수)
+from shared.file_fingerprint import file_fingerprint
+
+# /node/poll 서버측 대기 시간 (초)
+POLL_WAIT_SECONDS = 25
+
+# 폴더 인제스트 추출 (supervisor RAG 폴더 인제스트 기본값과 동일)
+CHUNK_CHARS = 12000           # 청크당 최대 글자 수
+XLSX_CELL_LIMIT = 20000
+MAX_FILE_MB = 50
+EXTRACT_WORKERS = min(4, max(1, (os.cpu_count() or 2) - 1))  # 0 = 프로세스 없이 순차 추출
+EXTRACT_TIMEOUT_SECONDS = 120.0
+DEFAULT_EXTENSIONS = "pdf,docx,pptx,xlsx,txt,md" if ExtractPool is not None else "txt,md"
+# manifest 도입 전 에이전트의 .txt/.md 청크 doc_id: {파일명}::{sha1(실제 경로)[:12]}::chunk{n}
+LEGACY_CHUNK_CHARS = 4000
+LEGACY_EXTENSIONS = {"txt", "md"}
+
+# 폴더 인제스트 업로드 (/node/ingest/batch)
+INGEST_BATCH_CHUNKS = 64      # 배치당 최대 청크 수 (서버 NODE_INGEST_BATCH_MAX 이하)
+INGEST_BATCH_CHARS = 512_000  # 배치당 최대 글자 수 (요청 본문 크기 제한)
+INGEST_WINDOW = 8             # 서버 반영(ack) 전까지 보관하는 배치 수 (재전송용)
+INGEST_STALL_SECONDS = 30     # ack 진행이 없으면 acked_seq 다음부터 재전송
+INGEST_MAX_RETRIES = 8        # 연속 네트워크 실패 허용 횟수
+
+
+class IngestUploadError(RuntimeError):
+    pass
+
+
+class ChunkUploader:
+    """
+    청크 배치 스트리밍 업로드 (seq 순서, 재개 가능)
+    
+    add()로 청크를 넣으면 배치 단위로 /node/ingest/batch에 올리고, 서버가 RAG에 반영한
+    배치(acked_seq 이하)는 버린다. 네트워크가 끊기면 /node/ingest/status로 acked_seq를
+    확인한 뒤 그 다음 배치부터 다시 보낸다 (doc_id가 고정이라 재전송은 멱등).
+    """
+    
+    def __init__(self, agent: "NodeAgent", command_id: str):
+        self.agent = agent
+        self.command_id = command_id
+        self.pending: "OrderedDict[int, Tuple[List[Dict[str, Any]], List[str], bool]]" = OrderedDict()
+        self.seq = 0
+        self.next_send = 1
+        self.acked = 0
+        self.sent_chunks = 0
+        self.sent_deletes = 0
+        self._buf: List[Dict[str, Any]] = []
+        self._buf_deletes: List[str] = []
+        self._buf_chars = 0
+    
+    def add(self, chunk: Dict[str, Any]) -> None:
+        self._buf.append(chunk)
+        self._buf_chars += len(chunk["text"])
+        self._maybe_flush()
+    
+    def delete(self, doc_ids: List[str]) -> None:
+        """서버 인덱스에서 지울 청크 (변경/삭제된 파일의 이전 청크)"""
+        for doc_id in doc_ids:
+            self._buf_deletes.append(doc_id)
+            self._maybe_flush()
+    
+    def _maybe_flush(self) -> None:
+        if len(self._buf) + len(self._buf_deletes) >= INGEST_BATCH_CHUNKS or self._buf_chars >= INGEST_BATCH_CHARS:
+            self._flush(final=False)
+    
+    def finish(self, timeout_s: float = 600.0) -> Dict[str, Any]:
+        """마지막 배치(final) 전송 후 서버가 전부 반영할 때까지 대기"""
+        self._flush(final=True)
+        return self._wait_acked(self.seq, timeout_s)
+    
+    # ---- internals ----
+    def _flush(self, final: bool) -> None:
+        self.seq += 1
+        self.pending[self.seq] = (self._buf, self._buf_deletes, final)
+        self.sent_chunks += len(self._buf)
+        self.sent_deletes += len(self._buf_deletes)
+        self._buf, self._buf_deletes, self._buf_chars = [], [], 0
+        self._pump()
+        if len(self.pending) > INGEST_WINDOW:
+            self._wait_acked(self.seq - INGEST_WINDOW, timeout_s=INGEST_STALL_SECONDS * 10)
+    
+    def _set_acked(self, acked: int) -> None:
+        self.acked = max(self.acked, int(acked))
+        while self.pending and next(iter(self.pending)) <= self.acked:
+            self.pending.popitem(last=False)
+        self.next_send = max(self.next_send, self.acked + 1)
+    
+    def _pump(self) -> None:
+        """next_send부터 현재 seq까지 전송 (429 대기, 409 되감기, 네트워크 오류 시 재개)"""
+        failures = 0
+        while self.next_send <= self.seq:
+            seq = self.next_send
+            if seq not in self.pending:  # 이미 반영됨
+                self.next_send += 1
+                continue
+            chunks, delete_ids, final = self.pending[seq]
+            try:
+                resp = self.agent.session.post(
+                    f"{self.agent.base_url}/node/ingest/batch",
+                    json={
+                        "node_id": self.agent.node_id,
+                        "node_token": self.agent.node_token,
+                        "command_id": self.command_id,
+                        "seq": seq,
+                        "final": final,
+                        "chunks": chunks,
+                        "delete_ids": delete_ids
+                    },
+                    timeout=30
+                )
+            except requests.RequestException as e:
+                resp = None
+                err = str(e)
+            
+            if resp is not None and resp.status_code in (200, 202):
+                failures = 0
+                self.next_send = seq + 1
+                self._set_acked(resp.json().get("acked_seq", 0))
+                continue
+            if resp is not None and resp.status_code == 409:
+                error = (resp.json().get("detail") or {}).get("error") or {}
+                self._set_acked(error.get("acked_seq", 0))
+                self.next_send = max(self.acked + 1, min(self.next_send, int(error.get("expected_seq", self.next_send))))
+                continue
+            if resp is not None and resp.status_code == 429:
+                time.sleep(float(resp.headers.get("Retry-After", 2)))
+                continue
+            if resp is not None and resp.status_code < 500:
+                raise IngestUploadError(f"batch {seq} rejected: {resp.status_code} {resp.text[:200]}")
+            
+            # 네트워크 오류 / 5xx: 백오프 후 서버 반영 지점부터 재개
+            failures += 1
+            if failures > INGEST_MAX_RETRIES:
+                raise IngestUploadError(f"batch {seq} upload failed: {err if resp is None else resp.status_code}")
+            time.sleep(min(2 ** failures, 30))
+            status = self._status()
+            if status is not None:
+                self._set_acked(status.get("acked_seq", 0))
+                self.next_send = self.acked + 1
+    
+    def _status(self) -> Optional[Dict[str, Any]]:
+        try:
+            resp = self.agent.session.get(
+                f"{self.agent.base_url}/node/ingest/status",
+                params={"node_id": self.agent.node_id, "node_token": self.agent.node_token, "command_id": self.command_id},
+                timeout=10
+            )
+            if resp.status_code == 200:
+                return resp.json()
+        except requests.RequestException:
+            pass
+        return None
+    
+    def _wait_acked(self, target_seq: int, timeout_s: float) -> Dict[str, Any]:
+        """acked_seq >= target_seq까지 대기. 진행이 멈추면 acked_seq 다음부터 재전송"""
+        deadline = time.monotonic() + timeout_s
+        last_progress = time.monotonic()
+        status: Dict[str, Any] = {}
+        while self.acked < target_seq:
+            if time.monotonic() > deadline:
+                raise IngestUploadError(f"timed out waiting for ingest ack (acked={self.acked}, target={target_seq})")
+            time.sleep(0.5)
+            status = self._status() or status
+            before = self.acked
+            self._set_acked(status.get("acked_seq", 0))
+            if self.acked > before:
+                last_progress = time.monotonic()
+            elif time.monotonic() - last_progress > INGEST_STALL_SECONDS:
+                # 서버 재시작 등으로 큐에서 유실된 배치 재전송
+                self.next_send = self.acked + 1
+                self._pump()
+                last_progress = time.monotonic()
+        return status
+
+
+def legacy_doc_ids(path: str, size: int) -> List[str]:
+    """
+    manifest 도입 전 에이전트가 이 파일에 대해 올렸을 수 있는 doc_id 목록
+    
+    이전 청크 수는 글자 수 기준(LEGACY_CHUNK_CHARS)이라 바이트 크기로 상한을 잡는다.
+    서버에 없는 id의 삭제는 아무 일도 하지 않는다.
+    """
+    key = hashlib.sha1(os.path.realpath(path).encode("utf-8")).hexdigest()[:12]
+    name = os.path.basename(path)
+    return [f"{name}::{key}::chunk{n}" for n in range(max(1, -(-size // LEGACY_CHUNK_CHARS)))]
+
+
+class LocalManifest:
+    """
+    업로드한 파일 기록 (JSON: path → {size, mtime, hash, doc_ids})
+    
+    size/mtime이 같으면 해시 없이 건너뛰고, 달라도 해시가 같으면 (복사/동기화로 touch만 된 경우) 건너뛴다.
+    서버가 모든 배치를 반영한 뒤에만 저장하므로, 중간에 실패하면 다음 실행에서 다시 보낸다.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.files: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.files = json.load(f).get("files", {})
+            except (OSError, ValueError):
+                self.files = {}
+    
+    def under(self, folder: str) -> List[str]:
+        prefix = folder.rstrip(os.sep) + os.sep
+        return [p for p in self.files if p.startswith(prefix)]
+    
+    def save(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"version": 1, "files": self.files}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+
+@dataclass(eq=False)
+class _FileJob:
+    path: str
+    rel: str
+    ext: str
+    size: int
+    mtime: int
+    fingerprint: str
+    old_doc_ids: List[str]
+    new_ids: List[str] = field(default_factory=list)
+
+
+def _plain_text_chunks(path: str, max_chars: int) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """shared.doc_extract가 없을 때의 .txt/.md 추출 → (chunk_id, text, meta)"""
+    text = Path(path).read_text(encoding='utf-8', errors='ignore')
+    out = []
+    for n, start in enumerate(range(0, len(text), max_chars)):
+        piece = text[start:start + max_chars]
+        if piece.strip():
+            out.append((f"c{n}", piece, {}))
+    return out
+
 
 class NodeAgent:
     """Windows Node Agent"""
@@ -29,6 +285,9 @@ class NodeAgent:
         self.base_url = self.config.get("base_url", "http://localhost:8000")
         self.node_id = self.config.get("node_id", f"node-win-{uuid.uuid4().hex[:8]}")
         self.node_token = self.config.get("node_token")
+        self.manifest_path = os.path.join(os.path.dirname(os.path.abspath(config_path)), "node_manifest.json")
+        # keep-alive 연결 재사용 (long poll 반복)
+        self.session = requests.Session()
         
     def _load_config(self) -> Dict[str, Any]:
         """Load config from JSON file"""
@@ -100,22 +359,22 @@ class NodeAgent:
     # Poll Commands
     # ============================================================
     
-    def poll_commands(self) -> List[Dict[str, Any]]:
+    def poll_commands(self) -> Optional[List[Dict[str, Any]]]:
         """
-        Poll 방식으로 명령 가져오기 (30초 타임아웃)
+        Long poll 방식으로 명령 가져오기 (서버가 명령이 생길 때까지 최대 POLL_WAIT_SECONDS 대기)
         
         Returns:
-            명령 목록
+            명령 목록 (대기 시간 내 명령이 없으면 빈 목록), 요청 실패 시 None
         """
         if not self.node_token:
             print("[Node Agent] ❌ Not enrolled. Run --enroll first.")
-            return []
+            return None
         
         try:
-            resp = requests.get(
+            resp = self.session.get(
                 f"{self.base_url}/node/poll",
-                params={"node_id": self.node_id, "node_token": self.node_token},
-                timeout=35  # 30초 + 5초 여유
+                params={"node_id": self.node_id, "node_token": self.node_token, "wait": POLL_WAIT_SECONDS},
+                timeout=POLL_WAIT_SECONDS + 10  # 서버 대기 + 여유
             )
             
             if resp.status_code == 200:
@@ -126,10 +385,10 @@ class NodeAgent:
                 return commands
             else:
                 print(f"[Node Agent] ❌ Poll failed: {resp.status_code}")
-                return []
+                return None
         except Exception as e:
             print(f"[Node Agent] ❌ Poll error: {e}")
-            return []
+            return None
     
     # ============================================================
     # Execute Commands
@@ -159,76 +418,181 @@ class NodeAgent:
     
     def _execute_folder_ingest(self, command_id: str, params: Dict[str, Any]) -> None:
         """
-        로컬 폴더 스캔 + 텍스트 추출
+        로컬 폴더 스캔 + 문서 추출 + 변경분 업로드
         
         Args:
             command_id: 명령 ID
-            params: { folder, extensions }
+            params: { folder, extensions, workers, max_file_mb }
         """
-        folder = params.get("folder", ".")
-        extensions = params.get("extensions", "txt,md,pdf").split(",")
+        folder = os.path.abspath(params.get("folder", "."))
+        extensions = [e.strip().lower().lstrip(".") for e in params.get("extensions", DEFAULT_EXTENSIONS).split(",") if e.strip()]
+        workers = int(params.get("workers", EXTRACT_WORKERS)) if ExtractPool is not None else 0
+        max_bytes = int(params.get("max_file_mb", MAX_FILE_MB)) * 1024 * 1024
         
         print(f"[Node Agent] Scanning folder: {folder}")
-        print(f"[Node Agent] Extensions: {extensions}")
+        print(f"[Node Agent] Extensions: {extensions} (workers={workers})")
         
         # 진행 상황 리포트
         self._send_report(command_id, "in_progress", progress={"scanned": 0, "total": 0})
         
         try:
-            folder_path = Path(folder)
-            if not folder_path.exists():
+            if not os.path.isdir(folder):
                 raise FileNotFoundError(f"Folder not found: {folder}")
             
-            # 파일 수집
-            all_files = []
-            for ext in extensions:
-                all_files.extend(folder_path.rglob(f"*.{ext.strip()}"))
+            allow = set(extensions)
+            if ExtractPool is None:
+                allow &= {"txt", "md"}
+            manifest = LocalManifest(self.manifest_path)
+            uploader = ChunkUploader(self, command_id)
+            stats = {"scanned": 0, "changed": 0, "unchanged": 0, "removed": 0, "chunks": 0, "failed": 0}
+            errors: List[Dict[str, Any]] = []
+            updates: Dict[str, Optional[Dict[str, Any]]] = {}  # 업로드 완료 후 manifest 반영 (None = 삭제)
+            seen = set()
             
-            total_files = len(all_files)
-            print(f"[Node Agent] Found {total_files} file(s)")
+            def scan() -> Iterator[_FileJob]:
+                # 디렉터리 트리 1회 순회, 확장자는 집합으로 필터
+                for root, _, files in os.walk(folder):
+                    for fn in files:
+                        ext = os.path.splitext(fn)[1].lower().lstrip(".")
+                        if ext not in allow:
+                            continue
+                        path = os.path.join(root, fn)
+                        seen.add(path)
+                        stats["scanned"] += 1
+                        if stats["scanned"] % 200 == 0:
+                            self._send_report(command_id, "in_progress", progress={**stats, "uploaded_chunks": uploader.sent_chunks, "acked_batches": uploader.acked})
+                        try:
+                            st = os.stat(path)
+                            size, mtime = int(st.st_size), int(st.st_mtime)
+                            if size <= 0 or size > max_bytes:
+                                continue
+                            entry = manifest.files.get(path)
+                            if entry and entry.get("size") == size and entry.get("mtime") == mtime:
+                                stats["unchanged"] += 1
+                                continue
+                            fp = file_fingerprint(path, size)
+                        except OSError as e:
+                            errors.append({"path": path, "error": "READ_FAILED", "detail": str(e)})
+                            continue
+                        if entry and entry.get("hash") == fp:
+                            stats["unchanged"] += 1
+                            updates[path] = {**entry, "size": size, "mtime": mtime}
+                            continue
+                        stats["changed"] += 1
+                        rel = os.path.relpath(path, folder).replace(os.sep, "/")
+                        if entry:
+                            old_ids = list(entry.get("doc_ids") or [])
+                        elif ext in LEGACY_EXTENSIONS:
+                            # manifest에 없는 파일: 이전 버전이 경로 기반 id로 올린 청크를 새 id로 교체
+                            old_ids = legacy_doc_ids(path, size)
+                        else:
+                            old_ids = []
+                        yield _FileJob(path=path, rel=rel, ext=ext, size=size, mtime=mtime, fingerprint=fp, old_doc_ids=old_ids)
             
-            # 텍스트 추출 (간단한 프로토타입: .txt만)
-            chunks = []
-            for idx, file_path in enumerate(all_files[:50], 1):  # 최대 50개
-                try:
-                    if file_path.suffix.lower() in ['.txt', '.md']:
-                        text = file_path.read_text(encoding='utf-8', errors='ignore')
-                        doc_id = f"{file_path.name}::{uuid.uuid4().hex[:8]}::chunk0"
-                        
-                        chunks.append({
-                            "doc_id": doc_id,
-                            "text": text[:10000],  # 최대 10KB
-                            "meta": {
-                                "source_path": str(file_path),
-                                "source_ext": file_path.suffix,
-                                "source_size": file_path.stat().st_size
-                            }
-                        })
-                    
-                    # 진행 상황 업데이트 (5개마다)
-                    if idx % 5 == 0:
-                        self._send_report(
-                            command_id, 
-                            "in_progress", 
-                            progress={"scanned": idx, "total": total_files}
-                        )
-                except Exception as e:
-                    print(f"[Node Agent] ⚠️  Failed to extract {file_path}: {e}")
+            for job, chunks, error, done in self._extract(scan(), workers):
+                # 경로 기반 고정 doc_id (재실행/재전송 시 덮어쓰기)
+                base_doc_id = f"{job.rel}::{hashlib.sha1(job.path.encode('utf-8')).hexdigest()[:12]}"
+                for chunk_id, text, meta in chunks:
+                    doc_id = f"{base_doc_id}::{chunk_id}"
+                    uploader.add({
+                        "doc_id": doc_id,
+                        "text": text,
+                        "meta": {
+                            "source_path": job.path,
+                            "source_rel": job.rel,
+                            "source_ext": job.ext,
+                            "source_mtime": job.mtime,
+                            "source_size": job.size,
+                            "chunk_id": chunk_id,
+                            **(meta or {})
+                        }
+                    })
+                    job.new_ids.append(doc_id)
+                    stats["chunks"] += 1
+                if not done:
+                    continue
+                if error:
+                    # 이전 청크는 유지하고 hash를 비워 기록 → 파일이 다시 바뀔 때까지 재시도하지 않음
+                    stats["failed"] += 1
+                    errors.append({"path": job.path, "error": error[0], "detail": error[1]})
+                    updates[job.path] = {"size": job.size, "mtime": job.mtime, "hash": "", "doc_ids": list(dict.fromkeys(job.old_doc_ids + job.new_ids))}
+                    continue
+                keep = set(job.new_ids)
+                uploader.delete([d for d in job.old_doc_ids if d not in keep])
+                updates[job.path] = {"size": job.size, "mtime": job.mtime, "hash": job.fingerprint, "doc_ids": list(dict.fromkeys(job.new_ids))}
+            
+            # 폴더에서 사라진 파일의 청크 삭제
+            for path in manifest.under(folder):
+                ext = os.path.splitext(path)[1].lower().lstrip(".")
+                if path not in seen and ext in allow:
+                    uploader.delete(list(manifest.files[path].get("doc_ids") or []))
+                    updates[path] = None
+                    stats["removed"] += 1
             
-            # 최종 리포트
+            status = uploader.finish()
+            
+            for path, entry in updates.items():
+                if entry is None:
+                    manifest.files.pop(path, None)
+                else:
+                    manifest.files[path] = entry
+            manifest.save()
+            
+            # 최종 리포트 (청크는 이미 업로드됨; RAG 완료 리포트는 서버가 전파)
             result = {
-                "ingested": len(chunks),
-                "total": total_files,
-                "chunks": chunks
+                "ingested": status.get("chunks_ingested", uploader.sent_chunks),
+                "total": stats["scanned"],
+                "changed": stats["changed"],
+                "unchanged": stats["unchanged"],
+                "removed_files": stats["removed"],
+                "deleted_chunks": uploader.sent_deletes,
+                "failed": stats["failed"],
+                "errors": errors[:20],
+                "batches": uploader.seq
             }
             
             self._send_report(command_id, "completed", result=result)
-            print(f"[Node Agent] ✅ Completed: {len(chunks)} chunks extracted")
+            print(f"[Node Agent] ✅ Completed: {stats['changed']} changed / {stats['unchanged']} unchanged file(s), {uploader.sent_chunks} chunks in {uploader.seq} batch(es)")
         
         except Exception as e:
             print(f"[Node Agent] ❌ Folder ingest failed: {e}")
             self._send_report(command_id, "failed", error=str(e))
     
+    def _extract(self, jobs: Iterator[_FileJob], workers: int) -> Iterator[Tuple[_FileJob, List[Tuple[str, str, Dict[str, Any]]], Optional[Tuple[str, str]], bool]]:
+        """
+        (job, chunks, error, done) 스트림. ExtractPool이 있으면 workers개 프로세스에서 파싱하고
+        청크를 부분 배치로 흘려 보내므로, 큰 파일도 추출과 업로드가 겹쳐 진행된다.
+        """
+        if ExtractPool is None:
+            for job in jobs:
+                try:
+                    yield job, _plain_text_chunks(job.path, CHUNK_CHARS), None, True
+                except Exception as e:
+                    yield job, [], ("EXTRACT_FAILED", str(e)), True
+            return
+        
+        def convert(res):
+            chunks = [(c.chunk_id, c.text, c.meta) for c in res.chunks]
+            error = (res.error, res.detail) if res.error else None
+            return res.key, chunks, error, res.done
+        
+        with ExtractPool(
+            workers,
+            timeout_s=EXTRACT_TIMEOUT_SECONDS,
+            max_chars=CHUNK_CHARS,
+            xlsx_cell_limit=XLSX_CELL_LIMIT,
+        ) as pool:
+            for job in jobs:
+                pool.submit(job, job.path)
+                for res in pool.poll(0):
+                    yield convert(res)
+                while pool.full():
+                    for res in pool.poll():
+                        yield convert(res)
+            while pool.outstanding():
+                for res in pool.poll():
+                    yield convert(res)
+    
     # ============================================================
     # Report Upload
     # ============================================================
@@ -261,7 +625,7 @@ class NodeAgent:
         }
         
         try:
-            resp = requests.post(
+            resp = self.session.post(
                 f"{self.base_url}/node/report",
                 json=payload,
                 timeout=10
@@ -292,23 +656,28 @@ class NodeAgent:
             return
         
         try:
+            backoff = 0.0
             while True:
-                # Poll 명령
+                # Long poll: 서버가 명령 도착 시 즉시 응답하므로 성공 시에는 대기 없이 다시 poll
                 commands = self.poll_commands()
                 
+                if commands is None:
+                    # 요청 실패 시에만 지수 백오프 (1s → 최대 30s)
+                    backoff = min(max(backoff * 2, 1.0), 30.0)
+                    time.sleep(backoff)
+                    continue
+                backoff = 0.0
+                
                 # 명령 실행
                 for command in commands:
                     self.execute_command(command)
-                
-                # 5초 대기 (Poll이 30초 타임아웃이므로 짧은 간격)
-                if not commands:
-                    time.sleep(5)
         
         except KeyboardInterrupt:
             print("\n[Node Agent] Stopped by user")
 
 
 def main():
+    multiprocessing.freeze_support()  # 패키징된 exe에서 추출 프로세스 풀 사용
     parser = argparse.ArgumentParser(description="Windows Node Agent")
     parser.add_argument("--enroll", type=str, help="Enroll with pairing code")
     parser.add_argument("--run", action="store_true", help="Run agent (poll mode)")
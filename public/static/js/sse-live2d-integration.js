@@ -202,6 +202,11 @@ class Live2DAgentIntegration {
         this.isSpeaking = false;
         this.speakingTimeout = null;
         
+        // Sentence-pipelined replies: tts_chunk clips are played one after another
+        this.ttsQueue = Promise.resolve();
+        this.ttsPending = 0;
+        this.ttsEnded = true;
+        
         this.setupHandlers();
     }
 
@@ -252,6 +257,12 @@ class Live2DAgentIntegration {
                 this.live2dManager.setState('speaking');
             }
             
+            // Sentence-pipelined reply: audio arrives per sentence as tts_chunk events
+            if (data.segments) {
+                this.ttsEnded = false;
+                return;
+            }
+            
             // Play high-quality TTS audio if audio_url is provided
             if (data.audio_url) {
                 // Use Web Audio API for high-quality playback
@@ -281,19 +292,31 @@ class Live2DAgentIntegration {
             }
         };
 
+        this.sseClient.onTTSChunk = (data) => {
+            if (!data.audio_url) {
+                return;
+            }
+            // Queue the sentence behind the previous one; its audio streams while it is synthesized
+            this.ttsPending += 1;
+            this.ttsQueue = this.ttsQueue
+                .then(() => this.playTTSAudio(data.audio_url, data.duration_ms))
+                .catch(err => console.error('[Live2D Agent] TTS sentence playback error:', err))
+                .finally(() => {
+                    this.ttsPending -= 1;
+                    if (this.ttsEnded && this.ttsPending === 0) {
+                        this.scheduleIdle();
+                    }
+                });
+        };
+
         this.sseClient.onTTSEnd = (data) => {
             console.log('[Live2D Agent] TTS ended, duration:', data.duration_ms);
             
-            // Wait a bit before returning to idle
-            if (this.speakingTimeout) {
-                clearTimeout(this.speakingTimeout);
+            // Pipelined replies end once the last queued sentence finished playing
+            this.ttsEnded = true;
+            if (this.ttsPending === 0) {
+                this.scheduleIdle();
             }
-            this.speakingTimeout = setTimeout(() => {
-                if (this.live2dManager) {
-                    this.live2dManager.setState('idle');
-                }
-                this.isSpeaking = false;
-            }, 500); // 500ms buffer after TTS ends
         };
 
         // Report handler (for UI updates)
@@ -311,6 +334,19 @@ class Live2DAgentIntegration {
         };
     }
     
+    scheduleIdle() {
+        // Wait a bit before returning to idle
+        if (this.speakingTimeout) {
+            clearTimeout(this.speakingTimeout);
+        }
+        this.speakingTimeout = setTimeout(() => {
+            if (this.live2dManager) {
+                this.live2dManager.setState('idle');
+            }
+            this.isSpeaking = false;
+        }, 500); // 500ms buffer after TTS ends
+    }
+    
     /**
      * Play high-quality TTS audio using Web Audio API
      * @param {string} audioUrl - URL to the TTS audio file